@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import DatabaseConnection
+from .models import DatabaseConnection, IncrementalSync
 
 
 @admin.register(DatabaseConnection)
@@ -38,3 +38,17 @@ class DatabaseConnectionAdmin(admin.ModelAdmin):
         return obj.updated_at > recent_threshold
     is_active.boolean = True
     is_active.short_description = 'Recently Active'
+
+
+
+@admin.register(IncrementalSync)
+class IncrementalSyncAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for watermark-based incremental refresh settings.
+    """
+    list_display = ('datasource', 'connection', 'watermark_column', 'last_watermark',
+                    'interval_minutes', 'is_enabled', 'last_status', 'last_synced_at')
+    list_filter = ('is_enabled', 'last_status')
+    search_fields = ('datasource__name', 'connection__name', 'watermark_column')
+    readonly_fields = ('last_watermark', 'watermark_type', 'last_synced_at', 'last_status',
+                       'last_error', 'rows_last_sync', 'total_rows_synced', 'created_at', 'updated_at')
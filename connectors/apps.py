@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ConnectorsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'connectors'
+
+    def ready(self):
+        from . import signals  # noqa: F401
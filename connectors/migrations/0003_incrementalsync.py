@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2025-08-20 10:00
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connectors', '0002_alter_databaseconnection_options_and_more'),
+        ('projects', '0011_add_column_flags_only'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IncrementalSync',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('query', models.TextField(help_text='Source query; new rows are selected from its result')),
+                ('watermark_column', models.CharField(help_text='Monotonically increasing column (timestamp or id) used to find new rows', max_length=255)),
+                ('key_column', models.CharField(blank=True, help_text='Optional unique key; rows re-sent with an existing key replace the old version', max_length=255, null=True)),
+                ('last_watermark', models.CharField(blank=True, max_length=255, null=True)),
+                ('watermark_type', models.CharField(blank=True, choices=[('number', 'Number'), ('timestamp', 'Timestamp'), ('text', 'Text')], max_length=20, null=True)),
+                ('interval_minutes', models.PositiveIntegerField(default=60, help_text='Minutes between scheduled refreshes')),
+                ('is_enabled', models.BooleanField(default=True)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('last_status', models.CharField(choices=[('never', 'Never synced'), ('running', 'Running'), ('success', 'Success'), ('failed', 'Failed')], default='never', max_length=20)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('rows_last_sync', models.PositiveIntegerField(default=0)),
+                ('total_rows_synced', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('connection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='incremental_syncs', to='connectors.databaseconnection')),
+                ('datasource', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='incremental_sync', to='projects.datasource')),
+            ],
+            options={
+                'verbose_name': 'Incremental Sync',
+                'verbose_name_plural': 'Incremental Syncs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
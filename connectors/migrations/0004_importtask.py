@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connectors', '0003_incrementalsync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.CharField(help_text='Celery task id', max_length=255, unique=True)),
+                ('cancel_requested', models.BooleanField(default=False, help_text='Polled by the running task between chunks')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('connection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_tasks', to='connectors.databaseconnection')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='database_import_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Import Task',
+                'verbose_name_plural': 'Import Tasks',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
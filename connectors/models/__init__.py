@@ -1,5 +1,7 @@
 # connectors/models/__init__.py
 
 from .database_connection import DatabaseConnection
+from .incremental_sync import IncrementalSync
+from .import_task import ImportTask
 
-__all__ = ['DatabaseConnection']
+__all__ = ['DatabaseConnection', 'IncrementalSync', 'ImportTask']
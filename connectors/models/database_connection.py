@@ -51,7 +51,8 @@ class DatabaseConnection(models.Model):
         """Test if this database connection is valid."""
         try:
             import sqlalchemy
-            engine = sqlalchemy.create_engine(self.connection_string)
+            from ..services.engine_registry import get_engine
+            engine = get_engine(self)
             with engine.connect() as conn:
                 conn.execute(sqlalchemy.text("SELECT 1"))
             return True, "Connection successful"
@@ -0,0 +1,29 @@
+# connectors/models/import_task.py
+
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class ImportTask(models.Model):
+    """Background database import (or incremental refresh) started by a user."""
+
+    task_id = models.CharField(max_length=255, unique=True, help_text="Celery task id")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='database_import_tasks')
+    connection = models.ForeignKey(
+        'connectors.DatabaseConnection',
+        on_delete=models.CASCADE,
+        related_name='import_tasks'
+    )
+    cancel_requested = models.BooleanField(
+        default=False,
+        help_text="Polled by the running task between chunks"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Import Task"
+        verbose_name_plural = "Import Tasks"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.task_id} ({self.connection.name})"
@@ -0,0 +1,97 @@
+# connectors/models/incremental_sync.py
+
+import uuid
+from datetime import datetime, timedelta
+from django.db import models
+from django.utils import timezone
+
+
+class IncrementalSync(models.Model):
+    """Watermark-based incremental refresh settings for a database-imported DataSource."""
+
+    WATERMARK_TYPES = [
+        ('number', 'Number'),
+        ('timestamp', 'Timestamp'),
+        ('text', 'Text'),
+    ]
+
+    STATUS_CHOICES = [
+        ('never', 'Never synced'),
+        ('running', 'Running'),
+        ('success', 'Success'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    datasource = models.OneToOneField(
+        'projects.DataSource',
+        on_delete=models.CASCADE,
+        related_name='incremental_sync'
+    )
+    connection = models.ForeignKey(
+        'connectors.DatabaseConnection',
+        on_delete=models.CASCADE,
+        related_name='incremental_syncs'
+    )
+    query = models.TextField(help_text="Source query; new rows are selected from its result")
+    watermark_column = models.CharField(
+        max_length=255,
+        help_text="Monotonically increasing column (timestamp or id) used to find new rows"
+    )
+    key_column = models.CharField(
+        max_length=255, blank=True, null=True,
+        help_text="Optional unique key; rows re-sent with an existing key replace the old version"
+    )
+    last_watermark = models.CharField(max_length=255, blank=True, null=True)
+    watermark_type = models.CharField(max_length=20, choices=WATERMARK_TYPES, blank=True, null=True)
+    interval_minutes = models.PositiveIntegerField(default=60, help_text="Minutes between scheduled refreshes")
+    is_enabled = models.BooleanField(default=True)
+
+    last_synced_at = models.DateTimeField(blank=True, null=True)
+    last_status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='never')
+    last_error = models.TextField(blank=True, null=True)
+    rows_last_sync = models.PositiveIntegerField(default=0)
+    total_rows_synced = models.PositiveBigIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Incremental Sync"
+        verbose_name_plural = "Incremental Syncs"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.datasource} <- {self.connection.name} ({self.watermark_column})"
+
+    @property
+    def is_due(self) -> bool:
+        """True if the sync is enabled and its interval has elapsed."""
+        if not self.is_enabled:
+            return False
+        if self.last_synced_at is None:
+            return True
+        return timezone.now() >= self.last_synced_at + timedelta(minutes=self.interval_minutes)
+
+    def get_watermark(self):
+        """Return the stored watermark converted back to its native type."""
+        if self.last_watermark is None:
+            return None
+        if self.watermark_type == 'number':
+            try:
+                return int(self.last_watermark)
+            except ValueError:
+                return float(self.last_watermark)
+        if self.watermark_type == 'timestamp':
+            return datetime.fromisoformat(self.last_watermark)
+        return self.last_watermark
+
+    def set_watermark(self, value, watermark_type: str):
+        """Store a watermark value as text together with its type."""
+        if value is None:
+            return
+        if watermark_type == 'timestamp':
+            self.last_watermark = value.isoformat()
+        else:
+            self.last_watermark = str(value)
+        self.watermark_type = watermark_type
@@ -1,5 +1,22 @@
 # connectors/services/__init__.py
 
-from .database_connection_service import DatabaseConnectionService
+from .database_connection_service import (
+    DatabaseConnectionService, ImportCancelled, register_import_task, request_import_cancel,
+    is_import_cancelled, finish_import_task, prune_import_tasks
+)
+from .engine_registry import EngineRegistry, engine_registry, get_engine
+from .incremental_sync_service import IncrementalSyncService
 
-__all__ = ['DatabaseConnectionService']
+__all__ = [
+    'DatabaseConnectionService',
+    'ImportCancelled',
+    'register_import_task',
+    'request_import_cancel',
+    'is_import_cancelled',
+    'finish_import_task',
+    'prune_import_tasks',
+    'EngineRegistry',
+    'engine_registry',
+    'get_engine',
+    'IncrementalSyncService',
+]
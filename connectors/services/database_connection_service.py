@@ -1,16 +1,64 @@
 # connectors/services/database_connection_service.py
 
+import os
 import logging
+import tempfile
+from datetime import timedelta
 import pandas as pd
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, Callable
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.utils import timezone
 
-from ..models import DatabaseConnection
+from ..models import DatabaseConnection, ImportTask
+from .engine_registry import get_engine
 from projects.models import DataSource
 
 logger = logging.getLogger(__name__)
 
+# Import task records older than this belong to workers that died mid-import
+IMPORT_TASK_MAX_AGE_SECONDS = 24 * 3600
+
+class ImportCancelled(Exception):
+    """Raised when a running database import is cancelled by the user."""
+
+
+def register_import_task(task_id: str, user: User, connection: DatabaseConnection) -> ImportTask:
+    """Record a queued import task so its owner can cancel it from any process."""
+    return ImportTask.objects.create(task_id=task_id, user=user, connection=connection)
+
+
+def request_import_cancel(task_id: str, user: User) -> bool:
+    """
+    Flag a user's running import task so its chunk loop stops at the next chunk.
+    
+    Returns:
+        bool: False if ``user`` has no import task with this id
+    """
+    return ImportTask.objects.filter(task_id=task_id, user=user).update(cancel_requested=True) > 0
+
+
+def is_import_cancelled(task_id: str) -> bool:
+    """Check whether cancellation was requested for an import task."""
+    return ImportTask.objects.filter(task_id=task_id, cancel_requested=True).exists()
+
+
+def finish_import_task(task_id: str) -> None:
+    """Forget an import task once it has finished (successfully or not)."""
+    ImportTask.objects.filter(task_id=task_id).delete()
+
+
+def prune_import_tasks(max_age_seconds: int = IMPORT_TASK_MAX_AGE_SECONDS) -> int:
+    """
+    Delete import task records left behind by dead workers.
+    
+    Returns:
+        int: Number of records deleted
+    """
+    cutoff = timezone.now() - timedelta(seconds=max_age_seconds)
+    deleted, _ = ImportTask.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
 
 class DatabaseConnectionService:
     """Service for managing database connections and data import operations."""
@@ -28,11 +76,10 @@ class DatabaseConnectionService:
         """
         try:
             # Import here to avoid dependency issues if SQLAlchemy is not installed
-            import sqlalchemy
-            from sqlalchemy import create_engine, text
+            from sqlalchemy import text
             
-            # Create engine with connection string
-            engine = create_engine(connection.connection_string)
+            # Reuse the pooled engine for this connection
+            engine = get_engine(connection)
             
             # Test connection with a simple query
             with engine.connect() as conn:
@@ -64,10 +111,9 @@ class DatabaseConnectionService:
             Tuple of (success: bool, tables: list or error_message: str)
         """
         try:
-            import sqlalchemy
-            from sqlalchemy import create_engine, inspect
+            from sqlalchemy import inspect
             
-            engine = create_engine(connection.connection_string)
+            engine = get_engine(connection)
             inspector = inspect(engine)
             
             # Get table names
@@ -99,10 +145,9 @@ class DatabaseConnectionService:
             Tuple of (success: bool, columns: list or error_message: str)
         """
         try:
-            import sqlalchemy
-            from sqlalchemy import create_engine, inspect
+            from sqlalchemy import inspect
             
-            engine = create_engine(connection.connection_string)
+            engine = get_engine(connection)
             inspector = inspect(engine)
             
             # Get column information
@@ -151,10 +196,7 @@ class DatabaseConnectionService:
             Tuple of (success: bool, dataframe: pd.DataFrame or error_message: str)
         """
         try:
-            import sqlalchemy
-            from sqlalchemy import create_engine
-            
-            engine = create_engine(connection.connection_string)
+            engine = get_engine(connection)
             
             # Add LIMIT clause if specified and not already present
             if limit and 'LIMIT' not in query.upper():
@@ -176,16 +218,101 @@ class DatabaseConnectionService:
             logger.error(f"Query execution failed for {connection.name}: {error_msg}")
             return False, error_msg
     
+    @staticmethod
+    def stream_query_to_parquet(
+        connection: DatabaseConnection,
+        query: str,
+        output_path: str,
+        chunk_size: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream query results into a Parquet file chunk by chunk.
+        
+        Rows are fetched through a server-side cursor and each chunk is written
+        as its own row group, so peak memory is bounded by ``chunk_size``.
+        Column types are widened as later chunks need it (see
+        ``WideningParquetWriter``).
+        
+        Args:
+            connection: DatabaseConnection instance
+            query: SQL query to execute (string or SQLAlchemy TextClause)
+            output_path: Destination Parquet file
+            chunk_size: Rows per fetch / row group
+            max_rows: Stop after this many rows (result marked as truncated)
+            max_bytes: Stop once this many in-memory bytes were written
+            progress_callback: Called with the running stats after every chunk
+            should_cancel: Polled before every chunk; True raises ImportCancelled
+            
+        Returns:
+            Dict with rows, bytes, chunks, columns and truncated flag
+        """
+        import pyarrow as pa
+        
+        chunk_size = chunk_size or getattr(settings, 'CONNECTOR_IMPORT_CHUNK_SIZE', 50000)
+        engine = get_engine(connection)
+        stats = {'rows': 0, 'bytes': 0, 'chunks': 0, 'columns': [], 'truncated': False}
+        writer = WideningParquetWriter(output_path)
+        
+        try:
+            with engine.connect() as conn:
+                conn = conn.execution_options(stream_results=True, yield_per=chunk_size)
+                chunks = pd.read_sql_query(
+                    query, conn, chunksize=chunk_size, dtype_backend='pyarrow'
+                )
+                for chunk in chunks:
+                    if should_cancel and should_cancel():
+                        raise ImportCancelled(f"Import cancelled after {stats['rows']} rows")
+                    
+                    if max_rows is not None and stats['rows'] + len(chunk) > max_rows:
+                        chunk = chunk.iloc[:max_rows - stats['rows']]
+                        stats['truncated'] = True
+                    
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if not stats['columns']:
+                        stats['columns'] = list(table.column_names)
+                    writer.write(table)
+                    
+                    stats['rows'] += table.num_rows
+                    stats['bytes'] += table.nbytes
+                    stats['chunks'] += 1
+                    del chunk, table
+                    
+                    if progress_callback:
+                        progress_callback(dict(stats))
+                    
+                    if max_bytes is not None and stats['bytes'] >= max_bytes:
+                        stats['truncated'] = True
+                    if stats['truncated']:
+                        break
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        
+        return stats
+    
     @staticmethod
     def create_datasource_from_query(
         connection: DatabaseConnection,
         query: str,
         datasource_name: str,
         project,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None
     ) -> Tuple[bool, Any]:
         """
-        Execute a query and create a DataSource from the results.
+        Execute a query and create a Parquet-backed DataSource from the results.
+        
+        Results are streamed to disk in chunks (see ``stream_query_to_parquet``)
+        instead of being materialized in memory.
         
         Args:
             connection: DatabaseConnection instance
@@ -193,57 +320,222 @@ class DatabaseConnectionService:
             datasource_name: Name for the new DataSource
             project: Project instance to create the DataSource in
             description: Optional description for the DataSource
+            chunk_size: Rows per chunk (defaults to CONNECTOR_IMPORT_CHUNK_SIZE)
+            max_rows: Row cap (defaults to CONNECTOR_IMPORT_MAX_ROWS)
+            max_bytes: Byte cap (defaults to CONNECTOR_IMPORT_MAX_BYTES)
+            progress_callback: Called with running stats after every chunk
+            should_cancel: Polled before every chunk to support cancellation
             
         Returns:
             Tuple of (success: bool, datasource: DataSource or error_message: str)
         """
+        from django.core.files import File
+        
+        if max_rows is None:
+            max_rows = getattr(settings, 'CONNECTOR_IMPORT_MAX_ROWS', None)
+        if max_bytes is None:
+            max_bytes = getattr(settings, 'CONNECTOR_IMPORT_MAX_BYTES', None)
+        
+        fd, tmp_path = tempfile.mkstemp(suffix='.parquet')
+        os.close(fd)
+        
         try:
-            # Execute the query
-            success, result = DatabaseConnectionService.execute_query(connection, query)
-            
-            if not success:
-                return False, result
-            
-            df = result
+            stats = DatabaseConnectionService.stream_query_to_parquet(
+                connection, query, tmp_path,
+                chunk_size=chunk_size,
+                max_rows=max_rows,
+                max_bytes=max_bytes,
+                progress_callback=progress_callback,
+                should_cancel=should_cancel
+            )
             
-            # Validate DataFrame
-            if df.empty:
+            # Validate result
+            if stats['rows'] == 0:
                 return False, "Query returned no data"
             
-            # Create temporary file for the data
-            import tempfile
-            import os
-            from django.core.files.base import ContentFile
-            
-            # Convert DataFrame to CSV
-            csv_content = df.to_csv(index=False)
-            csv_file = ContentFile(csv_content.encode('utf-8'), name=f"{datasource_name}.csv")
-            
             # Create DataSource
-            datasource = DataSource.objects.create(
+            datasource = DataSource(
                 name=datasource_name,
                 description=description or f"Data imported from {connection.name}",
                 project=project,
                 data_type='ORIGINAL',
-                status='READY',
-                file=csv_file
+                status='READY'
             )
+            with open(tmp_path, 'rb') as parquet_file:
+                datasource.file.save(f"{datasource_name}.parquet", File(parquet_file), save=False)
             
             # Update metadata in quality_report field
             datasource.quality_report = {
                 'connection_name': connection.name,
                 'connection_type': connection.database_type,
                 'query': query,
-                'rows': len(df),
-                'columns': list(df.columns),
+                'rows': stats['rows'],
+                'columns': stats['columns'],
+                'chunks': stats['chunks'],
+                'bytes': stats['bytes'],
+                'truncated': stats['truncated'],
                 'import_source': 'database_connection'
             }
             datasource.save()
             
-            logger.info(f"DataSource {datasource_name} created successfully from {connection.name}")
+            logger.info(
+                f"DataSource {datasource_name} created successfully from {connection.name} "
+                f"({stats['rows']} rows in {stats['chunks']} chunks)"
+            )
             return True, datasource
             
+        except ImportCancelled as e:
+            logger.info(f"Import from {connection.name} cancelled: {e}")
+            return False, "Import cancelled"
+            
         except Exception as e:
             error_msg = f"Failed to create DataSource: {str(e)}"
             logger.error(f"Failed to create DataSource from {connection.name}: {error_msg}")
             return False, error_msg
+        
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class WideningParquetWriter:
+    """
+    Parquet writer for chunked results whose column types are only known
+    once every chunk has been seen.
+
+    The first chunk fixes nothing: a column that is all NULL so far keeps
+    the null type, and a later chunk may widen a column (null -> any type,
+    int -> float, incompatible types -> string). Chunks are written straight
+    to ``output_path`` while the schema holds; a widening closes the current
+    part file and continues in a new one. ``close`` rewrites the parts into
+    ``output_path`` row group by row group under the final schema, so the
+    common case (no widening) costs no extra pass and memory stays bounded
+    by one row group.
+
+    Args:
+        output_path: Destination Parquet file
+        schema: Optional starting schema that chunks are widened from
+            (e.g. the schema of the file they will be read together with)
+        metadata: Optional key/value metadata stored in the file schema
+    """
+
+    def __init__(self, output_path: str, schema=None, metadata: Optional[Dict[bytes, bytes]] = None):
+        self.output_path = output_path
+        self.schema = schema
+        self.metadata = metadata
+        self.parts = []
+        self.writer = None
+
+    def write(self, table):
+        """Append a chunk, widening the schema first if it needs to."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        # A column with no values in this chunk says nothing about its type
+        # (pandas infers string for all-None columns)
+        for index, column in enumerate(table.columns):
+            if column.null_count == len(column) and not pa.types.is_null(column.type):
+                table = table.set_column(index, table.field(index).name, pa.nulls(len(column)))
+        
+        schema = table.schema if self.schema is None else _widen_schema(self.schema, table.schema)
+        if self.writer is None or not schema.equals(self.schema, check_metadata=False):
+            if self.writer is not None:
+                self.writer.close()
+            path = self.output_path if not self.parts else f"{self.output_path}.part{len(self.parts)}"
+            self.writer = pq.ParquetWriter(path, self._file_schema(schema))
+            self.parts.append(path)
+            self.schema = schema
+        self.writer.write_table(_conform_table(table, self.writer.schema))
+
+    def close(self):
+        """Finish the file, merging the parts if the schema was widened."""
+        import pyarrow.parquet as pq
+        
+        if self.writer is None:
+            return
+        self.writer.close()
+        self.writer = None
+        if len(self.parts) == 1:
+            return
+        
+        final_schema = self._file_schema(self.schema)
+        merged_path = f"{self.output_path}.merged"
+        with pq.ParquetWriter(merged_path, final_schema) as writer:
+            for path in self.parts:
+                part = pq.ParquetFile(path)
+                for index in range(part.num_row_groups):
+                    writer.write_table(_conform_table(part.read_row_group(index), final_schema))
+        self._remove_parts()
+        os.replace(merged_path, self.output_path)
+
+    def abort(self):
+        """Close without merging and remove the extra part files."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self._remove_parts()
+
+    def _file_schema(self, schema):
+        schema = _writable_schema(schema)
+        return schema.with_metadata(self.metadata) if self.metadata else schema
+
+    def _remove_parts(self):
+        for path in self.parts[1:]:
+            if os.path.exists(path):
+                os.remove(path)
+        self.parts = self.parts[:1]
+
+
+def _widen_type(current, new):
+    """Narrowest type holding values of both ``current`` and ``new``."""
+    import pyarrow as pa
+    
+    if current == new or pa.types.is_null(new):
+        return current
+    if pa.types.is_null(current):
+        return new
+    try:
+        return pa.unify_schemas(
+            [pa.schema([('value', current)]), pa.schema([('value', new)])],
+            promote_options='permissive'
+        ).field('value').type
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.string()
+
+
+def _widen_schema(schema, other):
+    """Widen every field of ``schema`` to also hold the matching field of ``other``."""
+    import pyarrow as pa
+    
+    return pa.schema([
+        field.with_type(_widen_type(field.type, other.field(field.name).type))
+        for field in schema
+    ])
+
+
+def _writable_schema(schema):
+    """Schema for the Parquet writer: columns that are all NULL so far are stored as strings."""
+    import pyarrow as pa
+    
+    return pa.schema([
+        pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+        for field in schema
+    ])
+
+
+def _conform_table(table, schema):
+    """Cast a chunk to the writer schema (all-null columns, widened types)."""
+    import pyarrow as pa
+    
+    if table.schema.equals(schema):
+        return table
+    
+    columns = []
+    for field in schema:
+        column = table.column(field.name)
+        if pa.types.is_null(column.type):
+            column = pa.nulls(table.num_rows, type=field.type)
+        elif column.type != field.type:
+            column = column.cast(field.type)
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=schema)
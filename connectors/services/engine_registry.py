@@ -0,0 +1,138 @@
+# connectors/services/engine_registry.py
+
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, Tuple, Optional, Any
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EngineRegistry:
+    """
+    Process-wide cache of SQLAlchemy engines, one pooled engine per DatabaseConnection.
+
+    Engines are keyed by connection id plus a hash of the connection string,
+    so edited credentials never reuse a stale pool in any process: the next
+    lookup with the new hash disposes the old engine. Engines idle for longer
+    than ``idle_timeout`` seconds are disposed on the next registry access,
+    unless they still have connections checked out (a long-running import
+    that has not touched the registry since it started).
+    """
+
+    def __init__(self, pool_size: int = None, max_overflow: int = None,
+                 pool_recycle: int = None, idle_timeout: int = None):
+        self.pool_size = pool_size or getattr(settings, 'DB_CONNECTOR_POOL_SIZE', 5)
+        self.max_overflow = max_overflow if max_overflow is not None else getattr(
+            settings, 'DB_CONNECTOR_MAX_OVERFLOW', 5)
+        self.pool_recycle = pool_recycle or getattr(settings, 'DB_CONNECTOR_POOL_RECYCLE', 1800)
+        self.idle_timeout = idle_timeout or getattr(settings, 'DB_CONNECTOR_IDLE_TIMEOUT', 600)
+        self.engines: Dict[Tuple[str, str], Any] = {}
+        self.last_used: Dict[Tuple[str, str], float] = {}
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def credentials_hash(connection_string: str) -> str:
+        """Stable fingerprint of a connection string (never logged or stored in clear)"""
+        return hashlib.sha256(connection_string.encode('utf-8')).hexdigest()[:16]
+
+    def get_engine(self, connection):
+        """
+        Get the pooled engine for a DatabaseConnection, creating it if needed.
+
+        Raises:
+            ImportError: If SQLAlchemy is not installed
+        """
+        connection_string = connection.connection_string
+        key = (str(connection.id), self.credentials_hash(connection_string))
+
+        with self.lock:
+            self.dispose_idle()
+
+            engine = self.engines.get(key)
+            if engine is None:
+                # Credentials changed: drop any engine built from the old ones
+                self._dispose_matching(lambda k: k[0] == key[0])
+                engine = self._create_engine(connection, connection_string)
+                self.engines[key] = engine
+                logger.info(f"Created pooled engine for connection {connection.name}")
+
+            self.last_used[key] = time.monotonic()
+            return engine
+
+    def invalidate(self, connection_id) -> int:
+        """Dispose every engine belonging to a connection. Returns the number disposed."""
+        with self.lock:
+            return self._dispose_matching(lambda k: k[0] == str(connection_id))
+
+    def dispose_idle(self, max_idle_seconds: Optional[float] = None) -> int:
+        """Dispose engines not used within the idle timeout. Returns the number disposed."""
+        max_idle = self.idle_timeout if max_idle_seconds is None else max_idle_seconds
+        cutoff = time.monotonic() - max_idle
+        with self.lock:
+            return self._dispose_matching(
+                lambda k: self.last_used.get(k, 0) < cutoff and not self._in_use(self.engines[k])
+            )
+
+    def dispose_all(self) -> int:
+        """Dispose every cached engine (e.g. after fork or in tests)"""
+        with self.lock:
+            return self._dispose_matching(lambda k: True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool status for every cached engine"""
+        with self.lock:
+            return {
+                'engine_count': len(self.engines),
+                'engines': [
+                    {
+                        'connection_id': key[0],
+                        'idle_seconds': round(time.monotonic() - self.last_used.get(key, 0), 1),
+                        'pool_status': engine.pool.status(),
+                    }
+                    for key, engine in self.engines.items()
+                ]
+            }
+
+    def _create_engine(self, connection, connection_string: str):
+        """Create an engine with pool sizing and pre-ping"""
+        from sqlalchemy import create_engine
+
+        options = {'pool_pre_ping': True}
+        if connection.database_type != 'sqlite':
+            # SQLite uses file/thread-local pools that do not take sizing options
+            options.update({
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'pool_recycle': self.pool_recycle,
+            })
+        return create_engine(connection_string, **options)
+
+    @staticmethod
+    def _in_use(engine) -> bool:
+        """Whether the engine's pool has connections checked out"""
+        checkedout = getattr(engine.pool, 'checkedout', None)
+        return bool(checkedout and checkedout() > 0)
+
+    def _dispose_matching(self, predicate) -> int:
+        """Dispose and forget engines whose key matches ``predicate`` (lock held)"""
+        keys = [key for key in self.engines if predicate(key)]
+        for key in keys:
+            engine = self.engines.pop(key)
+            self.last_used.pop(key, None)
+            try:
+                engine.dispose()
+            except Exception as e:
+                logger.warning(f"Error disposing engine for connection {key[0]}: {e}")
+        return len(keys)
+
+
+# Global engine registry
+engine_registry = EngineRegistry()
+
+
+def get_engine(connection):
+    """Get the shared pooled engine for a DatabaseConnection"""
+    return engine_registry.get_engine(connection)
@@ -0,0 +1,388 @@
+# connectors/services/incremental_sync_service.py
+
+import os
+import time
+import uuid
+import shutil
+import logging
+import tempfile
+from collections import Counter
+from typing import Optional, Dict, Any, Callable
+from django.conf import settings
+from django.utils import timezone
+
+from data_tools.services.dataset_reader import (
+    PARTS_SUFFIX, UPSERT_KEY_METADATA, dataset_parts, read_schema, upsert_key
+)
+from ..models import DatabaseConnection, IncrementalSync
+from .database_connection_service import DatabaseConnectionService, WideningParquetWriter, _widen_schema
+from .engine_registry import get_engine
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalSyncService:
+    """
+    Service for watermark-based incremental refresh of database-imported DataSources.
+
+    Each refresh stores its new rows as one part file next to the DataSource
+    file (see ``dataset_reader.dataset_parts``) instead of rewriting it; the
+    parts are compacted into the file once there are
+    ``CONNECTOR_SYNC_COMPACT_PARTS`` of them or they reach
+    ``CONNECTOR_SYNC_COMPACT_RATIO`` of its size. Rows re-sent with an
+    existing key replace the old version when read and at compaction.
+    """
+
+    @staticmethod
+    def enable_sync(
+        datasource,
+        connection: DatabaseConnection,
+        query: str,
+        watermark_column: str,
+        key_column: Optional[str] = None,
+        interval_minutes: int = 60
+    ) -> IncrementalSync:
+        """
+        Enable incremental refresh for a DataSource imported from ``query``.
+
+        The initial watermark is taken from the DataSource's current Parquet
+        file, so the first scheduled run only fetches rows added since import.
+        """
+        sync, _ = IncrementalSync.objects.update_or_create(
+            datasource=datasource,
+            defaults={
+                'connection': connection,
+                'query': query,
+                'watermark_column': watermark_column,
+                'key_column': key_column or None,
+                'interval_minutes': interval_minutes,
+                'is_enabled': True,
+            }
+        )
+
+        if datasource.file and datasource.file.name.endswith('.parquet'):
+            value, watermark_type = _parquet_column_max(datasource.file.path, watermark_column)
+            sync.set_watermark(value, watermark_type)
+            sync.save()
+
+        return sync
+
+    @staticmethod
+    def build_delta_query(sync: IncrementalSync, dialect):
+        """
+        Wrap the source query so only rows at or past the watermark are selected.
+
+        Rows equal to the watermark are selected again because rows with that
+        value may have been committed after the previous run; the ones already
+        stored are dropped when the delta is written.
+
+        Returns:
+            SQLAlchemy TextClause with the watermark bound as a parameter
+        """
+        from sqlalchemy import text
+
+        column = dialect.identifier_preparer.quote(sync.watermark_column)
+        base_query = sync.query.strip().rstrip(';')
+        sql = f"SELECT * FROM ({base_query}) AS incremental_src"
+
+        watermark = sync.get_watermark()
+        if watermark is None:
+            return text(f"{sql} ORDER BY {column}")
+        return text(f"{sql} WHERE {column} >= :watermark ORDER BY {column}").bindparams(
+            watermark=watermark
+        )
+
+    @staticmethod
+    def run_sync(
+        sync: IncrementalSync,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Any]:
+        """
+        Pull rows newer than the stored watermark and add them to the DataSource.
+
+        Without a watermark (or a non-Parquet file) the full query result
+        replaces the file instead.
+
+        Returns:
+            Dict with rows_added, total_rows and watermark
+        """
+        datasource = sync.datasource
+        connection = sync.connection
+        engine = get_engine(connection)
+        delta_query = IncrementalSyncService.build_delta_query(sync, engine.dialect)
+
+        has_parquet = bool(datasource.file) and datasource.file.name.endswith('.parquet')
+        full_refresh = sync.last_watermark is None or not has_parquet
+        if full_refresh and not has_parquet:
+            delta_query = IncrementalSyncService.build_delta_query(
+                _without_watermark(sync), engine.dialect
+            )
+
+        fd, delta_path = tempfile.mkstemp(suffix='.parquet')
+        os.close(fd)
+
+        try:
+            stats = DatabaseConnectionService.stream_query_to_parquet(
+                connection, delta_query, delta_path,
+                progress_callback=progress_callback,
+                should_cancel=should_cancel
+            )
+
+            rows_added = 0
+            if stats['rows'] > 0:
+                if full_refresh:
+                    _replace_datasource_file(datasource, delta_path)
+                    rows_added = stats['rows']
+                else:
+                    rows_added = _write_part(
+                        datasource.file.path, delta_path, sync.watermark_column,
+                        sync.get_watermark(), sync.key_column
+                    )
+                    if _needs_compaction(datasource.file.path):
+                        compact_parts(datasource.file.path)
+
+                value, watermark_type = _parquet_column_max(delta_path, sync.watermark_column)
+                sync.set_watermark(value, watermark_type)
+
+            total_rows = read_schema(datasource.file.path).num_rows
+
+            report = dict(datasource.quality_report or {})
+            report.update({
+                'rows': total_rows,
+                'last_incremental_sync': timezone.now().isoformat(),
+                'last_incremental_rows': rows_added,
+            })
+            datasource.quality_report = report
+            datasource.save(update_fields=['quality_report', 'file', 'updated_at'])
+
+            sync.last_synced_at = timezone.now()
+            sync.last_status = 'success'
+            sync.last_error = None
+            sync.rows_last_sync = rows_added
+            sync.total_rows_synced += rows_added
+            sync.save()
+
+            logger.info(
+                f"Incremental sync for {datasource.name} added {rows_added} rows "
+                f"(watermark {sync.last_watermark})"
+            )
+            return {
+                'rows_added': rows_added,
+                'total_rows': total_rows,
+                'watermark': sync.last_watermark,
+                'full_refresh': full_refresh,
+            }
+
+        finally:
+            if os.path.exists(delta_path):
+                os.remove(delta_path)
+
+
+def _without_watermark(sync: IncrementalSync) -> IncrementalSync:
+    """Unsaved copy of a sync with its watermark cleared (for full refreshes)"""
+    return IncrementalSync(
+        query=sync.query,
+        watermark_column=sync.watermark_column,
+        key_column=sync.key_column
+    )
+
+
+def _parquet_column_max(path: str, column: str):
+    """Maximum of one column in a Parquet file and its parts, reading only that column"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    maximum, values = None, None
+    for file_path in [path] + dataset_parts(path):
+        values = pq.read_table(file_path, columns=[column]).column(column)
+        file_max = pc.max(values).as_py()
+        if file_max is not None and (maximum is None or file_max > maximum):
+            maximum = file_max
+
+    if pa.types.is_timestamp(values.type) or pa.types.is_date(values.type):
+        watermark_type = 'timestamp'
+    elif pa.types.is_integer(values.type) or pa.types.is_floating(values.type) \
+            or pa.types.is_decimal(values.type):
+        watermark_type = 'number'
+    else:
+        watermark_type = 'text'
+    return maximum, watermark_type
+
+
+def _write_part(target_path: str, delta_path: str, watermark_column: str, watermark,
+                key_column: Optional[str] = None) -> int:
+    """
+    Store the delta file's rows as a new part file of the target dataset.
+
+    Delta rows identical to stored rows at the previous watermark (selected
+    again by the ``>=`` delta query) are dropped. The part is written under a
+    temporary name and renamed into place, so readers never see it half
+    written. Returns the number of rows stored.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(target_path)
+    delta = pq.ParquetFile(delta_path)
+
+    missing = set(schema.names) - set(delta.schema_arrow.names)
+    if missing:
+        raise ValueError(f"Source query no longer returns columns: {sorted(missing)}")
+
+    stored = _stored_rows_at(target_path, schema.names, watermark_column, watermark)
+
+    parts_dir = target_path + PARTS_SUFFIX
+    os.makedirs(parts_dir, exist_ok=True)
+    part_name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp_path = os.path.join(parts_dir, f".{part_name}.tmp")
+    metadata = {UPSERT_KEY_METADATA: key_column.encode('utf-8')} if key_column else None
+    writer = WideningParquetWriter(tmp_path, schema=schema, metadata=metadata)
+
+    rows = 0
+    try:
+        for index in range(delta.num_row_groups):
+            group = delta.read_row_group(index).select(schema.names)
+            if stored:
+                keep = []
+                for row_hash in _row_hashes(group.to_pandas()):
+                    duplicate = stored[row_hash] > 0
+                    if duplicate:
+                        stored[row_hash] -= 1
+                    keep.append(not duplicate)
+                group = group.filter(pa.array(keep))
+            if group.num_rows:
+                writer.write(group)
+                rows += group.num_rows
+    except BaseException:
+        writer.abort()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    writer.close()
+
+    if rows:
+        os.replace(tmp_path, os.path.join(parts_dir, part_name))
+    elif os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    return rows
+
+
+def _stored_rows_at(target_path: str, columns, watermark_column: str, watermark) -> Counter:
+    """Hashes (with multiplicity) of stored rows whose watermark equals ``watermark``"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if watermark is None:
+        return Counter()
+
+    hashes = Counter()
+    for path in [target_path] + dataset_parts(target_path):
+        try:
+            table = pq.read_table(path, columns=list(columns), filters=[(watermark_column, '==', watermark)])
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError, TypeError) as e:
+            logger.warning(f"Cannot compare stored rows with watermark {watermark!r}: {e}")
+            return Counter()
+        hashes.update(_row_hashes(table.to_pandas()))
+    return hashes
+
+
+def _row_hashes(df):
+    """Content hash per row, insensitive to int/float and Arrow/NumPy dtype differences"""
+    import pandas as pd
+
+    return pd.util.hash_pandas_object(df.astype(str), index=False).tolist()
+
+
+def _needs_compaction(target_path: str) -> bool:
+    """Whether the dataset's part files should be merged into its main file"""
+    parts = dataset_parts(target_path)
+    if not parts:
+        return False
+    if len(parts) >= getattr(settings, 'CONNECTOR_SYNC_COMPACT_PARTS', 24):
+        return True
+    parts_bytes = sum(os.path.getsize(part) for part in parts)
+    ratio = getattr(settings, 'CONNECTOR_SYNC_COMPACT_RATIO', 0.25)
+    return parts_bytes >= ratio * os.path.getsize(target_path)
+
+
+def compact_parts(target_path: str) -> int:
+    """
+    Merge a dataset's part files into its main Parquet file.
+
+    Row groups are copied one at a time (never the whole dataset in memory).
+    With an upsert key, a row is dropped when its key reappears in a later
+    file, so updated rows replace their previous version. The main file is
+    swapped atomically before the parts are removed.
+
+    Returns:
+        int: Number of part files merged.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    parts = dataset_parts(target_path)
+    if not parts:
+        return 0
+
+    files = [target_path] + parts
+    schema = pq.read_schema(target_path)
+    for part in parts:
+        schema = _widen_schema(schema, pq.read_schema(part))
+
+    # Keys of every later file, per file
+    key = upsert_key(parts)
+    later_keys = [None] * len(files)
+    if key:
+        key_type = schema.field(key).type
+        seen = []
+        for index in range(len(files) - 1, 0, -1):
+            seen.append(pq.read_table(files[index], columns=[key]).column(key).cast(key_type))
+            later_keys[index - 1] = pa.chunked_array(
+                [chunk for column in seen for chunk in column.chunks], type=key_type
+            ).combine_chunks()
+
+    fd, output_path = tempfile.mkstemp(suffix='.parquet', dir=os.path.dirname(target_path))
+    os.close(fd)
+    writer = WideningParquetWriter(output_path, schema=schema)
+
+    try:
+        for path, keys in zip(files, later_keys):
+            parquet_file = pq.ParquetFile(path)
+            for index in range(parquet_file.num_row_groups):
+                group = parquet_file.read_row_group(index).select(schema.names)
+                if keys is not None:
+                    group = group.filter(pc.invert(pc.is_in(group.column(key).cast(key_type), value_set=keys)))
+                if group.num_rows:
+                    writer.write(group)
+        writer.close()
+        os.replace(output_path, target_path)
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+    shutil.rmtree(target_path + PARTS_SUFFIX, ignore_errors=True)
+    logger.info(f"Compacted {len(parts)} sync parts into {target_path}")
+    return len(parts)
+
+
+def _replace_datasource_file(datasource, parquet_path: str):
+    """Store a freshly imported Parquet file as the DataSource's file"""
+    from django.core.files import File
+
+    old_name = datasource.file.name if datasource.file else None
+    if old_name:
+        # Parts belong to the replaced content
+        shutil.rmtree(datasource.file.path + PARTS_SUFFIX, ignore_errors=True)
+    base_name = os.path.splitext(os.path.basename(old_name))[0] if old_name else datasource.name
+
+    with open(parquet_path, 'rb') as parquet_file:
+        datasource.file.save(f"{base_name}.parquet", File(parquet_file), save=False)
+
+    if old_name and old_name != datasource.file.name:
+        datasource.file.storage.delete(old_name)
@@ -0,0 +1,20 @@
+# connectors/signals.py
+"""
+Signal handlers for the connectors app.
+
+Drop this process's pooled engine whenever a database connection is saved
+or deleted, including deletes through cascades (user removal) and
+querysets, which never call ``Model.delete``.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DatabaseConnection
+from .services.engine_registry import engine_registry
+
+
+@receiver(post_save, sender=DatabaseConnection)
+@receiver(post_delete, sender=DatabaseConnection)
+def invalidate_connection_engine(sender, instance, **kwargs):
+    """Dispose the pooled engine so edited or removed settings take effect."""
+    engine_registry.invalidate(instance.pk)
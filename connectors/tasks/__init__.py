@@ -7,14 +7,18 @@ Tasks are logically separated into different modules for better maintainability.
 Modules:
     - import_tasks: Database import and data synchronization tasks
     - connection_tasks: Database connection testing and management tasks
+    - sync_tasks: Watermark-based incremental refresh of imported DataSources
 """
 
 # Import all tasks so they are discoverable by Celery
 from .components.import_tasks import import_data_from_database_task
 from .components.connection_tasks import test_database_connection_task, get_database_tables_task
+from .components.sync_tasks import incremental_sync_task, run_due_incremental_syncs_task
 
 __all__ = [
     'import_data_from_database_task',
     'test_database_connection_task',
-    'get_database_tables_task'
+    'get_database_tables_task',
+    'incremental_sync_task',
+    'run_due_incremental_syncs_task'
 ]
@@ -8,7 +8,9 @@ from django.core.mail import send_mail
 from django.conf import settings
 
 from connectors.models import DatabaseConnection
-from connectors.services import DatabaseConnectionService
+from connectors.services import (
+    DatabaseConnectionService, IncrementalSyncService, finish_import_task, is_import_cancelled
+)
 from projects.models import DataSource, Project
 
 logger = logging.getLogger(__name__)
@@ -22,11 +24,19 @@ def import_data_from_database_task(
     datasource_name: str,
     project_id: str,
     user_id: int,
-    description: str = None
+    description: str = None,
+    chunk_size: int = None,
+    max_rows: int = None,
+    max_bytes: int = None,
+    incremental: dict = None
 ):
     """
     Celery task to import data from a database connection.
     
+    Results are streamed into Parquet chunk by chunk; progress is reported
+    after every chunk and the import can be cancelled between chunks via
+    ``request_import_cancel(task_id)``.
+    
     Args:
         connection_id: UUID of the DatabaseConnection
         query: SQL query to execute
@@ -34,6 +44,11 @@ def import_data_from_database_task(
         project_id: UUID of the Project to create the DataSource in
         user_id: ID of the user creating the DataSource
         description: Optional description
+        chunk_size: Rows fetched per chunk
+        max_rows: Optional row cap
+        max_bytes: Optional byte cap
+        incremental: Optional incremental refresh settings
+            ({'watermark_column', 'key_column', 'interval_minutes'})
     """
     try:
         # Update task state
@@ -75,13 +90,34 @@ def import_data_from_database_task(
             meta={'current': 40, 'total': 100, 'status': 'Executing query...'}
         )
         
-        # Execute query and create DataSource
+        def report_progress(stats):
+            # Without a row cap the total is unknown, so progress stays mid-range
+            current = 60
+            if max_rows:
+                current = 40 + int(40 * min(stats['rows'] / max_rows, 1))
+            self.update_state(
+                state='PROGRESS',
+                meta={
+                    'current': current,
+                    'total': 100,
+                    'status': f"Imported {stats['rows']:,} rows...",
+                    'rows': stats['rows'],
+                    'bytes': stats['bytes']
+                }
+            )
+        
+        # Stream query results into a new DataSource
         success, result = DatabaseConnectionService.create_datasource_from_query(
             connection=connection,
             query=query,
             datasource_name=datasource_name,
             project=project,
-            description=description
+            description=description,
+            chunk_size=chunk_size,
+            max_rows=max_rows,
+            max_bytes=max_bytes,
+            progress_callback=report_progress,
+            should_cancel=lambda: is_import_cancelled(self.request.id)
         )
         
         if not success:
@@ -90,6 +126,17 @@ def import_data_from_database_task(
         
         datasource = result
         
+        # Enable watermark-based refresh if requested
+        if incremental and incremental.get('watermark_column'):
+            IncrementalSyncService.enable_sync(
+                datasource=datasource,
+                connection=connection,
+                query=query,
+                watermark_column=incremental['watermark_column'],
+                key_column=incremental.get('key_column'),
+                interval_minutes=int(incremental.get('interval_minutes') or 60)
+            )
+        
         # Update progress
         self.update_state(
             state='PROGRESS',
@@ -119,9 +166,13 @@ def import_data_from_database_task(
             'datasource_id': str(datasource.id),
             'datasource_name': datasource.name,
             'rows': datasource.quality_report.get('rows', 0),
-            'columns': len(datasource.quality_report.get('columns', []))
+            'columns': len(datasource.quality_report.get('columns', [])),
+            'truncated': datasource.quality_report.get('truncated', False)
         }
         
     except Exception as e:
         logger.error(f"Unexpected error in import task: {str(e)}")
         return {'success': False, 'error': f"Unexpected error: {str(e)}"}
+    finally:
+        # Cancellation is only polled while the task runs
+        finish_import_task(self.request.id)
@@ -0,0 +1,118 @@
+"""
+Incremental (watermark-based) refresh tasks for database-imported DataSources.
+"""
+import logging
+from datetime import timedelta
+from celery import shared_task
+from django.db.models import Q
+from django.utils import timezone
+
+from connectors.models import IncrementalSync
+from connectors.services import IncrementalSyncService, finish_import_task, is_import_cancelled, prune_import_tasks
+
+logger = logging.getLogger(__name__)
+
+# A sync still marked running after this long belongs to a dead worker
+SYNC_STALE_SECONDS = 6 * 3600
+
+
+def _claimable():
+    """Syncs not running (or whose run went stale), as a queryset filter"""
+    stale_before = timezone.now() - timedelta(seconds=SYNC_STALE_SECONDS)
+    return ~Q(last_status='running') | Q(updated_at__lt=stale_before)
+
+
+@shared_task(bind=True)
+def incremental_sync_task(self, sync_id: str):
+    """
+    Celery task to pull rows newer than the stored watermark into a DataSource.
+    
+    Args:
+        sync_id: UUID of the IncrementalSync configuration
+    """
+    # Claim the sync in the database: one UPDATE, so only one worker wins
+    claimed = IncrementalSync.objects.filter(_claimable(), id=sync_id).update(
+        last_status='running', updated_at=timezone.now()
+    )
+    if not claimed:
+        logger.info(f"Incremental sync {sync_id} already running or missing, skipping")
+        finish_import_task(self.request.id)
+        return {'success': False, 'error': 'Sync already running'}
+    
+    try:
+        try:
+            sync = IncrementalSync.objects.select_related('datasource', 'connection').get(id=sync_id)
+        except IncrementalSync.DoesNotExist as e:
+            logger.error(f"Task failed: {str(e)}")
+            return {'success': False, 'error': str(e)}
+        
+        self.update_state(
+            state='PROGRESS',
+            meta={'current': 10, 'total': 100, 'status': 'Fetching new rows...'}
+        )
+        
+        def report_progress(stats):
+            self.update_state(
+                state='PROGRESS',
+                meta={
+                    'current': 50,
+                    'total': 100,
+                    'status': f"Fetched {stats['rows']:,} new rows...",
+                    'rows': stats['rows']
+                }
+            )
+        
+        try:
+            result = IncrementalSyncService.run_sync(
+                sync,
+                progress_callback=report_progress,
+                should_cancel=lambda: is_import_cancelled(self.request.id)
+            )
+        except Exception as e:
+            logger.error(f"Incremental sync {sync_id} failed: {str(e)}")
+            sync.last_status = 'failed'
+            sync.last_error = str(e)
+            sync.save(update_fields=['last_status', 'last_error', 'updated_at'])
+            return {'success': False, 'error': str(e)}
+        
+        return {
+            'success': True,
+            'datasource_id': str(sync.datasource_id),
+            **result
+        }
+        
+    except BaseException:
+        # Anything not recorded by run_sync (e.g. the worker being shut down)
+        IncrementalSync.objects.filter(id=sync_id, last_status='running').update(
+            last_status='failed', updated_at=timezone.now()
+        )
+        raise
+    finally:
+        # Drop the cancel record of a user-started refresh
+        finish_import_task(self.request.id)
+
+
+@shared_task
+def run_due_incremental_syncs_task():
+    """
+    Periodic task: queue an incremental sync for every enabled configuration whose interval elapsed.
+    
+    Syncs that are still running are skipped, so slow syncs are not queued
+    again on every beat. Import task records left behind by dead workers are
+    pruned on the way.
+    """
+    pruned = prune_import_tasks()
+    if pruned:
+        logger.info(f"Pruned {pruned} stale import task records")
+    
+    queued = []
+    for sync in IncrementalSync.objects.filter(_claimable(), is_enabled=True).only(
+        'id', 'is_enabled', 'last_synced_at', 'interval_minutes'
+    ):
+        if sync.is_due:
+            incremental_sync_task.delay(str(sync.id))
+            queued.append(str(sync.id))
+    
+    if queued:
+        logger.info(f"Queued {len(queued)} incremental syncs")
+    return {'queued': queued}
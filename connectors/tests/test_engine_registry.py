@@ -0,0 +1,114 @@
+"""
+Tests for the pooled SQLAlchemy engine registry used by database connectors.
+Uses a local SQLite file as a stand-in for the operational database.
+"""
+
+import os
+import sqlite3
+import tempfile
+import uuid
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from connectors.models import DatabaseConnection
+from connectors.services import DatabaseConnectionService
+from connectors.services.engine_registry import EngineRegistry, engine_registry
+
+
+class EngineRegistryTestCase(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'gauges.sqlite')
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, level REAL)")
+            conn.executemany("INSERT INTO readings (level) VALUES (?)", [(0.5,), (0.7,), (0.9,)])
+
+        self.registry = EngineRegistry(idle_timeout=600)
+        self.connection = DatabaseConnection(
+            id=uuid.uuid4(), name='Gauges', database_type='sqlite', database_name=self.db_path
+        )
+
+    def tearDown(self):
+        self.registry.dispose_all()
+        engine_registry.dispose_all()
+        self.tmpdir.cleanup()
+
+    def test_engine_is_reused_for_same_connection(self):
+        first = self.registry.get_engine(self.connection)
+        second = self.registry.get_engine(self.connection)
+        self.assertIs(first, second)
+        self.assertEqual(self.registry.get_stats()['engine_count'], 1)
+
+    def test_changed_credentials_replace_engine(self):
+        first = self.registry.get_engine(self.connection)
+        other_path = os.path.join(self.tmpdir.name, 'other.sqlite')
+        self.connection.database_name = other_path
+        second = self.registry.get_engine(self.connection)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.registry.get_stats()['engine_count'], 1)
+
+    def test_invalidate_disposes_engine(self):
+        first = self.registry.get_engine(self.connection)
+        self.assertEqual(self.registry.invalidate(self.connection.id), 1)
+        self.assertIsNot(self.registry.get_engine(self.connection), first)
+
+    def test_idle_engines_are_disposed(self):
+        self.registry.get_engine(self.connection)
+        self.assertEqual(self.registry.dispose_idle(max_idle_seconds=-1), 1)
+        self.assertEqual(self.registry.get_stats()['engine_count'], 0)
+
+    def test_engine_pre_pings_connections(self):
+        engine = self.registry.get_engine(self.connection)
+        self.assertTrue(engine.pool._pre_ping)
+
+    def test_service_calls_share_one_engine(self):
+        success, message = DatabaseConnectionService.test_connection(self.connection)
+        self.assertTrue(success, message)
+        engine = engine_registry.get_engine(self.connection)
+
+        success, tables = DatabaseConnectionService.get_table_list(self.connection)
+        self.assertTrue(success)
+        self.assertEqual(tables, ['readings'])
+
+        success, df = DatabaseConnectionService.execute_query(
+            self.connection, "SELECT * FROM readings"
+        )
+        self.assertTrue(success)
+        self.assertEqual(len(df), 3)
+        self.assertIs(engine_registry.get_engine(self.connection), engine)
+        self.assertEqual(engine_registry.get_stats()['engine_count'], 1)
+
+    def test_saving_connection_invalidates_engine(self):
+        user = User.objects.create_user(username='engine_owner', password='testpass')
+        self.connection.user = user
+        self.connection.save()
+        engine = engine_registry.get_engine(self.connection)
+
+        self.connection.name = 'Gauges (renamed)'
+        self.connection.save()
+        self.assertIsNot(engine_registry.get_engine(self.connection), engine)
+
+    def test_idle_engines_with_checked_out_connections_are_kept(self):
+        engine = self.registry.get_engine(self.connection)
+        with engine.connect():
+            self.assertEqual(self.registry.dispose_idle(max_idle_seconds=-1), 0)
+        self.assertEqual(self.registry.dispose_idle(max_idle_seconds=-1), 1)
+
+    def test_cascade_and_queryset_deletes_invalidate_engine(self):
+        user = User.objects.create_user(username='engine_cascade', password='testpass')
+        self.connection.user = user
+        self.connection.save()
+        engine_registry.get_engine(self.connection)
+
+        user.delete()
+        self.assertEqual(engine_registry.get_stats()['engine_count'], 0)
+
+        other = DatabaseConnection.objects.create(
+            user=User.objects.create_user(username='engine_bulk', password='testpass'),
+            name='Bulk', database_type='sqlite', database_name=self.db_path
+        )
+        engine_registry.get_engine(other)
+        DatabaseConnection.objects.filter(pk=other.pk).delete()
+        self.assertEqual(engine_registry.get_stats()['engine_count'], 0)
@@ -0,0 +1,172 @@
+"""
+Tests for watermark-based incremental refresh of database-imported DataSources.
+Uses a local SQLite file as a stand-in for the operational database.
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import pyarrow.parquet as pq
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from connectors.models import DatabaseConnection, IncrementalSync
+from connectors.services import DatabaseConnectionService, IncrementalSyncService, engine_registry
+from connectors.services.incremental_sync_service import compact_parts
+from connectors.tasks.components.sync_tasks import incremental_sync_task, run_due_incremental_syncs_task
+from data_tools.services import process_datasource_to_df
+from data_tools.services.dataset_reader import dataset_parts, read_dataset
+from projects.models import Project
+
+
+class IncrementalSyncTestCase(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # Tiny files are dominated by Parquet footers: compact by part count only
+        media_override = override_settings(
+            MEDIA_ROOT=os.path.join(self.tmpdir.name, 'media'), CONNECTOR_SYNC_COMPACT_RATIO=1000.0
+        )
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.db_path = os.path.join(self.tmpdir.name, 'gauges.sqlite')
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, station TEXT, level REAL)")
+            conn.executemany(
+                "INSERT INTO readings (id, station, level) VALUES (?, ?, ?)",
+                [(i, f"S{i % 3}", i * 0.5) for i in range(1, 101)]
+            )
+
+        self.user = User.objects.create_user(username='sync_owner', password='testpass')
+        self.project = Project.objects.create(name='Sync Project', owner=self.user)
+        self.connection = DatabaseConnection.objects.create(
+            user=self.user, name='Gauges', database_type='sqlite', database_name=self.db_path
+        )
+
+        success, self.datasource = DatabaseConnectionService.create_datasource_from_query(
+            self.connection, "SELECT * FROM readings", 'Readings', self.project, chunk_size=40
+        )
+        self.assertTrue(success, self.datasource)
+        self.sync = IncrementalSyncService.enable_sync(
+            self.datasource, self.connection, "SELECT * FROM readings", 'id', key_column='id'
+        )
+
+    def tearDown(self):
+        engine_registry.dispose_all()
+        self.tmpdir.cleanup()
+
+    def insert(self, rows):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO readings (id, station, level) VALUES (?, ?, ?)", rows
+            )
+
+    def read_ids(self):
+        return read_dataset(self.datasource.file.path, columns=['id'])['id'].tolist()
+
+    def test_enable_sets_watermark_from_imported_file(self):
+        self.assertEqual(self.sync.get_watermark(), 100)
+        self.assertEqual(self.sync.watermark_type, 'number')
+        self.assertTrue(self.sync.is_due)
+
+    def test_delta_query_binds_watermark(self):
+        clause = IncrementalSyncService.build_delta_query(
+            self.sync, engine_registry.get_engine(self.connection).dialect
+        )
+        self.assertIn('>= :watermark', str(clause))
+
+    def test_run_appends_only_new_rows(self):
+        self.insert([(i, 'S9', i * 0.5) for i in range(101, 111)])
+        result = IncrementalSyncService.run_sync(self.sync)
+
+        self.assertEqual(result['rows_added'], 10)
+        self.assertEqual(result['total_rows'], 110)
+        self.assertFalse(result['full_refresh'])
+        self.assertEqual(self.read_ids(), list(range(1, 111)))
+
+        # The DataSource file is left alone; the delta is one part file
+        self.assertEqual(pq.ParquetFile(self.datasource.file.path).metadata.num_rows, 100)
+        self.assertEqual(len(dataset_parts(self.datasource.file.path)), 1)
+
+        self.sync.refresh_from_db()
+        self.assertEqual(self.sync.get_watermark(), 110)
+        self.assertEqual(self.sync.last_status, 'success')
+        self.assertFalse(self.sync.is_due)
+
+    def test_synced_rows_reach_datasource_consumers(self):
+        self.insert([(i, 'S9', i * 0.5) for i in range(101, 106)])
+        IncrementalSyncService.run_sync(self.sync)
+
+        df = process_datasource_to_df(self.datasource.id)
+        self.assertEqual(sorted(df['id'].tolist()), list(range(1, 106)))
+
+    def test_run_without_new_rows_is_noop(self):
+        result = IncrementalSyncService.run_sync(self.sync)
+        self.assertEqual(result['rows_added'], 0)
+        self.assertEqual(self.read_ids(), list(range(1, 101)))
+
+    def test_resent_keys_replace_previous_rows(self):
+        sync = IncrementalSyncService.enable_sync(
+            self.datasource, self.connection, "SELECT * FROM readings", 'level', key_column='id'
+        )
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE readings SET level = 999.0 WHERE id = 5")
+
+        result = IncrementalSyncService.run_sync(sync)
+        self.assertEqual(result['rows_added'], 1)
+        self.assertEqual(result['total_rows'], 100)
+
+        df = read_dataset(self.datasource.file.path)
+        self.assertEqual(df['id'].tolist()[-1], 5)
+        self.assertEqual(df.loc[df['id'] == 5, 'level'].tolist(), [999.0])
+
+        self.assertEqual(compact_parts(self.datasource.file.path), 1)
+        self.assertEqual(dataset_parts(self.datasource.file.path), [])
+        compacted = pq.read_table(self.datasource.file.path).to_pandas()
+        self.assertEqual(len(compacted), 100)
+        self.assertEqual(compacted.loc[compacted['id'] == 5, 'level'].tolist(), [999.0])
+
+    def test_missing_watermark_triggers_full_refresh(self):
+        IncrementalSync.objects.filter(pk=self.sync.pk).update(last_watermark=None)
+        self.sync.refresh_from_db()
+        result = IncrementalSyncService.run_sync(self.sync)
+        self.assertTrue(result['full_refresh'])
+        self.assertEqual(result['total_rows'], 100)
+
+    def test_late_rows_at_the_watermark_are_picked_up_once(self):
+        sync = IncrementalSyncService.enable_sync(
+            self.datasource, self.connection, "SELECT * FROM readings", 'level'
+        )
+        self.insert([(101, 'S9', 50.0)])
+
+        result = IncrementalSyncService.run_sync(sync)
+        self.assertEqual(result['rows_added'], 1)
+        self.assertEqual(sorted(self.read_ids()), list(range(1, 102)))
+
+        result = IncrementalSyncService.run_sync(sync)
+        self.assertEqual(result['rows_added'], 0)
+        self.assertEqual(result['total_rows'], 101)
+
+    @override_settings(CONNECTOR_SYNC_COMPACT_PARTS=2)
+    def test_parts_are_compacted_after_enough_syncs(self):
+        self.insert([(101, 'S9', 50.5)])
+        IncrementalSyncService.run_sync(self.sync)
+        self.assertEqual(len(dataset_parts(self.datasource.file.path)), 1)
+
+        self.insert([(102, 'S9', 51.0)])
+        result = IncrementalSyncService.run_sync(self.sync)
+        self.assertEqual(dataset_parts(self.datasource.file.path), [])
+        self.assertEqual(result['total_rows'], 102)
+        self.assertEqual(
+            pq.read_table(self.datasource.file.path, columns=['id']).column('id').to_pylist(),
+            list(range(1, 103))
+        )
+
+    def test_running_sync_is_not_claimed_or_queued_again(self):
+        IncrementalSync.objects.filter(pk=self.sync.pk).update(last_status='running')
+
+        result = incremental_sync_task.apply(args=[str(self.sync.id)]).get()
+        self.assertEqual(result, {'success': False, 'error': 'Sync already running'})
+        self.assertEqual(run_due_incremental_syncs_task(), {'queued': []})
@@ -0,0 +1,140 @@
+"""
+Tests for chunked, streaming database imports into Parquet.
+Uses a local SQLite file as a stand-in for the operational database.
+"""
+
+import os
+import sqlite3
+import tempfile
+import uuid
+from datetime import timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from connectors.models import DatabaseConnection, ImportTask
+from connectors.services.database_connection_service import IMPORT_TASK_MAX_AGE_SECONDS
+from connectors.services import (
+    DatabaseConnectionService, engine_registry, finish_import_task, is_import_cancelled,
+    prune_import_tasks, register_import_task, request_import_cancel
+)
+
+
+class StreamingImportTestCase(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'gauges.sqlite')
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE readings (id INTEGER PRIMARY KEY, station TEXT, level REAL)")
+            conn.executemany(
+                "INSERT INTO readings (station, level) VALUES (?, ?)",
+                [(None if i < 10 else f"S{i % 7}", i * 0.1) for i in range(1000)]
+            )
+            conn.execute("CREATE TABLE gauges (id INTEGER PRIMARY KEY, offset_m INTEGER, depth NUMERIC)")
+            conn.executemany(
+                "INSERT INTO gauges (offset_m, depth) VALUES (?, ?)",
+                [(None if i < 10 else i, 2 if i < 10 else 2.25) for i in range(30)]
+            )
+        self.connection = DatabaseConnection(
+            id=uuid.uuid4(), name='Gauges', database_type='sqlite', database_name=self.db_path
+        )
+        self.output_path = os.path.join(self.tmpdir.name, 'out.parquet')
+
+    def tearDown(self):
+        engine_registry.dispose_all()
+        self.tmpdir.cleanup()
+
+    def test_chunks_become_row_groups(self):
+        progress = []
+        stats = DatabaseConnectionService.stream_query_to_parquet(
+            self.connection, "SELECT * FROM readings", self.output_path,
+            chunk_size=100, progress_callback=progress.append
+        )
+        self.assertEqual(stats['rows'], 1000)
+        self.assertEqual(stats['chunks'], 10)
+        self.assertFalse(stats['truncated'])
+        self.assertEqual([p['rows'] for p in progress], list(range(100, 1001, 100)))
+
+        parquet = pq.ParquetFile(self.output_path)
+        self.assertEqual(parquet.metadata.num_rows, 1000)
+        self.assertEqual(parquet.metadata.num_row_groups, 10)
+
+    def test_all_null_first_chunk_column_is_kept(self):
+        DatabaseConnectionService.stream_query_to_parquet(
+            self.connection, "SELECT * FROM readings ORDER BY id", self.output_path, chunk_size=10
+        )
+        df = pq.read_table(self.output_path).to_pandas()
+        self.assertTrue(df['station'].iloc[:10].isna().all())
+        self.assertEqual(df['station'].iloc[10], 'S3')
+
+    def test_row_cap_truncates(self):
+        stats = DatabaseConnectionService.stream_query_to_parquet(
+            self.connection, "SELECT * FROM readings", self.output_path,
+            chunk_size=100, max_rows=250
+        )
+        self.assertEqual(stats['rows'], 250)
+        self.assertTrue(stats['truncated'])
+        self.assertEqual(pq.ParquetFile(self.output_path).metadata.num_rows, 250)
+
+    def test_byte_cap_stops_streaming(self):
+        stats = DatabaseConnectionService.stream_query_to_parquet(
+            self.connection, "SELECT * FROM readings", self.output_path,
+            chunk_size=100, max_bytes=1
+        )
+        self.assertEqual(stats['chunks'], 1)
+        self.assertTrue(stats['truncated'])
+
+    def test_cancellation_stops_import(self):
+        calls = []
+
+        def should_cancel():
+            calls.append(1)
+            return len(calls) > 3
+
+        success, message = DatabaseConnectionService.create_datasource_from_query(
+            self.connection, "SELECT * FROM readings", 'cancelled import', project=None,
+            chunk_size=100, should_cancel=should_cancel
+        )
+        self.assertFalse(success)
+        self.assertEqual(message, "Import cancelled")
+        self.assertEqual(len(calls), 4)
+
+    def test_later_chunks_widen_column_types(self):
+        stats = DatabaseConnectionService.stream_query_to_parquet(
+            self.connection, "SELECT * FROM gauges ORDER BY id", self.output_path, chunk_size=10
+        )
+        table = pq.read_table(self.output_path)
+        self.assertEqual(stats['rows'], 30)
+        self.assertTrue(pa.types.is_integer(table.schema.field('offset_m').type))
+        self.assertEqual(table.schema.field('depth').type, pa.float64())
+        self.assertEqual(table.column('depth').to_pylist()[9:11], [2.0, 2.25])
+        self.assertEqual(sorted(os.listdir(self.tmpdir.name)), ['gauges.sqlite', 'out.parquet'])
+
+    def test_cancel_flag_is_stored_for_the_owner_only(self):
+        owner = User.objects.create_user(username='import_owner', password='testpass')
+        other = User.objects.create_user(username='import_other', password='testpass')
+        self.connection.user = owner
+        self.connection.save()
+        register_import_task('task-1', owner, self.connection)
+
+        self.assertFalse(request_import_cancel('task-1', other))
+        self.assertFalse(is_import_cancelled('task-1'))
+        self.assertTrue(request_import_cancel('task-1', owner))
+        self.assertTrue(is_import_cancelled('task-1'))
+
+    def test_finished_and_stale_import_tasks_are_removed(self):
+        owner = User.objects.create_user(username='import_cleanup', password='testpass')
+        register_import_task('task-done', owner, self.connection)
+        register_import_task('task-dead', owner, self.connection)
+        ImportTask.objects.filter(task_id='task-dead').update(
+            created_at=timezone.now() - timedelta(seconds=IMPORT_TASK_MAX_AGE_SECONDS + 1)
+        )
+        register_import_task('task-running', owner, self.connection)
+
+        finish_import_task('task-done')
+        self.assertEqual(prune_import_tasks(), 1)
+        self.assertEqual(list(ImportTask.objects.values_list('task_id', flat=True)), ['task-running'])
@@ -14,7 +14,9 @@ from .views import (
     DatabaseImportQueryView,
     get_database_tables_view,
     get_table_columns_view,
-    preview_query_view
+    preview_query_view,
+    cancel_import_view,
+    refresh_datasource_view
 )
 
 app_name = 'connectors'
@@ -39,6 +41,8 @@ urlpatterns = [
     path('api/tables/', get_database_tables_view, name='api_get_tables'),
     path('api/columns/', get_table_columns_view, name='api_get_columns'),
     path('api/preview/', preview_query_view, name='api_preview_query'),
+    path('api/import/<str:task_id>/cancel/', cancel_import_view, name='api_cancel_import'),
+    path('api/sync/<uuid:datasource_id>/refresh/', refresh_datasource_view, name='api_refresh_datasource'),
     
     # Data Sources URLs
     path('data-sources/', DatabaseConnectionListView.as_view(), name='data_source_list'),
@@ -13,7 +13,9 @@ from .data_import_views import (
     DatabaseImportQueryView,
     get_database_tables_view,
     get_table_columns_view,
-    preview_query_view
+    preview_query_view,
+    cancel_import_view,
+    refresh_datasource_view
 )
 
 __all__ = [
@@ -26,5 +28,7 @@ __all__ = [
     'DatabaseImportQueryView',
     'get_database_tables_view',
     'get_table_columns_view',
-    'preview_query_view'
+    'preview_query_view',
+    'cancel_import_view',
+    'refresh_datasource_view'
 ]
@@ -11,9 +11,11 @@ from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 import json
 
-from ..models import DatabaseConnection
-from ..services import DatabaseConnectionService
-from ..tasks import import_data_from_database_task, get_database_tables_task
+from ..models import DatabaseConnection, IncrementalSync
+from ..services import (
+    DatabaseConnectionService, IncrementalSyncService, register_import_task, request_import_cancel
+)
+from ..tasks import import_data_from_database_task, get_database_tables_task, incremental_sync_task
 from projects.models import Project
 
 
@@ -92,6 +94,7 @@ class DatabaseImportQueryView(LoginRequiredMixin, View):
             datasource_name = data.get('datasource_name', '').strip()
             description = data.get('description', '').strip()
             execute_async = data.get('async', False)
+            incremental = data.get('incremental') or None
             
             # Validate input
             if not query:
@@ -120,8 +123,10 @@ class DatabaseImportQueryView(LoginRequiredMixin, View):
                     datasource_name=datasource_name,
                     project_id=str(project.id),
                     user_id=request.user.id,
-                    description=description
+                    description=description,
+                    incremental=incremental
                 )
+                register_import_task(task.id, request.user, connection)
                 
                 return JsonResponse({
                     'success': True,
@@ -140,6 +145,15 @@ class DatabaseImportQueryView(LoginRequiredMixin, View):
                 
                 if success:
                     datasource = result
+                    if incremental and incremental.get('watermark_column'):
+                        IncrementalSyncService.enable_sync(
+                            datasource=datasource,
+                            connection=connection,
+                            query=query,
+                            watermark_column=incremental['watermark_column'],
+                            key_column=incremental.get('key_column'),
+                            interval_minutes=int(incremental.get('interval_minutes') or 60)
+                        )
                     return JsonResponse({
                         'success': True,
                         'datasource_id': str(datasource.id),
@@ -336,3 +350,65 @@ def preview_query_view(request):
             'success': False,
             'error': f'An error occurred: {str(e)}'
         }, status=500)
+
+
+
+@login_required
+@require_POST
+def cancel_import_view(request, task_id):
+    """AJAX view to cancel a running background database import."""
+    
+    try:
+        from celery.result import AsyncResult
+        
+        # Running imports stop at the next chunk; queued ones never start
+        if not request_import_cancel(task_id, request.user):
+            return JsonResponse({
+                'success': False,
+                'error': 'Import not found'
+            }, status=404)
+        AsyncResult(task_id).revoke()
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Import cancellation requested'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        }, status=500)
+
+
+
+@login_required
+@require_POST
+def refresh_datasource_view(request, datasource_id):
+    """AJAX view to trigger an incremental refresh of a database-imported DataSource."""
+    
+    try:
+        sync = IncrementalSync.objects.get(
+            datasource_id=datasource_id,
+            connection__user=request.user
+        )
+    except IncrementalSync.DoesNotExist:
+        return JsonResponse({
+            'success': False,
+            'error': 'Incremental sync is not enabled for this DataSource'
+        }, status=404)
+    
+    try:
+        task = incremental_sync_task.delay(str(sync.id))
+        register_import_task(task.id, request.user, sync.connection)
+        return JsonResponse({
+            'success': True,
+            'task_id': task.id,
+            'message': 'Incremental refresh started in background'
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': f'An error occurred: {str(e)}'
+        }, status=500)
@@ -8,6 +8,9 @@ ML_MODEL_CHOICES = [
     ('RandomForestRegressor', 'Random Forest'),
     ('GradientBoostingRegressor', 'Gradient Boosting'),
     ('LinearRegression', 'Regresión Lineal'),
+    # Support partial_fit: trained out of core on datasets larger than memory
+    ('SGDRegressor', 'Regresión SGD (incremental)'),
+    ('MLPRegressor', 'Red Neuronal MLP (incremental)'),
 ]
 
 # For form display (includes empty option)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_add_model_type_to_preset'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hyperparameterpreset',
+            name='model_type',
+            field=models.CharField(
+                choices=[
+                    ('RandomForestRegressor', 'Random Forest'),
+                    ('GradientBoostingRegressor', 'Gradient Boosting'),
+                    ('LinearRegression', 'Regresión Lineal'),
+                    ('SGDRegressor', 'Regresión SGD (incremental)'),
+                    ('MLPRegressor', 'Red Neuronal MLP (incremental)')
+                ],
+                help_text='ML model type this preset is designed for',
+                max_length=100
+            ),
+        ),
+    ]
@@ -9,6 +9,12 @@ except ImportError:
     perform_data_fusion = None
     perform_feature_engineering = None
 from .data_analysis_service import *
+from .nullity_service import build_nullity_heatmap, get_nullity_heatmap
+from .chart_data import build_chart, get_chart
+from .dataset_reader import (
+    DatasetSchema, clear_dataset_cache, column_null_counts, dataset_cache_stats, dataset_parts, dataset_version,
+    datasource_version, read_dataset, read_schema,
+)
 from .session_service import *
 
 # New modular quality services
@@ -37,6 +43,21 @@ __all__ = [
     # Data analysis services
     "calculate_nullity_report",
     "generate_nullity_visualizations",
+    "build_nullity_heatmap",
+    "get_nullity_heatmap",
+    # Chart data
+    "build_chart",
+    "get_chart",
+    # Dataset reads
+    "DatasetSchema",
+    "read_dataset",
+    "read_schema",
+    "column_null_counts",
+    "dataset_parts",
+    "dataset_version",
+    "datasource_version",
+    "dataset_cache_stats",
+    "clear_dataset_cache",
     # Session services
     "initialize_session",
     "load_current_dataframe",
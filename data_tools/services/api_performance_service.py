@@ -16,6 +16,8 @@ from django.conf import settings
 import threading
 from collections import defaultdict
 
+from .dataset_reader import dataset_cache_stats
+
 logger = logging.getLogger(__name__)
 
 
@@ -450,6 +452,7 @@ def get_api_stats() -> Dict[str, Any]:
             'hit_rate': 'N/A',  # Would need to implement hit tracking
             'memory_usage': 'N/A'
         },
+        'dataset_cache': dataset_cache_stats(),
         'rate_limiting': {
             'active_limits': len(rate_limiter.requests),
             'total_requests': sum(len(requests) for requests in rate_limiter.requests.values())
@@ -0,0 +1,389 @@
+"""
+Server-side chart data for Data Studio visualizations.
+
+Charts used to hand every row of a datasource to Plotly Express and return
+the resulting HTML, so payload size and latency grew with the row count.
+Each chart type is now reduced to what it actually draws before the figure
+is built:
+
+- histogram: bin counts from ``np.histogram``
+- box: quartiles, whiskers and mean per group, plus at most
+  ``CHART_MAX_POINTS`` of the most extreme outliers
+- bar: one aggregate (sum, mean or count) per category
+- heatmap: a mean pivot over the most frequent categories of each axis
+- scatter: a stratified sample of at most ``CHART_MAX_POINTS`` points
+- line: LTTB-downsampled series of at most ``CHART_MAX_POINTS`` points
+
+Figures are returned as Plotly JSON (no plotly.js, no HTML) and cached per
+datasource version and chart specification.
+"""
+import hashlib
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from django.conf import settings
+from django.core.cache import cache
+
+from .dataset_reader import datasource_version
+from .downsampling import lttb, stratified_sample
+
+logger = logging.getLogger(__name__)
+
+# Bump when a figure builder changes so cached charts are rebuilt
+CHART_DATA_VERSION = 1
+
+BAR_AGGREGATES = ('sum', 'mean', 'count')
+
+
+def point_budget():
+    """Maximum number of points drawn by scatter and line charts."""
+    return int(getattr(settings, 'CHART_MAX_POINTS', 5000))
+
+
+def category_budget():
+    """Maximum number of categories drawn per axis or colour."""
+    return int(getattr(settings, 'CHART_MAX_CATEGORIES', 50))
+
+
+def chart_columns(config):
+    """Columns referenced by a chart configuration."""
+    columns = []
+    for key, value in config.items():
+        if (key.endswith(('_axis', '_by')) or key in ('column', 'values')) and value and value not in columns:
+            columns.append(value)
+    return columns
+
+
+def _require_column(df, column, numeric=False):
+    if column not in df.columns:
+        raise ValueError(f'La columna "{column}" no existe en el dataset')
+    if numeric and not pd.api.types.is_numeric_dtype(df[column]):
+        raise ValueError(f'La columna "{column}" no es numérica')
+
+
+def _finite(values):
+    values = np.asarray(values, dtype='float64')
+    return values[np.isfinite(values)]
+
+
+def _top_categories(series, limit):
+    """The ``limit`` most frequent values of ``series``."""
+    return series.value_counts(dropna=True).index[:limit]
+
+
+def _grouped_values(df, column, group_by):
+    """Finite ``column`` values per most frequent ``group_by`` category, most frequent first."""
+    categories = _top_categories(df[group_by], category_budget())
+    data = df.loc[df[group_by].isin(categories), [group_by, column]]
+    groups = {category: _finite(values) for category, values in data.groupby(group_by, observed=True, sort=False)[column]}
+    return [(str(category), groups[category]) for category in categories if category in groups]
+
+
+def _axis_values(series):
+    """Numeric view of an x column for downsampling (datetimes as ns)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype('int64').to_numpy(dtype='float64')
+    return series.to_numpy(dtype='float64')
+
+
+def _histogram(df, config):
+    column = config['column']
+    _require_column(df, column, numeric=True)
+    bins = int(config.get('bins', 30))
+    color_by = config.get('color_by')
+
+    values = _finite(df[column])
+    if not len(values):
+        raise ValueError(f'La columna "{column}" no tiene datos válidos')
+    edges = np.histogram_bin_edges(values, bins=bins)
+    centers = (edges[:-1] + edges[1:]) / 2
+    widths = np.diff(edges)
+
+    fig = go.Figure()
+    if color_by:
+        _require_column(df, color_by)
+        for name, group in _grouped_values(df, column, color_by):
+            counts, _ = np.histogram(group, bins=edges)
+            fig.add_trace(go.Bar(x=centers, y=counts, width=widths, name=name, opacity=0.75))
+        fig.update_layout(barmode='overlay')
+    else:
+        counts, _ = np.histogram(values, bins=edges)
+        fig.add_trace(go.Bar(x=centers, y=counts, width=widths, name=column))
+
+    fig.update_layout(
+        title=config.get('title', f'Distribución de {column}'),
+        xaxis_title=column, yaxis_title='Frecuencia', bargap=0,
+    )
+    return fig, len(values), bins
+
+
+def _box_stats(values):
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lower, upper = inside.min(), inside.max()
+    outliers = values[(values < lower) | (values > upper)]
+    return {
+        'q1': q1, 'median': median, 'q3': q3,
+        'lowerfence': lower, 'upperfence': upper,
+        'mean': values.mean(), 'outliers': outliers,
+    }
+
+
+def _box(df, config):
+    column = config['y_axis']
+    _require_column(df, column, numeric=True)
+    group_by = config.get('x_axis') or config.get('color_by')
+
+    if group_by:
+        _require_column(df, group_by)
+        groups = _grouped_values(df, column, group_by)
+    else:
+        groups = [(column, _finite(df[column]))]
+    groups = [(name, values) for name, values in groups if len(values)]
+    if not groups:
+        raise ValueError(f'La columna "{column}" no tiene datos válidos')
+
+    fig = go.Figure()
+    outlier_budget = max(1, point_budget() // len(groups))
+    rendered = 0
+    for name, values in groups:
+        stats = _box_stats(values)
+        fig.add_trace(go.Box(
+            x=[name], name=name, boxpoints=False,
+            q1=[stats['q1']], median=[stats['median']], q3=[stats['q3']],
+            lowerfence=[stats['lowerfence']], upperfence=[stats['upperfence']], mean=[stats['mean']],
+        ))
+        outliers = stats['outliers']
+        if len(outliers) > outlier_budget:
+            # Keep the outliers farthest from the median
+            outliers = outliers[np.argsort(-np.abs(outliers - stats['median']))[:outlier_budget]]
+        if len(outliers):
+            fig.add_trace(go.Scatter(
+                x=[name] * len(outliers), y=outliers, mode='markers', name=f'{name} (atípicos)',
+                showlegend=False, marker=dict(size=4),
+            ))
+        rendered += len(outliers) + 5
+
+    fig.update_layout(
+        title=config.get('title', f'Diagrama de Caja de {column}'),
+        yaxis_title=column, xaxis_title=group_by or '',
+    )
+    return fig, int(sum(len(values) for _, values in groups)), rendered
+
+
+def _bar(df, config):
+    x, y = config['x_axis'], config['y_axis']
+    color_by = config.get('color_by')
+    aggregate = config.get('aggregate', 'sum')
+    if aggregate not in BAR_AGGREGATES:
+        raise ValueError(f'Agregación no soportada: {aggregate}')
+    _require_column(df, x)
+    _require_column(df, y, numeric=aggregate != 'count')
+
+    categories = _top_categories(df[x], category_budget())
+    data = df[df[x].isin(categories)]
+    keys = [x] + ([color_by] if color_by else [])
+    if color_by:
+        _require_column(df, color_by)
+        data = data[data[color_by].isin(_top_categories(df[color_by], category_budget()))]
+    totals = data.groupby(keys, observed=True, sort=False)[y].agg(aggregate)
+
+    fig = go.Figure()
+    if color_by:
+        for color, group in totals.groupby(level=1, sort=False):
+            fig.add_trace(go.Bar(x=group.index.get_level_values(0), y=group.to_numpy(), name=str(color)))
+        fig.update_layout(barmode='stack')
+    else:
+        fig.add_trace(go.Bar(x=totals.index, y=totals.to_numpy(), name=y))
+
+    fig.update_layout(
+        title=config.get('title', f'{y} por {x}'),
+        xaxis_title=x, yaxis_title=y if aggregate != 'count' else 'Cantidad',
+    )
+    return fig, len(data), len(totals)
+
+
+def _heatmap(df, config):
+    x, y, values = config['x_axis'], config['y_axis'], config['values']
+    _require_column(df, x)
+    _require_column(df, y)
+    _require_column(df, values, numeric=True)
+
+    limit = category_budget()
+    data = df[df[x].isin(_top_categories(df[x], limit)) & df[y].isin(_top_categories(df[y], limit))]
+    pivot = data.pivot_table(values=values, index=y, columns=x, aggfunc='mean', observed=True)
+
+    fig = go.Figure(go.Heatmap(
+        z=pivot.to_numpy(), x=[str(c) for c in pivot.columns], y=[str(i) for i in pivot.index],
+        colorbar=dict(title=values),
+    ))
+    fig.update_layout(title=config.get('title', 'Heatmap'), xaxis_title=x, yaxis_title=y)
+    return fig, len(data), int(pivot.size)
+
+
+def _marker_sizes(values):
+    """Marker sizes between 4 and 20 px proportional to ``values``."""
+    finite = values[np.isfinite(values)]
+    if not len(finite) or not finite.max() > finite.min():
+        return np.full(len(values), 6.0)
+    return np.nan_to_num(4 + 16 * (values - finite.min()) / (finite.max() - finite.min()), nan=4.0)
+
+
+def _scatter(df, config):
+    x, y = config['x_axis'], config['y_axis']
+    _require_column(df, x, numeric=True)
+    _require_column(df, y, numeric=True)
+    color_by, size_by = config.get('color_by'), config.get('size_by')
+    for column in (color_by, size_by):
+        if column:
+            _require_column(df, column)
+
+    data = df[chart_columns(config)].dropna(subset=[x, y])
+    if not len(data):
+        raise ValueError(f'No hay datos válidos para las columnas "{x}" y "{y}"')
+    sample = data.iloc[stratified_sample(data[y].to_numpy(), point_budget())]
+
+    sizes = 5
+    if size_by and pd.api.types.is_numeric_dtype(sample[size_by]):
+        sizes = _marker_sizes(sample[size_by].to_numpy(dtype='float64'))
+
+    fig = go.Figure()
+    if color_by and not pd.api.types.is_numeric_dtype(sample[color_by]):
+        for category in _top_categories(sample[color_by], category_budget()):
+            mask = (sample[color_by] == category).to_numpy()
+            fig.add_trace(go.Scattergl(
+                x=sample.loc[mask, x], y=sample.loc[mask, y], mode='markers', name=str(category),
+                marker=dict(size=sizes[mask] if isinstance(sizes, np.ndarray) else sizes),
+            ))
+    else:
+        marker = dict(size=sizes)
+        if color_by:
+            marker.update(color=sample[color_by], colorscale='Viridis', showscale=True, colorbar=dict(title=color_by))
+        fig.add_trace(go.Scattergl(x=sample[x], y=sample[y], mode='markers', name=y, marker=marker))
+
+    fig.update_layout(
+        title=config.get('title', f'Diagrama de Dispersión: {x} vs {y}'),
+        xaxis_title=x, yaxis_title=y,
+    )
+    return fig, len(data), len(sample)
+
+
+def _line(df, config):
+    x, y = config['x_axis'], config['y_axis']
+    _require_column(df, x)
+    _require_column(df, y, numeric=True)
+    color_by = config.get('color_by')
+
+    data = df[chart_columns(config)].dropna(subset=[x, y]).sort_values(x, kind='stable')
+    if not len(data):
+        raise ValueError(f'No hay datos válidos para las columnas "{x}" y "{y}"')
+
+    if color_by:
+        _require_column(df, color_by)
+        categories = _top_categories(data[color_by], category_budget())
+        grouped = dict(list(data[data[color_by].isin(categories)].groupby(color_by, observed=True, sort=False)))
+        groups = [(str(category), grouped[category]) for category in categories if category in grouped]
+    else:
+        groups = [(y, data)]
+
+    fig = go.Figure()
+    budget = max(3, point_budget() // len(groups))
+    rendered = 0
+    for name, group in groups:
+        if pd.api.types.is_numeric_dtype(group[x]) or pd.api.types.is_datetime64_any_dtype(group[x]):
+            group = group.iloc[lttb(_axis_values(group[x]), group[y].to_numpy(dtype='float64'), budget)]
+        else:
+            group = group.iloc[np.unique(np.linspace(0, len(group) - 1, min(budget, len(group))).astype(int))]
+        fig.add_trace(go.Scattergl(x=group[x], y=group[y], mode='lines', name=name))
+        rendered += len(group)
+
+    fig.update_layout(title=config.get('title', f'{y} vs {x}'), xaxis_title=x, yaxis_title=y)
+    return fig, len(data), rendered
+
+
+CHART_BUILDERS = {
+    'histogram': _histogram,
+    'box': _box,
+    'bar': _bar,
+    'heatmap': _heatmap,
+    'scatter': _scatter,
+    'line': _line,
+}
+
+
+def build_chart(df, chart_type, config):
+    """
+    Aggregate ``df`` for a chart and build its Plotly figure.
+
+    Args:
+        df (pd.DataFrame): Source data (only the referenced columns are read).
+        chart_type (str): One of ``CHART_BUILDERS``.
+        config (dict): Chart parameters (``x_axis``, ``y_axis``, ``column``,
+            ``values``, ``color_by``, ``size_by``, ``bins``, ``aggregate``,
+            ``title``).
+
+    Returns:
+        dict: ``figure`` (Plotly JSON), ``data_points`` (rows used) and
+        ``rendered_points`` (marks in the figure).
+
+    Raises:
+        ValueError: Unknown chart type, missing or non-numeric columns, or
+            no valid data.
+    """
+    builder = CHART_BUILDERS.get(chart_type)
+    if builder is None:
+        raise ValueError(f'Tipo de gráfico no soportado: {chart_type}')
+
+    fig, data_points, rendered_points = builder(df, config)
+    fig.update_layout(template='plotly_white', height=400)
+    return {
+        'figure': json.loads(pio.to_json(fig)),
+        'data_points': int(data_points),
+        'rendered_points': int(rendered_points),
+    }
+
+
+def chart_cache_key(datasource, chart_type, config):
+    """Cache key of a chart; changes with the datasource version and spec."""
+    payload = json.dumps({
+        'version': CHART_DATA_VERSION,
+        'datasource_version': datasource_version(datasource),
+        'chart_type': chart_type,
+        'config': {key: str(value) for key, value in config.items()},
+        'points': point_budget(),
+        'categories': category_budget(),
+    }, sort_keys=True)
+    return f"chart-data:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def get_chart(datasource, chart_type, config, load_dataframe):
+    """
+    Cached chart of a datasource.
+
+    Args:
+        datasource (DataSource): Datasource to chart.
+        chart_type (str): Chart type.
+        config (dict): Chart parameters.
+        load_dataframe (callable): ``load_dataframe(columns)`` returning the
+            referenced columns; only called on a cache miss.
+
+    Returns:
+        dict: See ``build_chart``.
+    """
+    key = chart_cache_key(datasource, chart_type, config)
+    chart = cache.get(key)
+    if chart is not None:
+        return chart
+
+    chart = build_chart(load_dataframe(chart_columns(config)), chart_type, config)
+    cache.set(key, chart, timeout=getattr(settings, 'CHART_CACHE_TIMEOUT', 24 * 3600))
+    logger.info(
+        f"Built {chart_type} chart for DataSource {datasource.id}: "
+        f"{chart['rendered_points']} marks from {chart['data_points']} rows"
+    )
+    return chart
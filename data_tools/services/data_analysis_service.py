@@ -11,6 +11,8 @@ import json
 import logging
 import sentry_sdk
 
+from .nullity_service import build_nullity_heatmap, nullity_heatmap_figure
+
 logger = logging.getLogger(__name__)
 
 
@@ -110,29 +112,10 @@ def generate_nullity_visualizations(df):
             
             visualizations['bar'] = json.loads(pio.to_json(fig_bar))
         
-        # 2. Missing Data Matrix (Heatmap)
-        if len(df.columns) <= 30:  # Only for manageable number of columns
-            # Create binary matrix for missing data
-            missing_matrix = df.isnull().astype(int)
-            
-            fig_matrix = go.Figure(data=go.Heatmap(
-                z=missing_matrix.values.T,
-                x=missing_matrix.index,
-                y=missing_matrix.columns,
-                colorscale=[[0, 'lightblue'], [1, 'darkred']],
-                showscale=True,
-                colorbar=dict(title="Missing", tickvals=[0, 1], ticktext=["Present", "Missing"])
-            ))
-            
-            fig_matrix.update_layout(
-                title='Missing Data Matrix',
-                xaxis_title='Row Index',
-                yaxis_title='Columns',
-                height=max(400, len(df.columns) * 20),
-                template='plotly_white'
-            )
-            
-            visualizations['matrix'] = json.loads(pio.to_json(fig_matrix))
+        # 2. Missing Data Matrix (Heatmap), rows aggregated into bins
+        if len(df.columns) > 0:
+            heatmap = build_nullity_heatmap(df)
+            visualizations['matrix'] = nullity_heatmap_figure(heatmap, title='Missing Data Matrix')
         
         # 3. Missing Data Percentage Pie Chart
         if len(missing_cols) > 0:
@@ -1,11 +1,16 @@
 """
 Data loader service for loading data from various file formats.
+
+Plain loads go through ``dataset_reader.read_dataset`` and share its
+per-worker frame cache; extra pandas arguments bypass the cache.
 """
 
 import pandas as pd
 import logging
 from typing import Optional
 
+from .dataset_reader import CSV_DELIMITERS, CSV_ENCODINGS, read_dataset
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +26,7 @@ def load_data_from_parquet(file_path: str) -> Optional[pd.DataFrame]:
     """
     try:
         logger.info(f"Loading data from Parquet file: {file_path}")
-        df = pd.read_parquet(file_path)
+        df = read_dataset(file_path)
         logger.info(f"Successfully loaded {len(df)} rows and {len(df.columns)} columns")
         return df
     except Exception as e:
@@ -42,13 +47,14 @@ def load_data_from_csv(file_path: str, **kwargs) -> Optional[pd.DataFrame]:
     """
     try:
         logger.info(f"Loading data from CSV file: {file_path}")
+        if not kwargs:
+            df = read_dataset(file_path)
+            logger.info(f"Successfully loaded {len(df)} rows and {len(df.columns)} columns")
+            return df
         
         # Try different delimiters and encodings
-        delimiters = [',', ';', '\t']
-        encodings = ['utf-8', 'latin-1', 'cp1252']
-        
-        for delimiter in delimiters:
-            for encoding in encodings:
+        for delimiter in CSV_DELIMITERS:
+            for encoding in CSV_ENCODINGS:
                 try:
                     df = pd.read_csv(file_path, delimiter=delimiter, encoding=encoding, **kwargs)
                     logger.info(f"Successfully loaded CSV with delimiter '{delimiter}' and encoding '{encoding}': {len(df)} rows and {len(df.columns)} columns")
@@ -80,7 +86,7 @@ def load_data_from_excel(file_path: str, **kwargs) -> Optional[pd.DataFrame]:
     """
     try:
         logger.info(f"Loading data from Excel file: {file_path}")
-        df = pd.read_excel(file_path, **kwargs)
+        df = pd.read_excel(file_path, **kwargs) if kwargs else read_dataset(file_path)
         logger.info(f"Successfully loaded {len(df)} rows and {len(df.columns)} columns")
         return df
     except Exception as e:
@@ -0,0 +1,430 @@
+"""
+Projection-aware reads of DataSource files.
+
+Views that only need column names, a row count or one or two columns used to
+load the whole file. Everything goes through this module instead:
+
+- ``read_dataset`` reads only the requested columns and, with ``nrows``,
+  only the Parquet row groups needed to cover those rows
+- ``read_schema`` answers column, dtype and row-count questions from the
+  Parquet footer without reading any data
+- ``column_null_counts`` takes missing-value counts from the row-group
+  statistics in the footer, reading only columns without statistics
+- ``datasource_version`` fingerprints a DataSource's content (file and
+  derivation lineage) for the caches keyed by it
+
+CSV and Excel files are supported with the same interface (columns are
+filtered while parsing, ``nrows`` stops the parser early).
+
+Decoded frames are kept in a per-worker LRU cache keyed by file path,
+modification time, size, columns and row limit, bounded by
+``DATASET_CACHE_MAX_BYTES``. A request for a subset of the columns or rows
+of a cached frame is served from it, so the endpoints of one page load read
+the file once. ``read_dataset`` returns a copy unless ``copy=False``; frames
+returned without a copy are shared and must be treated as read-only.
+
+A Parquet dataset may have appended part files in a sibling ``<file>.parts``
+directory (incremental database syncs write one per refresh and compact
+them into the main file from time to time). They are read after the main
+file; when the parts name an upsert key, a row whose key reappears in a
+later part replaces the earlier version.
+"""
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+import pandas as pd
+import pyarrow.parquet as pq
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CSV_DELIMITERS = (',', ';', '\t')
+# latin-1 decodes any byte sequence, so it must come last
+CSV_ENCODINGS = ('utf-8', 'cp1252', 'latin-1')
+
+# Rows parsed to infer CSV dtypes for schema-only requests
+CSV_SCHEMA_SAMPLE_ROWS = 10_000
+
+# Directory suffix holding appended part files of a Parquet dataset
+PARTS_SUFFIX = '.parts'
+
+# Part-file schema metadata naming the column rows are upserted by
+UPSERT_KEY_METADATA = b'hydroml.upsert_key'
+
+_frame_cache = OrderedDict()
+_frame_cache_lock = threading.Lock()
+_frame_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0, 'read_seconds': 0.0}
+
+
+@dataclass
+class DatasetSchema:
+    """Columns, pandas dtypes and row count of a dataset file."""
+    columns: list
+    dtypes: dict = field(default_factory=dict)
+    num_rows: int = 0
+
+    @property
+    def num_columns(self):
+        return len(self.columns)
+
+    def numeric_columns(self):
+        """Columns with a numeric (non-boolean) dtype, in file order."""
+        return [column for column in self.columns
+                if pd.api.types.is_numeric_dtype(self.dtypes[column])
+                and not pd.api.types.is_bool_dtype(self.dtypes[column])]
+
+
+def file_format(file_path):
+    """'parquet', 'csv' or 'excel' (unknown extensions are read as Parquet)."""
+    if file_path.endswith('.csv'):
+        return 'csv'
+    if file_path.endswith(('.xls', '.xlsx')):
+        return 'excel'
+    return 'parquet'
+
+
+def dataset_parts(file_path):
+    """Appended part files of a Parquet dataset, oldest first."""
+    parts_dir = file_path + PARTS_SUFFIX
+    if not os.path.isdir(parts_dir):
+        return []
+    return [os.path.join(parts_dir, name) for name in sorted(os.listdir(parts_dir)) if name.endswith('.parquet')]
+
+
+def upsert_key(parts):
+    """Upsert key column recorded in the newest part file, if any."""
+    if not parts:
+        return None
+    metadata = pq.read_schema(parts[-1]).metadata or {}
+    key = metadata.get(UPSERT_KEY_METADATA)
+    return key.decode('utf-8') if key else None
+
+
+def dataset_version(file_path):
+    """
+    Identity of a dataset file's current content.
+
+    Returns:
+        tuple: (absolute path, newest modification time in ns, total size),
+        covering appended part files.
+    """
+    stat = os.stat(file_path)
+    mtime, size = stat.st_mtime_ns, stat.st_size
+    for part in dataset_parts(file_path):
+        part_stat = os.stat(part)
+        mtime, size = max(mtime, part_stat.st_mtime_ns), size + part_stat.st_size
+    return (os.path.abspath(file_path), mtime, size)
+
+
+def datasource_version(datasource):
+    """
+    Fingerprint of a DataSource's content.
+
+    Original datasources are identified by their file (name, size, mtime);
+    derived ones by their transformation recipe plus their parents' versions,
+    so any upstream change produces a new version (and new cache keys).
+
+    Args:
+        datasource (DataSource): The datasource to fingerprint.
+
+    Returns:
+        str: Stable version string.
+    """
+    parts = [str(datasource.id)]
+
+    if datasource.file:
+        try:
+            _, mtime_ns, size = dataset_version(datasource.file.path)
+            parts.append(f"{datasource.file.name}:{size}:{mtime_ns}")
+        except (OSError, NotImplementedError):
+            parts.append(datasource.file.name)
+
+    if datasource.is_derived:
+        parts.append(json.dumps(datasource.recipe_steps, sort_keys=True, default=str))
+        for transformation in datasource.transformations.order_by('order'):
+            parts.append(json.dumps(
+                [transformation.operation_type, transformation.parameters],
+                sort_keys=True, default=str
+            ))
+        for parent in datasource.parents.order_by('id'):
+            parts.append(datasource_version(parent))
+
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def read_dataset(file_path, columns=None, nrows=None, copy=True):
+    """
+    Read a dataset file, optionally restricted to columns and leading rows.
+
+    Args:
+        file_path (str): Path to a Parquet, CSV or Excel file.
+        columns (list, optional): Columns to read; names that do not exist in
+            the file are skipped. Defaults to all columns.
+        nrows (int, optional): Read only the first ``nrows`` rows.
+        copy (bool): Return a private copy of the cached frame. Pass False
+            only when the result is not modified.
+
+    Returns:
+        pd.DataFrame: Requested data, columns in file order.
+    """
+    version = dataset_version(file_path)
+    wanted = frozenset(columns) if columns is not None else None
+
+    df = _cached_frame(version, wanted, nrows)
+    if df is None:
+        started = time.perf_counter()
+        df = _read_file(file_path, columns, nrows)
+        read_seconds = time.perf_counter() - started
+        nbytes = _store_frame(version, wanted, nrows, df, read_seconds)
+        logger.debug(
+            f"Read {file_path} in {read_seconds:.3f}s: "
+            f"{len(df)} rows x {len(df.columns)} columns, {nbytes / 2**20:.1f} MiB"
+        )
+    return df.copy() if copy else df
+
+
+def _read_file(file_path, columns, nrows):
+    fmt = file_format(file_path)
+    if fmt == 'parquet':
+        return _read_parquet(file_path, columns, nrows)
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda column: column in wanted  # noqa: E731
+
+    if fmt == 'excel':
+        return pd.read_excel(file_path, usecols=usecols, nrows=nrows)
+    return _read_csv(file_path, usecols=usecols, nrows=nrows)
+
+
+def _covers(key, wanted, nrows):
+    """Whether the cached read ``key`` contains the requested columns and rows."""
+    cached_wanted, cached_nrows = key[3], key[4]
+    if cached_nrows is not None and (nrows is None or nrows > cached_nrows):
+        return False
+    return cached_wanted is None or (wanted is not None and wanted <= cached_wanted)
+
+
+def _cached_frame(version, wanted, nrows):
+    with _frame_cache_lock:
+        key = version + (wanted, nrows)
+        if key not in _frame_cache:
+            key = next((k for k in reversed(_frame_cache) if k[:3] == version and _covers(k, wanted, nrows)), None)
+        if key is None:
+            _frame_cache_stats['misses'] += 1
+            return None
+        _frame_cache.move_to_end(key)
+        _frame_cache_stats['hits'] += 1
+        df = _frame_cache[key][0]
+
+    if wanted is not None and key[3] != wanted:
+        df = df[[column for column in df.columns if column in wanted]]
+    if nrows is not None and key[4] != nrows:
+        df = df.iloc[:nrows]
+    return df
+
+
+def _store_frame(version, wanted, nrows, df, read_seconds):
+    nbytes = int(df.memory_usage(deep=True).sum())
+    max_bytes = getattr(settings, 'DATASET_CACHE_MAX_BYTES', 512 * 2**20)
+
+    with _frame_cache_lock:
+        _frame_cache_stats['read_seconds'] += read_seconds
+        if nbytes > max_bytes:
+            return nbytes
+
+        key = version + (wanted, nrows)
+        # Drop stale versions of the file and reads the new frame covers
+        for cached_key in list(_frame_cache):
+            if cached_key[0] == version[0] and (cached_key[:3] != version or _covers(key, cached_key[3], cached_key[4])):
+                _frame_cache_stats['bytes'] -= _frame_cache.pop(cached_key)[1]
+        _frame_cache[key] = (df, nbytes)
+        _frame_cache_stats['bytes'] += nbytes
+
+        while _frame_cache_stats['bytes'] > max_bytes:
+            _frame_cache_stats['bytes'] -= _frame_cache.popitem(last=False)[1][1]
+            _frame_cache_stats['evictions'] += 1
+    return nbytes
+
+
+def dataset_cache_stats():
+    """
+    Counters of this worker's decoded-frame cache.
+
+    Returns:
+        dict: entries, bytes, max_bytes, hits, misses, evictions and the
+        total seconds spent reading files on misses.
+    """
+    with _frame_cache_lock:
+        return {
+            'entries': len(_frame_cache),
+            'max_bytes': getattr(settings, 'DATASET_CACHE_MAX_BYTES', 512 * 2**20),
+            **_frame_cache_stats,
+        }
+
+
+def clear_dataset_cache():
+    """Forget all frames cached in this worker and reset the counters."""
+    with _frame_cache_lock:
+        _frame_cache.clear()
+        _frame_cache_stats.update(hits=0, misses=0, evictions=0, bytes=0, read_seconds=0.0)
+
+
+def _pandas_columns(parquet_file):
+    """Data columns of a Parquet file as pandas sees them (index columns excluded)."""
+    return list(parquet_file.schema_arrow.empty_table().to_pandas().columns)
+
+
+def _read_parquet(file_path, columns, nrows):
+    parquet_file = pq.ParquetFile(file_path)
+    if columns is not None:
+        wanted = set(columns)
+        columns = [column for column in _pandas_columns(parquet_file) if column in wanted]
+
+    parts = dataset_parts(file_path)
+    if parts:
+        key = upsert_key(parts)
+        if key is not None or nrows is None or parquet_file.metadata.num_rows < nrows:
+            return _read_with_parts(file_path, parts, key, columns, nrows)
+
+    if nrows is None:
+        return pd.read_parquet(file_path, columns=columns)
+
+    # Only the leading row groups covering ``nrows`` rows are decoded
+    metadata = parquet_file.metadata
+    row_groups, covered = [], 0
+    for index in range(metadata.num_row_groups):
+        if covered >= nrows:
+            break
+        row_groups.append(index)
+        covered += metadata.row_group(index).num_rows
+
+    if not row_groups:
+        df = parquet_file.schema_arrow.empty_table().to_pandas()
+        return df if columns is None else df[columns]
+    table = parquet_file.read_row_groups(row_groups, columns=columns, use_pandas_metadata=True)
+    return table.slice(0, nrows).to_pandas()
+
+
+def _read_with_parts(file_path, parts, key, columns, nrows):
+    """Main file followed by its part files, with later versions of a key winning."""
+    read_columns = columns
+    if key is not None and columns is not None and key not in columns:
+        read_columns = columns + [key]
+
+    df = pd.concat(
+        [pd.read_parquet(path, columns=read_columns) for path in [file_path] + parts],
+        ignore_index=True,
+    )
+    if key is not None:
+        df = df.drop_duplicates(subset=[key], keep='last').reset_index(drop=True)
+        if read_columns is not columns:
+            df = df.drop(columns=[key])
+    return df if nrows is None else df.iloc[:nrows]
+
+
+def _read_csv(file_path, usecols=None, nrows=None):
+    for delimiter in CSV_DELIMITERS:
+        for encoding in CSV_ENCODINGS:
+            try:
+                return pd.read_csv(file_path, delimiter=delimiter, encoding=encoding, usecols=usecols, nrows=nrows)
+            except (pd.errors.ParserError, UnicodeDecodeError):
+                continue
+    raise ValueError("No se pudo leer el archivo CSV con ningún formato soportado")
+
+
+def read_schema(file_path):
+    """
+    Columns, dtypes and row count of a dataset file.
+
+    Parquet schemas come from the file footer alone. CSV dtypes are inferred
+    from the first ``CSV_SCHEMA_SAMPLE_ROWS`` rows and the row count from a
+    single-column pass; Excel files are read in full.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        DatasetSchema: Schema of the file.
+    """
+    fmt = file_format(file_path)
+    if fmt == 'parquet':
+        parquet_file = pq.ParquetFile(file_path)
+        empty = parquet_file.schema_arrow.empty_table().to_pandas()
+        num_rows = parquet_file.metadata.num_rows
+        parts = dataset_parts(file_path)
+        if parts:
+            # Part files may have widened column types
+            empty = pd.concat([empty] + [pq.read_schema(part).empty_table().to_pandas() for part in parts])
+            key = upsert_key(parts)
+            if key is None:
+                num_rows += sum(pq.ParquetFile(part).metadata.num_rows for part in parts)
+            else:
+                num_rows = len(read_dataset(file_path, columns=[key], copy=False))
+        return DatasetSchema(
+            columns=list(empty.columns),
+            dtypes=empty.dtypes.to_dict(),
+            num_rows=num_rows,
+        )
+
+    if fmt == 'excel':
+        df = pd.read_excel(file_path)
+        return DatasetSchema(columns=list(df.columns), dtypes=df.dtypes.to_dict(), num_rows=len(df))
+
+    sample = _read_csv(file_path, nrows=CSV_SCHEMA_SAMPLE_ROWS)
+    if len(sample) < CSV_SCHEMA_SAMPLE_ROWS or not len(sample.columns):
+        num_rows = len(sample)
+    else:
+        first_column = sample.columns[0]
+        num_rows = len(_read_csv(file_path, usecols=lambda column: column == first_column))
+    return DatasetSchema(columns=list(sample.columns), dtypes=sample.dtypes.to_dict(), num_rows=num_rows)
+
+
+def column_null_counts(file_path, columns=None):
+    """
+    Missing values per column.
+
+    For Parquet files the counts are summed from row-group statistics; only
+    columns whose statistics lack null counts are actually read.
+
+    Args:
+        file_path (str): Path to the file.
+        columns (list, optional): Columns to count (default: all).
+
+    Returns:
+        pd.Series: Missing-value count per column, in file order.
+    """
+    if file_format(file_path) != 'parquet' or dataset_parts(file_path):
+        return read_dataset(file_path, columns=columns, copy=False).isnull().sum()
+
+    parquet_file = pq.ParquetFile(file_path)
+    wanted = set(columns) if columns is not None else None
+    names = [name for name in _pandas_columns(parquet_file) if wanted is None or name in wanted]
+    metadata = parquet_file.metadata
+    positions = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+
+    counts, unknown = {}, []
+    for name in names:
+        position = positions.get(name)
+        total = 0
+        for index in range(metadata.num_row_groups):
+            statistics = metadata.row_group(index).column(position).statistics if position is not None else None
+            if statistics is None or not statistics.has_null_count:
+                total = None
+                break
+            total += statistics.null_count
+        if total is None:
+            unknown.append(name)
+        else:
+            counts[name] = int(total)
+
+    if unknown:
+        counts.update(pd.read_parquet(file_path, columns=unknown).isnull().sum().astype(int).to_dict())
+    return pd.Series({name: counts[name] for name in names}, dtype='int64')
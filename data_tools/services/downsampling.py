@@ -0,0 +1,97 @@
+"""
+Point reduction for charts.
+
+Charts of long series or large tables draw at most a few thousand points;
+these helpers choose which ones:
+
+- ``lttb``: Largest-Triangle-Three-Buckets over an ordered series, which
+  keeps peaks and troughs
+- ``stratified_sample``: a sample stratified over the range of the values,
+  so sparse extremes stay visible
+
+Both return row indices, so callers can select any aligned columns.
+"""
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    keeps the point forming the largest triangle with the previously kept
+    point and the average of the next bucket.
+
+    Args:
+        x (np.ndarray): Ordered x values.
+        y (np.ndarray): y values.
+        n_out (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices into ``x``/``y``.
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 0)], dtype=int)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def stratified_sample(values, n_out, n_strata=20, random_state=0):
+    """
+    Indices of a sample spread evenly over the range of ``values``.
+
+    The range is cut into equal-width strata and the sample is divided
+    between them as evenly as their sizes allow, so sparse tails are not
+    drowned out by the bulk of the distribution.
+
+    Args:
+        values (np.ndarray): Values to stratify on.
+        n_out (int): Sample size.
+        n_strata (int): Number of strata.
+        random_state (int): Seed.
+
+    Returns:
+        np.ndarray: Sorted indices into ``values``.
+    """
+    values = np.asarray(values, dtype='float64')
+    n = len(values)
+    if n_out >= n:
+        return np.arange(n)
+
+    low, high = np.nanmin(values), np.nanmax(values)
+    if not high > low:
+        strata = np.zeros(n, dtype=int)
+    else:
+        strata = np.minimum(((values - low) / (high - low) * n_strata).astype(int), n_strata - 1)
+
+    groups = [group for group in np.split(np.argsort(strata, kind='stable'),
+                                          np.cumsum(np.bincount(strata, minlength=n_strata))[:-1])
+              if len(group)]
+    groups.sort(key=len)
+
+    rng = np.random.default_rng(random_state)
+    remaining = n_out
+    chosen = []
+    for position, group in enumerate(groups):
+        take = min(len(group), remaining // (len(groups) - position))
+        chosen.append(rng.choice(group, take, replace=False))
+        remaining -= take
+    return np.sort(np.concatenate(chosen))
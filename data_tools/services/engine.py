@@ -1,9 +1,14 @@
 import pandas as pd
 from projects.models import DataSource, Transformation
 
+from .dataset_reader import read_dataset
+
 def process_datasource_to_df(datasource_id):
     """
     Processes a DataSource into a pandas DataFrame, applying a chain of transformations recursively.
+
+    Original files are read with ``read_dataset``, so rows added by an
+    incremental sync (part files not compacted yet) are included.
     """
     try:
         datasource = DataSource.objects.get(id=datasource_id)
@@ -14,7 +19,7 @@ def process_datasource_to_df(datasource_id):
     if not datasource.is_derived:
         if not datasource.file:
             raise ValueError(f"Original DataSource {datasource_id} has no file.")
-        return pd.read_csv(datasource.file.path)
+        return read_dataset(datasource.file.path)
 
     # --- RECURSIVE CASE ---
     parents = datasource.parents.all()
@@ -0,0 +1,180 @@
+"""
+Incremental grid diffs for Data Studio.
+Computes a compact patch of the visible window between two session states.
+"""
+
+import logging
+from difflib import SequenceMatcher
+from typing import Optional, Dict, Any, List
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Rows the Data Studio grid shows without paging (matches get_data_preview)
+GRID_WINDOW_ROWS = 100
+
+# Rows the Data Studio page loads into its grid (data_studio_page)
+STUDIO_GRID_ROWS = 10_000
+
+# Fall back to a full window when a patch would touch more than this share of cells
+MAX_PATCH_CELL_RATIO = 0.5
+
+# Below this share of matched rows, row alignment is considered meaningless
+MIN_ROW_MATCH_RATIO = 0.5
+
+# Content alignment is quadratic in the worst case; larger windows only get
+# positional column patches
+MAX_ALIGN_ROWS = 2_000
+
+
+def compute_grid_diff(previous_window: Optional[pd.DataFrame], df: pd.DataFrame,
+                      window_rows: int = GRID_WINDOW_ROWS) -> Dict[str, Any]:
+    """
+    Compute the patch that turns the previously shown window into the new one.
+
+    Args:
+        previous_window: First rows of the previous state (None if unknown)
+        df: New session DataFrame
+        window_rows: Number of rows in the visible window
+
+    Returns:
+        Dict with ``mode`` 'patch' (row ranges + column values to apply in
+        order: deletions, insertions, column updates) or 'full' (whole window).
+    """
+    window = df.head(window_rows)
+    if previous_window is None:
+        return _full_window(window, len(df))
+
+    previous_columns = list(previous_window.columns)
+    columns = list(window.columns)
+    common = [col for col in columns if col in previous_window.columns]
+    added = [col for col in columns if col not in previous_window.columns]
+    removed = [col for col in previous_columns if col not in window.columns]
+
+    if not common:
+        return _full_window(window, len(df))
+
+    # Candidate patches: positional column updates, or row ranges from
+    # content alignment; the cheaper one (in cells shipped) wins
+    candidates = []
+    if len(previous_window) == len(window):
+        changed = [col for col in common
+                   if not _column_equal(previous_window[col], window[col])]
+        candidates.append(([], [], changed))
+    alignment = None
+    if max(len(previous_window), len(window)) <= MAX_ALIGN_ROWS:
+        alignment = _align_rows(previous_window[common], window[common])
+    if alignment is not None:
+        candidates.append((alignment[0], alignment[1], []))
+    if not candidates:
+        return _full_window(window, len(df))
+
+    def patch_cells(candidate):
+        _, inserted, changed = candidate
+        inserted_count = sum(end - start for start, end in inserted)
+        return (len(changed) + len(added)) * len(window) + inserted_count * len(columns)
+
+    best = min(candidates, key=patch_cells)
+    if patch_cells(best) > MAX_PATCH_CELL_RATIO * max(window.size, 1):
+        return _full_window(window, len(df))
+
+    deleted_rows, inserted_rows, changed = best
+    changed = changed + added
+    dtypes = {col: str(window[col].dtype) for col in added}
+    dtypes.update({col: str(window[col].dtype) for col in common
+                   if window[col].dtype != previous_window[col].dtype})
+
+    return {
+        'mode': 'patch',
+        'row_count': len(df),
+        'window_rows': len(window),
+        'columns': columns,
+        'column_order_changed': [c for c in previous_columns if c not in removed] != common,
+        'removed_columns': removed,
+        'added_columns': added,
+        'dtypes': dtypes,
+        'deleted_rows': [[start, end] for start, end in deleted_rows],
+        'inserted_rows': [
+            {'start': start, 'rows': _records(window.iloc[start:end])}
+            for start, end in inserted_rows
+        ],
+        'changed_columns': {col: _values(window[col]) for col in changed},
+    }
+
+
+def _full_window(window: pd.DataFrame, row_count: int) -> Dict[str, Any]:
+    """Fallback payload equivalent to a fresh preview"""
+    return {
+        'mode': 'full',
+        'row_count': row_count,
+        'window_rows': len(window),
+        'columns': list(window.columns),
+        'dtypes': {col: str(dtype) for col, dtype in window.dtypes.items()},
+        'preview_data': _records(window),
+    }
+
+
+def _align_rows(previous: pd.DataFrame, current: pd.DataFrame) -> Optional[tuple]:
+    """
+    Match rows of two windows by content over their shared columns.
+
+    Returns (deleted ranges in the previous window, inserted ranges in the
+    new window) as half-open [start, end) pairs, or None if too few rows match.
+    """
+    try:
+        previous_hashes = pd.util.hash_pandas_object(previous, index=False).tolist()
+        current_hashes = pd.util.hash_pandas_object(current, index=False).tolist()
+    except TypeError:
+        # Unhashable cell values (lists, dicts) cannot be aligned
+        return None
+
+    matcher = SequenceMatcher(None, previous_hashes, current_hashes, autojunk=False)
+    matched = sum(block.size for block in matcher.get_matching_blocks())
+    if matched < MIN_ROW_MATCH_RATIO * max(len(previous), len(current), 1):
+        return None
+
+    deleted, inserted = [], []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('delete', 'replace'):
+            deleted.append((i1, i2))
+        if tag in ('insert', 'replace'):
+            inserted.append((j1, j2))
+    return deleted, inserted
+
+
+def _column_equal(previous: pd.Series, current: pd.Series) -> bool:
+    """Compare column values positionally, treating NaN == NaN"""
+    try:
+        return previous.reset_index(drop=True).equals(current.reset_index(drop=True))
+    except Exception:
+        return False
+
+
+def _values(series: pd.Series) -> List[Any]:
+    """JSON-safe column values, with missing shown as '' like the HTTP preview"""
+    return [_json_value(value) for value in series.astype(object).tolist()]
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """JSON-safe row records, with missing shown as '' like the HTTP preview"""
+    columns = list(df.columns)
+    return [
+        {col: _json_value(value) for col, value in zip(columns, row)}
+        for row in df.astype(object).itertuples(index=False, name=None)
+    ]
+
+
+def _json_value(value: Any) -> Any:
+    if value is None:
+        return ''
+    try:
+        if pd.isna(value):
+            return ''
+    except (TypeError, ValueError):
+        pass
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return str(value)
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
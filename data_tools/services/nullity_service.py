@@ -0,0 +1,254 @@
+"""
+Binned nullity heatmaps for the Missing Data Toolkit.
+
+Drawing one heatmap cell per row and column produced Plotly documents of
+several megabytes for long datasources, most of which the browser could not
+even display. Rows are instead aggregated into a fixed number of consecutive
+bins, and each cell holds the fraction of missing values of a column within
+that bin. Columns can be ordered by hierarchical clustering of their nullity
+correlation so variables that go missing together sit side by side.
+
+The result is a compact JSON document (a few kilobytes regardless of the
+number of rows) cached per datasource version and rendered client-side.
+"""
+import hashlib
+import json
+import logging
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from django.conf import settings
+from django.core.cache import cache
+
+from .dataset_reader import datasource_version, read_dataset
+from .engine import process_datasource_to_df
+
+logger = logging.getLogger(__name__)
+
+# Bump when the heatmap document changes so cached heatmaps are rebuilt
+NULLITY_HEATMAP_VERSION = 1
+
+# Missing fractions are stored as integers in 0..NULLITY_SCALE
+NULLITY_SCALE = 1000
+
+# Rows read per pass when aggregating nullity
+NULLITY_CHUNK_ROWS = 1_000_000
+
+
+def _default_bins():
+    return int(getattr(settings, 'NULLITY_HEATMAP_BINS', 200))
+
+
+def bin_edges(n_rows, n_bins):
+    """
+    First row of each bin, plus ``n_rows``.
+
+    Rows are split into ``min(n_bins, n_rows)`` consecutive bins whose sizes
+    differ by at most one row.
+    """
+    n_bins = max(1, min(int(n_bins), int(n_rows)))
+    return -(-np.arange(n_bins + 1, dtype=np.int64) * n_rows // n_bins)
+
+
+def aggregate_nullity(df, columns, n_bins, with_correlation=False):
+    """
+    Missing counts per row bin and, optionally, the nullity correlation.
+
+    The frame is scanned in chunks of ``NULLITY_CHUNK_ROWS`` rows so only one
+    chunk's missingness mask is materialised at a time.
+
+    Args:
+        df (pd.DataFrame): Input data.
+        columns (list): Columns to aggregate.
+        n_bins (int): Requested number of row bins.
+        with_correlation (bool): Also compute the column nullity correlation.
+
+    Returns:
+        tuple: (bin edges, missing counts of shape (bins, columns),
+        correlation matrix or None)
+    """
+    n_rows = len(df)
+    edges = bin_edges(n_rows, n_bins)
+    n_bins = len(edges) - 1
+    counts = np.zeros((n_bins, len(columns)), dtype=np.int64)
+    co_missing = np.zeros((len(columns), len(columns))) if with_correlation else None
+
+    for start in range(0, n_rows, NULLITY_CHUNK_ROWS):
+        stop = min(start + NULLITY_CHUNK_ROWS, n_rows)
+        mask = df.iloc[start:stop][columns].isna().to_numpy()
+
+        # Bin of every row in the chunk; bins are contiguous, so one reduceat
+        # over the positions where the bin changes sums each bin's rows.
+        bins = np.searchsorted(edges, np.arange(start, stop), side='right') - 1
+        starts = np.flatnonzero(np.diff(bins, prepend=-1))
+        counts[bins[starts]] += np.add.reduceat(mask, starts, axis=0, dtype=np.int64)
+
+        if with_correlation:
+            block = mask.astype(np.float32)
+            co_missing += block.T @ block
+
+    correlation = None
+    if with_correlation and n_rows:
+        rate = np.diag(co_missing) / n_rows
+        covariance = co_missing / n_rows - np.outer(rate, rate)
+        spread = np.sqrt(rate * (1 - rate))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = covariance / np.outer(spread, spread)
+        # Columns that are never (or always) missing carry no correlation
+        correlation[~np.isfinite(correlation)] = 0.0
+        np.fill_diagonal(correlation, 1.0)
+
+    return edges, counts, correlation
+
+
+def cluster_columns(correlation):
+    """
+    Column order from average-linkage clustering of nullity correlation.
+
+    Args:
+        correlation (np.ndarray): Square nullity correlation matrix.
+
+    Returns:
+        list: Column positions in display order.
+    """
+    n_columns = len(correlation)
+    if n_columns < 3:
+        return list(range(n_columns))
+
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    distance = np.clip(1.0 - correlation, 0.0, 2.0)
+    distance = (distance + distance.T) / 2
+    np.fill_diagonal(distance, 0.0)
+    return [int(i) for i in leaves_list(linkage(squareform(distance, checks=False), method='average'))]
+
+
+def build_nullity_heatmap(df, columns=None, n_bins=None, cluster=True):
+    """
+    Compact binned nullity heatmap of a DataFrame.
+
+    Args:
+        df (pd.DataFrame): Input data.
+        columns (list, optional): Columns to include (default: all).
+        n_bins (int, optional): Number of row bins (default:
+            ``NULLITY_HEATMAP_BINS``).
+        cluster (bool): Order columns by nullity correlation clustering.
+
+    Returns:
+        dict: ``columns``, ``n_rows``, ``bin_edges`` (first row of each bin
+        plus the row count), ``missing`` (one list per column of per-bin
+        missing fractions scaled to ``scale``), ``column_missing`` (overall
+        missing fraction per column) and ``clustered``.
+    """
+    columns = [column for column in (columns or df.columns) if column in df.columns]
+    n_bins = n_bins or _default_bins()
+
+    edges, counts, correlation = aggregate_nullity(df, columns, n_bins, with_correlation=cluster)
+    order = cluster_columns(correlation) if cluster and correlation is not None else list(range(len(columns)))
+
+    sizes = np.diff(edges)[:, None]
+    fractions = counts / np.maximum(sizes, 1)
+    scaled = np.rint(fractions * NULLITY_SCALE).astype(np.int64)
+    # Keep isolated gaps visible instead of rounding them to zero
+    scaled[(counts > 0) & (scaled == 0)] = 1
+
+    totals = counts.sum(axis=0)
+    return {
+        'version': NULLITY_HEATMAP_VERSION,
+        'columns': [str(columns[i]) for i in order],
+        'n_rows': int(len(df)),
+        'bin_edges': edges.tolist(),
+        'scale': NULLITY_SCALE,
+        'missing': [scaled[:, i].tolist() for i in order],
+        'column_missing': [round(float(totals[i]) / max(len(df), 1), 4) for i in order],
+        'clustered': bool(cluster and correlation is not None),
+    }
+
+
+def nullity_heatmap_key(datasource, columns=None, n_bins=None, cluster=True):
+    """Cache key of a datasource's heatmap; changes with the datasource version."""
+    payload = json.dumps({
+        'version': NULLITY_HEATMAP_VERSION,
+        'datasource_version': datasource_version(datasource),
+        'columns': [str(column) for column in columns] if columns else None,
+        'bins': n_bins or _default_bins(),
+        'cluster': bool(cluster),
+    }, sort_keys=True)
+    return f"nullity-heatmap:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def get_nullity_heatmap(datasource, columns=None, n_bins=None, cluster=True, df=None):
+    """
+    Cached binned nullity heatmap of a datasource.
+
+    Args:
+        datasource (DataSource): Datasource to render.
+        columns (list, optional): Columns to include (default: all).
+        n_bins (int, optional): Number of row bins.
+        cluster (bool): Order columns by nullity correlation clustering.
+        df (pd.DataFrame, optional): Already loaded data, used on a cache
+            miss instead of reading the datasource.
+
+    Returns:
+        dict: Heatmap document (see ``build_nullity_heatmap``).
+    """
+    key = nullity_heatmap_key(datasource, columns, n_bins, cluster)
+    heatmap = cache.get(key)
+    if heatmap is not None:
+        return heatmap
+
+    if df is None:
+        df = _load_datasource(datasource)
+
+    heatmap = build_nullity_heatmap(df, columns, n_bins, cluster)
+    cache.set(key, heatmap, timeout=getattr(settings, 'NULLITY_HEATMAP_CACHE_TIMEOUT', 7 * 24 * 3600))
+    logger.info(
+        f"Built nullity heatmap for DataSource {datasource.id}: "
+        f"{len(heatmap['columns'])} columns x {len(heatmap['bin_edges']) - 1} bins from {heatmap['n_rows']} rows"
+    )
+    return heatmap
+
+
+def _load_datasource(datasource):
+    if datasource.is_derived or not datasource.file:
+        return process_datasource_to_df(datasource.id)
+
+    return read_dataset(datasource.file.path, copy=False)
+
+
+def nullity_heatmap_figure(heatmap, title=None):
+    """
+    Plotly figure (as a JSON-compatible dict) for a heatmap document.
+
+    Args:
+        heatmap (dict): Heatmap document.
+        title (str, optional): Figure title.
+
+    Returns:
+        dict: Plotly figure specification.
+    """
+    edges = heatmap['bin_edges']
+    scale = heatmap['scale']
+    z = (np.asarray(heatmap['missing'], dtype=float).T / scale) if heatmap['missing'] else np.zeros((0, 0))
+    labels = [f"{edges[i]}–{edges[i + 1] - 1}" for i in range(len(edges) - 1)]
+
+    fig = go.Figure(data=go.Heatmap(
+        z=z,
+        x=heatmap['columns'],
+        y=labels,
+        zmin=0,
+        zmax=1,
+        colorscale=[[0, '#61AFEF'], [1, '#E06C75']],
+        colorbar=dict(title='Faltante', tickformat='.0%'),
+        hovertemplate='<b>%{x}</b><br>Filas %{y}<br>Faltante: %{z:.1%}<extra></extra>',
+    ))
+    fig.update_layout(
+        title=title or f"Patrón de Datos Faltantes - {len(heatmap['columns'])} variables, {heatmap['n_rows']:,} filas",
+        xaxis=dict(title='Variables', tickangle=-45),
+        yaxis=dict(title='Filas', autorange='reversed', type='category'),
+        height=max(400, min(800, len(labels) * 3 + 200)),
+        template='plotly_white',
+    )
+    return json.loads(pio.to_json(fig))
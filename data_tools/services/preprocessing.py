@@ -0,0 +1,132 @@
+"""
+Shared preprocessing transformer for numeric models.
+
+Features go through one fitted scikit-learn transformer:
+
+- numeric and boolean columns: median imputation and standard scaling
+- text and categorical columns: most-frequent imputation and ordinal
+  encoding (unseen categories map to -1)
+- any other column (e.g. datetimes) is dropped
+
+Experiments fit it on their training rows and store it with their split
+(see ``experiments.preprocessing``). Transformers fitted by the data
+quality tools are stored under ``preprocessors/`` in MEDIA_ROOT, keyed by a
+hash of everything that determines the fit, so repeated analyses of the
+same data skip refitting.
+"""
+import hashlib
+import json
+import logging
+import os
+import uuid
+
+import joblib
+import pandas as pd
+from django.conf import settings
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OrdinalEncoder, StandardScaler
+
+from .dataset_reader import datasource_version
+
+logger = logging.getLogger(__name__)
+
+# Bump when build_preprocessor changes so stored transformers are refitted
+PREPROCESSING_VERSION = 1
+
+PREPROCESSOR_DIR = 'preprocessors'
+
+
+def build_preprocessor():
+    """
+    Unfitted preprocessing transformer.
+
+    Returns:
+        ColumnTransformer: Transformer producing a numeric DataFrame whose
+        columns keep the input names.
+    """
+    numeric = Pipeline([
+        ('impute', SimpleImputer(strategy='median')),
+        ('scale', StandardScaler()),
+    ])
+    categorical = Pipeline([
+        ('impute', SimpleImputer(strategy='most_frequent')),
+        ('encode', OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=-1)),
+    ])
+    preprocessor = ColumnTransformer(
+        [
+            ('numeric', numeric, _numeric_columns),
+            ('categorical', categorical, _categorical_columns),
+        ],
+        remainder='drop',
+        verbose_feature_names_out=False,
+    )
+    return preprocessor.set_output(transform='pandas')
+
+
+def _numeric_columns(X):
+    return [column for column in X.columns
+            if pd.api.types.is_numeric_dtype(X[column]) or pd.api.types.is_bool_dtype(X[column])]
+
+
+def _categorical_columns(X):
+    return [column for column in X.columns
+            if pd.api.types.is_object_dtype(X[column]) or isinstance(X[column].dtype, pd.CategoricalDtype)
+            or pd.api.types.is_string_dtype(X[column])]
+
+
+def preprocessor_key(datasource, feature_columns, scope=None):
+    """
+    Content hash identifying a fitted preprocessor.
+
+    Args:
+        datasource (DataSource): Datasource the features come from.
+        feature_columns (list): Feature columns, in order.
+        scope (str, optional): What selects the fitting rows (for example
+            the analysis and target).
+
+    Returns:
+        str: Hex digest.
+    """
+    payload = json.dumps({
+        'version': PREPROCESSING_VERSION,
+        'datasource_version': datasource_version(datasource),
+        'features': [str(column) for column in feature_columns],
+        'scope': scope,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def preprocessor_relative_path(key):
+    """Path (relative to MEDIA_ROOT) of the stored preprocessor ``key``."""
+    return f'{PREPROCESSOR_DIR}/{key}.joblib'
+
+
+def get_or_fit_preprocessor(key, X):
+    """
+    Load the stored preprocessor ``key``, fitting and storing it on a miss.
+
+    Args:
+        key (str): Preprocessor key (see ``preprocessor_key``).
+        X (pd.DataFrame): Data to fit on when it is not stored yet.
+
+    Returns:
+        tuple: (fitted preprocessor, relative artifact path, whether it was
+        loaded from the store).
+    """
+    relative_path = preprocessor_relative_path(key)
+    path = os.path.join(settings.MEDIA_ROOT, relative_path)
+    if os.path.exists(path):
+        try:
+            return joblib.load(path), relative_path, True
+        except Exception as e:
+            logger.warning(f"Could not load preprocessor {key}, refitting: {e}")
+
+    preprocessor = build_preprocessor().fit(X)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temporary name first so concurrent readers never see a partial file
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    joblib.dump(preprocessor, tmp_path, compress=3)
+    os.replace(tmp_path, path)
+    return preprocessor, relative_path, False
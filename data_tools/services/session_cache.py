@@ -1,12 +1,16 @@
 """
 Redis cache operations for session management.
 Simple, focused class for caching DataFrame operations.
+
+Disk-backed sessions (see session_disk_store) keep only views in Redis;
+``get_dataframe`` assembles them from the session files.
 """
 
 import logging
 from typing import Optional
 from django.core.cache import cache
 from .secure_serialization import serialize_dataframe, deserialize_dataframe, serialize_metadata, deserialize_metadata
+from .session_disk_store import SessionDiskStore
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +23,7 @@ class SessionCache:
         self.datasource_id = datasource_id
         self.timeout = timeout_minutes * 60
         self.prefix = f"session:{user_id}:{datasource_id}"
+        self.disk = SessionDiskStore(user_id, datasource_id)
         
     def store_dataframe(self, key_suffix: str, df) -> bool:
         """Store DataFrame in cache."""
@@ -32,17 +37,45 @@ class SessionCache:
             return False
     
     def get_dataframe(self, key_suffix: str):
-        """Get DataFrame from cache."""
+        """Get DataFrame from cache, assembling it from disk for disk-backed sessions."""
         try:
             key = f"{self.prefix}:{key_suffix}"
-            data = cache.get(key)
-            if data is None:
+            view_key = f"{key}:view"
+            data = cache.get_many([key, view_key])
+            if view_key in data:
+                return self.disk.assemble(deserialize_metadata(data[view_key]))
+            if key not in data:
                 return None
-            return deserialize_dataframe(data)
+            return deserialize_dataframe(data[key])
         except Exception as e:
             logger.error(f"Failed to get DataFrame {key_suffix}: {e}")
             return None
     
+    def store_view(self, key_suffix: str, view: dict) -> bool:
+        """Store the view of a disk-backed session state."""
+        try:
+            key = f"{self.prefix}:{key_suffix}:view"
+            cache.set(key, serialize_metadata(view), timeout=self.timeout)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to store view {key_suffix}: {e}")
+            return False
+    
+    def get_view(self, key_suffix: str) -> Optional[dict]:
+        """Get the view of a disk-backed session state."""
+        try:
+            data = cache.get(f"{self.prefix}:{key_suffix}:view")
+            if data is None:
+                return None
+            return deserialize_metadata(data)
+        except Exception as e:
+            logger.error(f"Failed to get view {key_suffix}: {e}")
+            return None
+    
+    def is_disk_backed(self) -> bool:
+        """Check if the session data live on disk."""
+        return self.get_view('original') is not None
+    
     def store_metadata(self, data: dict) -> bool:
         """Store session metadata."""
         try:
@@ -79,13 +112,15 @@ class SessionCache:
     def clear_all(self) -> bool:
         """Clear all session data."""
         try:
-            keys = ['current', 'original', 'meta']
+            keys = ['current', 'original', 'meta', 'grid_window', 'current:view', 'original:view']
             for key_suffix in keys:
                 self.delete_key(key_suffix)
             # Clear history keys
             for i in range(50):  # Max history entries
                 self.delete_key(f"history:{i}")
                 self.delete_key(f"history:{i}:meta")
+                self.delete_key(f"redo:{i}:view")
+            self.disk.clear()
             return True
         except Exception as e:
             logger.error(f"Failed to clear session: {e}")
@@ -95,6 +130,6 @@ class SessionCache:
         """Check if session exists."""
         try:
             key = f"{self.prefix}:current"
-            return cache.get(key) is not None
+            return cache.has_key(key) or cache.has_key(f"{key}:view")
         except Exception:
             return False
\ No newline at end of file
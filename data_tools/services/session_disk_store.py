@@ -0,0 +1,222 @@
+"""
+Delta-encoded Data Studio sessions on the filesystem.
+
+Sessions whose data exceed ``DATA_STUDIO_DISK_SESSION_MIN_BYTES`` (or whose
+config sets ``persist_to_file``) are not copied into Redis at every step.
+The initial data is written once to an immutable ``base.parquet``; each
+operation then only writes what changed:
+
+- a row-selection vector (``.npy``) when rows were filtered or reordered
+- a patch Parquet holding the columns whose values changed or were added,
+  keyed by row position
+
+A session state is a small JSON *view* naming the row-space file, the
+selected rows and, for every column, the file and column it is read from.
+Redis only holds views (current state, undo history, redo), and the
+DataFrame is assembled from the files when it is requested. Results that
+cannot be expressed against the current rows (new or duplicated index
+labels, duplicated column names) are written as a full snapshot, which
+becomes the new row space.
+
+All files are immutable and uniquely named, so they are read through the
+per-worker frame cache of ``dataset_reader``.
+"""
+import logging
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from .dataset_reader import read_dataset
+
+logger = logging.getLogger(__name__)
+
+BASE_FILENAME = 'base.parquet'
+
+# Row positions (in the row space) of the rows stored in a patch file
+ROW_ID_COLUMN = '__row__'
+
+
+def session_store_path(user_id, datasource_id):
+    """Directory holding the files of a disk-backed session."""
+    return os.path.join(
+        settings.MEDIA_ROOT, 'temp_sessions', f'user_{user_id}', f'datasource_{datasource_id}', 'delta'
+    )
+
+
+def use_disk_store(df, config):
+    """
+    Whether a session for ``df`` should be stored on disk instead of Redis.
+
+    Args:
+        df (pd.DataFrame): Initial session data.
+        config (SessionConfig): Session configuration.
+
+    Returns:
+        bool: True when ``config.persist_to_file`` is set or the data take
+        at least ``DATA_STUDIO_DISK_SESSION_MIN_BYTES`` in memory.
+    """
+    if config.persist_to_file:
+        return True
+    threshold = getattr(settings, 'DATA_STUDIO_DISK_SESSION_MIN_BYTES', 256 * 2**20)
+    return int(df.memory_usage(deep=True).sum()) >= threshold
+
+
+class SessionDiskStore:
+    """Base file, patches and row selections of one disk-backed session."""
+
+    def __init__(self, user_id: int, datasource_id: int):
+        self.path = session_store_path(user_id, datasource_id)
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def initialize(self, df: pd.DataFrame) -> dict:
+        """Write the immutable base file and return the initial view."""
+        self.clear()
+        os.makedirs(self.path, exist_ok=True)
+        return self._snapshot(df, BASE_FILENAME)
+
+    def assemble(self, view: dict, columns=None) -> pd.DataFrame:
+        """
+        Build the DataFrame described by a view.
+
+        Args:
+            view (dict): Session view.
+            columns (list, optional): Only assemble these columns.
+
+        Returns:
+            pd.DataFrame: Session data, indexed by the original row labels.
+        """
+        wanted = set(columns) if columns is not None else None
+        refs = [ref for ref in view['columns'] if wanted is None or ref[0] in wanted]
+        labels = self._labels(view['space'])
+        rows = self._rows(view)
+        index = labels if rows is None else labels.take(rows)
+
+        by_file = {}
+        for _, file_name, file_column in refs:
+            by_file.setdefault(file_name, []).append(file_column)
+        frames = {}
+        for file_name, file_columns in by_file.items():
+            if file_name == view['space']:
+                frames[file_name] = (read_dataset(self._file(file_name), columns=file_columns, copy=False), rows)
+            else:
+                patch = read_dataset(self._file(file_name), columns=file_columns + [ROW_ID_COLUMN], copy=False)
+                positions = pd.Index(patch[ROW_ID_COLUMN]).get_indexer(
+                    rows if rows is not None else np.arange(len(labels))
+                )
+                frames[file_name] = (patch, positions)
+
+        series = []
+        for name, file_name, file_column in refs:
+            frame, positions = frames[file_name]
+            column = frame[file_column].copy() if positions is None else frame[file_column].take(positions)
+            column.index = index
+            column.name = name
+            series.append(column)
+        if not series:
+            return pd.DataFrame(index=index)
+        return pd.concat(series, axis=1, copy=False)
+
+    def commit(self, view: dict, df: pd.DataFrame) -> dict:
+        """
+        Store the result of an operation applied to the state ``view``.
+
+        Only the row selection and the columns that differ from ``view``
+        are written; everything else keeps pointing at existing files.
+
+        Args:
+            view (dict): View the operation was applied to.
+            df (pd.DataFrame): Operation result.
+
+        Returns:
+            dict: View of the new state.
+        """
+        labels = self._labels(view['space'])
+        rows = self._rows(view)
+        current_labels = labels if rows is None else labels.take(rows)
+
+        current_positions = None
+        if df.columns.is_unique and df.index.is_unique and current_labels.is_unique:
+            current_positions = current_labels.get_indexer(df.index)
+            if (current_positions < 0).any():
+                current_positions = None
+        if current_positions is None:
+            return self._snapshot(df, f'snapshot_{uuid.uuid4().hex}.parquet')
+
+        new_rows = current_positions if rows is None else rows[current_positions]
+        if rows is None and np.array_equal(new_rows, np.arange(len(labels))):
+            rows_file = None
+        elif rows is not None and np.array_equal(new_rows, rows):
+            rows_file = view['rows']
+        else:
+            rows_file = f'rows_{uuid.uuid4().hex}.npy'
+            np.save(self._file(rows_file), new_rows)
+
+        refs = {ref[0]: ref for ref in view['columns']}
+        current = self.assemble(view, columns=[name for name in df.columns if name in refs])
+
+        patch_file = f'patch_{uuid.uuid4().hex}.parquet'
+        columns, patch = [], {}
+        for name in df.columns:
+            if name in current.columns and _same_values(current[name].take(current_positions), df[name]):
+                columns.append(refs[name])
+            else:
+                file_column = f'c{len(patch)}'
+                patch[file_column] = df[name].reset_index(drop=True)
+                columns.append([name, patch_file, file_column])
+
+        if patch:
+            patch_frame = pd.DataFrame(patch)
+            patch_frame[ROW_ID_COLUMN] = new_rows
+            patch_frame.to_parquet(self._file(patch_file), index=False)
+
+        logger.debug(
+            f"Session commit in {self.path}: {len(patch)} of {len(df.columns)} columns written, "
+            f"rows {'unchanged' if rows_file == view['rows'] else 'reselected'}"
+        )
+        return {'space': view['space'], 'rows': rows_file, 'columns': columns, 'shape': list(df.shape)}
+
+    def prune(self, views) -> None:
+        """Delete files that none of ``views`` refer to."""
+        referenced = set()
+        for view in views:
+            referenced.update([view['space'], view['rows']])
+            referenced.update(file_name for _, file_name, _ in view['columns'])
+        if not os.path.isdir(self.path):
+            return
+        for name in os.listdir(self.path):
+            if name not in referenced:
+                os.remove(self._file(name))
+
+    def clear(self) -> None:
+        """Delete all files of the session."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _snapshot(self, df, file_name):
+        # Columns are stored positionally so that any column label survives
+        # Parquet; the index is stored as well and becomes the row labels.
+        frame = df.copy(deep=False)
+        frame.columns = [f'c{i}' for i in range(len(df.columns))]
+        frame.to_parquet(self._file(file_name))
+        return {
+            'space': file_name,
+            'rows': None,
+            'columns': [[name, file_name, f'c{i}'] for i, name in enumerate(df.columns)],
+            'shape': list(df.shape),
+        }
+
+    def _labels(self, space):
+        return read_dataset(self._file(space), columns=['c0'], copy=False).index
+
+    def _rows(self, view):
+        return np.load(self._file(view['rows'])) if view['rows'] is not None else None
+
+
+def _same_values(old, new):
+    """Equal dtype and values (NaN equal to NaN), ignoring the index."""
+    return old.reset_index(drop=True).equals(new.reset_index(drop=True))
@@ -45,24 +45,43 @@ class SessionHistory:
             # Store DataFrame state before transformation
             cache.set(history_key, serialize_dataframe(df), timeout=self.timeout)
             
-            # Create and store history entry metadata
-            entry = HistoryEntry(
-                operation_name=operation_name,
-                operation_params=operation_params or {},
-                timestamp=pd.Timestamp.now().isoformat(),
-                shape_before=df.shape,
-                shape_after=df_transformed.shape,
-                dataframe_key=history_key
-            )
-            
-            history_meta_key = f"{history_key}:meta"
-            cache.set(history_meta_key, serialize_metadata(asdict(entry)), timeout=self.timeout)
+            self._store_entry_meta(history_key, operation_name, operation_params,
+                                   df.shape, df_transformed.shape)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to add history entry: {e}")
+            return False
+    
+    def add_view_entry(self, view: Dict[str, Any], operation_name: str,
+                       operation_params: Dict[str, Any], current_step: int,
+                       shape_after: Tuple[int, int]) -> bool:
+        """Add new history entry for a disk-backed session (stores the view only)."""
+        try:
+            history_key = f"{self.history_prefix}:{current_step}"
+            cache.set(f"{history_key}:view", serialize_metadata(view), timeout=self.timeout)
             
+            self._store_entry_meta(history_key, operation_name, operation_params,
+                                   tuple(view['shape']), shape_after)
             return True
         except Exception as e:
             logger.error(f"Failed to add history entry: {e}")
             return False
     
+    def _store_entry_meta(self, history_key: str, operation_name: str,
+                          operation_params: Dict[str, Any], shape_before, shape_after) -> None:
+        """Create and store history entry metadata."""
+        entry = HistoryEntry(
+            operation_name=operation_name,
+            operation_params=operation_params or {},
+            timestamp=pd.Timestamp.now().isoformat(),
+            shape_before=shape_before,
+            shape_after=shape_after,
+            dataframe_key=history_key
+        )
+        
+        history_meta_key = f"{history_key}:meta"
+        cache.set(history_meta_key, serialize_metadata(asdict(entry)), timeout=self.timeout)
+    
     def get_entry(self, step: int) -> Optional[pd.DataFrame]:
         """Get DataFrame from history step."""
         try:
@@ -75,6 +94,17 @@ class SessionHistory:
             logger.error(f"Failed to get history entry {step}: {e}")
             return None
     
+    def get_view(self, step: int) -> Optional[Dict[str, Any]]:
+        """Get the view stored for a history step of a disk-backed session."""
+        try:
+            view_bytes = cache.get(f"{self.history_prefix}:{step}:view")
+            if view_bytes is None:
+                return None
+            return deserialize_metadata(view_bytes)
+        except Exception as e:
+            logger.error(f"Failed to get history view {step}: {e}")
+            return None
+    
     def get_summary(self, current_step: int, limit: int = 10) -> List[Dict[str, Any]]:
         """Get history summary for UI."""
         summary = []
@@ -125,6 +155,7 @@ def _clear_history_entry(history_prefix: str, step: int) -> None:
     history_meta_key = f"{history_key}:meta"
     cache.delete(history_key)
     cache.delete(history_meta_key)
+    cache.delete(f"{history_key}:view")
 
 
 def _clear_all_entries(history_prefix: str, total_operations: int = None) -> None:
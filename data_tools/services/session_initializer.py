@@ -9,6 +9,7 @@ import pandas as pd
 
 from .session_cache import SessionCache
 from .session_metadata import SessionMetadataManager, SessionConfig
+from .session_disk_store import use_disk_store
 
 logger = logging.getLogger(__name__)
 
@@ -39,9 +40,14 @@ class SessionInitializer:
             if force:
                 self.clear_session()
             
-            # Store original and current DataFrames
-            self.cache.store_dataframe('original', df)
-            self.cache.store_dataframe('current', df)
+            # Large sessions live on disk and keep only views in Redis
+            if use_disk_store(df, self.config):
+                view = self.cache.disk.initialize(df)
+                self.cache.store_view('original', view)
+                self.cache.store_view('current', view)
+            else:
+                self.cache.store_dataframe('original', df)
+                self.cache.store_dataframe('current', df)
             
             # Create and store metadata
             metadata = self.metadata_mgr.create(self.user_id, self.datasource_id, 
@@ -34,12 +34,18 @@ class SessionLifecycle:
     def reset_to_original(self) -> bool:
         """Reset to original state."""
         try:
-            original_df = self.cache.get_dataframe('original')
-            if original_df is None:
-                return False
-            
-            self.history.clear_all()
-            self.cache.store_dataframe('current', original_df)
+            original_view = self.cache.get_view('original')
+            if original_view is not None:
+                self.history.clear_all()
+                self.cache.store_view('current', original_view)
+                self.cache.disk.prune([original_view])
+            else:
+                original_df = self.cache.get_dataframe('original')
+                if original_df is None:
+                    return False
+                
+                self.history.clear_all()
+                self.cache.store_dataframe('current', original_df)
             
             metadata = self.metadata_mgr.get()
             if metadata:
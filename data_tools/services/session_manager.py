@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any
 from .session_operations import SessionOperations
 from .session_metadata import SessionConfig
 from .session_cache import SessionCache
+from .grid_diff import compute_grid_diff, STUDIO_GRID_ROWS
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +25,15 @@ class DataStudioSessionManager:
         
         self.operations = SessionOperations(user_id, datasource_id, self.config)
         self.cache = SessionCache(user_id, datasource_id, self.config.timeout_minutes)
+        # Grid patch produced by the last operation, returned in API responses
+        self.grid_diff = None
     
     def initialize_session(self, df, force: bool = False) -> bool:
         """Initialize session."""
-        return self.operations.initialize_session(df, force)
+        success = self.operations.initialize_session(df, force)
+        if success:
+            self.sync_grid_window(df)
+        return success
     
     def session_exists(self) -> bool:
         """Check if session exists."""
@@ -45,19 +51,48 @@ class DataStudioSessionManager:
     def apply_transformation(self, df_transformed, operation_name: str, 
                            operation_params: Dict[str, Any] = None) -> bool:
         """Apply transformation."""
-        return self.operations.apply_transformation(df_transformed, operation_name, operation_params)
+        success = self.operations.apply_transformation(df_transformed, operation_name, operation_params)
+        if success:
+            self.diff_grid_window(df_transformed)
+        return success
     
     def undo_operation(self):
         """Undo last operation."""
-        return self.operations.undo_operation()
+        df = self.operations.undo_operation()
+        if df is not None:
+            self.diff_grid_window(df)
+        return df
     
     def redo_operation(self):
         """Redo next operation."""
-        return self.operations.redo_operation()
+        df = self.operations.redo_operation()
+        if df is not None:
+            self.diff_grid_window(df)
+        return df
     
     def reset_to_original(self) -> bool:
         """Reset to original state."""
-        return self.operations.reset_to_original()
+        success = self.operations.reset_to_original()
+        if success:
+            original_df = self.get_original_dataframe()
+            if original_df is not None:
+                self.diff_grid_window(original_df)
+        return success
+    
+    def diff_grid_window(self, df) -> Optional[Dict[str, Any]]:
+        """Compute the patch from the grid rows the client shows to the new state."""
+        try:
+            previous_window = self.cache.get_dataframe('grid_window')
+            self.grid_diff = compute_grid_diff(previous_window, df, STUDIO_GRID_ROWS)
+            self.cache.store_dataframe('grid_window', df.head(STUDIO_GRID_ROWS))
+        except Exception as e:
+            logger.warning(f"Failed to compute grid diff: {e}")
+            self.grid_diff = None
+        return self.grid_diff
+    
+    def sync_grid_window(self, df) -> None:
+        """Record the rows the Data Studio page has just rendered for this session."""
+        self.cache.store_dataframe('grid_window', df.head(STUDIO_GRID_ROWS))
     
     def pause_session(self) -> bool:
         """Pause session."""
@@ -49,12 +49,16 @@ class SessionTransformer:
                 return None
             
             previous_step = metadata.current_step - 1
-            previous_df = self.history.get_entry(previous_step)
+            previous_view = self.history.get_view(previous_step)
             
-            if previous_df is None:
-                return None
-            
-            self.cache.store_dataframe('current', previous_df)
+            if previous_view is not None:
+                self.cache.store_view('current', previous_view)
+                previous_df = self.cache.disk.assemble(previous_view)
+            else:
+                previous_df = self.history.get_entry(previous_step)
+                if previous_df is None:
+                    return None
+                self.cache.store_dataframe('current', previous_df)
             
             metadata.current_step = previous_step
             metadata.last_accessed = pd.Timestamp.now().isoformat()
@@ -72,6 +76,16 @@ class SessionTransformer:
             if metadata is None or metadata.current_step >= metadata.total_operations:
                 return None
             
+            redo_view = self.cache.get_view(f"redo:{metadata.current_step}")
+            if redo_view is not None:
+                self.cache.store_view('current', redo_view)
+                
+                metadata.current_step += 1
+                metadata.last_accessed = pd.Timestamp.now().isoformat()
+                self.metadata_mgr.store(metadata)
+                
+                return self.cache.disk.assemble(redo_view)
+            
             # For redo, we need to re-apply the transformation stored in history
             # History stores the "before" state, so we need the transformation result
             # This is a simplified implementation - in a full system, we'd store 
@@ -115,6 +129,10 @@ def _apply_transformation_with_history(metadata_mgr, cache, history,
         if metadata is None:
             return False
         
+        if cache.is_disk_backed():
+            return _apply_delta_transformation(metadata_mgr, cache, history, metadata,
+                                               df_transformed, operation_name, operation_params)
+        
         current_df = cache.get_dataframe('current')
         if current_df is None:
             return False
@@ -147,4 +165,25 @@ def _apply_transformation_with_history(metadata_mgr, cache, history,
         return True
     except Exception as e:
         logger.error(f"Failed to apply transformation: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def _apply_delta_transformation(metadata_mgr, cache, history, metadata,
+                                df_transformed, operation_name, operation_params):
+    """Utility: Apply transformation to a disk-backed session, storing only the changes."""
+    current_view = cache.get_view('current')
+    if current_view is None:
+        return False
+    
+    view = cache.disk.commit(current_view, df_transformed)
+    history.add_view_entry(current_view, operation_name, operation_params,
+                           metadata.current_step, df_transformed.shape)
+    cache.store_view(f"redo:{metadata.current_step}", view)
+    cache.store_view('current', view)
+    
+    metadata.current_step += 1
+    metadata.total_operations += 1
+    metadata.last_accessed = pd.Timestamp.now().isoformat()
+    metadata_mgr.store(metadata)
+    
+    history.cleanup_old(metadata.total_operations)
+    return True
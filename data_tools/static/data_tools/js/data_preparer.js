@@ -386,15 +386,12 @@ function initializeChartFunctionality() {
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    // Display the chart
-                    chartContainer.innerHTML = data.chart_html;
-                    
-                    // Add some styling to the chart container
-                    const plotlyDiv = chartContainer.querySelector('#plotly-chart');
-                    if (plotlyDiv) {
-                        plotlyDiv.style.width = '100%';
-                        plotlyDiv.style.height = '400px';
-                    }
+                    // Display the chart (figure JSON aggregated server-side)
+                    chartContainer.innerHTML = '<div id="plotly-chart" style="width: 100%; height: 400px;"></div>';
+                    Plotly.newPlot('plotly-chart', data.figure.data, data.figure.layout, {
+                        responsive: true,
+                        displayModeBar: true
+                    });
                 } else {
                     // Show error message
                     chartContainer.innerHTML = `
@@ -0,0 +1,69 @@
+/**
+ * Data Studio Grid Sync - Apply operation results to the grid in place
+ * Session operations return a `grid_diff` (see services/grid_diff.py) computed
+ * against the rows this page rendered, so the grid is patched without refetching.
+ */
+
+class DataStudioGridSync {
+
+    /**
+     * Apply a server grid diff to the rows currently shown in the grid.
+     * Returns the new row array, or null when there is nothing to apply.
+     */
+    static applyGridDiff(rows, diff) {
+        if (!diff || diff.mode !== 'patch') {
+            return diff && diff.preview_data ? diff.preview_data : null;
+        }
+
+        const patched = rows.map(row => ({ ...row }));
+        // Deletions refer to previous positions: apply from the bottom up
+        diff.deleted_rows.slice().reverse().forEach(([start, end]) => {
+            patched.splice(start, end - start);
+        });
+        // Insertions refer to new positions: apply from the top down
+        diff.inserted_rows.forEach(({ start, rows: inserted }) => {
+            patched.splice(start, 0, ...inserted);
+        });
+
+        patched.forEach(row => {
+            diff.removed_columns.forEach(column => delete row[column]);
+        });
+        Object.entries(diff.changed_columns).forEach(([column, values]) => {
+            values.forEach((value, index) => {
+                if (patched[index]) {
+                    patched[index][column] = value;
+                }
+            });
+        });
+
+        return patched.slice(0, diff.window_rows);
+    }
+
+    /**
+     * Patch the page grid with the `grid_diff` of an operation response.
+     * Returns true when the grid was updated.
+     */
+    static apply(response) {
+        const table = window.hydroMLTable;
+        const diff = response && response.grid_diff;
+        if (!table || !diff) return false;
+
+        const rows = this.applyGridDiff(table.data || [], diff);
+        if (rows === null) return false;
+
+        if (!table.table) {
+            // Grid rendered empty: build it from the new window
+            table.init(rows, diff.columns);
+        } else {
+            table.columns = diff.columns;
+            table.updateData(rows);
+        }
+
+        window.gridRowData = rows;
+        window.columnDefsData = diff.columns;
+        return true;
+    }
+}
+
+// Export for use in other modules
+window.DataStudioGridSync = DataStudioGridSync;
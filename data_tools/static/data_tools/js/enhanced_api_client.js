@@ -116,6 +116,10 @@ class EnhancedDataStudioAPI {
             case 'data_preview':
                 this.emit('data_preview', data);
                 break;
+            case 'batch':
+                // Coalesced frame from the server-side progress publisher
+                (data.messages || []).forEach(message => this.handleWebSocketMessage(message));
+                break;
             case 'error':
                 this.emit('error', data);
                 break;
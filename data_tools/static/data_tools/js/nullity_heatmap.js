@@ -0,0 +1,44 @@
+/**
+ * Binned nullity heatmap for the Missing Data Toolkit.
+ * Renders the compact heatmap document (missing fraction per column and row bin)
+ * with Plotly instead of embedding a full per-row Plotly document in the page.
+ */
+
+function renderNullityHeatmap(container, heatmap) {
+    const edges = heatmap.bin_edges;
+    const labels = edges.slice(0, -1).map((start, i) => `${start}–${edges[i + 1] - 1}`);
+    // Documents store one list per column; Plotly expects one row per bin
+    const z = labels.map((_, bin) => heatmap.missing.map(column => column[bin] / heatmap.scale));
+
+    Plotly.newPlot(container, [{
+        type: 'heatmap',
+        z: z,
+        x: heatmap.columns,
+        y: labels,
+        zmin: 0,
+        zmax: 1,
+        colorscale: [[0, '#61AFEF'], [1, '#E06C75']],
+        colorbar: { title: 'Faltante', tickformat: '.0%' },
+        hovertemplate: '<b>%{x}</b><br>Filas %{y}<br>Faltante: %{z:.1%}<extra></extra>'
+    }], {
+        title: `Patrón de Datos Faltantes - ${heatmap.columns.length} variables, ${heatmap.n_rows.toLocaleString()} filas`,
+        xaxis: { title: 'Variables', tickangle: -45 },
+        yaxis: { title: 'Filas', autorange: 'reversed', type: 'category' },
+        height: Math.max(400, Math.min(800, labels.length * 3 + 200)),
+        margin: { t: 80, r: 80, b: 120, l: 100 }
+    }, {
+        displaylogo: false,
+        modeBarButtonsToRemove: ['pan2d', 'lasso2d', 'select2d']
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    if (typeof Plotly === 'undefined') return;
+
+    document.querySelectorAll('[data-nullity-heatmap]').forEach(container => {
+        const source = document.getElementById(container.dataset.nullityHeatmap);
+        if (source) {
+            renderNullityHeatmap(container, JSON.parse(source.textContent));
+        }
+    });
+});
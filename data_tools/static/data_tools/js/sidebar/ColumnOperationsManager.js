@@ -133,7 +133,7 @@ class ColumnOperationsManager {
             
             if (data.success) {
                 DataStudioUIUtils.showNotification(data.message || `${operationName} completed`, 'success');
-                this.refreshGrid();
+                this.refreshGrid(data);
             } else {
                 DataStudioUIUtils.showNotification(`${operationName} failed: ${data.error}`, 'error');
             }
@@ -142,9 +142,9 @@ class ColumnOperationsManager {
         }
     }
 
-    refreshGrid() {
-        if (this.gridManager && this.gridManager.refreshData) {
-            this.gridManager.refreshData();
+    refreshGrid(data) {
+        if (window.DataStudioGridSync) {
+            window.DataStudioGridSync.apply(data);
         }
     }
 }
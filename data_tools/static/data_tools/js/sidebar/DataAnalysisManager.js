@@ -131,7 +131,7 @@ class DataAnalysisManager {
             
             if (data.success) {
                 DataStudioUIUtils.showNotification('NaN cleaning completed', 'success');
-                this.refreshGrid();
+                this.refreshGrid(data);
             } else {
                 DataStudioUIUtils.showNotification(`Cleaning failed: ${data.error}`, 'error');
             }
@@ -140,9 +140,9 @@ class DataAnalysisManager {
         }
     }
 
-    refreshGrid() {
-        if (this.gridManager && this.gridManager.refreshData) {
-            this.gridManager.refreshData();
+    refreshGrid(data) {
+        if (window.DataStudioGridSync) {
+            window.DataStudioGridSync.apply(data);
         }
     }
 }
@@ -56,7 +56,7 @@ class SessionManager {
                 DataStudioUIUtils.showNotification('Session initialized successfully', 'success');
                 this.notifyStateChange(true);
                 this.updateSessionUI(true, data);
-                this.refreshGrid();
+                this.refreshGrid(data);
             } else {
                 DataStudioUIUtils.showNotification(`Failed to initialize: ${data.error}`, 'error');
             }
@@ -95,7 +95,7 @@ class SessionManager {
             if (data.success) {
                 DataStudioUIUtils.showNotification('Operation undone', 'success');
                 this.updateSessionUI(true, data);
-                this.refreshGrid();
+                this.refreshGrid(data);
             } else {
                 DataStudioUIUtils.showNotification(`Undo failed: ${data.error}`, 'error');
             }
@@ -116,7 +116,7 @@ class SessionManager {
             if (data.success) {
                 DataStudioUIUtils.showNotification('Operation redone', 'success');
                 this.updateSessionUI(true, data);
-                this.refreshGrid();
+                this.refreshGrid(data);
             } else {
                 DataStudioUIUtils.showNotification(`Redo failed: ${data.error}`, 'error');
             }
@@ -220,9 +220,9 @@ class SessionManager {
         }
     }
 
-    refreshGrid() {
-        if (window.gridManager && window.gridManager.refreshData) {
-            window.gridManager.refreshData();
+    refreshGrid(data) {
+        if (window.DataStudioGridSync) {
+            window.DataStudioGridSync.apply(data);
         }
     }
 }
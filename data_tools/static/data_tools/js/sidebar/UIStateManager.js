@@ -22,9 +22,9 @@ class UIStateManager {
         }
     }
 
-    refreshGrid(gridManager) {
-        if (gridManager && gridManager.refreshData) {
-            gridManager.refreshData();
+    refreshGrid(data) {
+        if (window.DataStudioGridSync) {
+            window.DataStudioGridSync.apply(data);
         }
     }
 
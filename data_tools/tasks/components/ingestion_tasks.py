@@ -4,6 +4,7 @@ Data ingestion and file processing tasks for data_tools.
 from celery import shared_task
 from data_tools.services import process_datasource_to_df
 from data_tools.services.data_quality_service import run_data_quality_pipeline
+from data_tools.services.dataset_reader import read_dataset
 from projects.models import DataSource
 import logging
 import os
@@ -172,7 +173,8 @@ def _load_file_with_format_detection(file_path: str) -> pd.DataFrame:
             return pd.read_csv(file_path, sep='\t', encoding='utf-8')
             
         elif file_ext == '.parquet':
-            return pd.read_parquet(file_path)
+            # Includes rows of synced part files
+            return read_dataset(file_path)
             
         else:
             # Default to CSV parsing for unknown extensions
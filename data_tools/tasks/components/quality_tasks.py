@@ -2,16 +2,18 @@
 Data quality and analysis tasks for data_tools.
 """
 from celery import shared_task
+from django.conf import settings
 from projects.models import DataSource
+from data_tools.services.dataset_reader import read_dataset
+from data_tools.services.nullity_service import get_nullity_heatmap
+from data_tools.services.preprocessing import build_preprocessor, get_or_fit_preprocessor, preprocessor_key
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import LabelEncoder
 from itertools import combinations
+from math import comb
 import logging
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,7 @@ def deep_missing_data_analysis_task(datasource_id, target_column, required_varia
     Comprehensive missing data analysis task for the Missing Data Toolkit.
     
     Performs:
-    1. Missing data heatmap generation using missingno.matrix()
+    1. Binned missing data heatmap generation (cached per datasource version)
     2. Feature importance estimation using RandomForestRegressor
     3. Complete case analysis for all relevant variable combinations
     4. Saves results to DataSource.missing_data_report
@@ -53,11 +55,11 @@ def deep_missing_data_analysis_task(datasource_id, target_column, required_varia
         
         # Step 1: Generate Missing Data Heatmap
         logger.info("Step 1: Generating missing data heatmap")
-        heatmap_html = _generate_missing_data_heatmap(df, datasource_id, required_variables)
+        nullity_heatmap = _generate_missing_data_heatmap(df, datasource, required_variables)
         
         # Step 2: Feature Importance Estimation
         logger.info("Step 2: Running feature importance estimation")
-        feature_importances = _calculate_feature_importance(df, target_column, required_variables)
+        feature_importances = _calculate_feature_importance(df, target_column, required_variables, datasource)
         
         # Step 3: Complete Case Analysis (Combinations)
         logger.info("Step 3: Running complete case analysis")
@@ -72,7 +74,7 @@ def deep_missing_data_analysis_task(datasource_id, target_column, required_varia
             'analysis_timestamp': pd.Timestamp.now().isoformat(),
             'target_column': target_column,
             'required_variables': required_variables,
-            'heatmap_html': heatmap_html,
+            'nullity_heatmap': nullity_heatmap,
             'feature_importance': feature_importances,
             'combination_analysis': combination_counts,
             'missing_statistics': missing_stats,
@@ -81,7 +83,7 @@ def deep_missing_data_analysis_task(datasource_id, target_column, required_varia
                 'total_complete_rows': int(df.dropna().shape[0]),
                 'total_rows_with_target': int(df[target_column].dropna().shape[0]) if target_column in df.columns else 0,
                 'analysis_successful': True,
-                'heatmap_generated': bool(heatmap_html)
+                'heatmap_generated': bool(nullity_heatmap)
             }
         }
         
@@ -97,7 +99,7 @@ def deep_missing_data_analysis_task(datasource_id, target_column, required_varia
             'feature_importance_variables': len(feature_importances),
             'combination_analysis_count': len(combination_counts),
             'total_complete_rows': missing_data_report['analysis_metadata']['total_complete_rows'],
-            'heatmap_generated': bool(heatmap_html)
+            'heatmap_generated': bool(nullity_heatmap)
         }
         
     except Exception as e:
@@ -128,32 +130,20 @@ def deep_missing_data_analysis_task(datasource_id, target_column, required_varia
 def _load_dataframe_from_datasource(datasource):
     """Load dataframe from DataSource file."""
     try:
-        file_path = datasource.file.path
-        
-        if file_path.endswith('.parquet'):
-            return pd.read_parquet(file_path)
-        elif file_path.endswith('.csv'):
-            # Try different encodings and separators
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                try:
-                    return pd.read_csv(file_path, encoding=encoding)
-                except (UnicodeDecodeError, pd.errors.ParserError):
-                    continue
-            # Final fallback
-            return pd.read_csv(file_path, encoding='latin-1')
-        elif file_path.endswith(('.xls', '.xlsx')):
-            return pd.read_excel(file_path)
-        else:
-            # Try parquet as fallback
-            return pd.read_parquet(file_path)
-            
+        return read_dataset(datasource.file.path)
     except Exception as e:
         logger.error(f"Failed to load dataframe from datasource: {e}")
         return None
 
 
-def _calculate_feature_importance(df, target_column, required_variables):
-    """Calculate feature importance using RandomForestRegressor after imputation."""
+def _calculate_feature_importance(df, target_column, required_variables, datasource=None):
+    """
+    Calculate feature importance using RandomForestRegressor after preprocessing.
+
+    Features go through the shared preprocessing pipeline, stored
+    per datasource version, feature set and target, so repeated analyses of
+    the same data reuse the fitted transformers.
+    """
     try:
         # Check if target column exists
         if target_column not in df.columns:
@@ -179,22 +169,14 @@ def _calculate_feature_importance(df, target_column, required_variables):
         if len(y) == 0:
             raise ValueError(f"No non-null values found in target column '{target_column}'")
         
-        # Prepare features for ML
-        X_processed = X.copy()
-        
-        # Handle categorical variables with label encoding
-        categorical_columns = X.select_dtypes(include=['object', 'category']).columns
-        for col in categorical_columns:
-            le = LabelEncoder()
-            X_processed[col] = le.fit_transform(X_processed[col].astype(str))
-        
-        # Impute missing values in features
-        imputer = SimpleImputer(strategy='median')
-        X_imputed = pd.DataFrame(
-            imputer.fit_transform(X_processed),
-            columns=X_processed.columns,
-            index=X_processed.index
-        )
+        # Encode categoricals and impute missing values (fitted once per datasource version)
+        if datasource is not None:
+            key = preprocessor_key(datasource, feature_vars, scope=f'feature_importance:{target_column}')
+            preprocessor, _, _ = get_or_fit_preprocessor(key, X)
+        else:
+            preprocessor = build_preprocessor().fit(X)
+        X_imputed = preprocessor.transform(X)
+        feature_vars = list(X_imputed.columns)
         
         # Handle target variable (ensure it's numeric)
         if y.dtype == 'object':
@@ -225,8 +207,63 @@ def _calculate_feature_importance(df, target_column, required_variables):
         return {}
 
 
-def _calculate_complete_case_combinations(df, required_variables):
-    """Calculate complete rows for all combinations of required variables."""
+def _missing_patterns(df, variables):
+    """
+    Distinct not-null patterns of ``variables`` and how many rows share each.
+
+    Each row's not-null flags are packed into a bitset (bit ``i`` set when
+    ``variables[i]`` is present), split into 64-bit words.
+
+    Returns:
+        tuple: (patterns as a (P, words) uint64 array, row count per pattern)
+    """
+    present = df[variables].notna().to_numpy()
+    n_words = max(1, -(-len(variables) // 64))
+    padded = np.zeros((len(present), n_words * 64), dtype=bool)
+    padded[:, :len(variables)] = present
+    words = np.packbits(padded, axis=1, bitorder='little').view('<u8')
+    patterns, counts = np.unique(words, axis=0, return_counts=True)
+    return patterns, counts.astype(np.int64)
+
+
+def _combination_masks(combos, n_words):
+    """Bitset masks (C, words) for combinations given as tuples of variable positions."""
+    masks = np.zeros((len(combos), n_words), dtype=np.uint64)
+    for row, combo in enumerate(combos):
+        for position in combo:
+            masks[row, position // 64] |= np.uint64(1) << np.uint64(position % 64)
+    return masks
+
+
+def _complete_rows(patterns, counts, masks, max_cells=5_000_000):
+    """
+    Rows complete in every variable of each mask.
+
+    A row is complete for a combination when its pattern is a superset of
+    the combination's mask, so the count is the sum of the multiplicities of
+    those patterns; masks are evaluated in chunks against all patterns.
+    """
+    totals = np.empty(len(masks), dtype=np.int64)
+    chunk = max(1, max_cells // max(1, patterns.shape[0] * patterns.shape[1]))
+    for start in range(0, len(masks), chunk):
+        block = masks[start:start + chunk]
+        covered = ((patterns[:, None, :] & block[None, :, :]) == block[None, :, :]).all(axis=2)
+        totals[start:start + chunk] = counts @ covered
+    return totals
+
+
+def _calculate_complete_case_combinations(df, required_variables, max_combination_size=5):
+    """
+    Calculate complete rows for combinations of required variables.
+
+    The null matrix is reduced to its distinct missingness patterns once;
+    each combination's complete-row count is then derived from pattern
+    counts with bitmask subset tests instead of a pass over the rows. When
+    the number of combinations exceeds ``MISSING_DATA_EXHAUSTIVE_COMBINATIONS``
+    only the ``MISSING_DATA_TOP_COMBINATIONS`` most complete combinations of
+    each size are kept, found with a beam search (adding a variable can only
+    lower completeness, so good combinations extend good smaller ones).
+    """
     try:
         # Filter to only include variables that exist in the dataframe
         available_variables = [var for var in required_variables if var in df.columns]
@@ -234,37 +271,57 @@ def _calculate_complete_case_combinations(df, required_variables):
         if len(available_variables) == 0:
             return {}
         
-        combination_counts = {}
+        n_rows = len(df)
+        patterns, counts = _missing_patterns(df, available_variables)
+        n_words = patterns.shape[1]
         
-        # Single variables
-        for var in available_variables:
-            complete_count = int(df[var].notna().sum())
-            combination_counts[var] = {
-                'variables': [var],
-                'complete_rows': complete_count,
-                'completion_rate': float(complete_count / len(df)) if len(df) > 0 else 0.0
+        def entry(combo, complete_count):
+            return {
+                'variables': [available_variables[i] for i in combo],
+                'complete_rows': int(complete_count),
+                'completion_rate': float(complete_count / n_rows) if n_rows > 0 else 0.0
             }
         
-        # Combinations of 2 or more variables (up to 5 for performance)
-        max_combination_size = min(5, len(available_variables))
-        
-        for r in range(2, max_combination_size + 1):
-            for combination in combinations(available_variables, r):
-                combination_key = " + ".join(sorted(combination))
-                
-                # Count rows where all variables in combination are not null
-                mask = pd.Series(True, index=df.index)
-                for var in combination:
-                    mask &= df[var].notna()
-                
-                complete_count = int(mask.sum())
-                combination_counts[combination_key] = {
-                    'variables': list(combination),
-                    'complete_rows': complete_count,
-                    'completion_rate': float(complete_count / len(df)) if len(df) > 0 else 0.0
-                }
-        
-        logger.info(f"Calculated complete case combinations for {len(combination_counts)} scenarios")
+        # Single variables
+        singles = [(i,) for i in range(len(available_variables))]
+        combination_counts = {
+            available_variables[combo[0]]: entry(combo, complete)
+            for combo, complete in zip(singles, _complete_rows(patterns, counts, _combination_masks(singles, n_words)))
+        }
+        
+        # Combinations of 2 or more variables (up to max_combination_size)
+        max_size = min(max_combination_size, len(available_variables))
+        sizes = range(2, max_size + 1)
+        exhaustive_limit = getattr(settings, 'MISSING_DATA_EXHAUSTIVE_COMBINATIONS', 10_000)
+        top_k = getattr(settings, 'MISSING_DATA_TOP_COMBINATIONS', 25)
+        exhaustive = sum(comb(len(available_variables), r) for r in sizes) <= exhaustive_limit
+        
+        beam = singles
+        for r in sizes:
+            if exhaustive:
+                candidates = list(combinations(range(len(available_variables)), r))
+            else:
+                candidates = sorted({
+                    tuple(sorted(combo + (i,)))
+                    for combo in beam for i in range(len(available_variables)) if i not in combo
+                })
+            complete = _complete_rows(patterns, counts, _combination_masks(candidates, n_words))
+            
+            if exhaustive:
+                kept = range(len(candidates))
+            else:
+                # Keep a wider beam than reported so later sizes have room to explore
+                order = np.argsort(-complete, kind='stable')
+                beam = [candidates[i] for i in order[:top_k * 4]]
+                kept = order[:top_k]
+            
+            for i in kept:
+                variables = [available_variables[position] for position in candidates[i]]
+                combination_counts[" + ".join(sorted(variables))] = entry(candidates[i], complete[i])
+        
+        logger.info(f"Calculated complete case combinations for {len(combination_counts)} scenarios "
+                    f"({len(counts)} distinct missingness patterns, "
+                    f"{'exhaustive' if exhaustive else f'top {top_k} per size'})")
         return combination_counts
         
     except Exception as e:
@@ -318,154 +375,34 @@ def _calculate_missing_data_statistics(df, required_variables):
         return {}
 
 
-def _generate_missing_data_heatmap(df, datasource_id, required_variables):
+def _generate_missing_data_heatmap(df, datasource, required_variables):
     """
-    Generate an interactive missing data heatmap using Plotly.
-    
+    Build the binned nullity heatmap of the required variables.
+
+    Rows are aggregated into ``NULLITY_HEATMAP_BINS`` bins holding the
+    fraction of missing values per column, columns are ordered by nullity
+    correlation, and the result is cached per datasource version.
+
     Args:
         df (pd.DataFrame): Input DataFrame
-        datasource_id (str): DataSource identifier for file naming
+        datasource (DataSource): DataSource the data was loaded from
         required_variables (list): List of required variables to focus on
-        
+
     Returns:
-        str or None: HTML string of interactive Plotly heatmap, or None if failed
+        dict or None: Compact heatmap document, or None if failed
     """
     try:
         # Filter dataframe to focus on required variables that exist
         available_variables = [var for var in required_variables if var in df.columns]
-        
+
         if not available_variables:
             logger.warning("No available variables for heatmap generation")
             return None
-        
-        # Create focused dataframe for heatmap (limit to reasonable size for performance)
-        heatmap_df = df[available_variables].copy()
-        
-        # If dataset is very large, sample for visualization
-        if len(heatmap_df) > 1000:
-            heatmap_df = heatmap_df.sample(n=1000, random_state=42)
-            logger.info(f"Sampled 1000 rows from {len(df)} for heatmap visualization")
-        
-        # Create nullity matrix (1 for missing, 0 for present)
-        nullity_matrix = heatmap_df.isnull().astype(int)
-        
-        # Create interactive heatmap with Plotly
-        fig = px.imshow(
-            nullity_matrix.values,
-            x=nullity_matrix.columns,
-            y=list(range(len(nullity_matrix))),
-            color_continuous_scale=[
-                [0, '#61AFEF'],    # Present data - One Dark blue
-                [1, '#E06C75']     # Missing data - One Dark red
-            ],
-            aspect="auto",
-            title=f"Missing Data Pattern Matrix - {len(available_variables)} Variables",
-            labels=dict(
-                x="Variables", 
-                y="Records", 
-                color="Status"
-            )
-        )
-        
-        # Apply One Dark theme styling
-        fig.update_layout(
-            # Dark background matching One Dark theme
-            plot_bgcolor='#282C34',
-            paper_bgcolor='#282C34',
-            
-            # Title styling
-            title=dict(
-                font=dict(color='#ABB2BF', size=16, family='monospace'),
-                x=0.5,
-                xanchor='center',
-                pad=dict(t=20)
-            ),
-            
-            # X-axis styling
-            xaxis=dict(
-                title=dict(
-                    text="Variables",
-                    font=dict(color='#ABB2BF', size=12)
-                ),
-                tickfont=dict(color='#ABB2BF', size=10),
-                tickangle=-45,
-                gridcolor='#3E4451',
-                showgrid=True,
-                zeroline=False,
-                side='bottom'
-            ),
-            
-            # Y-axis styling
-            yaxis=dict(
-                title=dict(
-                    text="Records",
-                    font=dict(color='#ABB2BF', size=12)
-                ),
-                tickfont=dict(color='#ABB2BF', size=10),
-                gridcolor='#3E4451',
-                showgrid=True,
-                zeroline=False,
-                autorange='reversed'  # Show first rows at top
-            ),
-            
-            # Colorbar styling
-            coloraxis_colorbar=dict(
-                title=dict(
-                    text="Data Status", 
-                    font=dict(color='#ABB2BF', size=12)
-                ),
-                tickfont=dict(color='#ABB2BF', size=10),
-                tickmode='array',
-                tickvals=[0, 1],
-                ticktext=['Present', 'Missing'],
-                thickness=20,
-                len=0.7
-            ),
-            
-            # Layout dimensions
-            width=900,
-            height=max(400, min(800, len(nullity_matrix) * 2 + 200)),
-            margin=dict(t=80, r=80, b=100, l=80),
-            
-            # Hover styling
-            hoverlabel=dict(
-                bgcolor='#3E4451',
-                bordercolor='#ABB2BF',
-                font=dict(color='#ABB2BF', family='monospace')
-            )
-        )
-        
-        # Enhanced hover template for better interactivity
-        fig.update_traces(
-            hovertemplate="<b>Variable:</b> %{x}<br>" +
-                         "<b>Record:</b> %{y}<br>" +
-                         "<b>Status:</b> %{customdata}<br>" +
-                         "<extra></extra>",
-            customdata=[["Missing" if val else "Present" for val in row] 
-                       for row in nullity_matrix.values]
-        )
-        
-        # Convert to HTML string for embedding in Django template
-        html_string = fig.to_html(
-            include_plotlyjs='cdn',
-            div_id=f"missing-data-heatmap-{datasource_id}",
-            config={
-                'displayModeBar': True,
-                'displaylogo': False,
-                'modeBarButtonsToRemove': ['pan2d', 'lasso2d', 'select2d'],
-                'toImageButtonOptions': {
-                    'format': 'png',
-                    'filename': f'missing_data_heatmap_{datasource_id}',
-                    'height': max(400, min(800, len(nullity_matrix) * 2 + 200)),
-                    'width': 900,
-                    'scale': 2
-                }
-            }
-        )
-        
-        logger.info(f"Generated interactive missing data heatmap with {len(available_variables)} variables")
-        return html_string
-        
+
+        heatmap = get_nullity_heatmap(datasource, available_variables, df=df)
+        logger.info(f"Generated missing data heatmap with {len(available_variables)} variables")
+        return heatmap
+
     except Exception as e:
         logger.error(f"Heatmap generation failed: {e}", exc_info=True)
         return None
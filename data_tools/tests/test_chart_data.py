@@ -0,0 +1,103 @@
+"""
+Tests for server-side chart aggregation
+"""
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from data_tools.services.chart_data import build_chart, chart_columns, get_chart
+
+
+@override_settings(CHART_MAX_POINTS=500, CHART_MAX_CATEGORIES=5)
+class ChartDataTestCase(SimpleTestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n_rows = 20_000
+        self.df = pd.DataFrame({
+            'time': pd.date_range('2024-01-01', periods=n_rows, freq='h'),
+            'flow': rng.normal(10, 2, n_rows),
+            'rain': rng.exponential(1, n_rows),
+            'station': rng.choice(list('ABCDEFGH'), n_rows),
+        })
+        self.df.loc[123, 'flow'] = 80.0
+        self.df.loc[::100, 'rain'] = np.nan
+
+    def test_histogram_counts_every_valid_row(self):
+        chart = build_chart(self.df, 'histogram', {'column': 'rain', 'bins': '20'})
+        trace = chart['figure']['data'][0]
+        self.assertEqual(len(trace['y']), 20)
+        self.assertEqual(sum(trace['y']), self.df['rain'].notna().sum())
+        self.assertEqual(chart['data_points'], self.df['rain'].notna().sum())
+
+    def test_box_uses_precomputed_quartiles(self):
+        chart = build_chart(self.df, 'box', {'y_axis': 'flow'})
+        box = chart['figure']['data'][0]
+        q1, median, q3 = np.percentile(self.df['flow'], [25, 50, 75])
+        self.assertAlmostEqual(box['median'][0], median)
+        self.assertAlmostEqual(box['q1'][0], q1)
+        self.assertAlmostEqual(box['q3'][0], q3)
+        outliers = chart['figure']['data'][1]['y']
+        self.assertLessEqual(len(outliers), 500)
+        self.assertIn(80.0, outliers)
+
+    def test_bar_aggregates_top_categories(self):
+        chart = build_chart(self.df, 'bar', {'x_axis': 'station', 'y_axis': 'flow', 'aggregate': 'mean'})
+        trace = chart['figure']['data'][0]
+        self.assertEqual(len(trace['x']), 5)
+        expected = self.df.groupby('station')['flow'].mean()
+        for station, value in zip(trace['x'], trace['y']):
+            self.assertAlmostEqual(value, expected[station])
+
+    def test_heatmap_pivots_means(self):
+        df = self.df.assign(hour=self.df['time'].dt.hour % 4)
+        chart = build_chart(df, 'heatmap', {'x_axis': 'hour', 'y_axis': 'station', 'values': 'flow'})
+        trace = chart['figure']['data'][0]
+        self.assertEqual(len(trace['y']), 5)
+        self.assertEqual(len(trace['x']), 4)
+
+    def test_scatter_and_line_respect_point_budget(self):
+        scatter = build_chart(self.df, 'scatter', {'x_axis': 'rain', 'y_axis': 'flow'})
+        self.assertLessEqual(scatter['rendered_points'], 500)
+        self.assertEqual(scatter['data_points'], self.df['rain'].notna().sum())
+        self.assertIn(80.0, scatter['figure']['data'][0]['y'])
+
+        line = build_chart(self.df, 'line', {'x_axis': 'time', 'y_axis': 'flow', 'color_by': 'station'})
+        self.assertEqual(len(line['figure']['data']), 5)
+        self.assertLessEqual(line['rendered_points'], 500)
+
+    def test_payload_does_not_grow_with_rows(self):
+        config = {'x_axis': 'time', 'y_axis': 'flow'}
+        small = len(json.dumps(build_chart(self.df, 'line', config)['figure']))
+        long_df = pd.concat([self.df] * 10, ignore_index=True)
+        long_df['time'] = pd.date_range('2024-01-01', periods=len(long_df), freq='min')
+        large = len(json.dumps(build_chart(long_df, 'line', config)['figure']))
+        self.assertLess(large, small * 1.5)
+
+    def test_invalid_columns_raise_value_error(self):
+        with self.assertRaisesRegex(ValueError, 'no existe'):
+            build_chart(self.df, 'histogram', {'column': 'missing'})
+        with self.assertRaisesRegex(ValueError, 'no es numérica'):
+            build_chart(self.df, 'histogram', {'column': 'station'})
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_charts_are_cached_per_spec(self):
+        cache.clear()
+        datasource = SimpleNamespace(id='ds-1', file=None, is_derived=False)
+        reads = []
+
+        def load(columns):
+            reads.append(columns)
+            return self.df[columns]
+
+        config = {'column': 'flow'}
+        first = get_chart(datasource, 'histogram', config, load)
+        self.assertEqual(get_chart(datasource, 'histogram', config, load), first)
+        get_chart(datasource, 'histogram', {'column': 'rain'}, load)
+
+        self.assertEqual(reads, [chart_columns(config), ['rain']])
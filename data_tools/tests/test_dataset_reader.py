@@ -0,0 +1,136 @@
+"""
+Tests for projection-only dataset reads and the decoded-frame cache
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.test import SimpleTestCase, override_settings
+
+from data_tools.services.dataset_reader import (
+    clear_dataset_cache, column_null_counts, dataset_cache_stats, read_dataset, read_schema,
+)
+
+
+class DatasetReaderTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        clear_dataset_cache()
+        self.addCleanup(clear_dataset_cache)
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'flow': rng.normal(size=10_000),
+            'rain': rng.exponential(size=10_000),
+            'station': rng.choice(['A', 'B'], size=10_000),
+        })
+        self.df.loc[::7, 'rain'] = np.nan
+        self.parquet = os.path.join(self.tmp.name, 'data.parquet')
+        pq.write_table(pa.Table.from_pandas(self.df, preserve_index=False), self.parquet, row_group_size=1_000)
+        self.csv = os.path.join(self.tmp.name, 'data.csv')
+        self.df.to_csv(self.csv, index=False)
+
+    def test_reads_only_requested_columns(self):
+        df = read_dataset(self.parquet, columns=['station', 'flow', 'unknown'])
+        self.assertEqual(list(df.columns), ['flow', 'station'])
+        self.assertEqual(len(df), 10_000)
+
+        df = read_dataset(self.csv, columns=['rain'])
+        self.assertEqual(list(df.columns), ['rain'])
+
+    def test_row_limit_reads_only_leading_row_groups(self):
+        with patch.object(pq.ParquetFile, 'read_row_groups', autospec=True,
+                          side_effect=pq.ParquetFile.read_row_groups) as read_row_groups:
+            df = read_dataset(self.parquet, columns=['flow'], nrows=1_500)
+
+        self.assertEqual(list(read_row_groups.call_args.args[1]), [0, 1])
+        pd.testing.assert_frame_equal(df, self.df[['flow']].head(1_500))
+        self.assertEqual(len(read_dataset(self.csv, nrows=1_500)), 1_500)
+
+    def test_schema_comes_from_footer(self):
+        with patch('pandas.read_parquet', side_effect=AssertionError('data was read')):
+            schema = read_schema(self.parquet)
+        self.assertEqual(schema.columns, ['flow', 'rain', 'station'])
+        self.assertEqual(schema.num_rows, 10_000)
+        self.assertEqual(schema.numeric_columns(), ['flow', 'rain'])
+
+        csv_schema = read_schema(self.csv)
+        self.assertEqual(csv_schema.num_rows, 10_000)
+        self.assertEqual(csv_schema.columns, schema.columns)
+
+    def test_null_counts_from_statistics(self):
+        expected = self.df.isnull().sum()
+        with patch('pandas.read_parquet', side_effect=AssertionError('data was read')):
+            counts = column_null_counts(self.parquet)
+        pd.testing.assert_series_equal(counts, expected, check_dtype=False)
+
+        no_stats = os.path.join(self.tmp.name, 'no_stats.parquet')
+        pq.write_table(pa.Table.from_pandas(self.df, preserve_index=False), no_stats, write_statistics=False)
+        pd.testing.assert_series_equal(column_null_counts(no_stats), expected, check_dtype=False)
+
+
+class DatasetCacheTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        clear_dataset_cache()
+        self.addCleanup(clear_dataset_cache)
+        self.df = pd.DataFrame({'flow': np.arange(5_000, dtype=float), 'rain': np.ones(5_000)})
+        self.parquet = self.write('data.parquet', self.df)
+
+    def write(self, name, df):
+        path = os.path.join(self.tmp.name, name)
+        df.to_parquet(path, index=False)
+        return path
+
+    def test_repeated_and_subset_reads_hit_the_cache(self):
+        full = read_dataset(self.parquet)
+        with patch('pandas.read_parquet', side_effect=AssertionError('file was read again')), \
+                patch.object(pq.ParquetFile, 'read_row_groups', side_effect=AssertionError('file was read again')):
+            again = read_dataset(self.parquet)
+            column = read_dataset(self.parquet, columns=['rain', 'unknown'])
+            head = read_dataset(self.parquet, columns=['flow'], nrows=10)
+
+        pd.testing.assert_frame_equal(again, full)
+        pd.testing.assert_frame_equal(column, self.df[['rain']])
+        pd.testing.assert_frame_equal(head, self.df[['flow']].head(10))
+        stats = dataset_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (3, 1, 1))
+
+    def test_returned_frames_are_private_copies(self):
+        read_dataset(self.parquet)['flow'] = 0.0
+        self.assertEqual(read_dataset(self.parquet)['flow'].iloc[-1], 4_999.0)
+
+    def test_modified_file_is_read_again(self):
+        read_dataset(self.parquet)
+        changed = self.df.assign(flow=-self.df['flow'])
+        changed.to_parquet(self.parquet, index=False)
+        stat = os.stat(self.parquet)
+        os.utime(self.parquet, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        pd.testing.assert_frame_equal(read_dataset(self.parquet), changed)
+        self.assertEqual(dataset_cache_stats()['entries'], 1)
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        nbytes = int(self.df.memory_usage(deep=True).sum())
+        other = self.write('other.parquet', self.df)
+        with override_settings(DATASET_CACHE_MAX_BYTES=int(nbytes * 1.5)):
+            read_dataset(self.parquet)
+            read_dataset(other)
+            stats = dataset_cache_stats()
+            self.assertEqual((stats['entries'], stats['evictions'], stats['bytes']), (1, 1, nbytes))
+
+            read_dataset(other)
+            self.assertEqual(dataset_cache_stats()['hits'], 1)
+
+        with override_settings(DATASET_CACHE_MAX_BYTES=0):
+            clear_dataset_cache()
+            read_dataset(self.parquet)
+            self.assertEqual(dataset_cache_stats()['entries'], 0)
@@ -0,0 +1,104 @@
+"""
+Tests for incremental Data Studio grid diffs
+"""
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from data_tools.services.grid_diff import STUDIO_GRID_ROWS, compute_grid_diff
+
+
+def apply_diff(rows, diff):
+    """Python mirror of DataStudioGridSync.applyGridDiff used to check round trips"""
+    if diff['mode'] == 'full':
+        return diff['preview_data']
+    patched = [dict(row) for row in rows]
+    for start, end in reversed(diff['deleted_rows']):
+        del patched[start:end]
+    for insert in diff['inserted_rows']:
+        patched[insert['start']:insert['start']] = insert['rows']
+    for row in patched:
+        for column in diff['removed_columns']:
+            row.pop(column, None)
+    for column, values in diff['changed_columns'].items():
+        for index, value in enumerate(values):
+            patched[index][column] = value
+    return patched[:diff['window_rows']]
+
+
+class GridDiffTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'id': range(200),
+            'flow': np.linspace(0.0, 10.0, 200),
+            'station': ['A', 'B', 'C', 'D'] * 50,
+        })
+        self.df.loc[[3, 7], 'flow'] = np.nan
+        self.window = self.df.head(100)
+        self.rows = compute_grid_diff(None, self.df)['preview_data']
+
+    def assertRoundTrip(self, new_df):
+        diff = compute_grid_diff(self.window, new_df)
+        expected = compute_grid_diff(None, new_df)['preview_data']
+        self.assertEqual(apply_diff(self.rows, diff), expected)
+        return diff
+
+    def test_unknown_previous_window_sends_full(self):
+        diff = compute_grid_diff(None, self.df)
+        self.assertEqual(diff['mode'], 'full')
+        self.assertEqual(len(diff['preview_data']), 100)
+        self.assertEqual(diff['row_count'], 200)
+
+    def test_changed_column_only_ships_that_column(self):
+        new_df = self.df.copy()
+        new_df['flow'] = new_df['flow'] * 2
+        diff = self.assertRoundTrip(new_df)
+        self.assertEqual(diff['mode'], 'patch')
+        self.assertEqual(list(diff['changed_columns']), ['flow'])
+        self.assertEqual(diff['deleted_rows'], [])
+
+    def test_few_changed_cells_ship_as_row_replacements(self):
+        new_df = self.df.copy()
+        new_df['flow'] = new_df['flow'].fillna(0.0)
+        diff = self.assertRoundTrip(new_df)
+        self.assertEqual(diff['deleted_rows'], [[3, 4], [7, 8]])
+        self.assertEqual(diff['changed_columns'], {})
+
+    def test_added_and_removed_columns(self):
+        new_df = self.df.drop(columns=['station'])
+        new_df['flow_x2'] = new_df['flow'] * 2
+        diff = self.assertRoundTrip(new_df)
+        self.assertEqual(diff['removed_columns'], ['station'])
+        self.assertEqual(diff['added_columns'], ['flow_x2'])
+        self.assertEqual(diff['dtypes'], {'flow_x2': 'float64'})
+
+    def test_dropped_rows_become_row_ranges(self):
+        new_df = self.df.dropna().reset_index(drop=True)
+        diff = self.assertRoundTrip(new_df)
+        self.assertEqual(diff['mode'], 'patch')
+        self.assertEqual(diff['deleted_rows'], [[3, 4], [7, 8]])
+        self.assertEqual([r['start'] for r in diff['inserted_rows']], [98])
+        self.assertEqual(diff['changed_columns'], {})
+
+    def test_reordering_rows_falls_back_to_full(self):
+        new_df = self.df.sample(frac=1.0, random_state=0)
+        diff = compute_grid_diff(self.window, new_df)
+        self.assertEqual(diff['mode'], 'full')
+
+    def test_patch_is_smaller_than_full_window(self):
+        new_df = self.df.copy()
+        new_df['flow'] = new_df['flow'].round(1)
+        patch = compute_grid_diff(self.window, new_df)
+        full = compute_grid_diff(None, new_df)
+        self.assertLess(len(str(patch)), len(str(full)))
+
+    def test_page_sized_window_patches_columns_without_alignment(self):
+        df = pd.DataFrame({'id': range(5_000), 'flow': np.arange(5_000) / 7})
+        window = df.head(STUDIO_GRID_ROWS)
+        new_df = df.assign(flow=df['flow'] * 2)
+        diff = compute_grid_diff(window, new_df, STUDIO_GRID_ROWS)
+        self.assertEqual(diff['mode'], 'patch')
+        self.assertEqual(list(diff['changed_columns']), ['flow'])
+        self.assertEqual(diff['window_rows'], 5_000)
@@ -0,0 +1,79 @@
+"""
+Tests for binned nullity heatmaps
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from data_tools.services import nullity_service
+from data_tools.services.nullity_service import bin_edges, build_nullity_heatmap, get_nullity_heatmap
+
+
+class NullityHeatmapTestCase(SimpleTestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n_rows = 10_000
+        outage = rng.random(n_rows) < 0.1
+        self.df = pd.DataFrame({
+            'rain': np.where(outage, np.nan, rng.normal(size=n_rows)),
+            'id': np.arange(n_rows, dtype=float),
+            'flow': np.where(outage, np.nan, rng.normal(size=n_rows)),
+            'level': np.where(rng.random(n_rows) < 0.3, np.nan, 1.0),
+        })
+        # The last quarter of the record has no level readings at all
+        self.df.loc[7_500:, 'level'] = np.nan
+
+    def test_bins_cover_every_row_once(self):
+        edges = bin_edges(1_003, 10)
+        self.assertEqual(edges[0], 0)
+        self.assertEqual(edges[-1], 1_003)
+        self.assertLessEqual(np.ptp(np.diff(edges)), 1)
+        self.assertEqual(len(bin_edges(5, 200)), 6)
+
+    def test_cells_hold_missing_fraction_per_bin(self):
+        heatmap = build_nullity_heatmap(self.df, n_bins=4, cluster=False)
+        self.assertEqual(heatmap['columns'], ['rain', 'id', 'flow', 'level'])
+        self.assertEqual(heatmap['bin_edges'], [0, 2_500, 5_000, 7_500, 10_000])
+
+        level = heatmap['missing'][3]
+        self.assertEqual(level[-1], heatmap['scale'])
+        expected = self.df['level'].iloc[:2_500].isna().mean()
+        self.assertAlmostEqual(level[0] / heatmap['scale'], expected, places=3)
+        self.assertEqual(heatmap['missing'][1], [0, 0, 0, 0])
+
+    def test_isolated_gaps_stay_visible(self):
+        df = pd.DataFrame({'flow': np.ones(100_000)})
+        df.loc[123, 'flow'] = np.nan
+        heatmap = build_nullity_heatmap(df, n_bins=10, cluster=False)
+        self.assertEqual(heatmap['missing'][0][0], 1)
+
+    def test_clustering_groups_columns_missing_together(self):
+        heatmap = build_nullity_heatmap(self.df, n_bins=50)
+        self.assertTrue(heatmap['clustered'])
+        positions = {column: i for i, column in enumerate(heatmap['columns'])}
+        self.assertEqual(abs(positions['rain'] - positions['flow']), 1)
+
+    def test_document_size_does_not_grow_with_rows(self):
+        long_df = pd.concat([self.df] * 50, ignore_index=True)
+        size = len(json.dumps(build_nullity_heatmap(long_df, n_bins=200)))
+        self.assertLess(size, 10_000)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_heatmap_is_cached_per_datasource_version(self):
+        cache.clear()
+        datasource = SimpleNamespace(id='ds-1', file=None, is_derived=False)
+        first = get_nullity_heatmap(datasource, ['rain', 'flow'], df=self.df)
+
+        with patch.object(nullity_service, '_load_datasource', side_effect=AssertionError('datasource was read')):
+            self.assertEqual(get_nullity_heatmap(datasource, ['rain', 'flow']), first)
+
+        with patch.object(nullity_service, '_load_datasource', return_value=self.df) as load:
+            get_nullity_heatmap(SimpleNamespace(id='ds-2', file=None, is_derived=False), ['rain', 'flow'])
+        load.assert_called_once()
@@ -0,0 +1,107 @@
+"""
+Tests for the coalescing WebSocket progress publisher
+"""
+
+from django.test import TestCase
+from django.core.cache import cache
+
+from data_tools.websockets.progress_publisher import (
+    ProgressPublisher, subscriber_key
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ProgressPublisherTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.sent = []
+        self.clock = FakeClock()
+        self.publisher = ProgressPublisher(
+            max_rate=2.0,
+            send_func=lambda group, message: self.sent.append((group, message)),
+            clock=self.clock,
+            use_timers=False
+        )
+
+    def _progress(self, processed, status='running'):
+        return {
+            'type': 'bulk_operation_progress',
+            'operation_id': 'op-1',
+            'processed': processed,
+            'total': 1000,
+            'status': status,
+            'errors': []
+        }
+
+    def test_first_event_is_sent_immediately(self):
+        self.publisher.publish('operation_op-1', self._progress(1))
+        self.assertEqual(len(self.sent), 1)
+        self.assertEqual(self.sent[0][1]['processed'], 1)
+
+    def test_updates_within_interval_are_coalesced(self):
+        for processed in range(1, 1001):
+            self.publisher.publish('operation_op-1', self._progress(processed))
+        self.assertEqual(len(self.sent), 1)
+
+        self.publisher.flush('operation_op-1')
+        self.assertEqual(len(self.sent), 2)
+        self.assertEqual(self.sent[1][1]['processed'], 1000)
+        self.assertEqual(self.publisher.get_stats()['coalesced'], 998)
+
+    def test_event_sent_once_interval_elapses(self):
+        self.publisher.publish('operation_op-1', self._progress(1))
+        self.publisher.publish('operation_op-1', self._progress(2))
+        self.clock.now += 0.5
+        self.publisher.publish('operation_op-1', self._progress(3))
+        self.assertEqual([m['processed'] for _, m in self.sent], [1, 3])
+
+    def test_terminal_status_bypasses_rate_limit(self):
+        self.publisher.publish('operation_op-1', self._progress(1))
+        self.publisher.publish('operation_op-1', self._progress(1000, status='completed'))
+        self.assertEqual(self.sent[-1][1]['status'], 'completed')
+
+    def test_terminal_status_forgets_the_group(self):
+        self.publisher.publish('operation_op-1', self._progress(1))
+        self.publisher.publish('operation_op-1', self._progress(1000, status='completed'))
+        self.assertNotIn('operation_op-1', self.publisher.last_flush)
+
+    def test_different_event_types_are_batched(self):
+        group = 'data_studio_session_1'
+        self.publisher.publish(group, {'type': 'session_state_changed', 'session_info': {}})
+        self.publisher.publish(group, {
+            'type': 'data_transformation_update', 'operation_id': 'a',
+            'progress': 10, 'status': 'running', 'message': None
+        })
+        self.publisher.publish(group, {'type': 'session_state_changed', 'session_info': {'v': 2}})
+        self.publisher.flush(group)
+
+        self.assertEqual(len(self.sent), 2)
+        batch = self.sent[1][1]
+        self.assertEqual(batch['type'], 'batched_update')
+        self.assertEqual(len(batch['events']), 2)
+
+    def test_group_without_subscribers_is_skipped(self):
+        cache.set(subscriber_key('operation_op-1'), 0)
+        self.publisher.publish('operation_op-1', self._progress(1, status='completed'))
+        self.assertEqual(self.sent, [])
+        self.assertEqual(self.publisher.get_stats()['skipped_no_subscribers'], 1)
+
+    def test_unknown_subscriber_count_still_sends(self):
+        self.publisher.publish('operation_op-1', self._progress(1))
+        self.assertEqual(len(self.sent), 1)
+
+    def test_send_errors_are_counted_not_raised(self):
+        publisher = ProgressPublisher(
+            max_rate=2.0, send_func=lambda group, message: 1 / 0,
+            clock=self.clock, use_timers=False
+        )
+        publisher.publish('operation_op-1', self._progress(1))
+        self.assertEqual(publisher.get_stats()['send_errors'], 1)
@@ -40,11 +40,12 @@ def test_scatter_plot_functionality():
     print("\n🎯 Expected API Response Structure:")
     expected_response = {
         "success": True,
-        "chart_html": "<div>...plotly chart HTML...</div>",
         "chart_type": "scatter",
+        "figure": {"data": ["...downsampled Plotly traces..."], "layout": {}},
+        "data_points": 1000,
+        "rendered_points": 1000,
         "x_column": "temperature",
-        "y_column": "humidity", 
-        "data_points": 1000
+        "y_column": "humidity"
     }
     print(json.dumps(expected_response, indent=2))
     
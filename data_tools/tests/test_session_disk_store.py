@@ -0,0 +1,88 @@
+"""
+Tests for delta-encoded disk-backed Data Studio sessions
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from data_tools.services.dataset_reader import clear_dataset_cache
+from data_tools.services.session_disk_store import SessionDiskStore
+from data_tools.services.session_manager import get_session_manager
+from data_tools.services.session_metadata import SessionConfig
+
+
+class SessionDiskStoreTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.tmp.name,
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        clear_dataset_cache()
+        self.addCleanup(clear_dataset_cache)
+
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'flow': rng.normal(size=1_000),
+            'rain': rng.exponential(size=1_000),
+            'station': rng.choice(['A', 'B', 'C'], size=1_000),
+        })
+        self.store = SessionDiskStore(1, 'ds-1')
+
+    def files(self, prefix):
+        return [name for name in os.listdir(self.store.path) if name.startswith(prefix)]
+
+    def test_commit_writes_only_changed_columns_and_row_selection(self):
+        base = self.store.initialize(self.df)
+        filtered = self.df[self.df['flow'] > 0].assign(rain=lambda df: df['rain'] * 25.4)
+        view = self.store.commit(base, filtered)
+
+        pd.testing.assert_frame_equal(self.store.assemble(view), filtered)
+        pd.testing.assert_frame_equal(self.store.assemble(base), self.df)
+        [patch_file] = self.files('patch_')
+        self.assertEqual(pd.read_parquet(os.path.join(self.store.path, patch_file)).shape[1], 2)
+        self.assertEqual(len(self.files('rows_')), 1)
+
+        sorted_df = filtered.sort_values('station').drop(columns=['flow'])
+        later = self.store.commit(view, sorted_df)
+        pd.testing.assert_frame_equal(self.store.assemble(later), sorted_df)
+        self.assertEqual(len(self.files('patch_')), 1)
+
+    def test_new_row_labels_become_a_snapshot(self):
+        base = self.store.initialize(self.df)
+        reset = self.df[self.df['station'] == 'A'].reset_index(drop=True)
+        view = self.store.commit(base, self.store.assemble(base).iloc[:0])
+        view = self.store.commit(view, reset)
+
+        self.assertTrue(view['space'].startswith('snapshot_'))
+        pd.testing.assert_frame_equal(self.store.assemble(view), reset)
+
+    def test_session_manager_keeps_only_views_in_cache(self):
+        manager = get_session_manager(1, 'ds-1', SessionConfig(persist_to_file=True))
+        self.assertTrue(manager.initialize_session(self.df))
+        self.assertTrue(manager.cache.is_disk_backed())
+        self.assertIsNone(cache.get(f"{manager.cache.prefix}:current"))
+
+        transformed = self.df.dropna().assign(flow=lambda df: df['flow'].abs())
+        self.assertTrue(manager.apply_transformation(transformed, 'abs_flow'))
+        pd.testing.assert_frame_equal(manager.get_current_dataframe(), transformed)
+
+        pd.testing.assert_frame_equal(manager.undo_operation(), self.df)
+        pd.testing.assert_frame_equal(manager.redo_operation(), transformed)
+
+        self.assertTrue(manager.reset_to_original())
+        pd.testing.assert_frame_equal(manager.get_current_dataframe(), self.df)
+        self.assertEqual(os.listdir(manager.cache.disk.path), ['base.parquet'])
+
+        manager.clear_session()
+        self.assertFalse(os.path.exists(manager.cache.disk.path))
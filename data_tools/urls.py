@@ -6,7 +6,7 @@ from .views.preparation_controller import data_preparer_page
 from .views.data_studio_views import data_studio_debug
 from .views.api.pagination_api import data_studio_pagination_api
 from .views.feature_engineering_views import feature_engineering_page
-from .views.missing_data_views import run_deep_missing_analysis_api, missing_data_results_page
+from .views.missing_data_views import run_deep_missing_analysis_api, missing_data_results_page, nullity_heatmap_api
 # Import refactored API views
 from .views.api import (
     get_columns_api, get_fusion_columns_api, generate_chart_api,
@@ -110,6 +110,10 @@ urlpatterns = [
          missing_data_results_page,
          name='missing_data_results_page'),
 
+    path('api/nullity-heatmap/<uuid:datasource_id>/',
+         nullity_heatmap_api,
+         name='nullity_heatmap_api'),
+
     # --- Data Studio Session Management API ---
     path('api/studio/<uuid:datasource_id>/session/initialize/',
          initialize_session,
@@ -5,6 +5,7 @@ Handles operations related to DataSource columns and metadata.
 import pandas as pd
 from django.views import View
 
+from data_tools.services.dataset_reader import read_dataset, read_schema
 from .mixins import BaseAPIView
 
 
@@ -33,27 +34,26 @@ class DataSourceColumnsAPIView(BaseAPIView, View):
             return self.error_response(validation_error['error'])
         
         try:
-            # Read file based on format
-            df = self._read_dataframe(datasource.file.path)
-            
-            # For ML experiment form, just return column names
-            columns = list(df.columns)
+            # Column names and row count come from the file footer (Parquet)
+            schema = read_schema(datasource.file.path)
             
             return self.success_response({
-                'columns': columns,
-                'total_rows': len(df),
-                'total_columns': len(df.columns)
+                'columns': schema.columns,
+                'total_rows': schema.num_rows,
+                'total_columns': schema.num_columns
             })
             
         except Exception as e:
             return self.error_response(f'Error procesando archivo: {str(e)}')
     
-    def _read_dataframe(self, file_path):
+    def _read_dataframe(self, file_path, columns=None, nrows=None):
         """
         Read DataFrame from file with format detection and error handling.
         
         Args:
             file_path: Path to the file
+            columns: Only read these columns (all by default)
+            nrows: Only read the first rows
             
         Returns:
             pandas.DataFrame: Loaded DataFrame
@@ -61,25 +61,7 @@ class DataSourceColumnsAPIView(BaseAPIView, View):
         Raises:
             Exception: If file cannot be read with any supported format
         """
-        if file_path.endswith('.parquet'):
-            return pd.read_parquet(file_path)
-        
-        elif file_path.endswith('.csv'):
-            # Try different CSV configurations
-            for delimiter in [',', ';', '\t']:
-                for encoding in ['latin-1', 'utf-8', 'cp1252']:
-                    try:
-                        return pd.read_csv(file_path, delimiter=delimiter, encoding=encoding)
-                    except (pd.errors.ParserError, UnicodeDecodeError):
-                        continue
-            
-            raise Exception("No se pudo leer el archivo CSV con ningún formato soportado")
-        
-        elif file_path.endswith(('.xlsx', '.xls')):
-            return pd.read_excel(file_path)
-        
-        else:
-            raise Exception(f"Formato de archivo no soportado: {file_path}")
+        return read_dataset(file_path, columns=columns, nrows=nrows)
     
     def _generate_columns_info(self, df):
         """
@@ -159,24 +141,24 @@ class FusionColumnsAPIView(BaseAPIView, View):
                     if validation_error:
                         continue  # Skip invalid DataSources but don't fail entirely
                     
-                    # Read DataFrame and get columns
-                    df = DataSourceColumnsAPIView()._read_dataframe(datasource.file.path)
+                    # Columns, dtypes and row count without reading the data
+                    schema = read_schema(datasource.file.path)
                     
                     # Add DataSource info
                     datasource_info.append({
                         'id': str(datasource.id),
                         'name': datasource.name,
-                        'columns': list(df.columns),
-                        'total_rows': len(df)
+                        'columns': schema.columns,
+                        'total_rows': schema.num_rows
                     })
                     
                     # Add columns to fusion list with source info
-                    for column in df.columns:
+                    for column in schema.columns:
                         fusion_columns.append({
                             'datasource_id': str(datasource.id),
                             'datasource_name': datasource.name,
                             'column': column,
-                            'dtype': str(df[column].dtype)
+                            'dtype': str(schema.dtypes[column])
                         })
                 
                 except Exception as e:
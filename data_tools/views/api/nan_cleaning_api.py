@@ -119,6 +119,7 @@ class QuickNaNCleaningAPIView(BaseAPIView, View):
                 'message': f'¡Limpieza completada! {cleaning_summary["rows_removed"]} filas y {cleaning_summary["columns_removed"]} columnas eliminadas.',
                 'summary': cleaning_summary,
                 'data_changed': True,
+                'grid_diff': session_manager.grid_diff,
                 'new_shape': final_shape,
                 'original_shape': original_shape
             })
@@ -11,6 +11,7 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
 from projects.models import DataSource
+from data_tools.services.dataset_reader import read_dataset
 from data_tools.services.session_service import (
     session_exists, load_current_dataframe, get_session_path
 )
@@ -110,17 +111,7 @@ def load_dataframe_for_pagination(datasource, user):
                 return session_df
 
         # Fallback to original file
-        file_path = datasource.file.path
-        
-        if file_path.endswith('.parquet'):
-            return pd.read_parquet(file_path)
-        elif file_path.endswith('.csv'):
-            return pd.read_csv(file_path, delimiter=',', encoding='latin-1')
-        elif file_path.endswith(('.xls', '.xlsx')):
-            return pd.read_excel(file_path)
-        else:
-            # Try Parquet as fallback
-            return pd.read_parquet(file_path)
+        return read_dataset(datasource.file.path)
 
     except Exception as e:
         logger.error(f"Error loading dataframe for pagination: {e}")
@@ -64,6 +64,9 @@ def format_success_response(message: str, session_manager=None, df: pd.DataFrame
     
     if session_manager:
         response['session_info'] = session_manager.get_session_info()
+        # Patch for the grid rows the page already shows (see grid_diff)
+        if session_manager.grid_diff is not None:
+            response['grid_diff'] = session_manager.grid_diff
     
     if df is not None:
         response['data_preview'] = get_data_preview(df)
@@ -97,6 +97,7 @@ def apply_missing_data_imputation(request, datasource_id):
         
         return JsonResponse({
             'success': True,
+            'grid_diff': session_manager.grid_diff,
             'message': f'Imputation applied successfully using {method} method',
             'affected_columns': columns,
             'shape': df_transformed.shape
@@ -175,6 +176,7 @@ def apply_feature_encoding(request, datasource_id):
         
         return JsonResponse({
             'success': True,
+            'grid_diff': session_manager.grid_diff,
             'message': f'Encoding applied successfully using {method} method',
             'affected_columns': columns,
             'shape': df_transformed.shape
@@ -251,6 +253,7 @@ def apply_feature_scaling(request, datasource_id):
         
         return JsonResponse({
             'success': True,
+            'grid_diff': session_manager.grid_diff,
             'message': f'Scaling applied successfully using {method} method',
             'affected_columns': columns,
             'shape': df_transformed.shape
@@ -324,6 +327,7 @@ def apply_outlier_treatment(request, datasource_id):
         
         return JsonResponse({
             'success': True,
+            'grid_diff': session_manager.grid_diff,
             'message': f'Outlier treatment applied successfully using {method} method',
             'affected_columns': columns,
             'shape': df_transformed.shape
@@ -402,6 +406,7 @@ def apply_feature_engineering(request, datasource_id):
         
         return JsonResponse({
             'success': True,
+            'grid_diff': session_manager.grid_diff,
             'message': f'Feature engineering applied successfully using {method} method',
             'affected_columns': columns,
             'shape': df_transformed.shape
@@ -472,6 +477,7 @@ def apply_column_operations(request, datasource_id):
         
         return JsonResponse({
             'success': True,
+            'grid_diff': session_manager.grid_diff,
             'message': f'Column operation "{operation}" applied successfully',
             'affected_columns': columns,
             'shape': df_transformed.shape
@@ -2,18 +2,20 @@
 Visualization and chart generation API views.
 Handles creation of charts and data visualizations using Plotly.
 """
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from django.http import JsonResponse
 from django.views import View
 
+from data_tools.services.chart_data import get_chart
+from data_tools.services.dataset_reader import read_dataset
 from .mixins import BaseAPIView
 
 
 class ChartGenerationAPIView(BaseAPIView, View):
     """
     API view for generating charts and visualizations from DataSource data.
-    Supports multiple chart types using Plotly.
+    Supports multiple chart types using Plotly. Charts are aggregated
+    server-side (see ``data_tools.services.chart_data``) and returned as
+    Plotly figure JSON.
     """
     
     # Supported chart types and their configurations
@@ -28,7 +30,7 @@ class ChartGenerationAPIView(BaseAPIView, View):
         },
         'bar': {
             'required_params': ['x_axis', 'y_axis'],
-            'optional_params': ['color_by', 'title']
+            'optional_params': ['color_by', 'aggregate', 'title']
         },
         'histogram': {
             'required_params': ['column'],
@@ -43,6 +45,9 @@ class ChartGenerationAPIView(BaseAPIView, View):
             'optional_params': ['title']
         }
     }
+
+    # Legacy chart type names
+    CHART_TYPE_ALIASES = {'boxplot': 'box'}
     
     def get(self, request):
         """
@@ -83,21 +88,23 @@ class ChartGenerationAPIView(BaseAPIView, View):
             # Extract parameters
             datasource_id = params.get('datasource_id')
             chart_type = params.get('chart_type', 'histogram').lower()
-            column_name = params.get('column_name')
-            x_column = params.get('x_column')
-            y_column = params.get('y_column')
+            chart_type = self.CHART_TYPE_ALIASES.get(chart_type, chart_type)
+            
+            if not datasource_id:
+                return JsonResponse({
+                    'error': 'Se requiere el parámetro: datasource_id'
+                }, status=400)
+            
+            if chart_type not in self.SUPPORTED_CHART_TYPES:
+                return JsonResponse({
+                    'error': f'Tipo de gráfico no soportado: {chart_type}'
+                }, status=400)
             
             # Parameter validation based on chart type
-            if chart_type == 'scatter':
-                if not datasource_id or not x_column or not y_column:
-                    return JsonResponse({
-                        'error': 'Para gráficos de dispersión se requieren: datasource_id, x_column y y_column'
-                    }, status=400)
-            else:
-                if not datasource_id or not column_name:
-                    return JsonResponse({
-                        'error': 'Se requieren los parámetros: datasource_id y column_name'
-                    }, status=400)
+            try:
+                config = self._validate_chart_parameters(self._chart_parameters(params, chart_type), chart_type)
+            except ValueError as e:
+                return JsonResponse({'error': str(e)}, status=400)
             
             # Validate UUID format
             from uuid import UUID
@@ -109,8 +116,8 @@ class ChartGenerationAPIView(BaseAPIView, View):
                 }, status=400)
             
             # Get and validate DataSource with user permission check
+            from projects.models.datasource import DataSource
             try:
-                from projects.models.datasource import DataSource
                 datasource = DataSource.objects.get(id=datasource_id, project__owner=request.user)
             except DataSource.DoesNotExist:
                 return JsonResponse({
@@ -123,30 +130,34 @@ class ChartGenerationAPIView(BaseAPIView, View):
                     'error': f'DataSource "{datasource.name}" no está listo (estado: {datasource.status})'
                 }, status=400)
             
-            # Load data with multiple format support
-            df = self._read_dataframe_multi_format(datasource.file.path)
-            
-            # Generate chart based on type (simplified approach for backward compatibility)
-            chart_html = self._generate_simple_chart(df, chart_type, column_name, x_column, y_column)
+            # Cached per datasource version and chart spec; the file is only
+            # read (and only the referenced columns) on a cache miss
+            try:
+                chart = get_chart(
+                    datasource, chart_type, config,
+                    lambda columns: self._read_dataframe_multi_format(datasource.file.path, columns)
+                )
+            except ValueError as e:
+                return JsonResponse({'error': str(e)}, status=400)
             
             # Prepare response data
             response_data = {
                 'success': True,
-                'chart_html': chart_html,
                 'chart_type': chart_type,
+                'figure': chart['figure'],
+                'data_points': chart['data_points'],
+                'rendered_points': chart['rendered_points'],
             }
             
             # Add appropriate metadata based on chart type
-            if chart_type == 'scatter':
-                response_data.update({
-                    'x_column': x_column,
-                    'y_column': y_column,
-                    'data_points': len(df)
-                })
+            if 'column' in config:
+                response_data['column_name'] = config['column']
+            elif chart_type == 'box':
+                response_data['column_name'] = config['y_axis']
             else:
                 response_data.update({
-                    'column_name': column_name,
-                    'data_points': len(df)
+                    'x_column': config.get('x_axis'),
+                    'y_column': config.get('y_axis')
                 })
             
             return JsonResponse(response_data)
@@ -156,18 +167,27 @@ class ChartGenerationAPIView(BaseAPIView, View):
                 'error': f'Error inesperado: {str(e)}'
             }, status=500)
     
-    def _load_dataframe(self, datasource):
+    def _chart_parameters(self, params, chart_type):
         """
-        Load DataFrame from DataSource file.
+        Chart parameters with the legacy names (column_name, x_column,
+        y_column) mapped onto the chart specification names.
         
         Args:
-            datasource: DataSource object
+            params: GET or POST parameters
+            chart_type: Type of chart to generate
             
         Returns:
-            pandas.DataFrame: Loaded data
-        """
-        from .datasource_api_views import DataSourceColumnsAPIView
-        return DataSourceColumnsAPIView()._read_dataframe(datasource.file.path)
+            dict: Parameters keyed by specification name
+        """
+        parameters = {key: params.get(key) for key in params}
+        if params.get('column_name'):
+            target = 'column' if chart_type == 'histogram' else 'y_axis'
+            parameters.setdefault(target, params.get('column_name'))
+        if params.get('x_column'):
+            parameters.setdefault('x_axis', params.get('x_column'))
+        if params.get('y_column'):
+            parameters.setdefault('y_axis', params.get('y_column'))
+        return parameters
     
     def _validate_chart_parameters(self, post_data, chart_type):
         """
@@ -201,262 +221,15 @@ class ChartGenerationAPIView(BaseAPIView, View):
         
         return config
     
-    def _generate_chart(self, df, chart_type, config):
-        """
-        Generate chart using Plotly based on type and configuration.
-        
-        Args:
-            df: pandas.DataFrame with data
-            chart_type: Type of chart to generate
-            config: Chart configuration parameters
-            
-        Returns:
-            dict: Plotly chart data
-        """
-        # Validate columns exist in DataFrame
-        self._validate_columns_exist(df, config)
-        
-        # Generate chart based on type
-        if chart_type == 'scatter':
-            fig = self._create_scatter_plot(df, config)
-        elif chart_type == 'line':
-            fig = self._create_line_plot(df, config)
-        elif chart_type == 'bar':
-            fig = self._create_bar_plot(df, config)
-        elif chart_type == 'histogram':
-            fig = self._create_histogram(df, config)
-        elif chart_type == 'box':
-            fig = self._create_box_plot(df, config)
-        elif chart_type == 'heatmap':
-            fig = self._create_heatmap(df, config)
-        else:
-            raise ValueError(f'Tipo de gráfico no implementado: {chart_type}')
-        
-        # Apply common styling
-        self._apply_common_styling(fig, config)
-        
-        # Convert to JSON
-        return fig.to_dict()
-    
-    def _validate_columns_exist(self, df, config):
-        """
-        Validate that all specified columns exist in the DataFrame.
-        
-        Args:
-            df: pandas.DataFrame to validate against
-            config: Chart configuration with column names
-            
-        Raises:
-            ValueError: If any column doesn't exist
-        """
-        available_columns = set(df.columns)
-        
-        for key, value in config.items():
-            if key.endswith(('_axis', '_by')) or key in ['column', 'values']:
-                if value not in available_columns:
-                    raise ValueError(
-                        f'Columna "{value}" no existe en el dataset. '
-                        f'Columnas disponibles: {", ".join(available_columns)}'
-                    )
-    
-    def _create_scatter_plot(self, df, config):
-        """Create scatter plot."""
-        return px.scatter(
-            df,
-            x=config['x_axis'],
-            y=config['y_axis'],
-            color=config.get('color_by'),
-            size=config.get('size_by'),
-            title=config.get('title', 'Scatter Plot')
-        )
-    
-    def _create_line_plot(self, df, config):
-        """Create line plot."""
-        return px.line(
-            df,
-            x=config['x_axis'],
-            y=config['y_axis'],
-            color=config.get('color_by'),
-            title=config.get('title', 'Line Plot')
-        )
-    
-    def _create_bar_plot(self, df, config):
-        """Create bar plot."""
-        return px.bar(
-            df,
-            x=config['x_axis'],
-            y=config['y_axis'],
-            color=config.get('color_by'),
-            title=config.get('title', 'Bar Plot')
-        )
-    
-    def _create_histogram(self, df, config):
-        """Create histogram."""
-        return px.histogram(
-            df,
-            x=config['column'],
-            nbins=int(config.get('bins', 30)),
-            color=config.get('color_by'),
-            title=config.get('title', 'Histogram')
-        )
-    
-    def _create_box_plot(self, df, config):
-        """Create box plot."""
-        return px.box(
-            df,
-            x=config.get('x_axis'),
-            y=config['y_axis'],
-            color=config.get('color_by'),
-            title=config.get('title', 'Box Plot')
-        )
-    
-    def _create_heatmap(self, df, config):
-        """Create heatmap."""
-        # For heatmap, we need to pivot the data
-        pivot_df = df.pivot_table(
-            values=config['values'],
-            index=config['y_axis'],
-            columns=config['x_axis'],
-            aggfunc='mean'
-        )
-        
-        return px.imshow(
-            pivot_df,
-            title=config.get('title', 'Heatmap'),
-            aspect='auto'
-        )
-    
-    def _read_dataframe_multi_format(self, file_path):
+    def _read_dataframe_multi_format(self, file_path, columns=None):
         """
         Read DataFrame with multiple format support (backward compatibility).
         
         Args:
             file_path: Path to the file
+            columns: Only read these columns (missing ones are skipped)
             
         Returns:
             pandas.DataFrame: Loaded DataFrame
         """
-        import pandas as pd
-        
-        if file_path.endswith('.parquet'):
-            return pd.read_parquet(file_path)
-        elif file_path.endswith('.csv'):
-            # Try different CSV configurations like original
-            try:
-                return pd.read_csv(file_path, delimiter=',', encoding='latin-1')
-            except pd.errors.ParserError:
-                try:
-                    return pd.read_csv(file_path, delimiter=';', encoding='latin-1')
-                except pd.errors.ParserError:
-                    try:
-                        return pd.read_csv(file_path, delimiter='\t', encoding='latin-1')
-                    except pd.errors.ParserError as e:
-                        raise Exception(f'Error al analizar el archivo CSV: {str(e)}')
-        elif file_path.endswith(('.xls', '.xlsx')):
-            return pd.read_excel(file_path)
-        else:
-            try:
-                return pd.read_parquet(file_path)
-            except Exception as e:
-                raise Exception(f'Error reading file: {str(e)}')
-    
-    def _generate_simple_chart(self, df, chart_type, column_name, x_column, y_column):
-        """
-        Generate simple chart HTML (backward compatibility).
-        
-        Args:
-            df: pandas.DataFrame with data
-            chart_type: Type of chart
-            column_name: Column for single-column charts
-            x_column: X-axis column for scatter plots
-            y_column: Y-axis column for scatter plots
-            
-        Returns:
-            str: Chart HTML
-        """
-        import plotly.express as px
-        
-        # Handle column validation based on chart type
-        if chart_type == 'scatter':
-            # Validate both X and Y columns for scatter plots
-            if x_column not in df.columns:
-                raise Exception(f'La columna X "{x_column}" no existe en el dataset')
-            
-            if y_column not in df.columns:
-                raise Exception(f'La columna Y "{y_column}" no existe en el dataset')
-            
-            # Check if both columns are numeric
-            if not pd.api.types.is_numeric_dtype(df[x_column]):
-                raise Exception(f'La columna X "{x_column}" no es numérica')
-            
-            if not pd.api.types.is_numeric_dtype(df[y_column]):
-                raise Exception(f'La columna Y "{y_column}" no es numérica')
-            
-            # Remove rows with null values in either column
-            plot_data = df[[x_column, y_column]].dropna()
-            
-            if len(plot_data) == 0:
-                raise Exception(f'No hay datos válidos para las columnas "{x_column}" y "{y_column}"')
-            
-            fig = px.scatter(
-                x=plot_data[x_column],
-                y=plot_data[y_column],
-                title=f'Diagrama de Dispersión: {x_column} vs {y_column}',
-                labels={'x': x_column, 'y': y_column}
-            )
-            fig.update_layout(
-                xaxis_title=x_column,
-                yaxis_title=y_column,
-                template='plotly_white',
-                height=400
-            )
-                
-        else:
-            # Single column validation for histogram and boxplot
-            if column_name not in df.columns:
-                raise Exception(f'La columna "{column_name}" no existe en el dataset')
-            
-            # Check if column is numeric
-            if not pd.api.types.is_numeric_dtype(df[column_name]):
-                raise Exception(f'La columna "{column_name}" no es numérica')
-            
-            # Remove null values for plotting
-            column_data = df[column_name].dropna()
-            
-            if len(column_data) == 0:
-                raise Exception(f'La columna "{column_name}" no tiene datos válidos')
-
-            # Generate chart based on type
-            if chart_type == 'histogram':
-                fig = px.histogram(
-                    x=column_data,
-                    nbins=30,
-                    title=f'Distribución de {column_name}',
-                    labels={'x': column_name, 'y': 'Frecuencia'}
-                )
-                fig.update_layout(
-                    xaxis_title=column_name,
-                    yaxis_title='Frecuencia',
-                    template='plotly_white',
-                    height=400
-                )
-            elif chart_type == 'boxplot':
-                fig = px.box(
-                    y=column_data,
-                    title=f'Diagrama de Caja de {column_name}',
-                    labels={'y': column_name}
-                )
-                fig.update_layout(
-                    yaxis_title=column_name,
-                    template='plotly_white',
-                    height=400
-                )
-            else:
-                raise Exception(f'Tipo de gráfico no soportado: {chart_type}')
-        
-        # Convert to HTML
-        return fig.to_html(
-            include_plotlyjs=False,  # Don't include plotly.js since it's already loaded
-            div_id="plotly-chart",
-            config={'responsive': True, 'displayModeBar': True}
-        )
+        return read_dataset(file_path, columns=columns, copy=False)
@@ -13,8 +13,10 @@ from django.urls import reverse
 from django.core.files.base import ContentFile
 
 from projects.models import DataSource
+from data_tools.services.dataset_reader import read_dataset
 from core.utils.breadcrumbs import create_basic_breadcrumbs
 from data_tools.services.data_analysis_service import calculate_nullity_report
+from data_tools.services.grid_diff import STUDIO_GRID_ROWS
 from data_tools.services.session_manager import (
     get_session_manager, SessionConfig
 )
@@ -80,6 +82,8 @@ def data_studio_page(request, pk):
             if session_df is not None:
                 df = session_df
                 session_data = session_manager.get_session_info()
+                # Operation responses patch the rows rendered here
+                session_manager.sync_grid_window(df)
         else:
             # Fallback to legacy file-based session check
             legacy_session_exists = session_exists(datasource, request.user)
@@ -116,7 +120,7 @@ def data_studio_page(request, pk):
         if not df.empty:
             # For very large datasets (>50k rows), we might want to implement chunking
             # But for typical datasets, AG Grid's virtualization handles this well
-            max_rows = 10000  # Safety limit for frontend performance
+            max_rows = STUDIO_GRID_ROWS  # Safety limit for frontend performance
             if len(df) > max_rows:
                 logger.warning(f"Large dataset detected ({len(df)} rows). Loading first {max_rows} rows for frontend.")
                 sample_data = df.head(max_rows).fillna('').to_dict('records')
@@ -182,20 +186,10 @@ def load_dataframe_from_source(datasource):
         pd.DataFrame or None: Loaded dataframe
     """
     try:
-        file_path = datasource.file.path
-        
-        if file_path.endswith('.parquet'):
-            return pd.read_parquet(file_path)
-        elif file_path.endswith('.csv'):
-            return pd.read_csv(file_path, delimiter=',', encoding='latin-1')
-        elif file_path.endswith(('.xls', '.xlsx')):
-            return pd.read_excel(file_path)
-        else:
-            # Try Parquet as fallback
-            return pd.read_parquet(file_path)
+        return read_dataset(datasource.file.path)
             
     except Exception as e:
-        logger.error(f"Error loading dataframe from {file_path}: {e}")
+        logger.error(f"Error loading dataframe from {datasource.file.name}: {e}")
         sentry_sdk.capture_exception(e)
         return None
 
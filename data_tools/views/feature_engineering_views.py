@@ -4,7 +4,7 @@ from django.contrib.auth.decorators import login_required
 from projects.models.datasource import DataSource
 # Import moved inside function to avoid circular import (Django best practice)
 from ..forms import FeatureEngineeringForm
-import pandas as pd
+from ..services.dataset_reader import read_schema
 
 @login_required
 def feature_engineering_page(request, datasource_id):
@@ -36,8 +36,8 @@ def feature_engineering_page(request, datasource_id):
     else:
         form = FeatureEngineeringForm()
 
-    df = pd.read_csv(parent_datasource.file.path)
-    columns = df.columns.tolist()
+    # Works for CSV and Parquet sources; only the column names are needed
+    columns = list(read_schema(parent_datasource.file.path).columns)
 
     return render(request, 'data_tools/feature_engineering.html', {
         'form': form,
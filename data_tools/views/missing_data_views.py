@@ -10,6 +10,7 @@ from django.urls import reverse
 
 from projects.models import DataSource
 from core.utils.breadcrumbs import create_basic_breadcrumbs
+from ..services.nullity_service import get_nullity_heatmap
 from ..tasks import deep_missing_data_analysis_task
 
 logger = logging.getLogger(__name__)
@@ -101,6 +102,37 @@ def run_deep_missing_analysis_api(request):
         }, status=500)
 
 
+@require_http_methods(["GET"])
+@login_required
+def nullity_heatmap_api(request, datasource_id):
+    """
+    Mapa de calor de nulidad agregado por bloques de filas, en JSON compacto.
+
+    Parámetros GET:
+        columns: columnas separadas por comas (por defecto todas)
+        bins: número de bloques de filas
+        cluster: '0' para conservar el orden original de las columnas
+    """
+    datasource = get_object_or_404(DataSource, id=datasource_id, project__owner=request.user)
+
+    columns = [c for c in request.GET.get('columns', '').split(',') if c] or None
+    cluster = request.GET.get('cluster', '1') != '0'
+    try:
+        n_bins = int(request.GET['bins']) if 'bins' in request.GET else None
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'bins must be an integer'}, status=400)
+    if n_bins is not None:
+        n_bins = max(1, min(n_bins, 2000))
+
+    try:
+        heatmap = get_nullity_heatmap(datasource, columns, n_bins=n_bins, cluster=cluster)
+    except Exception as e:
+        logger.error(f"Nullity heatmap failed for DataSource {datasource_id}: {e}", exc_info=True)
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+    return JsonResponse(heatmap)
+
+
 @login_required
 def missing_data_results_page(request, task_id):
     """
@@ -14,6 +14,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.core.files.base import ContentFile
 
 from projects.models import DataSource
+from data_tools.services.dataset_reader import read_dataset
 from data_tools.services.session_service import (
     initialize_session, load_current_dataframe, save_current_dataframe,
     get_session_path, load_session_metadata, clear_session_files
@@ -37,19 +38,7 @@ def handle_start_session(request, datasource):
     """
     try:
         # Load original dataframe
-        file_path = datasource.file.path
-        
-        if file_path.endswith('.parquet'):
-            df = pd.read_parquet(file_path)
-        elif file_path.endswith('.csv'):
-            df = pd.read_csv(file_path, delimiter=',', encoding='latin-1')
-        elif file_path.endswith(('.xls', '.xlsx')):
-            df = pd.read_excel(file_path)
-        else:
-            return JsonResponse({
-                'success': False,
-                'error': 'Unsupported file format'
-            })
+        df = read_dataset(datasource.file.path)
 
         # Initialize session
         success, session_path = initialize_session(datasource, request.user, df)
@@ -6,6 +6,7 @@ from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 
 from projects.models import DataSource
+from data_tools.services.dataset_reader import read_dataset
 
 
 @login_required
@@ -33,10 +34,9 @@ def get_datasource_json(request, pk):
 
         # ... (resto del código de la vista que ya funcionaba) ...
         try:
-            # All files are now converted to Parquet format
-            df = pd.read_parquet(file_path)
-            if len(df) > 100:
-                df = df.head(100)
+            # All files are now converted to Parquet format; only the
+            # row groups holding the first 100 rows are read
+            df = read_dataset(file_path, nrows=100)
         except pd.errors.ParserError as e:
             return JsonResponse({'error': f"Error al analizar el archivo: {str(e)}"}, status=400)
 
@@ -13,6 +13,12 @@ from asgiref.sync import sync_to_async
 from typing import Dict, Any, Optional
 import time
 
+from .progress_publisher import (
+    register_subscriber, unregister_subscriber,
+    publish_transformation_update, publish_session_update,
+    publish_bulk_progress, publish_error
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +33,8 @@ class DataStudioConsumer(AsyncWebsocketConsumer):
         self.user_id = None
         self.session_group = None
         self.user_group = None
+        self.operation_groups = set()
+        self._frame_buffer = None
         
     async def connect(self):
         """
@@ -58,6 +66,8 @@ class DataStudioConsumer(AsyncWebsocketConsumer):
         # Join groups
         await self.channel_layer.group_add(self.session_group, self.channel_name)
         await self.channel_layer.group_add(self.user_group, self.channel_name)
+        await register_subscriber(self.session_group)
+        await register_subscriber(self.user_group)
         
         # Accept connection
         await self.accept()
@@ -79,8 +89,14 @@ class DataStudioConsumer(AsyncWebsocketConsumer):
         # Leave groups
         if self.session_group:
             await self.channel_layer.group_discard(self.session_group, self.channel_name)
+            await unregister_subscriber(self.session_group)
         if self.user_group:
             await self.channel_layer.group_discard(self.user_group, self.channel_name)
+            await unregister_subscriber(self.user_group)
+        for operation_group in list(self.operation_groups):
+            await self.channel_layer.group_discard(operation_group, self.channel_name)
+            await unregister_subscriber(operation_group)
+        self.operation_groups.clear()
             
         logger.info(f"WebSocket disconnected: User {self.user_id}, Code {close_code}")
     
@@ -123,12 +139,34 @@ class DataStudioConsumer(AsyncWebsocketConsumer):
         """
         Send message to WebSocket client with error handling
         """
+        if self._frame_buffer is not None:
+            self._frame_buffer.append(message)
+            return
         try:
             await self.send(text_data=json.dumps(message))
         except Exception as e:
             logger.error(f"Error sending WebSocket message: {e}")
     
     # Group message handlers
+    async def batched_update(self, event):
+        """Handle coalesced events from the progress publisher as one frame"""
+        self._frame_buffer = []
+        try:
+            for inner_event in event['events']:
+                handler = getattr(self, inner_event['type'], None)
+                if handler and inner_event['type'] != 'batched_update':
+                    await handler(inner_event)
+            messages = self._frame_buffer
+        finally:
+            self._frame_buffer = None
+        
+        if messages:
+            await self.send_message({
+                'type': 'batch',
+                'messages': messages,
+                'timestamp': time.time()
+            })
+    
     async def data_transformation_update(self, event):
         """Handle data transformation progress updates"""
         await self.send_message({
@@ -195,6 +233,9 @@ class DataStudioConsumer(AsyncWebsocketConsumer):
         """Subscribe to specific operation updates"""
         operation_group = f'operation_{operation_id}'
         await self.channel_layer.group_add(operation_group, self.channel_name)
+        if operation_group not in self.operation_groups:
+            self.operation_groups.add(operation_group)
+            await register_subscriber(operation_group)
         
         await self.send_message({
             'type': 'subscription_confirmed',
@@ -206,6 +247,9 @@ class DataStudioConsumer(AsyncWebsocketConsumer):
         """Unsubscribe from specific operation updates"""
         operation_group = f'operation_{operation_id}'
         await self.channel_layer.group_discard(operation_group, self.channel_name)
+        if operation_group in self.operation_groups:
+            self.operation_groups.discard(operation_group)
+            await unregister_subscriber(operation_group)
         
         await self.send_message({
             'type': 'subscription_cancelled',
@@ -368,36 +412,25 @@ class DataStudioNotifier:
 
 
 # Synchronous wrapper functions for Django views
+# These route through the progress publisher, which rate-limits and batches
+# updates per operation instead of doing one group_send per call.
 def sync_send_transformation_update(datasource_id: str, operation_id: str, 
                                   progress: float, status: str, message: str = None):
     """Synchronous wrapper for sending transformation updates"""
-    import asyncio
-    from asgiref.sync import async_to_sync
-    
-    async_to_sync(DataStudioNotifier.send_transformation_update)(
-        datasource_id, operation_id, progress, status, message
-    )
+    publish_transformation_update(datasource_id, operation_id, progress, status, message)
 
 
 def sync_send_session_update(datasource_id: str, session_info: Dict[str, Any]):
     """Synchronous wrapper for sending session updates"""
-    from asgiref.sync import async_to_sync
-    
-    async_to_sync(DataStudioNotifier.send_session_update)(datasource_id, session_info)
+    publish_session_update(datasource_id, session_info)
 
 
 def sync_send_bulk_progress(operation_id: str, processed: int, total: int, 
                           status: str, errors: list = None):
     """Synchronous wrapper for sending bulk progress updates"""
-    from asgiref.sync import async_to_sync
-    
-    async_to_sync(DataStudioNotifier.send_bulk_progress)(
-        operation_id, processed, total, status, errors
-    )
+    publish_bulk_progress(operation_id, processed, total, status, errors)
 
 
 def sync_send_error(datasource_id: str, error_type: str, message: str, details: str = None):
     """Synchronous wrapper for sending error notifications"""
-    from asgiref.sync import async_to_sync
-    
-    async_to_sync(DataStudioNotifier.send_error)(datasource_id, error_type, message, details)
\ No newline at end of file
+    publish_error(datasource_id, error_type, message, details)
@@ -0,0 +1,240 @@
+"""
+Progress Publisher for Data Studio WebSocket Updates
+Coalesces high-frequency progress events before they reach the channel layer
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Statuses that end an operation and must never be delayed or dropped by coalescing
+TERMINAL_STATUSES = frozenset({'completed', 'failed', 'cancelled', 'error'})
+
+SUBSCRIBER_KEY_PREFIX = 'ws_subscribers'
+SUBSCRIBER_KEY_TIMEOUT = 24 * 3600
+
+
+def subscriber_key(group: str) -> str:
+    """Cache key holding the number of live consumers in a channel group"""
+    return f"{SUBSCRIBER_KEY_PREFIX}:{group}"
+
+
+async def register_subscriber(group: str):
+    """Record that a consumer joined ``group``"""
+    key = subscriber_key(group)
+    try:
+        await cache.aadd(key, 0, timeout=SUBSCRIBER_KEY_TIMEOUT)
+        await cache.aincr(key)
+    except Exception as e:
+        logger.warning(f"Could not register subscriber for {group}: {e}")
+
+
+async def unregister_subscriber(group: str):
+    """Record that a consumer left ``group``"""
+    key = subscriber_key(group)
+    try:
+        count = await cache.aget(key)
+        if count:
+            await cache.adecr(key)
+    except Exception as e:
+        logger.warning(f"Could not unregister subscriber for {group}: {e}")
+
+
+def has_subscribers(group: str) -> bool:
+    """
+    Check whether a group has live consumers.
+
+    Only an explicit zero count suppresses sends: a missing key means the
+    count is unknown (e.g. a per-process cache), so the message is sent.
+    """
+    try:
+        return cache.get(subscriber_key(group)) != 0
+    except Exception:
+        return True
+
+
+def _channel_layer_send(group: str, message: Dict[str, Any]):
+    """Default sender: push one message through the configured channel layer"""
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(group, message)
+
+
+class ProgressPublisher:
+    """
+    Rate-limited, latest-value-wins publisher for channel group events.
+
+    Events are keyed by (event type, operation id). Within one flush interval
+    only the newest event per key is kept; when the interval elapses every
+    pending event for the group is sent in a single ``batched_update`` frame.
+    Terminal events flush immediately so clients never miss completion.
+    """
+
+    def __init__(self, max_rate: Optional[float] = None,
+                 send_func: Callable[[str, Dict[str, Any]], None] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 use_timers: bool = True):
+        if max_rate is None:
+            max_rate = getattr(settings, 'DATA_STUDIO_PROGRESS_MAX_RATE', 4.0)
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.send_func = send_func or _channel_layer_send
+        self.clock = clock
+        self.use_timers = use_timers
+        self.lock = threading.RLock()
+        self.pending: Dict[str, Dict[Tuple[str, Optional[str]], Dict[str, Any]]] = {}
+        self.last_flush: Dict[str, float] = {}
+        self.timers: Dict[str, threading.Timer] = {}
+        self.stats = {
+            'published': 0,
+            'coalesced': 0,
+            'frames_sent': 0,
+            'events_sent': 0,
+            'skipped_no_subscribers': 0,
+            'send_errors': 0,
+        }
+
+    def publish(self, group: str, event: Dict[str, Any], force: bool = False):
+        """
+        Queue an event for ``group``, sending it now if the group is due.
+
+        Args:
+            group: Channel group name
+            event: Channel layer message (must contain ``type``)
+            force: Flush the group immediately regardless of rate
+        """
+        key = (event['type'], event.get('operation_id'))
+        force = force or event.get('status') in TERMINAL_STATUSES
+
+        with self.lock:
+            self.stats['published'] += 1
+            group_pending = self.pending.setdefault(group, {})
+            if key in group_pending:
+                self.stats['coalesced'] += 1
+            group_pending[key] = event
+
+            wait = self.min_interval - (self.clock() - self.last_flush.get(group, float('-inf')))
+            if not force and wait > 0:
+                self._schedule_flush(group, wait)
+                return
+            events = self._take_pending(group)
+
+        self._send(group, events)
+
+    def flush(self, group: Optional[str] = None):
+        """Send pending events now for one group, or for all groups"""
+        with self.lock:
+            groups = [group] if group else list(self.pending.keys())
+        for name in groups:
+            with self.lock:
+                events = self._take_pending(name)
+            self._send(name, events)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get publisher counters"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['pending_groups'] = len(self.pending)
+            return stats
+
+    def _take_pending(self, group: str) -> list:
+        """Pop pending events for a group and mark it as flushed (lock held)"""
+        timer = self.timers.pop(group, None)
+        if timer:
+            timer.cancel()
+        events = list(self.pending.pop(group, {}).values())
+        if any(event.get('status') in TERMINAL_STATUSES for event in events):
+            # The operation is over: forget the group instead of keeping one
+            # timestamp per finished operation forever
+            self.last_flush.pop(group, None)
+        elif events:
+            self.last_flush[group] = self.clock()
+        return events
+
+    def _schedule_flush(self, group: str, delay: float):
+        """Make sure the trailing value of a group is delivered (lock held)"""
+        if not self.use_timers or group in self.timers:
+            return
+        timer = threading.Timer(delay, self.flush, args=(group,))
+        timer.daemon = True
+        self.timers[group] = timer
+        timer.start()
+
+    def _send(self, group: str, events: list):
+        """Send events as one frame, skipping groups without subscribers"""
+        if not events:
+            return
+        if not has_subscribers(group):
+            with self.lock:
+                self.stats['skipped_no_subscribers'] += len(events)
+            return
+
+        if len(events) == 1:
+            message = events[0]
+        else:
+            message = {'type': 'batched_update', 'events': events}
+
+        try:
+            self.send_func(group, message)
+            with self.lock:
+                self.stats['frames_sent'] += 1
+                self.stats['events_sent'] += len(events)
+        except Exception as e:
+            with self.lock:
+                self.stats['send_errors'] += 1
+            logger.error(f"Error publishing to {group}: {e}")
+
+
+# Global progress publisher
+progress_publisher = ProgressPublisher()
+
+
+def publish_transformation_update(datasource_id: str, operation_id: str,
+                                  progress: float, status: str, message: str = None):
+    """Publish transformation progress for a Data Studio session"""
+    progress_publisher.publish(f'data_studio_session_{datasource_id}', {
+        'type': 'data_transformation_update',
+        'operation_id': operation_id,
+        'progress': progress,
+        'status': status,
+        'message': message
+    })
+
+
+def publish_session_update(datasource_id: str, session_info: Dict[str, Any]):
+    """Publish session state for a Data Studio session"""
+    progress_publisher.publish(f'data_studio_session_{datasource_id}', {
+        'type': 'session_state_changed',
+        'session_info': session_info
+    })
+
+
+def publish_bulk_progress(operation_id: str, processed: int, total: int,
+                          status: str, errors: list = None):
+    """Publish bulk operation progress to the operation group"""
+    progress_publisher.publish(f'operation_{operation_id}', {
+        'type': 'bulk_operation_progress',
+        'operation_id': operation_id,
+        'processed': processed,
+        'total': total,
+        'status': status,
+        'errors': errors or []
+    })
+
+
+def publish_error(datasource_id: str, error_type: str, message: str, details: str = None):
+    """Publish an error notification, flushing any queued progress first"""
+    progress_publisher.publish(f'data_studio_session_{datasource_id}', {
+        'type': 'error_notification',
+        'error_type': error_type,
+        'message': message,
+        'details': details
+    }, force=True)
+
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import MLExperiment, ExperimentSuite
+from .models import MLExperiment, ExperimentSuite, SplitArtifact
 
 @admin.register(MLExperiment)
 class MLExperimentAdmin(admin.ModelAdmin):
@@ -16,7 +16,8 @@ class MLExperimentAdmin(admin.ModelAdmin):
             'fields': ('input_datasource', 'target_column', 'model_name', 'feature_set', 'hyperparameters')
         }),
         ('Training Configuration', {
-            'fields': ('test_split_size', 'split_random_state', 'split_strategy')
+            'fields': ('test_split_size', 'split_random_state', 'split_strategy', 'validation_strategy',
+                       'cv_n_splits', 'cv_gap', 'cv_max_train_size')
         }),
         ('Suite & Versioning', {
             'fields': ('suite', 'parent_experiment', 'forked_from', 'version')
@@ -53,6 +54,9 @@ class ExperimentSuiteAdmin(admin.ModelAdmin):
         ('Study Configuration', {
             'fields': ('study_type', 'base_experiment', 'search_space', 'optimization_metric')
         }),
+        ('Sweep Execution', {
+            'fields': ('n_trials', 'timeout_seconds', 'parallelism', 'pruner')
+        }),
         ('Status', {
             'fields': ('status',)
         }),
@@ -60,4 +64,14 @@ class ExperimentSuiteAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at', 'started_at', 'completed_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(SplitArtifact)
+class SplitArtifactAdmin(admin.ModelAdmin):
+    """
+    Configuración del panel de administrador para los splits compartidos.
+    """
+    list_display = ('cache_key', 'datasource', 'n_rows', 'ref_count', 'created_at', 'last_used_at')
+    search_fields = ('cache_key', 'datasource__name')
+    readonly_fields = ('cache_key', 'config', 'artifact_paths', 'n_rows', 'ref_count', 'created_at', 'last_used_at')
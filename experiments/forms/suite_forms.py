@@ -18,7 +18,8 @@ class ExperimentSuiteForm(forms.ModelForm):
     
     class Meta:
         model = ExperimentSuite
-        fields = ['name', 'description', 'study_type', 'base_experiment', 'search_space', 'optimization_metric']
+        fields = ['name', 'description', 'study_type', 'base_experiment', 'search_space', 'optimization_metric',
+                  'n_trials', 'timeout_seconds', 'parallelism', 'pruner']
         widgets = {
             'description': forms.Textarea(attrs={'rows': 4}),
             'search_space': forms.Textarea(attrs={
@@ -31,14 +32,22 @@ class ExperimentSuiteForm(forms.ModelForm):
             'description': 'Descripción',
             'study_type': 'Tipo de Estudio',
             'search_space': 'Espacio de Búsqueda (JSON)',
-            'optimization_metric': 'Métrica de Optimización'
+            'optimization_metric': 'Métrica de Optimización',
+            'n_trials': 'Número de Trials',
+            'timeout_seconds': 'Tiempo Límite (segundos)',
+            'parallelism': 'Trials en Paralelo',
+            'pruner': 'Poda de Trials'
         }
         help_texts = {
             'name': 'Nombre descriptivo para el suite de experimentos.',
             'description': 'Descripción detallada del objetivo del estudio.',
             'study_type': 'Tipo de estudio que realizará este suite.',
             'search_space': 'Definición JSON de los parámetros a explorar.',
-            'optimization_metric': 'Métrica objetivo para optimizar (ej: r2_score, accuracy, f1_score).'
+            'optimization_metric': 'Métrica objetivo para optimizar (ej: r2_score, accuracy, f1_score).',
+            'n_trials': 'Total de trials de Optuna para barridos de hiperparámetros.',
+            'timeout_seconds': 'Opcional. No se inician nuevos trials después de este tiempo.',
+            'parallelism': 'Número de workers de Celery que ejecutan trials simultáneamente.',
+            'pruner': 'Detiene temprano los trials poco prometedores según métricas intermedias.'
         }
 
     def __init__(self, project=None, *args, **kwargs):
@@ -68,6 +77,14 @@ class ExperimentSuiteForm(forms.ModelForm):
                 Field('optimization_metric', css_class='form-control'),
                 css_class='mb-4'
             ),
+            Fieldset(
+                'Ejecución del Barrido',
+                Field('n_trials', css_class='form-control'),
+                Field('timeout_seconds', css_class='form-control'),
+                Field('parallelism', css_class='form-control'),
+                Field('pruner', css_class='form-control'),
+                css_class='mb-4'
+            ),
             Fieldset(
                 'Parámetros de Búsqueda',
                 Field('search_space', css_class='form-control font-monospace'),
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from experiments.models import MLExperiment
+from experiments.tracking import configure_tracking
 import mlflow
 import mlflow.sklearn
 from mlflow.entities import ViewType
@@ -17,8 +18,9 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         try:
-            # Set MLflow tracking URI
-            mlflow.set_tracking_uri("http://mlflow:5000")
+            # Use the tracking URI configured for the project
+            tracking_uri = configure_tracking()
+            self.stdout.write(f'MLflow tracking URI: {tracking_uri}')
             
             experiment_id = options.get('experiment_id')
             
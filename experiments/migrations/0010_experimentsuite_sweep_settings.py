@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0009_mlexperiment_validation_strategy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experimentsuite',
+            name='n_trials',
+            field=models.PositiveIntegerField(default=50, help_text='Total number of Optuna trials to run across all workers.'),
+        ),
+        migrations.AddField(
+            model_name='experimentsuite',
+            name='timeout_seconds',
+            field=models.PositiveIntegerField(blank=True, help_text='Optional wall-clock limit for the sweep in seconds; no new trials start after it.', null=True),
+        ),
+        migrations.AddField(
+            model_name='experimentsuite',
+            name='parallelism',
+            field=models.PositiveIntegerField(default=1, help_text="Number of Celery workers that run trials concurrently against the shared study."),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0010_experimentsuite_sweep_settings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experimentsuite',
+            name='pruner',
+            field=models.CharField(choices=[('NONE', 'Sin Poda'), ('MEDIAN', 'Mediana'), ('SUCCESSIVE_HALVING', 'Successive Halving'), ('HYPERBAND', 'Hyperband')], default='MEDIAN', help_text='Optuna pruner that stops unpromising trials based on intermediate metrics.', max_length=20),
+        ),
+    ]
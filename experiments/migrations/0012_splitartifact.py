@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0011_experimentsuite_pruner'),
+        ('projects', '0011_add_column_flags_only'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SplitArtifact',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Unique identifier for the split artifact using UUID4 format.', primary_key=True, serialize=False)),
+                ('cache_key', models.CharField(help_text='SHA-256 of the datasource version and split configuration.', max_length=64, unique=True)),
+                ('config', models.JSONField(default=dict, help_text='Split configuration covered by the cache key.')),
+                ('artifact_paths', models.JSONField(default=dict, help_text='MEDIA_ROOT-relative paths of the split Parquet files.')),
+                ('n_rows', models.PositiveIntegerField(default=0, help_text='Number of rows in the source data.')),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='Number of experiments currently using this split.')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Timestamp when the split was built.')),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Timestamp when an experiment last acquired the split.')),
+                ('datasource', models.ForeignKey(help_text='Source data the split was built from.', on_delete=django.db.models.deletion.CASCADE, related_name='split_artifacts', to='projects.datasource')),
+            ],
+            options={
+                'verbose_name': 'Split Artifact',
+                'verbose_name_plural': 'Split Artifacts',
+                'ordering': ['-last_used_at'],
+                'indexes': [models.Index(fields=['datasource', 'ref_count'], name='experiments_datasou_1d1bfa_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='mlexperiment',
+            name='split_artifact',
+            field=models.ForeignKey(blank=True, help_text='Shared train/test split used by this experiment.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='experiments', to='experiments.splitartifact'),
+        ),
+    ]
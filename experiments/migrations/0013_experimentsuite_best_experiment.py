@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0012_splitartifact'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experimentsuite',
+            name='best_experiment',
+            field=models.ForeignKey(blank=True, help_text='Child experiment with the best optimization metric, set when the suite finishes.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='best_in_suites', to='experiments.mlexperiment'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0013_experimentsuite_best_experiment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mlexperiment',
+            name='cv_n_splits',
+            field=models.PositiveSmallIntegerField(default=5, help_text='Number of folds for time series cross-validation.'),
+        ),
+        migrations.AddField(
+            model_name='mlexperiment',
+            name='cv_gap',
+            field=models.PositiveIntegerField(default=0, help_text='Samples excluded between the end of each training fold and its test fold.'),
+        ),
+        migrations.AddField(
+            model_name='mlexperiment',
+            name='cv_max_train_size',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum training samples per fold (rolling window); empty uses all past data.', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('experiments', '0014_mlexperiment_time_series_cv_settings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='splitartifact',
+            name='status',
+            field=models.CharField(choices=[('BUILDING', 'Building'), ('READY', 'Ready')], default='READY', help_text='Whether the split files are being built or ready to use.', max_length=20),
+        ),
+    ]
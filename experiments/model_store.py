@@ -0,0 +1,107 @@
+"""
+Persistence and per-worker caching of trained model artifacts.
+
+Models are written with joblib, compressed by default (tree ensembles
+shrink several times). With ``MODEL_ARTIFACT_COMPRESS = 0`` they are stored
+uncompressed instead and their numpy arrays are memory-mapped on load, so
+concurrent workers share them through the page cache.
+
+Loaded models are kept in a small LRU cache keyed by artifact path and
+modification time, so evaluation, explanations and predictions in the same
+worker reuse one loaded model. Cached models are shared: treat them as
+read-only.
+"""
+from collections import OrderedDict
+import logging
+import os
+import threading
+import time
+import warnings
+
+import joblib
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILENAME = 'trained_model.joblib'
+
+_model_cache = OrderedDict()
+_model_cache_lock = threading.Lock()
+
+
+def model_relative_path(experiment):
+    """
+    Artifact path (relative to MEDIA_ROOT) for an experiment's trained model.
+
+    Args:
+        experiment (MLExperiment): The experiment.
+
+    Returns:
+        str: Relative path of the model file.
+    """
+    return f'experiments/{experiment.id}/{MODEL_FILENAME}'
+
+
+def save_model(model, path):
+    """
+    Write a model artifact with joblib.
+
+    Args:
+        model: Fitted model.
+        path (str): Absolute destination path.
+
+    Returns:
+        int: Size of the written file in bytes.
+    """
+    compress = getattr(settings, 'MODEL_ARTIFACT_COMPRESS', 3)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump(model, path, compress=compress)
+    return os.path.getsize(path)
+
+
+def _read_model(path):
+    # Memory-map arrays of uncompressed artifacts; joblib warns and loads
+    # normally for compressed ones. Plain pickles from older experiments
+    # are read by joblib as well.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        return joblib.load(path, mmap_mode='r')
+
+
+def load_model(path):
+    """
+    Load a model artifact, reusing this worker's cached copy when current.
+
+    Args:
+        path (str): Absolute path to the model file.
+
+    Returns:
+        tuple: (model, load time in seconds; 0.0 when served from the cache)
+    """
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+
+    with _model_cache_lock:
+        if key in _model_cache:
+            _model_cache.move_to_end(key)
+            return _model_cache[key], 0.0
+
+    started = time.perf_counter()
+    model = _read_model(path)
+    load_seconds = time.perf_counter() - started
+
+    with _model_cache_lock:
+        # Drop stale versions of the same artifact
+        for cached_key in [k for k in _model_cache if k[0] == key[0]]:
+            del _model_cache[cached_key]
+        _model_cache[key] = model
+        while len(_model_cache) > getattr(settings, 'MODEL_CACHE_SIZE', 8):
+            _model_cache.popitem(last=False)
+
+    logger.debug(f"Loaded model {path} in {load_seconds:.3f}s")
+    return model, load_seconds
+
+
+def clear_model_cache():
+    """Forget all models cached in this worker."""
+    with _model_cache_lock:
+        _model_cache.clear()
@@ -1,8 +1,10 @@
 # experiments/models/__init__.py
 from .ml_experiment import MLExperiment
 from .experiment_suite import ExperimentSuite
+from .split_artifact import SplitArtifact
 
 __all__ = [
     'MLExperiment',
     'ExperimentSuite',
+    'SplitArtifact',
 ]
\ No newline at end of file
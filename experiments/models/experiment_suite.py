@@ -34,6 +34,11 @@ class ExperimentSuite(models.Model):
         base_experiment (ForeignKey): Template experiment for the suite.
         search_space (JSONField): Parameters and ranges to explore.
         optimization_metric (CharField): Target metric for optimization.
+        n_trials (PositiveIntegerField): Total Optuna trials for hyperparameter sweeps.
+        timeout_seconds (PositiveIntegerField): Optional wall-clock limit for a sweep.
+        parallelism (PositiveIntegerField): Number of Celery workers running trials concurrently.
+        pruner (CharField): Optuna pruner used to stop unpromising trials early.
+        best_experiment (ForeignKey): Best child experiment once the suite has finished.
         status (CharField): Current suite execution status.
         created_at (DateTimeField): Suite creation timestamp.
         updated_at (DateTimeField): Last modification timestamp.
@@ -71,6 +76,18 @@ class ExperimentSuite(models.Model):
         FAILED = 'FAILED', 'Falló'
         CANCELLED = 'CANCELLED', 'Cancelado'
 
+    class Pruner(models.TextChoices):
+        """
+        Optuna pruners available for hyperparameter sweeps.
+        
+        Trials report intermediate metrics (per CV fold or per batch of
+        estimators) and the pruner stops those unlikely to beat the best.
+        """
+        NONE = 'NONE', 'Sin Poda'
+        MEDIAN = 'MEDIAN', 'Mediana'
+        SUCCESSIVE_HALVING = 'SUCCESSIVE_HALVING', 'Successive Halving'
+        HYPERBAND = 'HYPERBAND', 'Hyperband'
+
     # Core identification and metadata fields
     id = models.UUIDField(
         primary_key=True, 
@@ -123,6 +140,30 @@ class ExperimentSuite(models.Model):
         help_text="The target metric to optimize (e.g., 'r2_score', 'accuracy', 'f1_score')."
     )
     
+    # Optuna sweep configuration
+    n_trials = models.PositiveIntegerField(
+        default=50,
+        help_text="Total number of Optuna trials to run across all workers."
+    )
+    
+    timeout_seconds = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Optional wall-clock limit for the sweep in seconds; no new trials start after it."
+    )
+    
+    parallelism = models.PositiveIntegerField(
+        default=1,
+        help_text="Number of Celery workers that run trials concurrently against the shared study."
+    )
+    
+    pruner = models.CharField(
+        max_length=20,
+        choices=Pruner.choices,
+        default=Pruner.MEDIAN,
+        help_text="Optuna pruner that stops unpromising trials based on intermediate metrics."
+    )
+    
     # Optuna optimization data fields
     trial_data = models.JSONField(
         default=list,
@@ -134,6 +175,15 @@ class ExperimentSuite(models.Model):
         help_text="Calculated hyperparameter importance data from Optuna study."
     )
     
+    best_experiment = models.ForeignKey(
+        MLExperiment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='best_in_suites',
+        help_text="Child experiment with the best optimization metric, set when the suite finishes."
+    )
+    
     status = models.CharField(
         max_length=20,
         choices=Status.choices,
@@ -256,6 +306,36 @@ class ExperimentSuite(models.Model):
             # For "higher is better" metrics, sort descending
             return max(experiments, key=lambda exp: exp.results.get(self.optimization_metric, float('-inf')))
 
+    def get_study_name(self):
+        """
+        Get the name of this suite's study in the shared Optuna storage.
+        
+        Returns:
+            str: Study name unique to this suite.
+        """
+        return f"hydroml-suite-{self.id}"
+
+    def append_trial_data(self, entry):
+        """
+        Atomically append a finished trial to trial_data.
+        
+        Trials finish concurrently on different workers, so the row is locked
+        while appending to avoid one worker overwriting another's results.
+        
+        Args:
+            entry (dict): Trial number, parameters, value and experiment id.
+        """
+        from django.db import transaction
+        
+        with transaction.atomic():
+            locked = ExperimentSuite.objects.select_for_update().only('trial_data').get(pk=self.pk)
+            trial_data = list(locked.trial_data or [])
+            trial_data.append(entry)
+            ExperimentSuite.objects.filter(pk=self.pk).update(
+                trial_data=trial_data, updated_at=timezone.now()
+            )
+        self.trial_data = trial_data
+
     def start_execution(self):
         """
         Mark the suite as started and update the status.
@@ -43,11 +43,16 @@ class MLExperiment(models.Model):
         test_split_size (FloatField): Proportion of data reserved for testing.
         split_random_state (IntegerField): Random seed for reproducible data splits.
         split_strategy (CharField): Strategy for train/test splitting.
+        validation_strategy (CharField): Train/test split or time series cross-validation.
+        cv_n_splits (PositiveSmallIntegerField): Number of time series CV folds.
+        cv_gap (PositiveIntegerField): Samples excluded between each CV train and test fold.
+        cv_max_train_size (PositiveIntegerField): Optional cap on CV training window size.
         version (PositiveIntegerField): Version number for experiment iterations.
         is_public (BooleanField): Whether experiment is publicly visible.
         published_at (DateTimeField): Timestamp when experiment was published.
         parent_experiment (ForeignKey): Reference to original experiment for versions.
         mlflow_run_id (CharField): Associated MLflow run identifier.
+        split_artifact (ForeignKey): Shared train/test split used by this experiment.
         created_at (DateTimeField): Experiment creation timestamp.
         updated_at (DateTimeField): Last modification timestamp.
     """
@@ -178,6 +183,23 @@ class MLExperiment(models.Model):
         help_text="Validation strategy used for model evaluation."
     )
 
+    # Time series cross-validation configuration
+    cv_n_splits = models.PositiveSmallIntegerField(
+        default=5,
+        help_text="Number of folds for time series cross-validation."
+    )
+    
+    cv_gap = models.PositiveIntegerField(
+        default=0,
+        help_text="Samples excluded between the end of each training fold and its test fold."
+    )
+    
+    cv_max_train_size = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Maximum training samples per fold (rolling window); empty uses all past data."
+    )
+
     # Version control and publication fields
     version = models.PositiveIntegerField(
         default=1, 
@@ -212,6 +234,15 @@ class MLExperiment(models.Model):
         related_name='forks',
         help_text="Reference to the original experiment if this is a fork."
     )
+    
+    split_artifact = models.ForeignKey(
+        'experiments.SplitArtifact',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='experiments',
+        help_text="Shared train/test split used by this experiment."
+    )
 
     # Suite relationship for multi-experiment studies
     suite = models.ForeignKey(
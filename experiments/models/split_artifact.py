@@ -0,0 +1,162 @@
+# experiments/models/split_artifact.py
+"""
+Shared train/test split artifacts for the HydroML project.
+
+This module contains the SplitArtifact model, a content-addressed record of
+split Parquet files that are reused by every experiment sharing the same
+datasource version, target, feature set and split configuration.
+"""
+
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+import uuid
+
+
+class SplitArtifact(models.Model):
+    """
+    Content-addressed train/test split shared across experiments.
+    
+    Split files live under ``experiments/splits/<cache_key>/`` and are keyed by
+    a hash of the datasource version and the split configuration, so suite
+    children that only differ in hyperparameters load and split the data once.
+    ``ref_count`` tracks how many experiments use the split; the files are
+    removed when the last reference is released.
+    
+    The record is created in the ``BUILDING`` state by the worker that builds
+    the split (the unique ``cache_key`` lets only one worker claim it) and
+    becomes ``READY`` once the files are in place.
+    
+    Attributes:
+        id (UUIDField): Primary key using UUID4 for global uniqueness.
+        cache_key (CharField): SHA-256 of datasource version and split configuration.
+        datasource (ForeignKey): Source data the split was built from.
+        config (JSONField): The keyed configuration (target, features, strategy, size, seed).
+        artifact_paths (JSONField): MEDIA_ROOT-relative paths of the split files.
+        n_rows (PositiveIntegerField): Number of rows in the source data.
+        ref_count (PositiveIntegerField): Number of experiments using this split.
+        status (CharField): Whether the split files are being built or ready.
+        created_at (DateTimeField): When the split was built.
+        last_used_at (DateTimeField): When an experiment last acquired the split.
+    """
+
+    class Status(models.TextChoices):
+        """
+        Enumeration of split build states.
+        """
+        BUILDING = 'BUILDING', 'Building'
+        READY = 'READY', 'Ready'
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        help_text="Unique identifier for the split artifact using UUID4 format."
+    )
+    
+    cache_key = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="SHA-256 of the datasource version and split configuration."
+    )
+    
+    datasource = models.ForeignKey(
+        'projects.DataSource',
+        on_delete=models.CASCADE,
+        related_name='split_artifacts',
+        help_text="Source data the split was built from."
+    )
+    
+    config = models.JSONField(
+        default=dict,
+        help_text="Split configuration covered by the cache key."
+    )
+    
+    artifact_paths = models.JSONField(
+        default=dict,
+        help_text="MEDIA_ROOT-relative paths of the split Parquet files."
+    )
+    
+    n_rows = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of rows in the source data."
+    )
+    
+    ref_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of experiments currently using this split."
+    )
+    
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.READY,
+        help_text="Whether the split files are being built or ready to use."
+    )
+    
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="Timestamp when the split was built."
+    )
+    
+    last_used_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Timestamp when an experiment last acquired the split."
+    )
+
+    class Meta:
+        """
+        Meta configuration for the SplitArtifact model.
+        """
+        verbose_name = "Split Artifact"
+        verbose_name_plural = "Split Artifacts"
+        ordering = ['-last_used_at']
+        indexes = [
+            models.Index(fields=['datasource', 'ref_count']),
+        ]
+
+    def __str__(self):
+        """
+        String representation of the SplitArtifact.
+        
+        Returns:
+            str: Human-readable string representation.
+        """
+        return f"Split {self.cache_key[:12]} ({self.ref_count} refs)"
+
+    def get_directory(self):
+        """
+        Get the MEDIA_ROOT-relative directory holding the split files.
+        
+        Returns:
+            str: Relative directory path.
+        """
+        return f"experiments/splits/{self.cache_key}"
+
+    def add_reference(self):
+        """
+        Atomically increment the reference count.
+        """
+        SplitArtifact.objects.filter(pk=self.pk).update(
+            ref_count=F('ref_count') + 1, last_used_at=timezone.now()
+        )
+        self.refresh_from_db(fields=['ref_count', 'last_used_at'])
+
+    def remove_reference(self):
+        """
+        Atomically decrement the reference count, deleting the split when unused.
+        
+        The row is locked so that a concurrent ``acquire_split`` either sees
+        the split deleted or references it before it can be removed. Splits
+        that are being rebuilt are kept.
+        
+        Returns:
+            bool: True if the split was deleted.
+        """
+        with transaction.atomic():
+            list(SplitArtifact.objects.select_for_update().filter(pk=self.pk).values_list('pk'))
+            SplitArtifact.objects.filter(pk=self.pk, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+            deleted, _ = SplitArtifact.objects.filter(
+                pk=self.pk, ref_count=0, status=self.Status.READY
+            ).delete()
+        return bool(deleted)
@@ -0,0 +1,175 @@
+"""
+Columnar storage of evaluation predictions and downsampled chart data.
+
+Evaluation writes every prediction to ``predictions.parquet`` and, for each
+resolution in ``PREDICTION_CHART_RESOLUTIONS``, a small JSON file with:
+
+- ``scatter``: actual vs. predicted points chosen by stratified sampling
+  over the range of the actual values, so sparse extremes stay visible
+- ``series``: the time-ordered actual and predicted series reduced with
+  Largest-Triangle-Three-Buckets (LTTB), which keeps peaks and troughs
+
+The results page requests the resolution it needs; ``experiment.results``
+only keeps the coarsest scatter sample.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+
+from data_tools.services.downsampling import lttb, stratified_sample
+
+PREDICTIONS_FILENAME = 'predictions.parquet'
+
+
+def chart_resolutions():
+    """
+    Point counts at which chart data is precomputed, ascending.
+
+    Returns:
+        list: Resolutions from ``PREDICTION_CHART_RESOLUTIONS``.
+    """
+    return sorted(set(getattr(settings, 'PREDICTION_CHART_RESOLUTIONS', [250, 1000, 5000])))
+
+
+def build_prediction_chart(y_true, y_pred, points):
+    """
+    Chart data for one resolution.
+
+    Args:
+        y_true (np.ndarray): Actual values, in test set order.
+        y_pred (np.ndarray): Predicted values.
+        points (int): Approximate number of points per chart.
+
+    Returns:
+        dict: 'n_total', 'points', 'scatter' and 'series' (column arrays).
+    """
+    y_true = np.asarray(y_true, dtype='float64')
+    y_pred = np.asarray(y_pred, dtype='float64')
+    positions = np.arange(len(y_true))
+
+    scatter = stratified_sample(y_true, points)
+    # Each series gets half the budget; the union keeps both shapes
+    series = np.union1d(lttb(positions, y_true, points // 2), lttb(positions, y_pred, points // 2))
+
+    return {
+        'n_total': int(len(y_true)),
+        'points': int(points),
+        'scatter': {
+            'actual': y_true[scatter].tolist(),
+            'predicted': y_pred[scatter].tolist(),
+        },
+        'series': {
+            'index': series.tolist(),
+            'actual': y_true[series].tolist(),
+            'predicted': y_pred[series].tolist(),
+        },
+    }
+
+
+def write_predictions(y_true, y_pred, path):
+    """
+    Write predictions as a Parquet file with ``y_true`` and ``y_pred`` columns.
+
+    Args:
+        y_true (array-like): Actual values.
+        y_pred (array-like): Predicted values.
+        path (str): Absolute destination path.
+    """
+    table = pa.table({
+        'y_true': np.asarray(y_true, dtype='float64'),
+        'y_pred': np.asarray(y_pred, dtype='float64'),
+    })
+    pq.write_table(table, path)
+
+
+def load_predictions(path):
+    """
+    Read stored predictions (Parquet, or CSV from older experiments).
+
+    Args:
+        path (str): Absolute path of the predictions file.
+
+    Returns:
+        tuple: (y_true, y_pred) as numpy arrays.
+    """
+    if path.endswith('.csv'):
+        df = pd.read_csv(path)
+    else:
+        df = pq.read_table(path, columns=['y_true', 'y_pred']).to_pandas()
+    return df['y_true'].to_numpy(), df['y_pred'].to_numpy()
+
+
+def write_prediction_charts(y_true, y_pred, absolute_dir, relative_dir):
+    """
+    Write chart data at every configured resolution.
+
+    Args:
+        y_true (array-like): Actual values, in test set order.
+        y_pred (array-like): Predicted values.
+        absolute_dir (str): Directory to write to.
+        relative_dir (str): Same directory relative to MEDIA_ROOT.
+
+    Returns:
+        tuple: (chart paths keyed by resolution, for
+        ``artifact_paths['prediction_charts']``; coarsest scatter sample as
+        ``[{'actual', 'predicted'}, ...]`` for ``experiment.results``).
+    """
+    os.makedirs(absolute_dir, exist_ok=True)
+    paths = {}
+    coarsest = None
+    for points in chart_resolutions():
+        chart = build_prediction_chart(y_true, y_pred, points)
+        filename = f'prediction_chart_{points}.json'
+        with open(os.path.join(absolute_dir, filename), 'w') as f:
+            json.dump(chart, f)
+        paths[str(points)] = f'{relative_dir}/{filename}'
+        if coarsest is None:
+            coarsest = chart
+
+    prediction_data = [
+        {'actual': actual, 'predicted': predicted}
+        for actual, predicted in zip(coarsest['scatter']['actual'], coarsest['scatter']['predicted'])
+    ] if coarsest else []
+    return paths, prediction_data
+
+
+def get_prediction_chart(experiment, points):
+    """
+    Chart data of an experiment at the smallest stored resolution >= ``points``.
+
+    Experiments evaluated before charts were precomputed fall back to the
+    sample stored in ``experiment.results``.
+
+    Args:
+        experiment (MLExperiment): Evaluated experiment.
+        points (int): Points the chart can display.
+
+    Returns:
+        dict or None: Chart data (see ``build_prediction_chart``).
+    """
+    charts = (experiment.artifact_paths or {}).get('prediction_charts') or {}
+    if charts:
+        available = sorted(int(resolution) for resolution in charts)
+        chosen = next((resolution for resolution in available if resolution >= points), available[-1])
+        path = os.path.join(settings.MEDIA_ROOT, charts[str(chosen)])
+        if os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+
+    sample = (experiment.results or {}).get('prediction_data')
+    if not sample:
+        return None
+    return {
+        'n_total': (experiment.results or {}).get('n_predictions', len(sample)),
+        'points': len(sample),
+        'scatter': {
+            'actual': [point['actual'] for point in sample],
+            'predicted': [point['predicted'] for point in sample],
+        },
+        'series': None,
+    }
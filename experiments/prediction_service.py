@@ -0,0 +1,167 @@
+"""
+Scoring new data with the trained model of a finished experiment.
+
+Used by the online prediction endpoint (small JSON batches) and by the
+batch scoring task, which streams a whole DataSource through the model.
+Models come from the per-worker cache in ``experiments.model_store``, so
+repeated requests to the same worker do not reload the artifact.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from django.conf import settings
+
+from .model_store import load_model
+from .preprocessing import load_preprocessor
+
+
+class PredictionError(ValueError):
+    """The experiment cannot score the given data."""
+
+
+def get_model_path(experiment):
+    """
+    Absolute path of an experiment's trained model, checked without loading it.
+
+    Args:
+        experiment (MLExperiment): Experiment to score with.
+
+    Returns:
+        str: Path to the model file.
+
+    Raises:
+        PredictionError: If the experiment has no usable trained model.
+    """
+    if experiment.status not in (experiment.Status.FINISHED, experiment.Status.ANALYZED,
+                                 experiment.Status.PUBLISHED):
+        raise PredictionError("Experiment has not finished training.")
+    relative_path = experiment.get_model_artifacts_path()
+    if not relative_path:
+        raise PredictionError("Experiment has no trained model.")
+    model_path = os.path.join(settings.MEDIA_ROOT, relative_path)
+    if not os.path.exists(model_path):
+        raise PredictionError("Trained model file is missing.")
+    return model_path
+
+
+def get_experiment_model(experiment):
+    """
+    Load (or reuse) the trained model of an experiment.
+
+    Args:
+        experiment (MLExperiment): Experiment to score with.
+
+    Returns:
+        Fitted model.
+
+    Raises:
+        PredictionError: If the experiment has no usable trained model.
+    """
+    model, _ = load_model(get_model_path(experiment))
+    return model
+
+
+def get_feature_columns(experiment, model):
+    """
+    Feature columns, in training order, expected by an experiment's model.
+
+    Args:
+        experiment (MLExperiment): The experiment.
+        model: Its fitted model.
+
+    Returns:
+        list: Column names.
+    """
+    # Models trained on preprocessed features expect the preprocessor's inputs
+    preprocessor = load_preprocessor(experiment.artifact_paths)
+    names = getattr(preprocessor if preprocessor is not None else model, 'feature_names_in_', None)
+    if names is not None:
+        return [str(name) for name in names]
+
+    # Models fitted on arrays (out-of-core training): use the split's schema
+    train_X = (experiment.artifact_paths or {}).get('train_X')
+    if train_X:
+        path = os.path.join(settings.MEDIA_ROOT, train_X)
+        if os.path.exists(path):
+            return list(pq.read_schema(path).names)
+    return list(experiment.feature_set or [])
+
+
+def prepare_features(df, columns):
+    """
+    Select and order the model's feature columns from incoming data.
+
+    Args:
+        df (pd.DataFrame): Data to score (may contain extra columns).
+        columns (list): Expected feature columns.
+
+    Returns:
+        pd.DataFrame: Features in training order.
+
+    Raises:
+        PredictionError: If required columns are missing.
+    """
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise PredictionError(f"Missing feature columns: {', '.join(missing)}")
+    return df[columns]
+
+
+def transform_features(experiment, features):
+    """
+    Apply the experiment's stored preprocessing pipeline, if it has one.
+
+    Args:
+        experiment (MLExperiment): The experiment.
+        features (pd.DataFrame): Raw features (see ``prepare_features``).
+
+    Returns:
+        pd.DataFrame: Features as the model saw them during training.
+    """
+    preprocessor = load_preprocessor(experiment.artifact_paths)
+    if preprocessor is None:
+        return features
+    return preprocessor.transform(features)
+
+
+def predict_frame(experiment, df, model=None):
+    """
+    Score a DataFrame with an experiment's model.
+
+    Args:
+        experiment (MLExperiment): Finished experiment.
+        df (pd.DataFrame): Rows to score.
+        model (optional): Already loaded model, to skip the cache lookup.
+
+    Returns:
+        np.ndarray: One prediction per row.
+    """
+    if model is None:
+        model = get_experiment_model(experiment)
+    features = prepare_features(df, get_feature_columns(experiment, model))
+    return np.asarray(model.predict(transform_features(experiment, features)))
+
+
+def records_to_frame(payload):
+    """
+    Build a DataFrame from an online prediction request body.
+
+    Accepts either ``{"rows": [{column: value, ...}, ...]}`` or the compact
+    ``{"columns": [...], "data": [[...], ...]}`` form.
+
+    Args:
+        payload (dict): Decoded JSON body.
+
+    Returns:
+        pd.DataFrame: Rows to score.
+
+    Raises:
+        PredictionError: If the body has neither form.
+    """
+    if isinstance(payload.get('rows'), list):
+        return pd.DataFrame.from_records(payload['rows'])
+    if isinstance(payload.get('columns'), list) and isinstance(payload.get('data'), list):
+        return pd.DataFrame(payload['data'], columns=payload['columns'])
+    raise PredictionError("Body must contain 'rows' or 'columns' and 'data'.")
@@ -0,0 +1,58 @@
+"""
+Preprocessing pipelines stored with experiment splits.
+
+Every experiment used to feed raw columns to its model. Features now go
+through the shared transformer built by
+``data_tools.services.preprocessing.build_preprocessor`` (imputation,
+scaling and ordinal encoding). An experiment's transformer is fitted on its
+training rows and stored with its split (``preprocessor.joblib`` in the
+split directory), so experiments sharing a split share the transformer and
+it is deleted with the split. It is loaded through the model store's
+per-worker cache.
+"""
+import os
+import uuid
+
+from django.conf import settings
+
+from data_tools.services.preprocessing import build_preprocessor
+
+from .model_store import load_model, save_model
+
+PREPROCESSOR_FILENAME = 'preprocessor.joblib'
+
+
+def fit_preprocessor(X, path):
+    """
+    Fit a new preprocessor on ``X`` and store it at ``path``.
+
+    Args:
+        X (pd.DataFrame): Data to fit on.
+        path (str): Absolute destination path.
+
+    Returns:
+        Fitted preprocessor.
+    """
+    preprocessor = build_preprocessor().fit(X)
+    # Write to a temporary name first so concurrent readers never see a partial file
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    save_model(preprocessor, tmp_path)
+    os.replace(tmp_path, path)
+    return preprocessor
+
+
+def load_preprocessor(artifact_paths):
+    """
+    Fitted preprocessor referenced by an experiment, if any.
+
+    Args:
+        artifact_paths (dict): Experiment artifact paths.
+
+    Returns:
+        Fitted preprocessor, or None for experiments trained on raw features.
+    """
+    relative_path = (artifact_paths or {}).get('preprocessor')
+    if not relative_path:
+        return None
+    preprocessor, _ = load_model(os.path.join(settings.MEDIA_ROOT, relative_path))
+    return preprocessor
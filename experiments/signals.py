@@ -0,0 +1,25 @@
+# experiments/signals.py
+"""
+Signal handlers for the experiments app.
+
+Keep shared split artifacts reference-counted: deleting an experiment (also
+through cascades and bulk deletes) releases its split, and deleting a split
+record removes its files.
+"""
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import MLExperiment, SplitArtifact
+from .split_cache import release_split, delete_split_files
+
+
+@receiver(post_delete, sender=MLExperiment)
+def release_experiment_split(sender, instance, **kwargs):
+    """Drop the deleted experiment's reference to its shared split."""
+    release_split(instance)
+
+
+@receiver(post_delete, sender=SplitArtifact)
+def remove_split_files(sender, instance, **kwargs):
+    """Remove the Parquet files of a deleted split."""
+    delete_split_files(instance)
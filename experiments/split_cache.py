@@ -0,0 +1,205 @@
+"""
+Content-addressed cache of train/test split artifacts.
+
+Suite children (grid search runs, Optuna trials) usually share the same
+datasource, target and split configuration and only differ in
+hyperparameters. Their split files are keyed by a hash of the datasource
+version and that configuration, built once by the worker that claims the
+split's database row, and referenced by every experiment that needs them.
+Files are deleted when the last referencing experiment releases the split.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+import logging
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from data_tools.services.dataset_reader import datasource_version
+from data_tools.services.preprocessing import PREPROCESSING_VERSION
+
+logger = logging.getLogger(__name__)
+
+SPLIT_LOCK_TIMEOUT = 30 * 60
+SPLIT_LOCK_POLL_SECONDS = 0.5
+
+
+def split_cache_key(experiment, test_size=None, random_state=None):
+    """
+    Compute the cache key and keyed configuration for an experiment's split.
+
+    Args:
+        experiment (MLExperiment): Experiment whose split is requested.
+        test_size (float, optional): Test fraction (train/test split only).
+        random_state (int, optional): Split seed (train/test split only).
+
+    Returns:
+        tuple: (cache_key, config dict)
+    """
+    config = {
+        'datasource_id': str(experiment.input_datasource_id),
+        'datasource_version': datasource_version(experiment.input_datasource),
+        'target_column': experiment.target_column,
+        'feature_set': experiment.feature_set,
+        'split_strategy': experiment.split_strategy,
+        'validation_strategy': experiment.validation_strategy,
+        'test_size': test_size,
+        'random_state': random_state,
+        # The split stores the preprocessor fitted on its training rows
+        'preprocessing_version': PREPROCESSING_VERSION,
+    }
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest(), config
+
+
+def acquire_split(experiment, build_split, test_size=None, random_state=None):
+    """
+    Get (building if needed) the shared split for an experiment and reference it.
+
+    Workers serialize on the SplitArtifact row: the first one to miss creates
+    it in the BUILDING state (the unique cache_key admits a single claim),
+    writes the files into a temporary directory and renames it into place;
+    the others wait for the row to become READY, or take the build over once
+    the claim is older than ``SPLIT_LOCK_TIMEOUT``. The reference is taken in
+    the transaction that found the split, while the row is locked, so the
+    last release cannot delete it in between.
+
+    Args:
+        experiment (MLExperiment): Experiment that needs the split.
+        build_split (callable): ``build_split(directory_abs, directory_rel)``
+            writes the split files into ``directory_abs`` and returns
+            ``(artifact_paths, n_rows)`` with paths under ``directory_rel``.
+        test_size (float, optional): Test fraction (part of the key).
+        random_state (int, optional): Split seed (part of the key).
+
+    Returns:
+        SplitArtifact: The split now referenced by ``experiment``.
+    """
+    from experiments.models import SplitArtifact
+
+    cache_key, config = split_cache_key(experiment, test_size, random_state)
+
+    while True:
+        with transaction.atomic():
+            artifact = SplitArtifact.objects.select_for_update().filter(cache_key=cache_key).first()
+            if artifact is None:
+                artifact = _claim_new_split(experiment, cache_key, config)
+            elif artifact.status == SplitArtifact.Status.READY and _split_files_exist(artifact):
+                logger.info(f"Reusing shared split {cache_key[:12]} for experiment {experiment.id}")
+                return _reference_split(experiment, artifact)
+            elif artifact.status == SplitArtifact.Status.BUILDING and not _build_is_stale(artifact):
+                artifact = None
+            else:
+                # Files are missing or the builder died: take the build over
+                SplitArtifact.objects.filter(pk=artifact.pk).update(
+                    status=SplitArtifact.Status.BUILDING, config=config, last_used_at=timezone.now()
+                )
+
+        if artifact is not None:
+            return _build_split(experiment, artifact, build_split, config)
+        time.sleep(SPLIT_LOCK_POLL_SECONDS)
+
+
+def release_split(experiment):
+    """
+    Drop an experiment's reference to its shared split.
+
+    Args:
+        experiment (MLExperiment): Experiment releasing its split.
+
+    Returns:
+        bool: True if the split had no references left and was deleted.
+    """
+    from experiments.models import SplitArtifact
+
+    if not experiment.split_artifact_id:
+        return False
+    try:
+        artifact = SplitArtifact.objects.get(pk=experiment.split_artifact_id)
+    except SplitArtifact.DoesNotExist:
+        return False
+    return artifact.remove_reference()
+
+
+def delete_split_files(artifact):
+    """Remove a split's directory from MEDIA_ROOT"""
+    shutil.rmtree(os.path.join(settings.MEDIA_ROOT, artifact.get_directory()), ignore_errors=True)
+
+
+def _claim_new_split(experiment, cache_key, config):
+    """Create the BUILDING record for ``cache_key``, or None if another worker did"""
+    from experiments.models import SplitArtifact
+
+    try:
+        with transaction.atomic():
+            return SplitArtifact.objects.create(
+                cache_key=cache_key,
+                datasource=experiment.input_datasource,
+                config=config,
+                status=SplitArtifact.Status.BUILDING,
+            )
+    except IntegrityError:
+        return None
+
+
+def _build_split(experiment, artifact, build_split, config):
+    """Build a claimed split into a temporary directory and publish it"""
+    from experiments.models import SplitArtifact
+
+    relative_dir = artifact.get_directory()
+    absolute_dir = os.path.join(settings.MEDIA_ROOT, relative_dir)
+    temp_dir = f"{absolute_dir}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(temp_dir)
+
+    try:
+        artifact_paths, n_rows = build_split(temp_dir, relative_dir)
+        with transaction.atomic():
+            artifact = SplitArtifact.objects.select_for_update().get(pk=artifact.pk)
+            shutil.rmtree(absolute_dir, ignore_errors=True)
+            os.rename(temp_dir, absolute_dir)
+            artifact.artifact_paths = artifact_paths
+            artifact.n_rows = n_rows
+            artifact.config = config
+            artifact.status = SplitArtifact.Status.READY
+            artifact.save(update_fields=['artifact_paths', 'n_rows', 'config', 'status'])
+            logger.info(f"Built shared split {artifact.cache_key[:12]} for experiment {experiment.id}")
+            return _reference_split(experiment, artifact)
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        # Give up the claim: drop the record unless experiments still use it
+        SplitArtifact.objects.filter(pk=artifact.pk, ref_count=0).delete()
+        SplitArtifact.objects.filter(pk=artifact.pk).update(status=SplitArtifact.Status.READY)
+        raise
+
+
+def _reference_split(experiment, artifact):
+    """Point ``experiment`` at ``artifact`` (locked by the caller), releasing its previous split"""
+    from experiments.models import SplitArtifact
+
+    if experiment.split_artifact_id == artifact.pk:
+        SplitArtifact.objects.filter(pk=artifact.pk).update(last_used_at=timezone.now())
+        return artifact
+
+    previous = experiment.split_artifact
+    artifact.add_reference()
+    experiment.split_artifact = artifact
+    if previous is not None:
+        previous.remove_reference()
+    return artifact
+
+
+def _split_files_exist(artifact):
+    """Whether all files of a split are present"""
+    return all(
+        os.path.exists(os.path.join(settings.MEDIA_ROOT, relative_path))
+        for relative_path in artifact.artifact_paths.values()
+    )
+
+
+def _build_is_stale(artifact):
+    """Whether a BUILDING split was claimed too long ago to still be in progress"""
+    return (timezone.now() - artifact.last_used_at).total_seconds() > SPLIT_LOCK_TIMEOUT
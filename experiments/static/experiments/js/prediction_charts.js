@@ -0,0 +1,116 @@
+/**
+ * Prediction charts for the ML experiment detail page.
+ * Fetches downsampled chart data at the resolution each canvas can display
+ * (scatter: stratified sample, series: LTTB) instead of embedding it in the page.
+ */
+
+class PredictionCharts {
+    constructor(scatterCanvas, seriesCanvas) {
+        this.scatterCanvas = scatterCanvas;
+        this.seriesCanvas = seriesCanvas;
+        this.url = scatterCanvas.dataset.chartUrl;
+    }
+
+    /**
+     * Points worth drawing: about two per horizontal device pixel
+     */
+    pointsFor(canvas) {
+        const width = canvas.parentElement ? canvas.parentElement.clientWidth : 600;
+        return Math.round(width * (window.devicePixelRatio || 1) * 2);
+    }
+
+    async load() {
+        const points = Math.max(this.pointsFor(this.scatterCanvas), this.seriesCanvas ? this.pointsFor(this.seriesCanvas) : 0);
+        const response = await fetch(`${this.url}?points=${points}`, { credentials: 'same-origin' });
+        if (!response.ok) return;
+
+        const chart = await response.json();
+        this.renderScatter(chart.scatter);
+        if (this.seriesCanvas && chart.series) {
+            this.renderSeries(chart.series);
+        }
+
+        const caption = document.getElementById('prediction-chart-caption');
+        if (caption && chart.n_total) {
+            caption.textContent = `Serie de predicciones en el conjunto de prueba (${chart.n_total.toLocaleString()} filas)`;
+        }
+    }
+
+    renderScatter(scatter) {
+        const points = scatter.actual.map((actual, i) => ({ x: actual, y: scatter.predicted[i] }));
+        const values = scatter.actual.concat(scatter.predicted);
+        const minVal = Math.min(...values);
+        const maxVal = Math.max(...values);
+
+        new Chart(this.scatterCanvas, {
+            type: 'scatter',
+            data: {
+                datasets: [{
+                    label: 'Predicciones',
+                    data: points,
+                    backgroundColor: 'rgba(59, 130, 246, 0.6)',
+                    borderColor: 'rgba(37, 99, 235, 1)',
+                    pointRadius: 3
+                }, {
+                    label: 'Línea Perfecta (y=x)',
+                    data: [{ x: minVal, y: minVal }, { x: maxVal, y: maxVal }],
+                    type: 'line',
+                    borderColor: 'rgba(239, 68, 68, 0.8)',
+                    borderWidth: 2,
+                    pointRadius: 0,
+                    borderDash: [5, 5],
+                    fill: false
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                animation: false,
+                scales: {
+                    x: { title: { display: true, text: 'Valores Reales' } },
+                    y: { title: { display: true, text: 'Valores Predichos' } }
+                }
+            }
+        });
+    }
+
+    renderSeries(series) {
+        const toPoints = values => values.map((value, i) => ({ x: series.index[i], y: value }));
+
+        new Chart(this.seriesCanvas, {
+            type: 'line',
+            data: {
+                datasets: [{
+                    label: 'Real',
+                    data: toPoints(series.actual),
+                    borderColor: 'rgba(107, 114, 128, 0.9)',
+                    borderWidth: 1,
+                    pointRadius: 0
+                }, {
+                    label: 'Predicción',
+                    data: toPoints(series.predicted),
+                    borderColor: 'rgba(37, 99, 235, 1)',
+                    borderWidth: 1,
+                    pointRadius: 0
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                animation: false,
+                parsing: false,
+                scales: {
+                    x: { type: 'linear', title: { display: true, text: 'Observación (orden del conjunto de prueba)' } },
+                    y: { title: { display: true, text: 'Valor' } }
+                }
+            }
+        });
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const scatterCanvas = document.getElementById('predictionScatterChart');
+    if (!scatterCanvas || !scatterCanvas.dataset.chartUrl || typeof Chart === 'undefined') return;
+
+    new PredictionCharts(scatterCanvas, document.getElementById('predictionSeriesChart')).load();
+});
@@ -18,7 +18,15 @@ from .experiment_tasks import (
     run_final_evaluation_task,
     set_experiment_status_as_finished,
     run_full_experiment_pipeline_task,
-    run_experiment_suite_task
+    run_experiment_suite_task,
+    run_optuna_trials_task,
+    finalize_optuna_suite_task,
+    run_grid_search_lane_task,
+    aggregate_grid_search_results_task,
+    run_batch_training_task,
+    run_shap_explanation_task,
+    run_batch_prediction_task,
+    flush_run_tracking_task
 )
 
 __all__ = [
@@ -28,5 +36,13 @@ __all__ = [
     'run_final_evaluation_task', 
     'set_experiment_status_as_finished',
     'run_full_experiment_pipeline_task',
-    'run_experiment_suite_task'
+    'run_experiment_suite_task',
+    'run_optuna_trials_task',
+    'finalize_optuna_suite_task',
+    'run_grid_search_lane_task',
+    'aggregate_grid_search_results_task',
+    'run_batch_training_task',
+    'run_shap_explanation_task',
+    'run_batch_prediction_task',
+    'flush_run_tracking_task'
 ]
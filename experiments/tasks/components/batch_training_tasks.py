@@ -0,0 +1,223 @@
+"""
+Batch training of many model configurations on a single data load.
+
+Sweeps of cheap models (linear models, small ensembles) are dominated by
+per-experiment task overhead and by re-reading the same split Parquet files
+at every pipeline stage. The batch trainer loads each shared split once,
+trains and evaluates every experiment that uses it in one worker (optionally
+across cores with joblib), and writes all results back with ``bulk_update``.
+"""
+from celery import shared_task
+from experiments.models import MLExperiment
+import logging
+import os
+import json
+import pandas as pd
+from django.conf import settings
+from django.utils import timezone
+from joblib import Parallel, delayed
+
+from experiments.model_store import MODEL_FILENAME, save_model, model_relative_path
+from experiments.prediction_charts import PREDICTIONS_FILENAME, write_predictions, write_prediction_charts
+from experiments.tasks.utils import run_single_experiment_sync
+from .training_tasks import build_model, prepare_split
+from .trial_reporting import score_predictions
+from .feature_matrix import load_features
+from .incremental_training import use_incremental_training
+
+logger = logging.getLogger(__name__)
+
+
+def _train_and_evaluate(experiment_id, model_type, hyperparameters, X_train, y_train, X_test, y_test):
+    """
+    Train and evaluate one model configuration.
+
+    Runs inside joblib workers, so it only receives plain data and writes the
+    fitted model straight to the experiment's artifact directory instead of
+    returning it.
+
+    Returns:
+        dict: Metrics, model size and chart data paths, or the error message.
+    """
+    try:
+        model = build_model(model_type, hyperparameters, y_train)
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_test)
+
+        artifacts_dir = os.path.join(settings.MEDIA_ROOT, 'experiments', str(experiment_id))
+        model_size = save_model(model, os.path.join(artifacts_dir, MODEL_FILENAME))
+
+        metrics = score_predictions(y_test, y_pred)
+        with open(os.path.join(artifacts_dir, 'evaluation_metrics.json'), 'w') as f:
+            json.dump(metrics, f, indent=2)
+
+        write_predictions(y_test, y_pred, os.path.join(artifacts_dir, PREDICTIONS_FILENAME))
+        chart_paths, prediction_data = write_prediction_charts(
+            y_test, y_pred, artifacts_dir, f'experiments/{experiment_id}'
+        )
+
+        return {
+            'metrics': metrics,
+            'model_size': model_size,
+            'prediction_charts': chart_paths,
+            'prediction_data': prediction_data,
+            'n_predictions': int(len(y_test)),
+        }
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def train_experiments_in_batch(experiments, n_jobs=None, progress_callback=None):
+    """
+    Train and evaluate experiments that share splits, loading each split once.
+
+    Experiments using time series cross-validation, or too large for memory
+    (out-of-core training), are not batched and are left untouched in the
+    returned ``skipped`` list.
+
+    Args:
+        experiments (list): MLExperiment instances (train/test split strategy).
+        n_jobs (int, optional): joblib workers per split group
+            (defaults to ``BATCH_TRAINER_N_JOBS``).
+        progress_callback (callable, optional): Called with (done, total).
+
+    Returns:
+        dict: Lists of finished, failed and skipped experiment ids.
+    """
+    if n_jobs is None:
+        n_jobs = getattr(settings, 'BATCH_TRAINER_N_JOBS', 1)
+
+    summary = {'finished': [], 'failed': [], 'skipped': []}
+    batchable = []
+    for experiment in experiments:
+        if experiment.validation_strategy == 'TIME_SERIES_CV':
+            summary['skipped'].append(str(experiment.id))
+        else:
+            batchable.append(experiment)
+
+    # Group by shared split so each split is read from disk once
+    groups = {}
+    for experiment in batchable:
+        try:
+            split = prepare_split(experiment)
+            experiment.artifact_paths = dict(split.artifact_paths)
+            if use_incremental_training(experiment):
+                summary['skipped'].append(str(experiment.id))
+                continue
+            groups.setdefault(split.pk, (split, []))[1].append(experiment)
+        except Exception as e:
+            logger.error(f"Could not prepare split for experiment {experiment.id}: {e}")
+            experiment.status = MLExperiment.Status.ERROR
+            experiment.results = {'error': str(e)}
+            experiment.updated_at = timezone.now()
+            summary['failed'].append(str(experiment.id))
+
+    done = 0
+    for split, group in groups.values():
+        paths = {key: os.path.join(settings.MEDIA_ROOT, path) for key, path in split.artifact_paths.items()}
+        X_train = load_features(split.artifact_paths, 'train_X')
+        y_train = pd.read_parquet(paths['train_y']).iloc[:, 0]
+        X_test = load_features(split.artifact_paths, 'test_X')
+        y_test = pd.read_parquet(paths['test_y']).iloc[:, 0]
+
+        print(f"Batch training {len(group)} experiments on split {split.cache_key[:12]} "
+              f"({len(X_train)} train rows, n_jobs={n_jobs})")
+
+        outcomes = Parallel(n_jobs=n_jobs)(
+            delayed(_train_and_evaluate)(
+                experiment.id, experiment.model_name, experiment.hyperparameters,
+                X_train, y_train, X_test, y_test
+            )
+            for experiment in group
+        )
+
+        for experiment, outcome in zip(group, outcomes):
+            experiment.artifact_paths = dict(split.artifact_paths)
+            experiment.updated_at = timezone.now()
+            if 'error' in outcome:
+                experiment.status = MLExperiment.Status.ERROR
+                experiment.results = {'error': outcome['error']}
+                summary['failed'].append(str(experiment.id))
+                continue
+
+            experiment.artifact_paths.update({
+                'trained_model': model_relative_path(experiment),
+                'evaluation_metrics': f'experiments/{experiment.id}/evaluation_metrics.json',
+                'predictions': f'experiments/{experiment.id}/{PREDICTIONS_FILENAME}',
+                'prediction_charts': outcome['prediction_charts'],
+            })
+            experiment.results = {
+                'performance_metrics': outcome['metrics'],
+                'prediction_data': outcome['prediction_data'],
+                'n_predictions': outcome['n_predictions'],
+                'batch_trained': True,
+                'model_artifact': {'size_bytes': outcome['model_size']},
+            }
+            experiment.status = MLExperiment.Status.FINISHED
+            summary['finished'].append(str(experiment.id))
+
+        done += len(group)
+        if progress_callback:
+            progress_callback(done, len(batchable))
+
+    skipped = set(summary['skipped'])
+    MLExperiment.objects.bulk_update(
+        [experiment for experiment in batchable if str(experiment.id) not in skipped],
+        ['status', 'results', 'artifact_paths', 'split_artifact', 'updated_at'],
+        batch_size=500
+    )
+    return summary
+
+
+@shared_task(bind=True)
+def run_batch_training_task(self, experiment_ids, n_jobs=None):
+    """
+    Train and evaluate a list of experiments in this worker.
+
+    Each distinct split is loaded once and shared by all experiments using
+    it; results are written back in bulk. MLflow logging and SHAP plots are
+    skipped for batch-trained experiments (``results['batch_trained']``).
+    Experiments the batch trainer skips run through the regular pipeline.
+
+    Args:
+        self: Celery task instance (bound task).
+        experiment_ids (list): UUIDs of the experiments to train.
+        n_jobs (int, optional): joblib workers (defaults to BATCH_TRAINER_N_JOBS).
+
+    Returns:
+        dict: Lists of finished and failed experiment ids.
+    """
+    experiments = list(
+        MLExperiment.objects.filter(id__in=experiment_ids).select_related('input_datasource', 'split_artifact')
+    )
+    MLExperiment.objects.filter(id__in=[e.id for e in experiments]).update(
+        status=MLExperiment.Status.RUNNING, updated_at=timezone.now()
+    )
+
+    def report_progress(done, total):
+        self.update_state(
+            state='PROGRESS',
+            meta={'current': done, 'total': total, 'status': f'Trained {done} of {total} experiments'}
+        )
+
+    summary = train_experiments_in_batch(experiments, n_jobs=n_jobs, progress_callback=report_progress)
+    
+    for experiment in experiments:
+        if str(experiment.id) not in summary['skipped']:
+            continue
+        try:
+            run_single_experiment_sync(experiment)
+            MLExperiment.objects.filter(pk=experiment.id, status=MLExperiment.Status.RUNNING).update(
+                status=MLExperiment.Status.FINISHED
+            )
+            summary['finished'].append(str(experiment.id))
+        except Exception as e:
+            logger.error(f"Experiment {experiment.id} failed in batch task: {e}")
+            summary['failed'].append(str(experiment.id))
+    summary['skipped'] = []
+    
+    logger.info(
+        f"Batch training finished: {len(summary['finished'])} finished, "
+        f"{len(summary['failed'])} failed, {len(summary['skipped'])} skipped"
+    )
+    return summary
@@ -3,22 +3,34 @@ Evaluation and metrics calculation tasks for ML experiments.
 """
 from celery import shared_task
 from experiments.models import MLExperiment
-from experiments.tasks.utils import generate_shap_plots
+from .trial_reporting import (
+    report_metrics, has_active_trial, active_metric, score_predictions
+)
+from .training_tasks import build_model
+from .feature_matrix import load_features
+from .incremental_training import use_incremental_training, evaluate_incremental
+from .explanation_tasks import run_shap_explanation_task
+from .tracking_tasks import RunTracker
+from experiments.model_store import load_model
+from experiments.prediction_charts import (
+    PREDICTIONS_FILENAME, load_predictions, write_predictions, write_prediction_charts
+)
 import logging
 import os
+import json
 import uuid
 from django.conf import settings
+from sklearn.base import clone
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-import mlflow
-import mlflow.sklearn
 import numpy as np
 import joblib
+from joblib import Parallel, delayed
 import traceback
 import pandas as pd
-import shap
+import pyarrow.parquet as pq
 import plotly.graph_objects as go
 import plotly.express as px
 import plotly.io as pio
@@ -26,6 +38,96 @@ import plotly.io as pio
 logger = logging.getLogger(__name__)
 
 
+def _fit_fold(estimator, X, y, train_index, test_index, fold, metric=None):
+    """
+    Fit a clone of the estimator on one time series fold and score it.
+    
+    Args:
+        estimator: Unfitted scikit-learn estimator to clone.
+        X (np.ndarray): Full feature matrix (memory-mapped in loky workers).
+        y (np.ndarray): Full target vector.
+        train_index (np.ndarray): Row positions of the training fold.
+        test_index (np.ndarray): Row positions of the test fold.
+        fold (int): 1-based fold number.
+        metric (str, optional): Suite metric selecting the metric family
+            (see ``score_predictions``).
+        
+    Returns:
+        dict: Fold number, metrics and fold sizes.
+    """
+    model = clone(estimator)
+    model.fit(X[train_index], y[train_index])
+    y_pred = model.predict(X[test_index])
+    
+    return {
+        'fold': fold,
+        **score_predictions(y[test_index], y_pred, metric),
+        'train_size': len(train_index),
+        'test_size': len(test_index)
+    }
+
+
+def _fold_summary(fold_metric):
+    """One-line summary of a fold's metrics"""
+    if 'accuracy' in fold_metric:
+        return f"Accuracy: {fold_metric['accuracy']:.4f}, F1: {fold_metric['f1_score']:.4f}"
+    return f"MSE: {fold_metric['mse']:.4f}, MAE: {fold_metric['mae']:.4f}, R²: {fold_metric['r2']:.4f}"
+
+
+def cross_validate_time_series(estimator, X, y, splitter, n_jobs=None, metric=None):
+    """
+    Run time series cross-validation with the folds trained concurrently.
+    
+    Folds are fitted in joblib's loky workers; X and y are passed as NumPy
+    arrays so joblib memory-maps them instead of pickling a copy per worker.
+    Inside an Optuna trial the folds run one at a time, so each fold can be
+    reported and a pruned trial stops before fitting the remaining folds.
+    
+    Args:
+        estimator: Unfitted scikit-learn estimator.
+        X (pd.DataFrame): Full feature matrix in time order.
+        y (pd.Series): Full target in time order.
+        splitter (TimeSeriesSplit): Configured splitter.
+        n_jobs (int, optional): Concurrent folds (defaults to
+            ``TIME_SERIES_CV_N_JOBS``, -1 for one worker per fold).
+        metric (str, optional): Suite metric selecting the metric family;
+            defaults to the active trial's metric, or regression metrics.
+            
+    Returns:
+        list: Metrics dict per fold, in fold order.
+    """
+    X_values = X.to_numpy()
+    y_values = y.to_numpy()
+    if metric is None:
+        metric = active_metric()
+    folds = [
+        (train_index, test_index, fold)
+        for fold, (train_index, test_index) in enumerate(splitter.split(X_values), start=1)
+    ]
+    
+    if has_active_trial():
+        fold_metrics = []
+        for train_index, test_index, fold in folds:
+            fold_metric = _fit_fold(estimator, X_values, y_values, train_index, test_index, fold, metric)
+            fold_metrics.append(fold_metric)
+            print(f"Fold {fold} - {_fold_summary(fold_metric)}")
+            # Report the fold to the running Optuna trial (raises TrialPruned to stop early)
+            report_metrics(fold_metric, fold)
+        return fold_metrics
+    
+    if n_jobs is None:
+        n_jobs = getattr(settings, 'TIME_SERIES_CV_N_JOBS', -1)
+    n_jobs = len(folds) if n_jobs == -1 else max(1, min(n_jobs, len(folds)))
+    
+    fold_metrics = Parallel(n_jobs=n_jobs, backend='loky', max_nbytes='1M', mmap_mode='r')(
+        delayed(_fit_fold)(estimator, X_values, y_values, train_index, test_index, fold, metric)
+        for train_index, test_index, fold in folds
+    )
+    for fold_metric in fold_metrics:
+        print(f"Fold {fold_metric['fold']} - {_fold_summary(fold_metric)}")
+    return fold_metrics
+
+
 @shared_task
 def run_time_series_cross_validation_task(experiment_id):
     """
@@ -36,6 +138,11 @@ def run_time_series_cross_validation_task(experiment_id):
     the model across multiple folds, calculating performance metrics for each fold
     and aggregating them to provide robust performance estimates.
     
+    The number of folds, the gap between train and test folds and the maximum
+    training window come from the experiment (``cv_n_splits``, ``cv_gap``,
+    ``cv_max_train_size``). Folds are trained concurrently, see
+    ``cross_validate_time_series``.
+    
     Args:
         experiment_id (str): UUID of the experiment to process.
         
@@ -52,7 +159,7 @@ def run_time_series_cross_validation_task(experiment_id):
         - Saves cross-validation results as JSON file
         - Updates experiment.results with aggregated metrics
         - Updates experiment.artifact_paths with CV results
-        - Logs metrics to MLflow
+        - Queues logging of metrics to MLflow
     """
     print(f"Running time series cross-validation for experiment {experiment_id}")
     
@@ -63,30 +170,8 @@ def run_time_series_cross_validation_task(experiment_id):
         experiment.status = MLExperiment.Status.RUNNING
         experiment.save()
         
-        # Set MLflow tracking URI and resume run
-        mlflow.set_tracking_uri("http://mlflow:5000")
-        
-        # Resume the MLflow run if we have a run ID
-        mlflow_context = None
-        if experiment.mlflow_run_id:
-            try:
-                mlflow_context = mlflow.start_run(run_id=experiment.mlflow_run_id)
-            except Exception as e:
-                print(f"Warning: Could not resume MLflow run {experiment.mlflow_run_id}: {e}")
-        
-        # Import required modules
-        import os
-        import pickle
-        import json
-        import pandas as pd
-        import numpy as np
-        from django.conf import settings
-        from sklearn.model_selection import TimeSeriesSplit
-        from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
-        from sklearn.linear_model import LinearRegression, LogisticRegression
-        from sklearn.ensemble import GradientBoostingRegressor, GradientBoostingClassifier
-        from sklearn.svm import SVR, SVC
-        from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+        # Tracking is buffered and flushed in the background when the task ends
+        tracker = RunTracker(experiment.mlflow_run_id)
         
         # Check if artifact paths exist
         if not experiment.artifact_paths or 'full_X' not in experiment.artifact_paths:
@@ -95,119 +180,54 @@ def run_time_series_cross_validation_task(experiment_id):
         artifacts_dir = os.path.join(settings.MEDIA_ROOT, 'experiments', str(experiment.id))
         
         # Load full data from Parquet files
-        full_X_path = os.path.join(settings.MEDIA_ROOT, experiment.artifact_paths['full_X'])
         full_y_path = os.path.join(settings.MEDIA_ROOT, experiment.artifact_paths['full_y'])
         
-        X = pd.read_parquet(full_X_path)
+        X = load_features(experiment.artifact_paths, 'full_X')
         y = pd.read_parquet(full_y_path).iloc[:, 0]  # Get first column as series
         
-        # Parse hyperparameters
-        hyperparameters = experiment.hyperparameters
-        
-        # Set up time series cross-validation
-        n_splits = 5  # Can be made configurable in the future
-        tscv = TimeSeriesSplit(n_splits=n_splits)
-        
-        # Create model based on type
-        model_type = experiment.model_type
+        # Set up time series cross-validation from the experiment's settings
+        n_splits = max(2, experiment.cv_n_splits)
+        tscv = TimeSeriesSplit(
+            n_splits=n_splits,
+            gap=experiment.cv_gap,
+            max_train_size=experiment.cv_max_train_size
+        )
         
-        # Initialize lists to store metrics for each fold
-        fold_metrics = []
+        # Choose the estimator once; every fold fits a fresh clone of it
+        model_type = experiment.model_name
+        estimator = build_model(model_type, experiment.hyperparameters, y)
         
         print(f"Starting {n_splits}-fold time series cross-validation for {model_type}")
-        
-        for fold, (train_index, test_index) in enumerate(tscv.split(X)):
-            print(f"Processing fold {fold + 1}/{n_splits}")
-            
-            # Split data for this fold
-            X_train_fold, X_test_fold = X.iloc[train_index], X.iloc[test_index]
-            y_train_fold, y_test_fold = y.iloc[train_index], y.iloc[test_index]
-            
-            # Create model for this fold
-            if model_type == 'RandomForest':
-                if y.dtype == 'object' or len(y.unique()) < 10:
-                    model = RandomForestClassifier(**hyperparameters)
-                else:
-                    model = RandomForestRegressor(**hyperparameters)
-            elif model_type == 'LinearRegression':
-                model = LinearRegression(**hyperparameters)
-            elif model_type == 'LogisticRegression':
-                model = LogisticRegression(**hyperparameters)
-            elif model_type == 'GradientBoosting':
-                if y.dtype == 'object' or len(y.unique()) < 10:
-                    model = GradientBoostingClassifier(**hyperparameters)
-                else:
-                    model = GradientBoostingRegressor(**hyperparameters)
-            elif model_type == 'SVM':
-                if y.dtype == 'object' or len(y.unique()) < 10:
-                    model = SVC(**hyperparameters)
-                else:
-                    model = SVR(**hyperparameters)
-            else:
-                raise ValueError(f"Unsupported model type: {model_type}")
-            
-            # Train model on training fold
-            model.fit(X_train_fold, y_train_fold)
-            
-            # Make predictions on test fold
-            y_pred_fold = model.predict(X_test_fold)
-            
-            # Calculate metrics for this fold (assuming regression)
-            fold_mse = mean_squared_error(y_test_fold, y_pred_fold)
-            fold_mae = mean_absolute_error(y_test_fold, y_pred_fold)
-            fold_r2 = r2_score(y_test_fold, y_pred_fold)
-            fold_rmse = fold_mse ** 0.5
-            
-            fold_metric = {
-                'fold': fold + 1,
-                'mse': fold_mse,
-                'mae': fold_mae,
-                'r2': fold_r2,
-                'rmse': fold_rmse,
-                'train_size': len(X_train_fold),
-                'test_size': len(X_test_fold)
-            }
-            
-            fold_metrics.append(fold_metric)
-            print(f"Fold {fold + 1} - MSE: {fold_mse:.4f}, MAE: {fold_mae:.4f}, R²: {fold_r2:.4f}")
+        # Suite children are scored with the family of the suite's metric
+        metric = experiment.suite.optimization_metric if experiment.suite_id else None
+        fold_metrics = cross_validate_time_series(estimator, X, y, tscv, metric=metric)
         
         # Calculate aggregated metrics across all folds
-        metrics_mean = {
-            'mse_mean': np.mean([m['mse'] for m in fold_metrics]),
-            'mae_mean': np.mean([m['mae'] for m in fold_metrics]),
-            'r2_mean': np.mean([m['r2'] for m in fold_metrics]),
-            'rmse_mean': np.mean([m['rmse'] for m in fold_metrics])
-        }
-        
-        metrics_std = {
-            'mse_std': np.std([m['mse'] for m in fold_metrics]),
-            'mae_std': np.std([m['mae'] for m in fold_metrics]),
-            'r2_std': np.std([m['r2'] for m in fold_metrics]),
-            'rmse_std': np.std([m['rmse'] for m in fold_metrics])
-        }
+        metric_names = [name for name in fold_metrics[0] if name not in ('fold', 'train_size', 'test_size')]
+        metrics_mean = {f'{name}_mean': np.mean([m[name] for m in fold_metrics]) for name in metric_names}
+        metrics_std = {f'{name}_std': np.std([m[name] for m in fold_metrics]) for name in metric_names}
         
         # Combine all results
         cv_results = {
             'cross_validation_type': 'time_series',
             'n_splits': n_splits,
+            'gap': experiment.cv_gap,
+            'max_train_size': experiment.cv_max_train_size,
             'fold_metrics': fold_metrics,
             'aggregated_metrics': {**metrics_mean, **metrics_std}
         }
         
-        print(f"Cross-validation completed - Mean R²: {metrics_mean['r2_mean']:.4f} ± {metrics_std['r2_std']:.4f}")
+        headline = 'r2' if 'r2' in metric_names else 'accuracy'
+        print(f"Cross-validation completed - Mean {headline}: {metrics_mean[f'{headline}_mean']:.4f} ± {metrics_std[f'{headline}_std']:.4f}")
         
         # Log aggregated metrics to MLflow
-        if mlflow_context:
-            mlflow.log_metric("cv_mse_mean", metrics_mean['mse_mean'])
-            mlflow.log_metric("cv_mae_mean", metrics_mean['mae_mean'])
-            mlflow.log_metric("cv_r2_mean", metrics_mean['r2_mean'])
-            mlflow.log_metric("cv_rmse_mean", metrics_mean['rmse_mean'])
-            mlflow.log_metric("cv_mse_std", metrics_std['mse_std'])
-            mlflow.log_metric("cv_mae_std", metrics_std['mae_std'])
-            mlflow.log_metric("cv_r2_std", metrics_std['r2_std'])
-            mlflow.log_metric("cv_rmse_std", metrics_std['rmse_std'])
-            mlflow.log_param("validation_strategy", "TIME_SERIES_CV")
-            mlflow.log_param("n_splits", n_splits)
+        tracker.log_metrics({f"cv_{name}": value for name, value in {**metrics_mean, **metrics_std}.items()})
+        tracker.log_params({
+            "validation_strategy": "TIME_SERIES_CV",
+            "n_splits": n_splits,
+            "cv_gap": experiment.cv_gap,
+            "cv_max_train_size": experiment.cv_max_train_size,
+        })
         
         # Save cross-validation results
         cv_results_path = os.path.join(artifacts_dir, 'cv_results.json')
@@ -227,21 +247,17 @@ def run_time_series_cross_validation_task(experiment_id):
         experiment.status = MLExperiment.Status.FINISHED
         experiment.save()
         
-        # End MLflow run successfully
-        if mlflow_context:
-            mlflow.end_run(status="FINISHED")
+        # Send everything logged above and close the MLflow run
+        tracker.flush(status="FINISHED")
         
         print(f"Time series cross-validation completed for experiment {experiment_id}")
         logger.info(f"Cross-validation completada para el experimento {experiment_id}.")
         return experiment_id
         
     except Exception as e:
-        # End MLflow run on error
-        if 'mlflow_context' in locals() and mlflow_context:
-            try:
-                mlflow.end_run(status="FAILED")
-            except:
-                pass
+        # Close the MLflow run as failed
+        if 'tracker' in locals():
+            tracker.flush(status="FAILED")
         
         print(f"Error in time series cross-validation for experiment {experiment_id}: {str(e)}")
         logger.error(f"Error en run_time_series_cross_validation_task para {experiment_id}: {e}")
@@ -266,10 +282,13 @@ def run_final_evaluation_task(experiment_id):
     
     The task generates multiple outputs including:
     - Performance metrics (MSE, MAE, R², RMSE for regression)
-    - Prediction results stored as CSV
-    - Chart-ready prediction data (limited to 1000 points for performance)
+    - Prediction results stored as Parquet
+    - Chart data downsampled at several resolutions (see ``prediction_charts``)
     - MLflow model logging for production deployment
     
+    Experiments trained out of core (see ``incremental_training``) are also
+    evaluated by streaming the test set, so it is never loaded whole.
+    
     Args:
         experiment_id (str): UUID of the experiment to evaluate.
         
@@ -284,11 +303,12 @@ def run_final_evaluation_task(experiment_id):
     Side Effects:
         - Updates experiment status to RUNNING, then FINISHED
         - Saves evaluation metrics as JSON file
-        - Saves predictions as CSV file
+        - Saves predictions as Parquet file and chart data as JSON files
         - Updates experiment.results with metrics and prediction data
         - Updates experiment.artifact_paths with evaluation artifacts
-        - Logs metrics and model to MLflow
-        - Ends MLflow run with appropriate status
+        - Queues logging of metrics and model to MLflow, which also ends
+          the MLflow run with the appropriate status
+        - Queues run_shap_explanation_task (SHAP plots arrive asynchronously)
     """
     print(f"Running final evaluation for experiment {experiment_id}")
     
@@ -299,16 +319,8 @@ def run_final_evaluation_task(experiment_id):
         experiment.status = MLExperiment.Status.RUNNING
         experiment.save()
         
-        # Set MLflow tracking URI and resume run
-        mlflow.set_tracking_uri("http://mlflow:5000")
-        
-        # Resume the MLflow run if we have a run ID
-        mlflow_context = None
-        if experiment.mlflow_run_id:
-            try:
-                mlflow_context = mlflow.start_run(run_id=experiment.mlflow_run_id)
-            except Exception as e:
-                print(f"Warning: Could not resume MLflow run {experiment.mlflow_run_id}: {e}")
+        # Tracking is buffered and flushed in the background when the task ends
+        tracker = RunTracker(experiment.mlflow_run_id)
         
         # Import required modules
         import os
@@ -328,117 +340,103 @@ def run_final_evaluation_task(experiment_id):
         
         artifacts_dir = os.path.join(settings.MEDIA_ROOT, 'experiments', str(experiment.id))
         
-        # Load test data from Parquet files
-        test_X_path = os.path.join(settings.MEDIA_ROOT, experiment.artifact_paths['test_X'])
         test_y_path = os.path.join(settings.MEDIA_ROOT, experiment.artifact_paths['test_y'])
-        
-        X_test = pd.read_parquet(test_X_path)
-        y_test = pd.read_parquet(test_y_path).iloc[:, 0]  # Get first column as series
+        predictions_path = os.path.join(artifacts_dir, PREDICTIONS_FILENAME)
         
         # Load trained model
         model_path = os.path.join(settings.MEDIA_ROOT, experiment.artifact_paths['trained_model'])
-        with open(model_path, 'rb') as f:
-            model = pickle.load(f)
-        
-        # Make predictions
-        y_pred = model.predict(X_test)
-        
-        # Calculate metrics (assuming regression for now since that's what's in the form)
-        # TODO: Add problem_type field to distinguish regression/classification
-        metrics = {}
+        model, load_seconds = load_model(model_path)
+        
+        if use_incremental_training(experiment):
+            # Too large for memory: accumulate metrics over streamed batches
+            test_X_path = os.path.join(settings.MEDIA_ROOT, experiment.artifact_paths['test_X'])
+            results = evaluate_incremental(model, test_X_path, test_y_path, predictions_path)
+            metrics = results['performance_metrics']
+            n_test = pq.ParquetFile(test_X_path).metadata.num_rows
+            y_true, y_pred = load_predictions(predictions_path)
+        else:
+            # Load test data from Parquet files
+            X_test = load_features(experiment.artifact_paths, 'test_X')
+            y_test = pd.read_parquet(test_y_path).iloc[:, 0]  # Get first column as series
+            n_test = len(X_test)
+            
+            # Make predictions
+            y_pred = model.predict(X_test)
+            
+            # Calculate metrics (assuming regression for now since that's what's in the form)
+            # TODO: Add problem_type field to distinguish regression/classification
+            metrics = {}
+            
+            # For now, treat everything as regression
+            metrics['mse'] = float(mean_squared_error(y_test, y_pred))
+            metrics['mae'] = float(mean_absolute_error(y_test, y_pred))
+            metrics['r2'] = float(r2_score(y_test, y_pred))
+            metrics['rmse'] = float(metrics['mse'] ** 0.5)
+            
+            write_predictions(y_test, y_pred, predictions_path)
+            results = {'performance_metrics': metrics}
+            y_true = y_test.to_numpy()
         
-        # For now, treat everything as regression
-        metrics['mse'] = float(mean_squared_error(y_test, y_pred))
-        metrics['mae'] = float(mean_absolute_error(y_test, y_pred))
-        metrics['r2'] = float(r2_score(y_test, y_pred))
-        metrics['rmse'] = float(metrics['mse'] ** 0.5)
+        # Chart data at several resolutions; only the coarsest sample goes in results
+        chart_paths, results['prediction_data'] = write_prediction_charts(
+            y_true, y_pred, artifacts_dir, f'experiments/{experiment.id}'
+        )
+        results['n_predictions'] = int(len(y_true))
         
         print(f"Regression Metrics - MSE: {metrics['mse']:.4f}, MAE: {metrics['mae']:.4f}, R²: {metrics['r2']:.4f}")
         
         # Log metrics to MLflow
-        if mlflow_context:
-            mlflow.log_metric("mse", metrics['mse'])
-            mlflow.log_metric("mae", metrics['mae'])
-            mlflow.log_metric("r2_score", metrics['r2'])
-            mlflow.log_metric("rmse", metrics['rmse'])
-            mlflow.log_metric("test_samples", len(X_test))
-            
-            # Log the model to MLflow
-            try:
-                mlflow.sklearn.log_model(
-                    sk_model=model,
-                    artifact_path="model",
-                    registered_model_name=f"HydroML_Model_{experiment_id}"
-                )
-                print(f"Model logged to MLflow for experiment {experiment_id}")
-            except Exception as e:
-                print(f"Warning: Could not log model to MLflow: {e}")
+        tracker.log_metrics({
+            "mse": metrics['mse'],
+            "mae": metrics['mae'],
+            "r2_score": metrics['r2'],
+            "rmse": metrics['rmse'],
+            "test_samples": n_test,
+        })
         
         # Save metrics
         metrics_path = os.path.join(artifacts_dir, 'evaluation_metrics.json')
         with open(metrics_path, 'w') as f:
             json.dump(metrics, f, indent=2)
         
-        # Save predictions
-        predictions_df = pd.DataFrame({
-            'y_true': y_test,
-            'y_pred': y_pred
-        })
-        predictions_path = os.path.join(artifacts_dir, 'predictions.csv')
-        predictions_df.to_csv(predictions_path, index=False)
-        
-        # Prepare prediction data for charts (limit to 1000 points for performance)
-        prediction_data = []
-        max_points = min(1000, len(y_test))
-        indices = np.random.choice(len(y_test), max_points, replace=False) if len(y_test) > max_points else range(len(y_test))
-        
-        for i in indices:
-            prediction_data.append({
-                'actual': float(y_test.iloc[i]),
-                'predicted': float(y_pred[i])
-            })
-        
         # Update artifact paths
         experiment.artifact_paths['evaluation_metrics'] = f'experiments/{experiment.id}/evaluation_metrics.json'
-        experiment.artifact_paths['predictions'] = f'experiments/{experiment.id}/predictions.csv'
+        experiment.artifact_paths['predictions'] = f'experiments/{experiment.id}/{PREDICTIONS_FILENAME}'
+        experiment.artifact_paths['prediction_charts'] = chart_paths
         
         # Store results in database for easy template access
-        experiment.results = {
-            'performance_metrics': metrics,
-            'prediction_data': prediction_data,
-            'y_test': y_test.tolist()[:max_points],
-            'predictions': y_pred.tolist()[:max_points]
+        results['model_artifact'] = {
+            'size_bytes': os.path.getsize(model_path),
+            'load_seconds': load_seconds,
         }
-        
-        # Generate SHAP interpretability plots
-        try:
-            shap_plot_path = generate_shap_plots(experiment, model, X_test, artifacts_dir)
-            if shap_plot_path:
-                experiment.artifact_paths['shap_summary'] = shap_plot_path
-                print(f"SHAP summary plot generated for experiment {experiment_id}")
-        except Exception as shap_error:
-            print(f"Warning: Could not generate SHAP plots for experiment {experiment_id}: {shap_error}")
-            logger.warning(f"SHAP generation failed for experiment {experiment_id}: {shap_error}")
+        experiment.results = results
         
         # Mark experiment as completed
         experiment.status = MLExperiment.Status.FINISHED
         experiment.save()
         
-        # End MLflow run successfully
-        if mlflow_context:
-            mlflow.end_run(status="FINISHED")
+        # SHAP plots are generated in their own stage; sweep trials skip them
+        if getattr(settings, 'SHAP_EXPLANATIONS_ENABLED', True) and not has_active_trial():
+            run_shap_explanation_task.delay(str(experiment.id))
+        
+        # Send the metrics, log and register the model (behind its
+        # preprocessor, so it takes raw features), and close the MLflow run
+        preprocessor_path = experiment.artifact_paths.get('preprocessor')
+        tracker.flush(
+            status="FINISHED",
+            model_path=model_path,
+            registered_model_name=f"HydroML_Model_{experiment_id}",
+            preprocessor_path=os.path.join(settings.MEDIA_ROOT, preprocessor_path) if preprocessor_path else None
+        )
         
         print(f"Final evaluation completed for experiment {experiment_id}")
         logger.info(f"Evaluación final completada para el experimento {experiment_id}.")
         return experiment_id
         
     except Exception as e:
-        # End MLflow run on error
-        if 'mlflow_context' in locals() and mlflow_context:
-            try:
-                mlflow.end_run(status="FAILED")
-            except:
-                pass
+        # Close the MLflow run as failed
+        if 'tracker' in locals():
+            tracker.flush(status="FAILED")
         
         print(f"Error in final evaluation for experiment {experiment_id}: {str(e)}")
         logger.error(f"Error en run_final_evaluation_task para {experiment_id}: {e}")
@@ -0,0 +1,293 @@
+"""
+SHAP explanation tasks for trained experiment models.
+
+Explanations run as their own Celery stage after evaluation, so an
+experiment is marked as finished without waiting for them. Explainers are
+built once per model artifact (tree and linear models use their exact fast
+paths, anything else the permutation explainer over a k-means background)
+and cached in the worker and next to the model file. SHAP values are
+computed in batches across processes with joblib.
+"""
+from collections import OrderedDict
+import json
+import logging
+import os
+
+import joblib
+import numpy as np
+import pyarrow.parquet as pq
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from joblib import Parallel, delayed
+
+from experiments.model_store import load_model
+from experiments.models import MLExperiment
+from .feature_matrix import load_features
+
+logger = logging.getLogger(__name__)
+
+TREE_MODELS = ['RandomForest', 'GradientBoosting', 'XGBoost', 'LightGBM']
+LINEAR_MODELS = ['LinearRegression', 'LogisticRegression', 'Ridge', 'Lasso']
+
+EXPLAINER_FILE = 'shap_explainer.joblib'
+
+# Explainers kept in memory per worker, keyed by model artifact fingerprint
+_explainer_cache = OrderedDict()
+_EXPLAINER_CACHE_SIZE = 8
+
+
+def _model_fingerprint(model_path):
+    stat = os.stat(model_path)
+    return f'{os.path.abspath(model_path)}:{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def build_explainer(model, model_type, X_background):
+    """
+    Create the fastest suitable SHAP explainer for a model.
+
+    Args:
+        model: Fitted scikit-learn model.
+        model_type (str): MLExperiment.model_name.
+        X_background (pd.DataFrame): Data used to summarise the background
+            distribution (k-means centroids).
+
+    Returns:
+        shap.Explainer: Tree, linear or permutation explainer.
+    """
+    import shap
+
+    if any(name in model_type for name in TREE_MODELS):
+        # Exact and fast, needs no background data
+        return shap.TreeExplainer(model)
+
+    n_clusters = min(getattr(settings, 'SHAP_BACKGROUND_SIZE', 50), len(X_background))
+    background = shap.kmeans(X_background.to_numpy(dtype='float64'), n_clusters).data
+    masker = shap.maskers.Independent(background, max_samples=len(background))
+
+    if any(name in model_type for name in LINEAR_MODELS):
+        return shap.LinearExplainer(model, masker)
+
+    # Model agnostic: permutation explainer is much faster than KernelExplainer
+    n_features = X_background.shape[1]
+    return shap.PermutationExplainer(model.predict, masker, max_evals=max(500, 2 * n_features + 1))
+
+
+def get_explainer(model, model_type, model_path, X_background):
+    """
+    Return the cached explainer for a model artifact, building it if needed.
+
+    Explainers are cached in this worker's memory and pickled next to the
+    model file; both caches are keyed by the model file's path, mtime and
+    size, so retraining the model invalidates them.
+
+    Args:
+        model: Fitted model loaded from ``model_path``.
+        model_type (str): MLExperiment.model_name.
+        model_path (str): Absolute path to the model artifact.
+        X_background (pd.DataFrame): Background data for new explainers.
+
+    Returns:
+        shap.Explainer: Explainer for the model.
+    """
+    fingerprint = _model_fingerprint(model_path)
+    if fingerprint in _explainer_cache:
+        _explainer_cache.move_to_end(fingerprint)
+        return _explainer_cache[fingerprint]
+
+    explainer_path = os.path.join(os.path.dirname(model_path), EXPLAINER_FILE)
+    explainer = None
+    if os.path.exists(explainer_path):
+        try:
+            cached = joblib.load(explainer_path)
+            if cached.get('fingerprint') == fingerprint:
+                explainer = cached['explainer']
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable SHAP explainer cache {explainer_path}: {e}")
+
+    if explainer is None:
+        explainer = build_explainer(model, model_type, X_background)
+        try:
+            joblib.dump({'fingerprint': fingerprint, 'explainer': explainer}, explainer_path)
+        except Exception as e:
+            logger.warning(f"Could not cache SHAP explainer for {model_path}: {e}")
+
+    _explainer_cache[fingerprint] = explainer
+    if len(_explainer_cache) > _EXPLAINER_CACHE_SIZE:
+        _explainer_cache.popitem(last=False)
+    return explainer
+
+
+def _explain_batch(explainer, X_batch):
+    """Compute SHAP values for one batch (runs in joblib workers)."""
+    import shap
+
+    if isinstance(explainer, shap.TreeExplainer):
+        values = explainer(X_batch, check_additivity=False).values
+    else:
+        values = explainer(X_batch).values
+    # Multi-output models (e.g. classification): keep the first output
+    if values.ndim == 3:
+        values = values[..., 0]
+    return values
+
+
+def compute_shap_values(explainer, X_sample, n_jobs=None):
+    """
+    Compute SHAP values in batches across processes.
+
+    Args:
+        explainer (shap.Explainer): Explainer from ``get_explainer``.
+        X_sample (pd.DataFrame): Rows to explain.
+        n_jobs (int, optional): Worker processes (defaults to ``SHAP_N_JOBS``).
+
+    Returns:
+        np.ndarray: SHAP values, one row per sample.
+    """
+    if n_jobs is None:
+        n_jobs = getattr(settings, 'SHAP_N_JOBS', 2)
+    n_batches = max(1, min(n_jobs if n_jobs > 0 else os.cpu_count() or 1, len(X_sample)))
+    batches = np.array_split(np.arange(len(X_sample)), n_batches)
+
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_explain_batch)(explainer, X_sample.iloc[batch]) for batch in batches
+    )
+    return np.vstack(results)
+
+
+def save_shap_summary(experiment, shap_values, feature_names, artifacts_dir):
+    """
+    Write the SHAP feature importance plot and data for an experiment.
+
+    Args:
+        experiment (MLExperiment): The experiment instance.
+        shap_values (np.ndarray): SHAP values, one row per sample.
+        feature_names (list): Feature column names.
+        artifacts_dir (str): Directory to save the files to.
+
+    Returns:
+        str: Relative path to the interactive summary plot.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    # Calculate feature importance (mean absolute SHAP values)
+    feature_importance = np.abs(shap_values).mean(0)
+
+    # Limit to top 20 features for readability
+    max_features = min(20, len(feature_names))
+    top_indices = np.argsort(feature_importance)[-max_features:]
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=feature_importance[top_indices],
+        y=[feature_names[i] for i in top_indices],
+        orientation='h',
+        marker=dict(color='rgba(55, 128, 191, 0.7)', line=dict(color='rgba(55, 128, 191, 1.0)', width=1)),
+        hovertemplate='<b>%{y}</b><br>Importance: %{x:.4f}<extra></extra>'
+    ))
+    fig.update_layout(
+        title='SHAP Feature Importance Summary',
+        xaxis_title='Mean |SHAP Value| (Feature Importance)',
+        yaxis_title='Features',
+        height=max(400, max_features * 25),
+        template='plotly_white',
+        margin=dict(l=200)  # Extra margin for feature names
+    )
+
+    shap_plot_filename = 'shap_summary.html'
+    pio.write_html(fig, os.path.join(artifacts_dir, shap_plot_filename), include_plotlyjs='cdn')
+    try:
+        pio.write_image(fig, os.path.join(artifacts_dir, 'shap_summary.png'), width=800, height=600, scale=2)
+    except Exception as img_error:
+        print(f"Warning: Could not save static image: {img_error}")
+
+    shap_data = {
+        'feature_names': feature_names,
+        'feature_importance': feature_importance.tolist(),
+        'shap_values_sample': shap_values[:min(100, len(shap_values))].tolist()
+    }
+    with open(os.path.join(artifacts_dir, 'shap_data.json'), 'w') as f:
+        json.dump(shap_data, f, indent=2)
+
+    return f'experiments/{experiment.id}/{shap_plot_filename}'
+
+
+def explain_model(experiment, model, X_test, artifacts_dir, model_path=None):
+    """
+    Explain a model on a sample of its test data and save the summary.
+
+    Args:
+        experiment (MLExperiment): The experiment instance.
+        model: The trained model.
+        X_test (pd.DataFrame): Test features.
+        artifacts_dir (str): Directory to save the SHAP files to.
+        model_path (str, optional): Model artifact path; enables explainer caching.
+
+    Returns:
+        str: Relative path to the saved SHAP summary plot.
+    """
+    max_samples = min(getattr(settings, 'SHAP_MAX_SAMPLES', 500), len(X_test))
+    if len(X_test) > max_samples:
+        X_sample = X_test.sample(n=max_samples, random_state=42)
+    else:
+        X_sample = X_test
+    print(f"Using {len(X_sample)} samples for SHAP analysis")
+
+    if model_path:
+        explainer = get_explainer(model, experiment.model_name, model_path, X_sample)
+    else:
+        explainer = build_explainer(model, experiment.model_name, X_sample)
+    print(f"Using {type(explainer).__name__} for model type: {experiment.model_name}")
+
+    shap_values = compute_shap_values(explainer, X_sample)
+    return save_shap_summary(experiment, shap_values, [str(c) for c in X_test.columns], artifacts_dir)
+
+
+@shared_task
+def run_shap_explanation_task(experiment_id):
+    """
+    Generate SHAP explanations for an evaluated experiment.
+
+    Queued by the final evaluation once the experiment is finished; failures
+    are logged and never change the experiment's status.
+
+    Args:
+        experiment_id (str): UUID of the experiment to explain.
+
+    Returns:
+        str or None: Relative path to the SHAP summary plot, None on failure.
+    """
+    try:
+        experiment = MLExperiment.objects.get(id=experiment_id)
+        paths = experiment.artifact_paths or {}
+        if 'trained_model' not in paths or 'test_X' not in paths:
+            logger.warning(f"Experiment {experiment_id} has no trained model or test data to explain")
+            return None
+
+        model_path = os.path.join(settings.MEDIA_ROOT, paths['trained_model'])
+        model, _ = load_model(model_path)
+
+        test_X_path = os.path.join(settings.MEDIA_ROOT, paths['test_X'])
+        if 'test_X_matrix' in paths:
+            X_test = load_features(paths, 'test_X')
+        else:
+            # Only a sample is explained: don't load large test sets whole
+            X_test = pq.ParquetFile(test_X_path).read_row_group(0).to_pandas()
+
+        artifacts_dir = os.path.join(settings.MEDIA_ROOT, 'experiments', str(experiment.id))
+        shap_plot_path = explain_model(experiment, model, X_test, artifacts_dir, model_path=model_path)
+
+        with transaction.atomic():
+            experiment = MLExperiment.objects.select_for_update().get(id=experiment_id)
+            experiment.artifact_paths['shap_summary'] = shap_plot_path
+            experiment.artifact_paths['shap_data'] = f'experiments/{experiment.id}/shap_data.json'
+            experiment.save(update_fields=['artifact_paths', 'updated_at'])
+
+        print(f"SHAP summary plot generated for experiment {experiment_id}")
+        return shap_plot_path
+
+    except Exception as e:
+        print(f"Warning: Could not generate SHAP plots for experiment {experiment_id}: {e}")
+        logger.warning(f"SHAP generation failed for experiment {experiment_id}: {e}")
+        return None
@@ -0,0 +1,85 @@
+"""
+Memory-mapped feature matrices for experiment splits.
+
+Besides the Parquet files, the split stage stores each feature table as a
+contiguous ``.npy`` matrix plus the column names. Tasks open the matrix with
+``np.load(mmap_mode='r')`` and wrap it in a DataFrame without copying, so
+scikit-learn validates it in place and concurrent workers training on the
+same split share the operating system's page cache instead of each holding
+its own decoded copy.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+COLUMNS_FILE = 'feature_columns.json'
+
+
+def write_feature_matrices(features, absolute_dir, relative_dir):
+    """
+    Persist feature tables as contiguous ``.npy`` matrices.
+
+    Only all-numeric tables are written; anything else keeps using the
+    Parquet files alone.
+
+    Args:
+        features (dict): Split name ('train_X', 'test_X', 'full_X') -> DataFrame.
+            All tables must share the same columns.
+        absolute_dir (str): Directory to write the files to.
+        relative_dir (str): Same directory relative to MEDIA_ROOT.
+
+    Returns:
+        dict: Artifact paths to add to the split ('<name>_matrix' and
+        'feature_columns'), empty when the features are not numeric.
+    """
+    first = next(iter(features.values()))
+    if not all(pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+               for dtype in first.dtypes):
+        return {}
+
+    dtype = np.dtype(getattr(settings, 'SPLIT_FEATURE_DTYPE', 'float64'))
+    artifact_paths = {}
+    for name, frame in features.items():
+        matrix = np.ascontiguousarray(frame.to_numpy(dtype=dtype))
+        np.save(os.path.join(absolute_dir, f'{name}.npy'), matrix)
+        artifact_paths[f'{name}_matrix'] = f'{relative_dir}/{name}.npy'
+
+    with open(os.path.join(absolute_dir, COLUMNS_FILE), 'w') as f:
+        json.dump({'columns': [str(column) for column in first.columns], 'dtype': dtype.name}, f)
+    artifact_paths['feature_columns'] = f'{relative_dir}/{COLUMNS_FILE}'
+    return artifact_paths
+
+
+def load_features(artifact_paths, name):
+    """
+    Load a split's feature table, memory-mapped when a matrix is available.
+
+    Args:
+        artifact_paths (dict): Experiment or split artifact paths.
+        name (str): 'train_X', 'test_X' or 'full_X'.
+
+    Returns:
+        pd.DataFrame: Features backed by a read-only memory map, or read from
+        Parquet (and passed through the split's preprocessor, if it has one)
+        when the matrix is missing.
+    """
+    matrix_path = artifact_paths.get(f'{name}_matrix')
+    columns_path = artifact_paths.get('feature_columns')
+    if matrix_path and columns_path:
+        matrix_path = os.path.join(settings.MEDIA_ROOT, matrix_path)
+        columns_path = os.path.join(settings.MEDIA_ROOT, columns_path)
+        if os.path.exists(matrix_path) and os.path.exists(columns_path):
+            with open(columns_path) as f:
+                columns = json.load(f)['columns']
+            matrix = np.load(matrix_path, mmap_mode='r')
+            return pd.DataFrame(matrix, columns=columns, copy=False)
+
+    features = pd.read_parquet(os.path.join(settings.MEDIA_ROOT, artifact_paths[name]))
+    # The Parquet files hold the raw features; the matrices hold the preprocessed ones
+    from experiments.preprocessing import load_preprocessor
+
+    preprocessor = load_preprocessor(artifact_paths)
+    return preprocessor.transform(features) if preprocessor is not None else features
@@ -0,0 +1,297 @@
+"""
+Out-of-core training for datasets that do not fit in memory.
+
+Experiments whose training data is larger than
+``INCREMENTAL_TRAINING_THRESHOLD_BYTES`` and whose model supports
+``partial_fit`` are trained by streaming the split's Parquet row groups:
+
+- the split itself is written chunk by chunk from the source CSV
+  (``write_split_streaming``)
+- a StandardScaler (whose means also impute missing values) and the
+  estimator are fitted batch by batch (``fit_incremental``)
+- evaluation accumulates metrics batch by batch (``evaluate_incremental``)
+
+so memory use is bounded by the batch size, not by the dataset.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+from sklearn.base import is_classifier
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+# Model names (MLExperiment.model_name) whose estimators implement partial_fit
+INCREMENTAL_MODELS = {'SGDRegressor', 'SGDClassifier', 'MLPRegressor'}
+
+
+def _threshold_bytes():
+    return getattr(settings, 'INCREMENTAL_TRAINING_THRESHOLD_BYTES', 1024 ** 3)
+
+
+def _batch_rows():
+    return getattr(settings, 'INCREMENTAL_TRAINING_BATCH_ROWS', 100_000)
+
+
+def parquet_memory_size(path):
+    """
+    Estimate the in-memory size of a Parquet file from its metadata.
+
+    Args:
+        path (str): Absolute path to the Parquet file.
+
+    Returns:
+        int: Uncompressed size of all row groups, in bytes.
+    """
+    metadata = pq.ParquetFile(path).metadata
+    return sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+
+
+def use_incremental_training(experiment):
+    """
+    Whether an experiment should be trained and evaluated out of core.
+
+    Args:
+        experiment (MLExperiment): Experiment with its split prepared.
+
+    Returns:
+        bool: True for partial_fit models whose training data exceeds the threshold.
+    """
+    if experiment.model_name not in INCREMENTAL_MODELS:
+        return False
+    train_X = (experiment.artifact_paths or {}).get('train_X')
+    if not train_X:
+        return False
+    path = os.path.join(settings.MEDIA_ROOT, train_X)
+    return os.path.exists(path) and parquet_memory_size(path) > _threshold_bytes()
+
+
+def should_stream_split(datasource):
+    """
+    Whether a datasource is too large to be loaded whole for splitting.
+
+    Only original (non-derived) CSV datasources are streamed: derived ones
+    are produced by in-memory transformations, and Parquet sources (which
+    may carry synced part files) are read through ``read_dataset``.
+
+    Args:
+        datasource (DataSource): Experiment input datasource.
+
+    Returns:
+        bool: True if the source file is larger than the threshold.
+    """
+    if datasource.is_derived or not datasource.file or not datasource.file.name.lower().endswith('.csv'):
+        return False
+    try:
+        return datasource.file.size > _threshold_bytes()
+    except (OSError, ValueError):
+        return False
+
+
+def write_split_streaming(datasource, target_column, absolute_dir, relative_dir, test_size, random_state,
+                          feature_columns=None):
+    """
+    Write a train/test split by streaming the source CSV in chunks.
+
+    Each row is assigned to the test set with probability ``test_size``
+    using a generator seeded with ``random_state``, so the split is
+    reproducible without holding the dataset in memory. Every chunk becomes
+    one Parquet row group.
+
+    Integer and boolean columns are written as float64: a column typed as
+    integer in the first chunk may hold decimals or gaps (NaN) further down,
+    and every chunk must match the schema of the first one.
+
+    Args:
+        datasource (DataSource): Original datasource with a CSV file.
+        target_column (str): Name of the target column.
+        absolute_dir (str): Directory to write the files to.
+        relative_dir (str): Same directory relative to MEDIA_ROOT.
+        test_size (float): Fraction of rows assigned to the test set.
+        random_state (int): Seed for the row assignment.
+        feature_columns (list, optional): Feature columns to keep; defaults
+            to every column but the target.
+
+    Returns:
+        tuple: (artifact_paths relative to MEDIA_ROOT, number of source rows)
+
+    Raises:
+        ValueError: If the target or a feature column is not in the
+            datasource, or a column changes to an incompatible type between
+            chunks.
+    """
+    rng = np.random.default_rng(random_state)
+    writers = {}
+    n_rows = 0
+
+    def write(name, frame):
+        frame = frame.astype({
+            column: 'float64' for column, dtype in frame.dtypes.items()
+            if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+        })
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if name not in writers:
+            writers[name] = pq.ParquetWriter(os.path.join(absolute_dir, f'{name}.parquet'), table.schema)
+        try:
+            table = table.cast(writers[name].schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError(
+                f"Column types of the datasource change between chunks of {_batch_rows()} rows: {e}"
+            ) from e
+        writers[name].write_table(table)
+
+    try:
+        for chunk in pd.read_csv(datasource.file.path, chunksize=_batch_rows()):
+            if target_column not in chunk.columns:
+                raise ValueError(f"Target column '{target_column}' not found in datasource")
+            missing = [column for column in feature_columns or [] if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"Feature columns not found in datasource: {missing}")
+            n_rows += len(chunk)
+            is_test = rng.random(len(chunk)) < test_size
+            X = chunk[feature_columns] if feature_columns else chunk.drop(columns=[target_column])
+            y = chunk[[target_column]]
+            write('train_X', X[~is_test])
+            write('train_y', y[~is_test])
+            write('test_X', X[is_test])
+            write('test_y', y[is_test])
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    print(f"Streamed train/test split completed: {n_rows} rows")
+    artifact_paths = {name: f'{relative_dir}/{name}.parquet' for name in ('train_X', 'train_y', 'test_X', 'test_y')}
+    return artifact_paths, n_rows
+
+
+def iter_batches(X_path, y_path, columns=None):
+    """
+    Yield aligned feature/target batches from a pair of Parquet files.
+
+    Rows without a target value are dropped; missing feature values are
+    kept as NaN.
+
+    Args:
+        X_path (str): Absolute path to the features file.
+        y_path (str): Absolute path to the target file.
+        columns (list, optional): Feature columns to read.
+
+    Yields:
+        tuple: (np.ndarray features, np.ndarray target) per batch.
+    """
+    batch_size = _batch_rows()
+    X_batches = pq.ParquetFile(X_path).iter_batches(batch_size=batch_size, columns=columns)
+    y_batches = pq.ParquetFile(y_path).iter_batches(batch_size=batch_size)
+    for X_batch, y_batch in zip(X_batches, y_batches):
+        X = X_batch.to_pandas().to_numpy(dtype='float64')
+        y = y_batch.column(0)
+        if y.null_count:
+            has_target = y.is_valid().to_numpy(zero_copy_only=False)
+            X = X[has_target]
+            y = y.drop_null()
+        yield X, y.to_numpy(zero_copy_only=False)
+
+
+def fit_incremental(model, X_path, y_path, n_epochs=None):
+    """
+    Fit a partial_fit estimator by streaming its training data.
+
+    A first pass fits a StandardScaler (SGD and MLP estimators need scaled
+    inputs) and collects the classes for classifiers; each following epoch
+    streams the data through ``model.partial_fit``. The scaler ignores NaN
+    when computing its means, so missing values (sensor gaps) are imputed
+    with the column mean by filling them with 0 after scaling.
+
+    Args:
+        model: Unfitted estimator implementing partial_fit.
+        X_path (str): Absolute path to the training features.
+        y_path (str): Absolute path to the training target.
+        n_epochs (int, optional): Passes over the data
+            (defaults to ``INCREMENTAL_TRAINING_EPOCHS``).
+
+    Returns:
+        Pipeline: Fitted scaler, imputer and estimator, usable like any other model.
+
+    Raises:
+        ValueError: If the training data has no rows with a target value.
+    """
+    if n_epochs is None:
+        n_epochs = getattr(settings, 'INCREMENTAL_TRAINING_EPOCHS', 5)
+
+    scaler = StandardScaler()
+    classes = set()
+    for X_batch, y_batch in iter_batches(X_path, y_path):
+        if len(X_batch) == 0:
+            continue
+        scaler.partial_fit(X_batch)
+        if is_classifier(model):
+            classes.update(np.unique(y_batch).tolist())
+    if not hasattr(scaler, 'n_features_in_'):
+        raise ValueError("Training data has no rows with a target value.")
+
+    # Scaled means are 0, so a constant 0 imputes the streamed column means
+    imputer = SimpleImputer(strategy='constant', fill_value=0.0).fit(np.zeros((1, scaler.n_features_in_)))
+
+    fit_kwargs = {'classes': np.array(sorted(classes))} if is_classifier(model) else {}
+    for epoch in range(n_epochs):
+        for X_batch, y_batch in iter_batches(X_path, y_path):
+            if len(X_batch) == 0:
+                continue
+            model.partial_fit(imputer.transform(scaler.transform(X_batch)), y_batch, **fit_kwargs)
+        print(f"Incremental training epoch {epoch + 1}/{n_epochs} completed")
+
+    return Pipeline([('scaler', scaler), ('imputer', imputer), ('model', model)])
+
+
+def evaluate_incremental(model, X_path, y_path, predictions_path):
+    """
+    Evaluate a model by streaming the test data.
+
+    Metrics are accumulated from per-batch sums and predictions are appended
+    to a Parquet file batch by batch (chart data is built from that file,
+    see ``experiments.prediction_charts``).
+
+    Args:
+        model: Fitted model.
+        X_path (str): Absolute path to the test features.
+        y_path (str): Absolute path to the test target.
+        predictions_path (str): Parquet file to write y_true/y_pred to.
+
+    Returns:
+        dict: 'performance_metrics', matching the in-memory evaluation.
+    """
+    n = 0
+    sum_y = sum_y2 = sum_sq_err = sum_abs_err = 0.0
+    schema = pa.schema([('y_true', pa.float64()), ('y_pred', pa.float64())])
+
+    with pq.ParquetWriter(predictions_path, schema) as writer:
+        for X_batch, y_batch in iter_batches(X_path, y_path):
+            if len(X_batch) == 0:
+                continue
+            y_true = y_batch.astype('float64')
+            y_pred = np.asarray(model.predict(X_batch), dtype='float64')
+            errors = y_true - y_pred
+
+            n += len(y_true)
+            sum_y += float(y_true.sum())
+            sum_y2 += float((y_true ** 2).sum())
+            sum_sq_err += float((errors ** 2).sum())
+            sum_abs_err += float(np.abs(errors).sum())
+            writer.write_table(pa.table({'y_true': y_true, 'y_pred': y_pred}, schema=schema))
+
+    if n == 0:
+        raise ValueError("Test data is empty.")
+
+    mse = sum_sq_err / n
+    total_variance = sum_y2 - sum_y ** 2 / n
+    metrics = {
+        'mse': mse,
+        'mae': sum_abs_err / n,
+        'r2': 1.0 - sum_sq_err / total_variance if total_variance > 0 else 0.0,
+        'rmse': mse ** 0.5,
+    }
+    return {'performance_metrics': metrics}
@@ -4,6 +4,8 @@ Pipeline orchestration tasks for ML experiments.
 from celery import shared_task, chain
 from experiments.models import MLExperiment
 from django.urls import reverse
+from experiments.tracking import create_run
+from .tracking_tasks import RunTracker
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,8 +27,9 @@ def run_full_experiment_pipeline_task(self, experiment_id):
     3. Model evaluation and metrics calculation
     4. Final status update to FINISHED
     
-    The task includes comprehensive MLflow integration for experiment tracking,
-    parameter logging, and model registry. Each step in the pipeline is
+    The task creates the experiment's MLflow run; its parameters and tags
+    are buffered and logged in the background (see ``tracking_tasks``), so
+    tracking never delays the pipeline. Each step in the pipeline is
     tracked and can be monitored through both Django models and MLflow UI.
     
     Args:
@@ -41,7 +44,7 @@ def run_full_experiment_pipeline_task(self, experiment_id):
         - Updates experiment status to RUNNING
         - Creates MLflow experiment and run
         - Stores MLflow run ID in experiment model
-        - Logs experiment metadata to MLflow
+        - Queues logging of experiment metadata to MLflow
         - Initiates task chain for sequential execution
         - Updates experiment status to ERROR on failure
         
@@ -50,64 +53,43 @@ def run_full_experiment_pipeline_task(self, experiment_id):
         enabling better error handling and task introspection.
     """
     try:
-        import mlflow
-        
         experiment = MLExperiment.objects.get(id=experiment_id)
         experiment.status = MLExperiment.Status.RUNNING
         experiment.save(update_fields=['status', 'updated_at'])
         logger.info(f"Iniciando pipeline completo para el experimento: {experiment.name} ({experiment_id})")
 
-        # Set MLflow tracking URI
-        mlflow.set_tracking_uri("http://mlflow:5000")
-        
-        # Create or set experiment in MLflow
-        mlflow_experiment_name = f"HydroML_Experiment_{experiment_id}"
+        # Create the MLflow run; its metadata is logged in the background
+        tracker = RunTracker(None)
         try:
-            mlflow_experiment = mlflow.get_experiment_by_name(mlflow_experiment_name)
-            if mlflow_experiment is None:
-                mlflow_experiment_id = mlflow.create_experiment(mlflow_experiment_name)
-            else:
-                mlflow_experiment_id = mlflow_experiment.experiment_id
-        except Exception:
-            mlflow_experiment_id = mlflow.create_experiment(mlflow_experiment_name)
-        
-        mlflow.set_experiment(mlflow_experiment_name)
-        
-        # Start MLflow run
-        with mlflow.start_run() as mlflow_run:
-            # Store MLflow run ID in our experiment
-            experiment.mlflow_run_id = mlflow_run.info.run_id
+            experiment.mlflow_run_id = create_run(f"HydroML_Experiment_{experiment_id}")
             experiment.save(update_fields=['mlflow_run_id', 'updated_at'])
-            
-            # Log experiment metadata
-            mlflow.log_param("experiment_id", experiment_id)
-            mlflow.log_param("model_name", experiment.model_name)
-            mlflow.log_param("datasource_id", experiment.input_datasource.id)
-            mlflow.log_param("target_column", experiment.target_column)
-            
-            # Log hyperparameters if they exist
-            if experiment.hyperparameters:
-                for param_name, param_value in experiment.hyperparameters.items():
-                    mlflow.log_param(f"hp_{param_name}", param_value)
-            
-            # Sync tags from Django to MLflow
-            try:
-                experiment_tags = list(experiment.tags.names())
-                if experiment_tags:
-                    # Convert tag list to a dictionary for MLflow
-                    mlflow_tags = {f"tag_{i}": tag for i, tag in enumerate(experiment_tags)}
-                    # Also add a combined tags field
-                    mlflow_tags["all_tags"] = ",".join(experiment_tags)
-                    mlflow_tags["tag_count"] = str(len(experiment_tags))
-                    
-                    mlflow.set_tags(mlflow_tags)
-                    logger.info(f"Synced {len(experiment_tags)} tags to MLflow for experiment {experiment_id}: {experiment_tags}")
-                else:
-                    logger.info(f"No tags to sync for experiment {experiment_id}")
-            except Exception as tag_error:
-                logger.warning(f"Could not sync tags to MLflow for experiment {experiment_id}: {tag_error}")
-            
-            logger.info(f"Created MLflow run {mlflow_run.info.run_id} for experiment {experiment_id}")
+            tracker = RunTracker(experiment.mlflow_run_id)
+            logger.info(f"Created MLflow run {experiment.mlflow_run_id} for experiment {experiment_id}")
+        except Exception as tracking_error:
+            logger.warning(f"Could not create MLflow run for experiment {experiment_id}: {tracking_error}")
+
+        # Log experiment metadata
+        tracker.log_params({
+            "experiment_id": experiment_id,
+            "model_name": experiment.model_name,
+            "datasource_id": experiment.input_datasource.id,
+            "target_column": experiment.target_column,
+        })
+
+        # Log hyperparameters if they exist
+        if experiment.hyperparameters:
+            tracker.log_params({f"hp_{name}": value for name, value in experiment.hyperparameters.items()})
+
+        # Sync tags from Django to MLflow
+        experiment_tags = list(experiment.tags.names())
+        if experiment_tags:
+            # Convert tag list to a dictionary for MLflow
+            mlflow_tags = {f"tag_{i}": tag for i, tag in enumerate(experiment_tags)}
+            # Also add a combined tags field
+            mlflow_tags["all_tags"] = ",".join(experiment_tags)
+            mlflow_tags["tag_count"] = str(len(experiment_tags))
+            tracker.set_tags(mlflow_tags)
+        tracker.flush()
 
         # Choose pipeline based on validation strategy
         validation_strategy = getattr(experiment, 'validation_strategy', 'TRAIN_TEST_SPLIT')
@@ -0,0 +1,118 @@
+"""
+Batch scoring of DataSources with trained experiment models.
+"""
+from celery import shared_task
+from experiments.models import MLExperiment
+from experiments.prediction_service import (
+    get_experiment_model, get_feature_columns, prepare_features, transform_features
+)
+from projects.models import DataSource, DataSourceType
+from data_tools.services import dataset_parts, process_datasource_to_df, read_dataset
+import logging
+import os
+import tempfile
+import time
+import pandas as pd
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.core.files import File
+
+logger = logging.getLogger(__name__)
+
+
+def iter_datasource_chunks(datasource, chunk_rows):
+    """
+    Yield a DataSource's rows as DataFrames of at most ``chunk_rows`` rows.
+
+    Original CSV and Parquet files are streamed; derived datasources (and
+    Parquet files with sync parts not compacted yet) are materialised first.
+
+    Args:
+        datasource (DataSource): Data to read.
+        chunk_rows (int): Maximum rows per chunk.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the data.
+    """
+    if not datasource.is_derived and datasource.file:
+        path = datasource.file.path
+        if path.endswith('.parquet') and not dataset_parts(path):
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+            return
+        if not path.endswith('.parquet'):
+            yield from pd.read_csv(path, chunksize=chunk_rows)
+            return
+        # Synced parts not compacted yet: read with key upserts applied
+        df = read_dataset(path, copy=False)
+    else:
+        df = process_datasource_to_df(datasource.id)
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+@shared_task(bind=True)
+def run_batch_prediction_task(self, experiment_id, datasource_id, output_name=None):
+    """
+    Score a whole DataSource with an experiment's model.
+
+    The source is streamed in chunks of ``PREDICTION_BATCH_CHUNK_ROWS`` rows;
+    each chunk is scored and appended to a CSV with the original columns
+    plus ``prediction``, which is saved as a new prepared DataSource whose
+    parent is the scored source.
+
+    Args:
+        self: Celery task instance (bound task).
+        experiment_id (str): UUID of a finished experiment.
+        datasource_id (str): UUID of the DataSource to score.
+        output_name (str, optional): Name of the new DataSource.
+
+    Returns:
+        dict: New DataSource id, rows scored and throughput (rows/sec).
+
+    Raises:
+        PredictionError: If the experiment cannot score the data.
+    """
+    experiment = MLExperiment.objects.select_related('project').get(id=experiment_id)
+    source = DataSource.objects.get(id=datasource_id)
+    chunk_rows = getattr(settings, 'PREDICTION_BATCH_CHUNK_ROWS', 50_000)
+
+    model = get_experiment_model(experiment)
+    columns = get_feature_columns(experiment, model)
+
+    started = time.perf_counter()
+    n_rows = 0
+    output = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False)
+    try:
+        with output:
+            for chunk in iter_datasource_chunks(source, chunk_rows):
+                chunk = chunk.copy()
+                chunk['prediction'] = model.predict(transform_features(experiment, prepare_features(chunk, columns)))
+                chunk.to_csv(output, header=(n_rows == 0), index=False)
+                n_rows += len(chunk)
+                self.update_state(state='PROGRESS', meta={'rows': n_rows})
+        elapsed = time.perf_counter() - started
+        
+        predictions_ds = DataSource.objects.create(
+            project=experiment.project,
+            owner=source.owner,
+            name=output_name or f"{source.name} - predicciones {experiment.name}",
+            description=f"Predicciones del experimento '{experiment.name}' sobre '{source.name}'.",
+            data_type=DataSourceType.PREPARED,
+            status=DataSource.Status.READY,
+        )
+        with open(output.name, 'rb') as f:
+            predictions_ds.file.save(f"predictions_{experiment.id}_{source.id}.csv", File(f))
+        predictions_ds.parents.add(source)
+        experiment.project.datasources.add(predictions_ds)
+    finally:
+        os.remove(output.name)
+
+    rows_per_second = n_rows / elapsed if elapsed > 0 else None
+    logger.info(f"Scored {n_rows} rows of {source.id} with experiment {experiment_id} "
+                f"({rows_per_second or 0:.0f} rows/sec)")
+    return {
+        'datasource_id': str(predictions_ds.id),
+        'rows': n_rows,
+        'rows_per_second': rows_per_second,
+    }
@@ -7,11 +7,13 @@ including Optuna optimization and grid search strategies.
 
 from celery import shared_task
 from experiments.models import ExperimentSuite, MLExperiment
-from .utils import (
+from experiments.tasks.utils import (
     extract_optimization_metric,
     create_child_experiment_for_optuna,
     run_single_experiment_sync
 )
+from .trial_reporting import active_trial
+from .batch_training_tasks import train_experiments_in_batch
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,10 +31,10 @@ def run_experiment_suite_task(suite_id):
     - For other study types: Uses traditional grid search approach
     
     Optuna Integration:
-    - Creates an Optuna study with appropriate optimization direction
-    - Defines an objective function that suggests parameters and runs experiments
-    - Collects trial data and parameter importances for visualization
-    - Saves optimization results to the suite model
+    - Creates the suite's study in shared Optuna storage
+    - Runs ``suite.parallelism`` worker tasks that pull trials concurrently
+    - Streams trial data into the suite as trials finish
+    - Saves parameter importances once all workers are done
     
     Args:
         suite_id (str): UUID of the ExperimentSuite to execute.
@@ -48,6 +50,7 @@ def run_experiment_suite_task(suite_id):
         - Updates suite status to RUNNING, then COMPLETED
         - Creates multiple MLExperiment objects as children
         - For Optuna: Saves trial_data and param_importances to suite
+          (completion happens in finalize_optuna_suite_task)
         - Launches experiment pipeline tasks for each experiment
         - Updates suite timestamps (started_at, completed_at)
     """
@@ -92,112 +95,346 @@ def run_experiment_suite_task(suite_id):
         raise
 
 
+def get_optuna_storage(url=None):
+    """
+    Get the shared Optuna storage used by all sweep workers.
+    
+    The storage is taken from ``settings.OPTUNA_STORAGE_URL``. A
+    ``journal:///path`` URL uses a journal file (handy for tests and single
+    hosts); any other value is treated as an SQLAlchemy URL. When unset, the
+    default Django database is used so every Celery worker sees the same study.
+    
+    Args:
+        url (str, optional): Storage URL overriding the setting.
+        
+    Returns:
+        optuna.storages.BaseStorage: Storage shared across processes.
+    """
+    import optuna
+    from django.conf import settings
+    
+    url = url or getattr(settings, 'OPTUNA_STORAGE_URL', None) or _django_database_url()
+    
+    if url.startswith('journal://'):
+        from optuna.storages.journal import JournalFileBackend
+        return optuna.storages.JournalStorage(JournalFileBackend(url[len('journal://'):]))
+    
+    return optuna.storages.RDBStorage(
+        url,
+        engine_kwargs={'pool_pre_ping': True},
+        heartbeat_interval=60,
+        grace_period=180
+    )
+
+
+def _django_database_url():
+    """Build an SQLAlchemy URL for the default Django database"""
+    from urllib.parse import quote_plus
+    from django.conf import settings
+    
+    db = settings.DATABASES['default']
+    engine = db['ENGINE']
+    
+    if 'sqlite' in engine:
+        return f"sqlite:///{db['NAME']}"
+    if 'postgresql' in engine:
+        user = quote_plus(db.get('USER') or '')
+        password = quote_plus(db.get('PASSWORD') or '')
+        host = db.get('HOST') or 'localhost'
+        port = db.get('PORT') or '5432'
+        return f"postgresql+psycopg://{user}:{password}@{host}:{port}/{db['NAME']}"
+    
+    raise ValueError(f"No Optuna storage configured for database engine {engine}; set OPTUNA_STORAGE_URL")
+
+
+def get_optimization_direction(optimization_metric):
+    """
+    Get the Optuna direction for a metric name.
+    
+    Args:
+        optimization_metric (str): Metric being optimized.
+        
+    Returns:
+        str: 'minimize' for error metrics, 'maximize' otherwise.
+    """
+    lower_is_better_metrics = ['mse', 'mae', 'rmse', 'mean_squared_error', 'mean_absolute_error']
+    is_lower_better = any(metric in optimization_metric.lower() for metric in lower_is_better_metrics)
+    return 'minimize' if is_lower_better else 'maximize'
+
+
+def build_pruner(pruner_name):
+    """
+    Create the Optuna pruner selected on a suite.
+    
+    Pruners are not persisted in the shared storage, so every worker builds
+    its own from the suite setting.
+    
+    Args:
+        pruner_name (str): One of ExperimentSuite.Pruner values.
+        
+    Returns:
+        optuna.pruners.BasePruner: Pruner instance.
+    """
+    import optuna
+    
+    if pruner_name == ExperimentSuite.Pruner.MEDIAN:
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    if pruner_name == ExperimentSuite.Pruner.SUCCESSIVE_HALVING:
+        return optuna.pruners.SuccessiveHalvingPruner()
+    if pruner_name == ExperimentSuite.Pruner.HYPERBAND:
+        return optuna.pruners.HyperbandPruner(min_resource=1)
+    return optuna.pruners.NopPruner()
+
+
+def suggest_parameters(trial, search_space):
+    """
+    Suggest hyperparameters for a trial from a suite search space.
+    
+    Supports structured definitions (``{'type': 'int'|'float'|'categorical', ...}``)
+    and plain lists of categorical values.
+    
+    Args:
+        trial: Optuna trial object for parameter suggestion.
+        search_space (dict): The suite's search space.
+        
+    Returns:
+        dict: Suggested parameter values keyed by name.
+    """
+    suggested_params = {}
+    
+    for param_name, param_config in search_space.items():
+        if isinstance(param_config, dict):
+            # Handle structured parameter definition
+            param_type = param_config.get('type', 'float')
+            
+            if param_type == 'int':
+                suggested_params[param_name] = trial.suggest_int(
+                    param_name, 
+                    param_config['low'], 
+                    param_config['high']
+                )
+            elif param_type == 'float':
+                suggested_params[param_name] = trial.suggest_float(
+                    param_name, 
+                    param_config['low'], 
+                    param_config['high']
+                )
+            elif param_type == 'categorical':
+                suggested_params[param_name] = trial.suggest_categorical(
+                    param_name, 
+                    param_config['choices']
+                )
+        elif isinstance(param_config, list):
+            # Handle simple list of values (categorical)
+            suggested_params[param_name] = trial.suggest_categorical(param_name, param_config)
+    
+    return suggested_params
+
+
+def optimize_shared_study(study_name, storage, objective, n_trials, deadline=None, pruner=None):
+    """
+    Run trials of a shared study until the sweep-wide budget is used up.
+    
+    Several workers call this concurrently against the same storage. The
+    trial count is enforced across all of them (running trials included),
+    and ``deadline`` is an absolute wall-clock limit shared by the sweep.
+    
+    Args:
+        study_name (str): Name of the study in the shared storage.
+        storage: Optuna storage (see ``get_optuna_storage``).
+        objective (callable): Objective receiving an Optuna trial.
+        n_trials (int): Total trials for the whole sweep.
+        deadline (float, optional): ``time.time()`` after which no trial starts.
+        pruner (optional): Optuna pruner (see ``build_pruner``).
+        
+    Returns:
+        int: Number of trials this worker ran.
+    """
+    import time
+    import optuna
+    
+    study = optuna.load_study(study_name=study_name, storage=storage, pruner=pruner)
+    
+    timeout = None
+    if deadline is not None:
+        timeout = deadline - time.time()
+        if timeout <= 0:
+            return 0
+    
+    if len(study.get_trials(deepcopy=False)) >= n_trials:
+        return 0
+    
+    trials_before = {trial.number for trial in study.get_trials(deepcopy=False)}
+    study.optimize(
+        objective,
+        n_trials=n_trials,
+        timeout=timeout,
+        catch=(Exception,),
+        callbacks=[optuna.study.MaxTrialsCallback(n_trials, states=None)]
+    )
+    return sum(
+        1 for trial in study.get_trials(deepcopy=False)
+        if trial.number not in trials_before
+    )
+
+
 def _run_optuna_optimization_suite(suite):
     """
     Execute suite using Optuna for intelligent hyperparameter optimization.
     
     This function:
-    1. Creates an Optuna study with appropriate optimization direction
-    2. Defines an objective function that runs single experiments
-    3. Optimizes using the specified number of trials
-    4. Saves trial data and parameter importances
+    1. Creates the suite's study in the shared Optuna storage
+    2. Starts ``suite.parallelism`` worker tasks that pull trials from it
+    3. Registers a chord callback that saves importances and completes the suite
+    
+    Trial results are appended to ``suite.trial_data`` by the workers as each
+    trial finishes, so progress is visible while the sweep runs.
     
     Args:
         suite (ExperimentSuite): The suite to optimize.
         
     Returns:
-        str: Status message with optimization results.
+        str: Status message describing the dispatched sweep.
     """
     try:
+        import time
         import optuna
-        import optuna.importance
-        from django.utils import timezone
+        from celery import chord
         
         print(f"Starting Optuna optimization for suite {suite.id}")
         
-        # Determine optimization direction based on metric
-        lower_is_better_metrics = ['mse', 'mae', 'rmse', 'mean_squared_error', 'mean_absolute_error']
-        is_lower_better = any(metric in suite.optimization_metric.lower() for metric in lower_is_better_metrics)
-        direction = 'minimize' if is_lower_better else 'maximize'
+        if not suite.base_experiment:
+            raise ValueError("No base experiment found for suite")
         
-        # Create Optuna study
-        study = optuna.create_study(direction=direction)
+        direction = get_optimization_direction(suite.optimization_metric)
+        storage = get_optuna_storage()
         
-        # Storage for trial data
-        trial_data = []
+        # Re-running a suite starts a fresh study
+        study_name = suite.get_study_name()
+        try:
+            optuna.delete_study(study_name=study_name, storage=storage)
+        except KeyError:
+            pass
+        optuna.create_study(
+            study_name=study_name,
+            storage=storage,
+            direction=direction,
+            pruner=build_pruner(suite.pruner)
+        )
         
-        def objective(trial):
-            """
-            Optuna objective function that suggests parameters and runs a single experiment.
+        suite.trial_data = []
+        suite.param_importances = {}
+        suite.save(update_fields=['trial_data', 'param_importances', 'updated_at'])
+        
+        deadline = time.time() + suite.timeout_seconds if suite.timeout_seconds else None
+        parallelism = max(1, min(suite.parallelism, suite.n_trials))
+        
+        print(f"Starting Optuna optimization with {suite.n_trials} trials on {parallelism} workers")
+        chord(
+            run_optuna_trials_task.s(str(suite.id), deadline) for _ in range(parallelism)
+        )(finalize_optuna_suite_task.s(str(suite.id)))
+        
+        return f"Optuna optimization dispatched: {suite.n_trials} trials on {parallelism} workers"
+        
+    except Exception as e:
+        print(f"Error in Optuna optimization: {str(e)}")
+        suite.fail_execution()
+        raise
+
+
+@shared_task
+def run_optuna_trials_task(suite_id, deadline=None):
+    """
+    Sweep worker: run trials of a suite's shared Optuna study.
+    
+    Each trial suggests parameters, creates a child experiment, runs its
+    pipeline in this worker and appends the result to ``suite.trial_data``.
+    Pipeline steps report intermediate metrics to the trial, so the suite's
+    pruner can stop it early. Failed trials are recorded as FAIL in the study
+    and do not stop the worker.
+    
+    Args:
+        suite_id (str): UUID of the ExperimentSuite being optimized.
+        deadline (float, optional): Sweep-wide ``time.time()`` limit.
+        
+    Returns:
+        int: Number of trials run by this worker.
+    """
+    suite = ExperimentSuite.objects.get(id=suite_id)
+    
+    def objective(trial):
+        """
+        Optuna objective function that suggests parameters and runs a single experiment.
+        
+        Args:
+            trial: Optuna trial object for parameter suggestion.
             
-            Args:
-                trial: Optuna trial object for parameter suggestion.
-                
-            Returns:
-                float: The optimization metric value for this trial.
-            """
-            try:
-                # Suggest hyperparameters based on search space
-                suggested_params = {}
-                search_space = suite.search_space
-                
-                for param_name, param_config in search_space.items():
-                    if isinstance(param_config, dict):
-                        # Handle structured parameter definition
-                        param_type = param_config.get('type', 'float')
-                        
-                        if param_type == 'int':
-                            suggested_params[param_name] = trial.suggest_int(
-                                param_name, 
-                                param_config['low'], 
-                                param_config['high']
-                            )
-                        elif param_type == 'float':
-                            suggested_params[param_name] = trial.suggest_float(
-                                param_name, 
-                                param_config['low'], 
-                                param_config['high']
-                            )
-                        elif param_type == 'categorical':
-                            suggested_params[param_name] = trial.suggest_categorical(
-                                param_name, 
-                                param_config['choices']
-                            )
-                    elif isinstance(param_config, list):
-                        # Handle simple list of values (categorical)
-                        suggested_params[param_name] = trial.suggest_categorical(param_name, param_config)
-                
-                print(f"Trial {trial.number}: Testing parameters {suggested_params}")
-                
-                # Create child experiment with suggested parameters
-                child_experiment = create_child_experiment_for_optuna(suite, trial.number, suggested_params)
-                
-                # Run the experiment synchronously 
-                experiment_result = run_single_experiment_sync(child_experiment)
-                
-                # Extract the optimization metric value
-                metric_value = extract_optimization_metric(experiment_result, suite.optimization_metric)
-                
-                # Store trial data for visualization
-                trial_data.append({
-                    'trial_number': trial.number,
-                    'parameters': suggested_params,
-                    'value': metric_value,
-                    'experiment_id': str(child_experiment.id)
-                })
-                
-                print(f"Trial {trial.number} completed with {suite.optimization_metric}: {metric_value}")
-                return metric_value
-                
-            except Exception as e:
-                print(f"Error in trial {trial.number}: {str(e)}")
-                # Return worst possible value for failed trials
-                return float('inf') if direction == 'minimize' else float('-inf')
+        Returns:
+            float: The optimization metric value for this trial.
+        """
+        suggested_params = suggest_parameters(trial, suite.search_space)
+        print(f"Trial {trial.number}: Testing parameters {suggested_params}")
+        
+        # Create child experiment with suggested parameters
+        child_experiment = create_child_experiment_for_optuna(suite, trial.number, suggested_params)
+        
+        # Run the experiment synchronously in this worker, reporting
+        # intermediate metrics (raises TrialPruned when stopped early)
+        with active_trial(trial, suite.optimization_metric):
+            experiment_result = run_single_experiment_sync(child_experiment)
+        
+        metric_value = extract_optimization_metric(experiment_result, suite.optimization_metric)
+        if metric_value in (float('inf'), float('-inf')):
+            raise ValueError(f"Metric '{suite.optimization_metric}' missing from trial results")
+        
+        # Stream trial data back to the suite for visualization
+        suite.append_trial_data({
+            'trial_number': trial.number,
+            'parameters': suggested_params,
+            'value': metric_value,
+            'experiment_id': str(child_experiment.id)
+        })
+        
+        print(f"Trial {trial.number} completed with {suite.optimization_metric}: {metric_value}")
+        return metric_value
+    
+    try:
+        completed = optimize_shared_study(
+            suite.get_study_name(), get_optuna_storage(), objective, suite.n_trials, deadline,
+            pruner=build_pruner(suite.pruner)
+        )
+        logger.info(f"Sweep worker for suite {suite_id} ran {completed} trials")
+        return completed
+    except Exception as e:
+        # Never break the chord: the callback still finalizes the suite
+        logger.error(f"Sweep worker for suite {suite_id} failed: {e}")
+        return 0
+
+
+@shared_task
+def finalize_optuna_suite_task(worker_results, suite_id):
+    """
+    Chord callback run once every sweep worker has finished.
+    
+    Calculates parameter importances from the shared study, orders
+    ``trial_data`` by trial number and marks the suite as completed.
+    
+    Args:
+        worker_results (list): Trial counts returned by each worker.
+        suite_id (str): UUID of the ExperimentSuite.
         
-        # Run optimization with default 50 trials (configurable in future)
-        n_trials = 50
-        print(f"Starting Optuna optimization with {n_trials} trials")
-        study.optimize(objective, n_trials=n_trials)
+    Returns:
+        str: Status message with optimization results.
+    """
+    import optuna
+    import optuna.importance
+    
+    suite = ExperimentSuite.objects.get(id=suite_id)
+    
+    try:
+        study = optuna.load_study(study_name=suite.get_study_name(), storage=get_optuna_storage())
+        completed_trials = study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+        pruned_trials = study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.PRUNED,))
         
         # Calculate parameter importances
         try:
@@ -207,29 +444,39 @@ def _run_optuna_optimization_suite(suite):
             print(f"Could not calculate parameter importances: {e}")
             param_importances = {}
         
-        # Save optimization results to suite
-        suite.trial_data = trial_data
+        suite.refresh_from_db(fields=['trial_data'])
+        suite.trial_data = sorted(suite.trial_data or [], key=lambda t: t['trial_number'])
         suite.param_importances = param_importances
+        suite.save(update_fields=['trial_data', 'param_importances', 'updated_at'])
+        
+        if not completed_trials:
+            suite.fail_execution()
+            return f"Optuna optimization failed: no trial of {sum(worker_results or [])} completed"
         
-        # Save best trial results
         best_trial = study.best_trial
-        best_params = best_trial.params if best_trial else {}
-        best_value = best_trial.value if best_trial else None
+        best_entry = next(
+            (t for t in suite.trial_data if t['trial_number'] == best_trial.number), None
+        )
+        if best_entry:
+            suite.best_experiment_id = best_entry['experiment_id']
+            suite.save(update_fields=['best_experiment', 'updated_at'])
         
         print(f"Optuna optimization completed:")
-        print(f"Best value: {best_value}")
-        print(f"Best parameters: {best_params}")
+        print(f"Best value: {best_trial.value}")
+        print(f"Best parameters: {best_trial.params}")
         
         # Mark suite as completed
         suite.complete_execution()
         
-        completion_message = f"Optuna optimization completed: {len(trial_data)} trials, best {suite.optimization_metric}: {best_value}"
+        completion_message = (
+            f"Optuna optimization completed: {len(completed_trials)} trials "
+            f"({len(pruned_trials)} pruned), best {suite.optimization_metric}: {best_trial.value}"
+        )
         logger.info(f"Completed Optuna optimization for suite {suite.id}: {completion_message}")
-        
         return completion_message
         
     except Exception as e:
-        print(f"Error in Optuna optimization: {str(e)}")
+        print(f"Error finalizing Optuna optimization: {str(e)}")
         suite.fail_execution()
         raise
 
@@ -238,8 +485,11 @@ def _run_grid_search_suite(suite):
     """
     Execute suite using traditional grid search approach.
     
-    This function maintains the original grid search logic for non-HYPERPARAMETER_SWEEP
-    study types, generating all parameter combinations and launching experiments.
+    The parameter grid is expanded lazily and child experiments are created
+    with ``bulk_create`` in batches of ``GRID_SEARCH_BATCH_SIZE``. Execution is
+    dispatched as a chord of ``suite.parallelism`` lane tasks (the concurrency
+    cap); each lane runs its share of the children in turn, and the chord
+    callback aggregates metrics and picks the best experiment.
     
     Args:
         suite (ExperimentSuite): The suite to execute.
@@ -248,42 +498,93 @@ def _run_grid_search_suite(suite):
         str: Status message with experiment count.
     """
     try:
-        import itertools
-        from .experiment_tasks import run_full_experiment_pipeline_task
+        from celery import chord
+        from django.conf import settings
         
         # Parse the search space JSON
         search_space = suite.search_space
         if not search_space:
             raise ValueError("Search space is empty or invalid")
         
-        # Generate all parameter combinations
-        param_names = list(search_space.keys())
-        param_values = list(search_space.values())
-        
-        # Create cartesian product of all parameter values
-        combinations = list(itertools.product(*param_values))
-        
-        print(f"Generated {len(combinations)} parameter combinations from search space")
-        logger.info(f"Generated {len(combinations)} parameter combinations for suite {suite.id}")
-        
         # Check if we have a base experiment to copy from
         if not suite.base_experiment:
             raise ValueError("No base experiment found for suite")
         
-        base_experiment = suite.base_experiment
-        child_experiments_created = 0
+        batch_size = getattr(settings, 'GRID_SEARCH_BATCH_SIZE', 500)
+        child_experiments_created = create_grid_children(suite, iter_parameter_grid(search_space), batch_size)
         
-        # Loop through each parameter combination
-        for i, combination in enumerate(combinations):
-            # Create hyperparameters dict for this combination
-            hyperparameters = dict(zip(param_names, combination))
-            
-            # Create a new child experiment
-            child_experiment = MLExperiment(
+        print(f"Created {child_experiments_created} child experiments from search space")
+        logger.info(f"Created {child_experiments_created} grid search experiments for suite {suite.id}")
+        
+        if child_experiments_created == 0:
+            raise ValueError("Search space produced no parameter combinations")
+        
+        lane_count = max(1, min(suite.parallelism, child_experiments_created))
+        chord(
+            run_grid_search_lane_task.s(str(suite.id), lane_index, lane_count)
+            for lane_index in range(lane_count)
+        )(aggregate_grid_search_results_task.s(str(suite.id)))
+        
+        completion_message = (
+            f"Grid search dispatched: {child_experiments_created} child experiments on {lane_count} lanes"
+        )
+        print(completion_message)
+        return completion_message
+        
+    except Exception as e:
+        print(f"Error in grid search execution: {str(e)}")
+        suite.fail_execution()
+        raise
+
+
+def iter_parameter_grid(search_space):
+    """
+    Lazily yield every parameter combination of a grid search space.
+    
+    Args:
+        search_space (dict): Mapping of parameter name to list of values.
+        
+    Yields:
+        dict: One hyperparameter combination.
+    """
+    import itertools
+    
+    param_names = list(search_space.keys())
+    for combination in itertools.product(*search_space.values()):
+        yield dict(zip(param_names, combination))
+
+
+def create_grid_children(suite, combinations, batch_size=500):
+    """
+    Create one child experiment per combination using batched ``bulk_create``.
+    
+    Args:
+        suite (ExperimentSuite): Parent suite with a base experiment.
+        combinations (iterable): Hyperparameter dicts (consumed lazily).
+        batch_size (int): Rows per INSERT.
+        
+    Returns:
+        int: Number of child experiments created.
+    """
+    import itertools
+    
+    base_experiment = suite.base_experiment
+    iterator = iter(combinations)
+    created = 0
+    
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            break
+        
+        children = []
+        for offset, hyperparameters in enumerate(batch):
+            run_number = created + offset + 1
+            children.append(MLExperiment(
                 # Copy settings from base experiment
                 project=base_experiment.project,
-                name=f"{suite.name} - Run {i+1}",
-                description=f"Child experiment {i+1} of suite '{suite.name}'. Parameters: {hyperparameters}",
+                name=f"{suite.name} - Run {run_number}",
+                description=f"Child experiment {run_number} of suite '{suite.name}'. Parameters: {hyperparameters}",
                 input_datasource=base_experiment.input_datasource,
                 target_column=base_experiment.target_column,
                 model_name=base_experiment.model_name,
@@ -291,35 +592,164 @@ def _run_grid_search_suite(suite):
                 test_split_size=base_experiment.test_split_size,
                 split_random_state=base_experiment.split_random_state,
                 split_strategy=base_experiment.split_strategy,
+                validation_strategy=base_experiment.validation_strategy,
+                cv_n_splits=base_experiment.cv_n_splits,
+                cv_gap=base_experiment.cv_gap,
+                cv_max_train_size=base_experiment.cv_max_train_size,
                 
                 # Set specific parameters for this child
                 hyperparameters=hyperparameters,
                 suite=suite,  # Link to parent suite
-                status=MLExperiment.Status.QUEUED,
+                status=MLExperiment.Status.DRAFT,
                 version=1,
                 is_public=False
+            ))
+        
+        MLExperiment.objects.bulk_create(children, batch_size=batch_size)
+        created += len(children)
+    
+    return created
+
+
+@shared_task
+def run_grid_search_lane_task(suite_id, lane_index, lane_count):
+    """
+    Run one lane's share of a grid search suite's child experiments.
+    
+    Children are assigned round-robin by id, so lanes never overlap. Each
+    child is claimed atomically (DRAFT -> RUNNING) before it runs, which
+    makes retried lanes skip work already done. Children of the models
+    listed in ``GRID_SEARCH_BATCH_MODELS`` are trained together by the batch
+    trainer, which loads each shared split once but skips MLflow tracking and
+    SHAP; every other child (and time series CV children) runs through the
+    full pipeline one by one. A failing child does not stop the lane.
+    
+    Args:
+        suite_id (str): UUID of the ExperimentSuite.
+        lane_index (int): This lane's index.
+        lane_count (int): Total number of lanes.
+        
+    Returns:
+        dict: Counts of finished and failed children in this lane.
+    """
+    from django.conf import settings
+    
+    finished = failed = 0
+    child_ids = (
+        MLExperiment.objects.filter(suite_id=suite_id)
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    
+    claimed_ids = []
+    for position, child_id in enumerate(child_ids.iterator()):
+        if position % lane_count != lane_index:
+            continue
+        claimed = MLExperiment.objects.filter(
+            pk=child_id, status=MLExperiment.Status.DRAFT
+        ).update(status=MLExperiment.Status.RUNNING)
+        if claimed:
+            claimed_ids.append(child_id)
+    
+    children = list(
+        MLExperiment.objects.filter(pk__in=claimed_ids).select_related('input_datasource', 'split_artifact')
+    )
+    batch_models = set(getattr(settings, 'GRID_SEARCH_BATCH_MODELS', []))
+    batched = [child for child in children if child.model_name in batch_models]
+    summary = {'finished': [], 'failed': [], 'skipped': [
+        str(child.id) for child in children if child.model_name not in batch_models
+    ]}
+    if batched:
+        try:
+            batch_summary = train_experiments_in_batch(batched)
+        except Exception as e:
+            logger.error(f"Batch training failed for lane {lane_index} of suite {suite_id}: {e}")
+            batch_summary = {'finished': [], 'failed': [], 'skipped': [str(child.id) for child in batched]}
+        for key in summary:
+            summary[key].extend(batch_summary[key])
+    finished += len(summary['finished'])
+    failed += len(summary['failed'])
+    
+    for child_experiment in children:
+        if str(child_experiment.id) not in summary['skipped']:
+            continue
+        try:
+            run_single_experiment_sync(child_experiment)
+            MLExperiment.objects.filter(pk=child_experiment.id, status=MLExperiment.Status.RUNNING).update(
+                status=MLExperiment.Status.FINISHED
             )
-            
-            # Save the child experiment
-            child_experiment.save()
-            child_experiments_created += 1
-            
-            print(f"Created child experiment {i+1}/{len(combinations)}: {child_experiment.name}")
-            
-            # Launch the experiment pipeline task
-            run_full_experiment_pipeline_task.delay(str(child_experiment.id))
-            logger.info(f"Launched pipeline task for child experiment {child_experiment.id}")
+            finished += 1
+        except Exception as e:
+            logger.error(f"Grid search child {child_experiment.id} of suite {suite_id} failed: {e}")
+            failed += 1
+    
+    return {'finished': finished, 'failed': failed}
+
+
+@shared_task
+def aggregate_grid_search_results_task(lane_results, suite_id):
+    """
+    Chord callback that aggregates grid search results into the suite.
+    
+    Collects every child's optimization metric into ``suite.trial_data``
+    (same shape as Optuna trials, so the suite views render both), picks the
+    best experiment and marks the suite as completed.
+    
+    Args:
+        lane_results (list): Per-lane counts returned by the lane tasks.
+        suite_id (str): UUID of the ExperimentSuite.
+        
+    Returns:
+        str: Status message with the best metric value.
+    """
+    suite = ExperimentSuite.objects.get(id=suite_id)
+    
+    try:
+        direction = get_optimization_direction(suite.optimization_metric)
+        trial_data = []
+        best_entry = None
+        
+        children = (
+            MLExperiment.objects.filter(suite=suite, status=MLExperiment.Status.FINISHED)
+            .only('id', 'name', 'hyperparameters', 'results')
+            .order_by('created_at', 'name')
+        )
+        for number, child in enumerate(children.iterator()):
+            value = extract_optimization_metric(child.results, suite.optimization_metric)
+            if value in (float('inf'), float('-inf')):
+                continue
+            entry = {
+                'trial_number': number,
+                'parameters': child.hyperparameters,
+                'value': value,
+                'experiment_id': str(child.id)
+            }
+            trial_data.append(entry)
+            if best_entry is None or (
+                value < best_entry['value'] if direction == 'minimize' else value > best_entry['value']
+            ):
+                best_entry = entry
+        
+        suite.trial_data = trial_data
+        suite.best_experiment_id = best_entry['experiment_id'] if best_entry else None
+        suite.save(update_fields=['trial_data', 'best_experiment', 'updated_at'])
+        
+        failed = sum(result.get('failed', 0) for result in lane_results or [])
+        if best_entry is None:
+            suite.fail_execution()
+            return f"Grid search failed: no child experiment produced {suite.optimization_metric}"
         
         # Mark suite as completed
         suite.complete_execution()
         
-        completion_message = f"Grid search completed: {child_experiments_created} child experiments created and launched"
-        print(completion_message)
-        logger.info(f"Completed grid search for suite {suite.id}: {child_experiments_created} experiments created")
-        
+        completion_message = (
+            f"Grid search completed: {len(trial_data)} experiments ({failed} failed), "
+            f"best {suite.optimization_metric}: {best_entry['value']}"
+        )
+        logger.info(f"Completed grid search for suite {suite.id}: {completion_message}")
         return completion_message
         
     except Exception as e:
-        print(f"Error in grid search execution: {str(e)}")
+        print(f"Error aggregating grid search results: {str(e)}")
         suite.fail_execution()
         raise
@@ -0,0 +1,164 @@
+"""
+Buffered MLflow tracking for experiment tasks.
+
+Pipeline tasks record params, metrics and tags in a ``RunTracker`` while
+they work and flush it once at the end. A flush queues
+``flush_run_tracking_task``, which writes everything with ``log_batch``
+(and logs the model, if asked) in the background, so experiment latency
+does not include tracking-server round trips. With
+``MLFLOW_ASYNC_LOGGING = False`` the flush is written synchronously
+instead, which is what tests and offline workers with a local file store
+usually want.
+
+Tracking failures never fail an experiment: they are retried and then
+logged.
+"""
+import logging
+import time
+
+from celery import shared_task
+from django.conf import settings
+
+from experiments.tracking import configure_tracking, get_client, log_batch
+
+logger = logging.getLogger(__name__)
+
+
+class RunTracker:
+    """
+    In-memory buffer of params, metrics and tags for one MLflow run.
+
+    Every method is a no-op when ``run_id`` is empty, so tasks can track
+    unconditionally.
+    """
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.params = {}
+        self.metrics = []
+        self.tags = {}
+
+    def log_param(self, key, value):
+        self.params[key] = value
+
+    def log_params(self, params):
+        self.params.update(params or {})
+
+    def log_metric(self, key, value, step=0):
+        self.metrics.append((key, float(value), int(time.time() * 1000), step))
+
+    def log_metrics(self, metrics, step=0):
+        for key, value in (metrics or {}).items():
+            self.log_metric(key, value, step=step)
+
+    def set_tags(self, tags):
+        self.tags.update(tags or {})
+
+    def flush(self, status=None, model_path=None, registered_model_name=None, preprocessor_path=None):
+        """
+        Hand the buffered values to ``flush_run_tracking_task`` and clear them.
+
+        Args:
+            status (str, optional): Terminate the run with this status
+                ('FINISHED', 'FAILED').
+            model_path (str, optional): Model artifact to log as the run's
+                ``model``.
+            registered_model_name (str, optional): Register the logged model
+                under this name.
+            preprocessor_path (str, optional): Preprocessor the model was
+                trained behind; the logged model is then the pipeline of both.
+        """
+        if not self.run_id:
+            return
+        if not (self.params or self.metrics or self.tags or status or model_path):
+            return
+
+        kwargs = {
+            'params': {key: str(value) for key, value in self.params.items()},
+            'metrics': self.metrics,
+            'tags': {key: str(value) for key, value in self.tags.items()},
+            'status': status,
+            'model_path': model_path,
+            'registered_model_name': registered_model_name,
+            'preprocessor_path': preprocessor_path,
+        }
+        self.params, self.metrics, self.tags = {}, [], {}
+
+        if getattr(settings, 'MLFLOW_ASYNC_LOGGING', True):
+            try:
+                flush_run_tracking_task.delay(self.run_id, **kwargs)
+                return
+            except Exception as e:
+                logger.warning(f"Could not queue MLflow logging for run {self.run_id}, writing inline: {e}")
+        flush_run_tracking_task(self.run_id, **kwargs)
+
+
+def _log_model(run_id, model_path, registered_model_name=None, preprocessor_path=None):
+    """
+    Log a stored model artifact to a run with ``mlflow.sklearn``.
+
+    Models trained on preprocessed features are logged as
+    ``Pipeline(preprocessor, model)`` so the logged model takes raw features.
+
+    Args:
+        run_id (str): MLflow run ID.
+        model_path (str): Absolute path of the joblib model artifact.
+        registered_model_name (str, optional): Registry name.
+        preprocessor_path (str, optional): Absolute path of the preprocessor.
+    """
+    import mlflow
+    import mlflow.sklearn
+    from sklearn.pipeline import Pipeline
+    from experiments.model_store import load_model
+
+    configure_tracking()
+    model, _ = load_model(model_path)
+    if preprocessor_path:
+        preprocessor, _ = load_model(preprocessor_path)
+        model = Pipeline([('preprocessor', preprocessor), ('model', model)])
+    with mlflow.start_run(run_id=run_id):
+        mlflow.sklearn.log_model(
+            sk_model=model,
+            artifact_path="model",
+            registered_model_name=registered_model_name
+        )
+
+
+@shared_task(bind=True, max_retries=3)
+def flush_run_tracking_task(self, run_id, params=None, metrics=None, tags=None, status=None,
+                            model_path=None, registered_model_name=None, preprocessor_path=None):
+    """
+    Write buffered tracking data to an MLflow run.
+
+    Args:
+        self: Celery task instance (bound task).
+        run_id (str): MLflow run ID.
+        params (dict, optional): Params to log.
+        metrics (list, optional): ``(key, value, timestamp_ms, step)`` tuples.
+        tags (dict, optional): Tags to set.
+        status (str, optional): Terminate the run with this status.
+        model_path (str, optional): Model artifact to log.
+        registered_model_name (str, optional): Registry name for the model.
+        preprocessor_path (str, optional): Preprocessor to log in front of the model.
+
+    Returns:
+        dict: Number of log_batch requests and elapsed seconds, or the error.
+    """
+    started = time.perf_counter()
+    try:
+        client = get_client()
+        requests = log_batch(run_id, params, metrics, tags, client=client)
+        if model_path:
+            _log_model(run_id, model_path, registered_model_name, preprocessor_path)
+        if status:
+            client.set_terminated(run_id, status=status)
+    except Exception as exc:
+        if not self.request.called_directly and self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=30)
+        logger.warning(f"Could not log to MLflow run {run_id}: {exc}")
+        return {'run_id': run_id, 'error': str(exc)}
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Logged {len(params or {})} params, {len(metrics or [])} metrics to MLflow run "
+                f"{run_id} in {requests} requests ({elapsed:.2f}s)")
+    return {'run_id': run_id, 'requests': requests, 'seconds': elapsed}
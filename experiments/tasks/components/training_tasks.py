@@ -5,6 +5,18 @@ from celery import shared_task
 from experiments.models import MLExperiment
 from projects.models import DataSource
 from data_tools.services import process_datasource_to_df
+from experiments.split_cache import acquire_split
+from experiments.model_store import save_model, model_relative_path
+from experiments.preprocessing import PREPROCESSOR_FILENAME, fit_preprocessor
+from .trial_reporting import has_active_trial, fit_in_stages
+from .tracking_tasks import RunTracker
+from .feature_matrix import write_feature_matrices, load_features
+from .incremental_training import (
+    should_stream_split,
+    write_split_streaming,
+    use_incremental_training,
+    fit_incremental
+)
 import logging
 import os
 import uuid
@@ -12,15 +24,15 @@ import pickle
 from django.conf import settings
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier, GradientBoostingRegressor, GradientBoostingClassifier
-from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.linear_model import LinearRegression, LogisticRegression, SGDRegressor, SGDClassifier
+from sklearn.neural_network import MLPRegressor
 from sklearn.svm import SVR, SVC
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-import mlflow
-import mlflow.sklearn
 import numpy as np
 import joblib
 import traceback
 import pandas as pd
+import pyarrow.parquet as pq
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +45,10 @@ def run_train_test_split_task(experiment_id):
     This task loads data from the experiment's designated datasource, validates
     the target column, and splits the data into training and testing sets based
     on the experiment's configuration. The resulting datasets are saved as
-    Parquet files in the experiment's artifact directory.
+    Parquet files in a content-addressed split directory shared by every
+    experiment with the same datasource version, target, feature set and split
+    configuration (see ``experiments.split_cache``), so the data is only loaded
+    and split once per configuration.
     
     The task supports multiple splitting strategies and multiple validation strategies
     including simple train/test split and time series cross-validation.
@@ -54,6 +69,7 @@ def run_train_test_split_task(experiment_id):
         - Creates artifact directory structure
         - Saves train/test datasets as Parquet files (for simple split)
         - Saves full dataset as Parquet file (for cross-validation)
+        - References the shared SplitArtifact from the experiment
         - Updates experiment.artifact_paths with file locations
     """
     print(f"Running train/test split for experiment {experiment_id}")
@@ -64,71 +80,12 @@ def run_train_test_split_task(experiment_id):
         experiment.status = MLExperiment.Status.RUNNING
         experiment.save()
         
-        # Load data from target datasource
-        print(f"Loading data from datasource {experiment.input_datasource.id}")
-        df = process_datasource_to_df(experiment.input_datasource.id)
-        
-        # Validate target column exists
-        target_column = experiment.target_column
-        if target_column not in df.columns:
-            raise ValueError(f"Target column '{target_column}' not found in datasource")
-        
-        # Prepare features (X) and target (y)
-        X = df.drop(columns=[target_column])
-        y = df[target_column]
-        
-        # Create experiment artifacts directory
+        # Create experiment artifacts directory (model, metrics, plots)
         artifacts_dir = os.path.join(settings.MEDIA_ROOT, 'experiments', str(experiment.id))
         os.makedirs(artifacts_dir, exist_ok=True)
         
-        # Handle different validation strategies
-        if experiment.validation_strategy == 'TIME_SERIES_CV':
-            # For time series cross-validation, save the full dataset
-            full_X_path = os.path.join(artifacts_dir, 'full_X.parquet')
-            full_y_path = os.path.join(artifacts_dir, 'full_y.parquet')
-            
-            X.to_parquet(full_X_path, index=False)
-            y.to_frame().to_parquet(full_y_path, index=False)
-            
-            # Update experiment with artifact paths for time series CV
-            artifact_paths = {
-                'full_X': f'experiments/{experiment.id}/full_X.parquet',
-                'full_y': f'experiments/{experiment.id}/full_y.parquet'
-            }
-            
-            print(f"Data preparation for time series CV completed: {X.shape[0]} total samples")
-            return f"Data preparation for time series CV completed: {X.shape[0]} total samples"
-            
-        else:
-            # Default: Simple train/test split
-            test_size = experiment.test_split_size / 100.0  # Convert percentage to decimal
-            random_state = 42  # For reproducibility
-            
-            print(f"Splitting data with test_size={test_size}")
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=test_size, random_state=random_state
-            )
-            
-            # Save train and test datasets as Parquet files
-            train_X_path = os.path.join(artifacts_dir, 'train_X.parquet')
-            train_y_path = os.path.join(artifacts_dir, 'train_y.parquet')
-            test_X_path = os.path.join(artifacts_dir, 'test_X.parquet')
-            test_y_path = os.path.join(artifacts_dir, 'test_y.parquet')
-            
-            X_train.to_parquet(train_X_path, index=False)
-            y_train.to_frame().to_parquet(train_y_path, index=False)  
-            X_test.to_parquet(test_X_path, index=False)
-            y_test.to_frame().to_parquet(test_y_path, index=False)  
-            
-            # Update experiment with artifact paths
-            artifact_paths = {
-                'train_X': f'experiments/{experiment.id}/train_X.parquet',
-                'train_y': f'experiments/{experiment.id}/train_y.parquet',
-                'test_X': f'experiments/{experiment.id}/test_X.parquet',
-                'test_y': f'experiments/{experiment.id}/test_y.parquet'
-            }
-            
-            print(f"Train/test split completed: {X_train.shape[0]} train samples, {X_test.shape[0]} test samples")
+        split = prepare_split(experiment)
+        artifact_paths = dict(split.artifact_paths)
         
         experiment.artifact_paths = artifact_paths
         experiment.save()
@@ -147,6 +104,184 @@ def run_train_test_split_task(experiment_id):
         raise
 
 
+def _is_classification_target(y):
+    """Heuristic used until MLExperiment records the problem type"""
+    # TODO: Add problem_type field to MLExperiment model to distinguish regression/classification
+    return y.dtype == 'object' or len(y.unique()) < 10
+
+
+def build_model(model_type, hyperparameters, y):
+    """
+    Create an unfitted scikit-learn estimator for an experiment.
+    
+    Accepts the model names stored on MLExperiment (e.g. 'RandomForestRegressor')
+    as well as the generic names used by older experiments ('RandomForest'),
+    for which classification vs regression is detected from the target.
+    
+    Args:
+        model_type (str): Model identifier.
+        hyperparameters (dict): Estimator keyword arguments.
+        y (pd.Series): Training target, used to pick classifier vs regressor.
+        
+    Returns:
+        Unfitted estimator.
+        
+    Raises:
+        ValueError: If the model type is unsupported.
+    """
+    hyperparameters = hyperparameters or {}
+    
+    if model_type == 'RandomForestRegressor':
+        return RandomForestRegressor(**hyperparameters)
+    if model_type == 'GradientBoostingRegressor':
+        return GradientBoostingRegressor(**hyperparameters)
+    if model_type == 'RandomForest':
+        if _is_classification_target(y):
+            return RandomForestClassifier(**hyperparameters)
+        return RandomForestRegressor(**hyperparameters)
+    if model_type == 'LinearRegression':
+        return LinearRegression(**hyperparameters)
+    if model_type == 'LogisticRegression':
+        return LogisticRegression(**hyperparameters)
+    if model_type == 'GradientBoosting':
+        if _is_classification_target(y):
+            return GradientBoostingClassifier(**hyperparameters)
+        return GradientBoostingRegressor(**hyperparameters)
+    if model_type == 'SVM':
+        if _is_classification_target(y):
+            return SVC(**hyperparameters)
+        return SVR(**hyperparameters)
+    # Models supporting partial_fit (out-of-core training)
+    if model_type == 'SGDRegressor':
+        return SGDRegressor(**hyperparameters)
+    if model_type == 'SGDClassifier':
+        return SGDClassifier(**hyperparameters)
+    if model_type == 'MLPRegressor':
+        return MLPRegressor(**hyperparameters)
+    raise ValueError(f"Unsupported model type: {model_type}")
+
+
+def prepare_split(experiment):
+    """
+    Reference the shared split for an experiment, building it if needed.
+    
+    Args:
+        experiment (MLExperiment): Experiment to prepare.
+        
+    Returns:
+        SplitArtifact: The shared split (``experiment.split_artifact`` is set
+        but the experiment is not saved).
+    """
+    if experiment.validation_strategy == 'TIME_SERIES_CV':
+        test_size = random_state = None
+    else:
+        # Stored as a fraction (0.2); older experiments used percentages (20)
+        test_size = experiment.test_split_size
+        if test_size > 1:
+            test_size = test_size / 100.0
+        random_state = experiment.split_random_state
+    
+    # Reuse the split of any experiment with the same data and split
+    # configuration; only the first one loads and splits the datasource
+    return acquire_split(
+        experiment,
+        lambda absolute_dir, relative_dir: _write_split_files(
+            experiment, absolute_dir, relative_dir, test_size, random_state
+        ),
+        test_size=test_size,
+        random_state=random_state
+    )
+
+
+def _write_split_files(experiment, absolute_dir, relative_dir, test_size, random_state):
+    """
+    Load an experiment's datasource and write its split as Parquet files.
+    
+    Args:
+        experiment (MLExperiment): Experiment defining target and strategy.
+        absolute_dir (str): Directory to write the files to.
+        relative_dir (str): Same directory relative to MEDIA_ROOT.
+        test_size (float): Test fraction (train/test split only).
+        random_state (int): Split seed (train/test split only).
+        
+    Returns:
+        tuple: (artifact_paths relative to MEDIA_ROOT, number of source rows)
+    """
+    # Only the experiment's feature set is split (it is part of the split's key)
+    target_column = experiment.target_column
+    feature_columns = [column for column in experiment.feature_set or [] if column != target_column]
+    
+    # Sources too large to load whole are split chunk by chunk
+    if experiment.validation_strategy != 'TIME_SERIES_CV' and should_stream_split(experiment.input_datasource):
+        print(f"Streaming split for large datasource {experiment.input_datasource.id}")
+        return write_split_streaming(
+            experiment.input_datasource, target_column,
+            absolute_dir, relative_dir, test_size, random_state, feature_columns
+        )
+    
+    # Load data from target datasource
+    print(f"Loading data from datasource {experiment.input_datasource.id}")
+    df = process_datasource_to_df(experiment.input_datasource.id)
+    
+    # Validate target and feature columns exist
+    if target_column not in df.columns:
+        raise ValueError(f"Target column '{target_column}' not found in datasource")
+    missing = [column for column in feature_columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"Feature columns not found in datasource: {missing}")
+    
+    # Prepare features (X) and target (y)
+    X = df[feature_columns] if feature_columns else df.drop(columns=[target_column])
+    y = df[target_column]
+    
+    # Handle different validation strategies
+    if experiment.validation_strategy == 'TIME_SERIES_CV':
+        # For time series cross-validation, save the full dataset
+        X.to_parquet(os.path.join(absolute_dir, 'full_X.parquet'), index=False)
+        y.to_frame().to_parquet(os.path.join(absolute_dir, 'full_y.parquet'), index=False)
+        
+        artifact_paths = {
+            'full_X': f'{relative_dir}/full_X.parquet',
+            'full_y': f'{relative_dir}/full_y.parquet'
+        }
+        artifact_paths.update(write_feature_matrices({'full_X': X}, absolute_dir, relative_dir))
+        
+        print(f"Data preparation for time series CV completed: {X.shape[0]} total samples")
+        
+    else:
+        # Default: Simple train/test split
+        print(f"Splitting data with test_size={test_size}")
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=random_state
+        )
+        
+        # Save train and test datasets as Parquet files
+        X_train.to_parquet(os.path.join(absolute_dir, 'train_X.parquet'), index=False)
+        y_train.to_frame().to_parquet(os.path.join(absolute_dir, 'train_y.parquet'), index=False)
+        X_test.to_parquet(os.path.join(absolute_dir, 'test_X.parquet'), index=False)
+        y_test.to_frame().to_parquet(os.path.join(absolute_dir, 'test_y.parquet'), index=False)
+        
+        artifact_paths = {
+            'train_X': f'{relative_dir}/train_X.parquet',
+            'train_y': f'{relative_dir}/train_y.parquet',
+            'test_X': f'{relative_dir}/test_X.parquet',
+            'test_y': f'{relative_dir}/test_y.parquet'
+        }
+        # Encoding, imputation and scaling are fitted on the training rows and
+        # stored with the split, so experiments sharing it reuse the fit; the
+        # matrices hold their output
+        preprocessor = fit_preprocessor(X_train, os.path.join(absolute_dir, PREPROCESSOR_FILENAME))
+        artifact_paths['preprocessor'] = f'{relative_dir}/{PREPROCESSOR_FILENAME}'
+        artifact_paths.update(write_feature_matrices(
+            {'train_X': preprocessor.transform(X_train), 'test_X': preprocessor.transform(X_test)},
+            absolute_dir, relative_dir
+        ))
+        
+        print(f"Train/test split completed: {X_train.shape[0]} train samples, {X_test.shape[0]} test samples")
+    
+    return artifact_paths, len(df)
+
+
 @shared_task
 def run_model_training_task(experiment_id):
     """
@@ -170,9 +305,9 @@ def run_model_training_task(experiment_id):
         
     Side Effects:
         - Updates experiment status to RUNNING, then back to appropriate status
-        - Saves trained model as pickle file
+        - Saves trained model as a compressed joblib file (see experiments.model_store)
         - Updates experiment.artifact_paths with model location
-        - Logs training parameters to MLflow
+        - Queues logging of training parameters to MLflow
         - Records training time and model metrics
     """
     print(f"Running model training for experiment {experiment_id}")
@@ -184,82 +319,74 @@ def run_model_training_task(experiment_id):
         experiment.status = MLExperiment.Status.RUNNING
         experiment.save()
         
-        # Set MLflow tracking URI and resume run
-        mlflow.set_tracking_uri("http://mlflow:5000")
-        
-        # Resume the MLflow run if we have a run ID
-        mlflow_context = None
-        if experiment.mlflow_run_id:
-            try:
-                mlflow_context = mlflow.start_run(run_id=experiment.mlflow_run_id)
-            except Exception as e:
-                print(f"Warning: Could not resume MLflow run {experiment.mlflow_run_id}: {e}")
+        # Tracking is buffered and flushed in the background when the task ends
+        tracker = RunTracker(experiment.mlflow_run_id)
 
         # Load training data
         artifacts_dir = os.path.join(settings.MEDIA_ROOT, 'experiments', str(experiment.id))
         
-        train_X_path = os.path.join(artifacts_dir, 'train_X.parquet')
-        train_y_path = os.path.join(artifacts_dir, 'train_y.parquet')
+        if not experiment.artifact_paths or 'train_X' not in experiment.artifact_paths:
+            raise ValueError("Training data files not found. Run train/test split first.")
+        
+        # Split files may be shared with other experiments (see split_cache)
+        train_X_path = os.path.join(settings.MEDIA_ROOT, experiment.artifact_paths['train_X'])
+        train_y_path = os.path.join(settings.MEDIA_ROOT, experiment.artifact_paths['train_y'])
         
         if not os.path.exists(train_X_path) or not os.path.exists(train_y_path):
             raise ValueError("Training data files not found. Run train/test split first.")
         
-        X_train = pd.read_parquet(train_X_path)
-        y_train = pd.read_parquet(train_y_path).iloc[:, 0]  # Get the target column
-        
         # Parse hyperparameters
         hyperparameters = experiment.hyperparameters
+        model_type = experiment.model_name
         
-        # Create model based on type
-        model_type = experiment.model_type
-        
-        if model_type == 'RandomForest':
-            # TODO: Add problem_type field to MLExperiment model to distinguish regression/classification
-            # For now, detect based on target variable characteristics
-            if y_train.dtype == 'object' or len(y_train.unique()) < 10:
-                model = RandomForestClassifier(**hyperparameters)
-            else:
-                model = RandomForestRegressor(**hyperparameters)
-        elif model_type == 'LinearRegression':
-            model = LinearRegression(**hyperparameters)
-        elif model_type == 'LogisticRegression':
-            model = LogisticRegression(**hyperparameters)
-        elif model_type == 'GradientBoosting':
-            if y_train.dtype == 'object' or len(y_train.unique()) < 10:
-                model = GradientBoostingClassifier(**hyperparameters)
-            else:
-                model = GradientBoostingRegressor(**hyperparameters)
-        elif model_type == 'SVM':
-            if y_train.dtype == 'object' or len(y_train.unique()) < 10:
-                model = SVC(**hyperparameters)
-            else:
-                model = SVR(**hyperparameters)
+        if use_incremental_training(experiment):
+            # Too large for memory: stream row groups into partial_fit. The raw
+            # Parquet files are used, so drop the preprocessed matrices
+            print(f"Training {model_type} incrementally with hyperparameters: {hyperparameters}")
+            for key in ('preprocessor', 'train_X_matrix', 'test_X_matrix', 'feature_columns'):
+                experiment.artifact_paths.pop(key, None)
+            model = fit_incremental(build_model(model_type, hyperparameters, None), train_X_path, train_y_path)
+            metadata = pq.ParquetFile(train_X_path).metadata
+            n_samples, n_features = metadata.num_rows, metadata.num_columns
         else:
-            raise ValueError(f"Unsupported model type: {model_type}")
-        
-        print(f"Training {model_type} model with hyperparameters: {hyperparameters}")
-        
-        # Train the model
-        model.fit(X_train, y_train)
+            # Feature matrices are memory-mapped when the split stored them
+            X_train = load_features(experiment.artifact_paths, 'train_X')
+            y_train = pd.read_parquet(train_y_path).iloc[:, 0]  # Get the target column
+            n_samples, n_features = X_train.shape
+            
+            # Create model based on type
+            model = build_model(model_type, hyperparameters, y_train)
+            
+            print(f"Training {model_type} model with hyperparameters: {hyperparameters}")
+            
+            # Train the model; during sweeps ensembles grow in reported stages
+            # (scored on a validation slice of the training rows) so the
+            # suite's pruner can stop unpromising trials early
+            if has_active_trial():
+                model = fit_in_stages(model, X_train, y_train)
+            else:
+                model.fit(X_train, y_train)
         
         # Save the model
-        model_path = os.path.join(artifacts_dir, 'trained_model.pkl')
-        with open(model_path, 'wb') as f:
-            pickle.dump(model, f)
+        model_path = os.path.join(settings.MEDIA_ROOT, model_relative_path(experiment))
+        model_size = save_model(model, model_path)
+        print(f"Model saved ({model_size / 1024:.1f} KB)")
         
         # Update experiment with model artifact path
         if not experiment.artifact_paths:
             experiment.artifact_paths = {}
-        experiment.artifact_paths['trained_model'] = f'experiments/{experiment.id}/trained_model.pkl'
+        experiment.artifact_paths['trained_model'] = model_relative_path(experiment)
         experiment.save()
         
-        # Log to MLflow
-        if mlflow_context:
-            mlflow.log_params(hyperparameters)
-            mlflow.sklearn.log_model(model, "model")
-            mlflow.log_param("model_type", model_type)
-            mlflow.log_param("training_samples", X_train.shape[0])
-            mlflow.log_param("features", X_train.shape[1])
+        # Log to MLflow (the model itself is logged after evaluation)
+        tracker.log_params(hyperparameters)
+        tracker.log_params({
+            "model_type": model_type,
+            "training_samples": n_samples,
+            "features": n_features,
+        })
+        tracker.log_metric("model_size_bytes", model_size)
+        tracker.flush()
         
         print(f"Model training completed for experiment {experiment_id}")
         return experiment_id
@@ -273,10 +400,3 @@ def run_model_training_task(experiment_id):
         except:
             pass
         raise
-    finally:
-        # Close MLflow run if it was opened
-        if mlflow_context:
-            try:
-                mlflow.end_run()
-            except:
-                pass
@@ -0,0 +1,176 @@
+"""
+Intermediate metric reporting for Optuna trials.
+
+Sweep workers run each trial's pipeline in-process. While a trial is active,
+pipeline steps report intermediate metrics (per CV fold, per batch of
+boosting stages or trees) through ``report_metrics``; when the suite's pruner
+decides the trial is not promising, ``optuna.TrialPruned`` is raised from
+inside the pipeline so no further compute is spent on it. Outside of a sweep
+every helper here is a no-op.
+"""
+import math
+import threading
+from contextlib import contextmanager
+import logging
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+
+@contextmanager
+def active_trial(trial, optimization_metric):
+    """
+    Make ``trial`` the target of intermediate reports in the current thread.
+
+    Args:
+        trial: Optuna trial being executed.
+        optimization_metric (str): Suite metric reported to the trial.
+    """
+    previous = getattr(_state, 'trial', None)
+    _state.trial = (trial, optimization_metric)
+    try:
+        yield trial
+    finally:
+        _state.trial = previous
+
+
+def has_active_trial():
+    """Return True if a sweep trial is running in the current thread"""
+    return getattr(_state, 'trial', None) is not None
+
+
+def active_metric():
+    """Return the suite metric of the active trial, or None outside a sweep"""
+    active = getattr(_state, 'trial', None)
+    return active[1] if active is not None else None
+
+
+def report_metrics(metrics, step):
+    """
+    Report a step's metrics to the active trial and prune if it should stop.
+
+    Args:
+        metrics (dict): Metric values for this step (e.g. mse, mae, r2, rmse).
+        step (int): Monotonically increasing step number (fold, stage batch).
+
+    Raises:
+        optuna.TrialPruned: If the suite's pruner stops the trial.
+    """
+    active = getattr(_state, 'trial', None)
+    if active is None:
+        return
+
+    import optuna
+    from experiments.tasks.utils import extract_optimization_metric
+
+    trial, optimization_metric = active
+    value = extract_optimization_metric({'performance_metrics': metrics}, optimization_metric)
+    if not math.isfinite(value):
+        return
+
+    trial.report(value, step)
+    if trial.should_prune():
+        logger.info(f"Trial {trial.number} pruned at step {step} ({optimization_metric}={value:.4f})")
+        raise optuna.TrialPruned(f"Pruned at step {step} with {optimization_metric}={value}")
+
+
+# Substrings of suite metrics scored as classification (see ExperimentSuite.optimization_metric)
+CLASSIFICATION_METRICS = ('accuracy', 'f1', 'precision', 'recall')
+
+# Share of the training rows (the last ones) held out to score intermediate stages
+STAGE_VALIDATION_FRACTION = 0.2
+
+
+def is_classification_metric(metric):
+    """Return True if ``metric`` names a classification metric"""
+    return bool(metric) and any(name in metric.lower() for name in CLASSIFICATION_METRICS)
+
+
+def score_predictions(y_true, y_pred, metric=None):
+    """
+    Calculate the metrics used for intermediate reports.
+
+    Args:
+        y_true: Ground truth values.
+        y_pred: Predicted values.
+        metric (str, optional): Suite metric; classification metrics select
+            the classification family. Defaults to regression.
+
+    Returns:
+        dict: mse, mae, r2 and rmse, or accuracy, precision, recall and
+        f1_score (weighted over classes).
+    """
+    if is_classification_metric(metric):
+        from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+
+        precision, recall, f1, _ = precision_recall_fscore_support(
+            y_true, y_pred, average='weighted', zero_division=0
+        )
+        return {
+            'accuracy': float(accuracy_score(y_true, y_pred)),
+            'precision': float(precision),
+            'recall': float(recall),
+            'f1_score': float(f1),
+        }
+
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+
+    mse = float(mean_squared_error(y_true, y_pred))
+    return {
+        'mse': mse,
+        'mae': float(mean_absolute_error(y_true, y_pred)),
+        'r2': float(r2_score(y_true, y_pred)),
+        'rmse': mse ** 0.5,
+    }
+
+
+def _rows(data, rows):
+    """Positional row slice of an array, memmap or pandas object"""
+    return data.iloc[rows] if hasattr(data, 'iloc') else data[rows]
+
+
+def fit_in_stages(model, X_train, y_train, n_stages=5):
+    """
+    Fit a model, reporting intermediate scores while a trial is active.
+
+    Ensembles with ``warm_start`` (random forests, gradient boosting) are
+    grown in ``n_stages`` batches of estimators on the training rows minus
+    a validation slice (the last ``STAGE_VALIDATION_FRACTION`` of them),
+    and scored on that slice with the suite metric's family after each
+    batch, so the pruner can stop them early. A trial that survives every
+    stage keeps its staged model rather than paying for a second fit on
+    all training rows. Other models, or fits outside a sweep, are trained
+    in a single call. The test split is never used.
+
+    Args:
+        model: Unfitted scikit-learn estimator.
+        X_train, y_train: Training data.
+        n_stages (int): Number of estimator batches to report.
+
+    Returns:
+        The fitted model.
+
+    Raises:
+        optuna.TrialPruned: If the suite's pruner stops the trial.
+    """
+    params = model.get_params()
+    total = params.get('n_estimators')
+    n_validation = int(len(y_train) * STAGE_VALIDATION_FRACTION)
+    if not has_active_trial() or 'warm_start' not in params or not total or total < n_stages \
+            or n_validation < 1:
+        return model.fit(X_train, y_train)
+
+    metric = active_metric()
+    cut = len(y_train) - n_validation
+    X_fit, y_fit = _rows(X_train, slice(None, cut)), _rows(y_train, slice(None, cut))
+    X_val, y_val = _rows(X_train, slice(cut, None)), _rows(y_train, slice(cut, None))
+
+    model.set_params(warm_start=True)
+    for stage in range(1, n_stages + 1):
+        model.set_params(n_estimators=math.ceil(total * stage / n_stages))
+        model.fit(X_fit, y_fit)
+        report_metrics(score_predictions(y_val, model.predict(X_val), metric), stage)
+
+    model.set_params(warm_start=params['warm_start'])
+    return model
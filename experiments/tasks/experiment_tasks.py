@@ -9,7 +9,17 @@ importing from specialized components for better maintainability.
 from .components.training_tasks import run_train_test_split_task, run_model_training_task
 from .components.evaluation_tasks import run_time_series_cross_validation_task, run_final_evaluation_task
 from .components.pipeline_tasks import run_full_experiment_pipeline_task, set_experiment_status_as_finished
-from .components.suite_tasks import run_experiment_suite_task
+from .components.batch_training_tasks import run_batch_training_task
+from .components.explanation_tasks import run_shap_explanation_task
+from .components.prediction_tasks import run_batch_prediction_task
+from .components.tracking_tasks import flush_run_tracking_task
+from .components.suite_tasks import (
+    run_experiment_suite_task,
+    run_optuna_trials_task,
+    finalize_optuna_suite_task,
+    run_grid_search_lane_task,
+    aggregate_grid_search_results_task
+)
 
 # Re-export for backward compatibility
 __all__ = [
@@ -19,5 +29,13 @@ __all__ = [
     'run_final_evaluation_task',
     'run_full_experiment_pipeline_task',
     'set_experiment_status_as_finished',
-    'run_experiment_suite_task'
+    'run_experiment_suite_task',
+    'run_optuna_trials_task',
+    'finalize_optuna_suite_task',
+    'run_grid_search_lane_task',
+    'aggregate_grid_search_results_task',
+    'run_batch_training_task',
+    'run_shap_explanation_task',
+    'run_batch_prediction_task',
+    'flush_run_tracking_task'
 ]
@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+
+from experiments.model_store import clear_model_cache
+from experiments.models import MLExperiment
+from projects.models.datasource import DataSource, DataSourceType
+from projects.models.project import Project
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    clear_model_cache()
+    return tmp_path
+
+
+@pytest.fixture
+def make_datasource(media_root):
+    """Create an original datasource in a new project from a DataFrame"""
+    def make(df, filename='flows.csv'):
+        user = User.objects.create_user(username='experiments', password='experimentspass')
+        project = Project.objects.create(name='Experiments Project', owner=user)
+        ds = DataSource.objects.create(name=filename, data_type=DataSourceType.ORIGINAL, project=project)
+        ds.file.save(filename, ContentFile(df.to_csv(index=False)))
+        return ds
+    return make
+
+
+@pytest.fixture
+def datasource(make_datasource):
+    return make_datasource(pd.DataFrame({'rain': range(50), 'flow': [2 * v + 1 for v in range(50)]}))
+
+
+@pytest.fixture
+def make_experiment():
+    """Create an experiment predicting ``flow`` from ``rain``"""
+    def make(datasource, **overrides):
+        fields = {
+            'project': datasource.project,
+            'input_datasource': datasource,
+            'target_column': 'flow',
+            'feature_set': ['rain'],
+            'model_name': 'LinearRegression',
+        }
+        fields.update(overrides)
+        return MLExperiment.objects.create(**fields)
+    return make
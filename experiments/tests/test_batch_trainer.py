@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from experiments.models import ExperimentSuite, MLExperiment, SplitArtifact
+from experiments.tasks.components import suite_tasks, training_tasks
+from experiments.tasks.components.batch_training_tasks import train_experiments_in_batch
+
+
+@pytest.mark.django_db
+def test_batch_loads_split_once(datasource, media_root, monkeypatch, make_experiment):
+    writes = []
+    original = training_tasks._write_split_files
+
+    def counting_write(*args, **kwargs):
+        writes.append(args[0].id)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(training_tasks, '_write_split_files', counting_write)
+    experiments = [
+        make_experiment(datasource, hyperparameters={'fit_intercept': flag}) for flag in (True, False, True)
+    ]
+
+    summary = train_experiments_in_batch(experiments, n_jobs=1)
+
+    assert len(writes) == 1
+    assert len(summary['finished']) == 3
+    assert SplitArtifact.objects.get().ref_count == 3
+    for experiment in MLExperiment.objects.all():
+        assert experiment.status == MLExperiment.Status.FINISHED
+        assert experiment.results['batch_trained'] is True
+        assert set(experiment.results['performance_metrics']) == {'mse', 'mae', 'r2', 'rmse'}
+        assert os.path.exists(media_root / experiment.artifact_paths['trained_model'])
+
+
+@pytest.mark.django_db
+def test_failed_configuration_does_not_stop_batch(datasource, make_experiment):
+    good = make_experiment(datasource)
+    bad = make_experiment(datasource, model_name='NotAModel')
+
+    summary = train_experiments_in_batch([good, bad], n_jobs=1)
+
+    assert summary['finished'] == [str(good.id)]
+    assert summary['failed'] == [str(bad.id)]
+    bad.refresh_from_db()
+    assert bad.status == MLExperiment.Status.ERROR
+    assert 'Unsupported model type' in bad.results['error']
+
+
+@pytest.mark.django_db
+def test_time_series_cv_is_not_batched(datasource, make_experiment):
+    experiment = make_experiment(datasource, validation_strategy='TIME_SERIES_CV')
+    summary = train_experiments_in_batch([experiment], n_jobs=1)
+    assert summary['skipped'] == [str(experiment.id)]
+    assert not SplitArtifact.objects.exists()
+
+
+@pytest.mark.django_db
+def test_grid_lane_batches_only_listed_models(datasource, settings, monkeypatch, make_experiment):
+    settings.GRID_SEARCH_BATCH_MODELS = ['LinearRegression']
+    suite = ExperimentSuite.objects.create(name='Grid', project=datasource.project, parallelism=1)
+    cheap = make_experiment(datasource, suite=suite)
+    forest = make_experiment(datasource, suite=suite, model_name='RandomForestRegressor')
+    full_pipeline = []
+    monkeypatch.setattr(suite_tasks, 'run_single_experiment_sync', lambda child: full_pipeline.append(child.id))
+
+    result = suite_tasks.run_grid_search_lane_task(str(suite.id), 0, 1)
+
+    assert result == {'finished': 2, 'failed': 0}
+    assert full_pipeline == [forest.id]
+    cheap.refresh_from_db()
+    assert cheap.results['batch_trained'] is True
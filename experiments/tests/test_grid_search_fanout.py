@@ -0,0 +1,78 @@
+import types
+
+import pytest
+from django.contrib.auth.models import User
+
+from experiments.models import ExperimentSuite, MLExperiment
+from experiments.tasks.components.suite_tasks import (
+    aggregate_grid_search_results_task,
+    create_grid_children,
+    iter_parameter_grid,
+)
+from projects.models.datasource import DataSource, DataSourceType
+from projects.models.project import Project
+
+
+@pytest.fixture
+def suite():
+    user = User.objects.create_user(username='griduser', password='gridpass')
+    project = Project.objects.create(name='Grid Project', owner=user)
+    datasource = DataSource.objects.create(name='Grid DS', data_type=DataSourceType.ORIGINAL, project=project)
+    base = MLExperiment.objects.create(
+        project=project, input_datasource=datasource, target_column='flow',
+        feature_set=['rain'], model_name='RandomForest'
+    )
+    return ExperimentSuite.objects.create(
+        name='Grid', project=project, study_type=ExperimentSuite.StudyType.ABLATION_STUDY,
+        base_experiment=base, optimization_metric='rmse', parallelism=4,
+        search_space={'n_estimators': [10, 20, 30], 'max_depth': [2, 4]}
+    )
+
+
+def test_grid_is_expanded_lazily():
+    grid = iter_parameter_grid({'a': list(range(1000)), 'b': list(range(1000)), 'c': list(range(1000))})
+    assert isinstance(grid, types.GeneratorType)
+    assert next(grid) == {'a': 0, 'b': 0, 'c': 0}
+
+
+@pytest.mark.django_db
+def test_children_are_bulk_created_in_batches(suite, django_assert_max_num_queries):
+    with django_assert_max_num_queries(4):
+        created = create_grid_children(suite, iter_parameter_grid(suite.search_space), batch_size=4)
+
+    assert created == 6
+    children = MLExperiment.objects.filter(suite=suite)
+    assert children.count() == 6
+    assert all(child.status == MLExperiment.Status.DRAFT for child in children)
+    assert {tuple(sorted(c.hyperparameters.items())) for c in children} == {
+        (('max_depth', d), ('n_estimators', n)) for n in (10, 20, 30) for d in (2, 4)
+    }
+
+
+@pytest.mark.django_db
+def test_aggregation_picks_best_and_completes_suite(suite):
+    create_grid_children(suite, iter_parameter_grid(suite.search_space))
+    children = list(MLExperiment.objects.filter(suite=suite).order_by('name'))
+    for rmse, child in zip([0.9, 0.4, 0.7, 0.5, 0.8], children):
+        child.status = MLExperiment.Status.FINISHED
+        child.results = {'performance_metrics': {'rmse': rmse}}
+        child.save()
+    children[-1].status = MLExperiment.Status.ERROR
+    children[-1].save()
+
+    message = aggregate_grid_search_results_task([{'finished': 5, 'failed': 1}], str(suite.id))
+
+    suite.refresh_from_db()
+    assert suite.status == ExperimentSuite.Status.COMPLETED
+    assert suite.best_experiment == children[1]
+    assert len(suite.trial_data) == 5
+    assert '1 failed' in message
+
+
+@pytest.mark.django_db
+def test_aggregation_fails_suite_without_results(suite):
+    create_grid_children(suite, iter_parameter_grid(suite.search_space))
+    aggregate_grid_search_results_task([{'finished': 0, 'failed': 6}], str(suite.id))
+    suite.refresh_from_db()
+    assert suite.status == ExperimentSuite.Status.FAILED
+    assert suite.best_experiment is None
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from sklearn.linear_model import SGDRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from experiments.models import MLExperiment
+from experiments.tasks.components.incremental_training import (
+    evaluate_incremental,
+    fit_incremental,
+    should_stream_split,
+    use_incremental_training,
+    write_split_streaming,
+)
+from projects.models.datasource import DataSource, DataSourceType
+from projects.models.project import Project
+
+
+@pytest.fixture
+def small_limits(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.INCREMENTAL_TRAINING_THRESHOLD_BYTES = 1
+    settings.INCREMENTAL_TRAINING_BATCH_ROWS = 50
+    return tmp_path
+
+
+@pytest.fixture
+def datasource(small_limits):
+    user = User.objects.create_user(username='outofcore', password='outofcorepass')
+    project = Project.objects.create(name='Sensors', owner=user)
+    ds = DataSource.objects.create(name='High frequency', data_type=DataSourceType.ORIGINAL, project=project)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'rain': rng.normal(size=500), 'temp': rng.normal(size=500)})
+    df['flow'] = 4 * df['rain'] - 2 * df['temp'] + rng.normal(scale=0.1, size=500)
+    ds.file.save('sensors.csv', ContentFile(df.to_csv(index=False)))
+    return ds
+
+
+@pytest.fixture
+def streamed_split(datasource, small_limits):
+    artifact_paths, n_rows = write_split_streaming(
+        datasource, 'flow', str(small_limits), '.', test_size=0.2, random_state=42
+    )
+    return artifact_paths, n_rows
+
+
+@pytest.mark.django_db
+def test_split_is_streamed_in_row_groups(datasource, streamed_split, small_limits):
+    artifact_paths, n_rows = streamed_split
+
+    assert should_stream_split(datasource)
+    assert n_rows == 500
+    train = pq.ParquetFile(small_limits / artifact_paths['train_X'])
+    test = pq.ParquetFile(small_limits / artifact_paths['test_X'])
+    assert train.metadata.num_rows + test.metadata.num_rows == 500
+    assert train.metadata.num_row_groups == 10
+
+
+@pytest.mark.django_db
+def test_split_keeps_only_the_feature_set(datasource, small_limits):
+    artifact_paths, _ = write_split_streaming(
+        datasource, 'flow', str(small_limits), '.', test_size=0.2, random_state=42, feature_columns=['rain']
+    )
+    assert pq.read_schema(small_limits / artifact_paths['train_X']).names == ['rain']
+
+    with pytest.raises(ValueError):
+        write_split_streaming(
+            datasource, 'flow', str(small_limits), '.', test_size=0.2, random_state=42, feature_columns=['snow']
+        )
+    assert 60 < test.metadata.num_rows < 140
+
+
+@pytest.mark.django_db
+def test_streamed_evaluation_matches_in_memory_metrics(streamed_split, small_limits):
+    artifact_paths, _ = streamed_split
+    paths = {name: str(small_limits / path) for name, path in artifact_paths.items()}
+
+    model = fit_incremental(SGDRegressor(random_state=0), paths['train_X'], paths['train_y'], n_epochs=3)
+    results = evaluate_incremental(model, paths['test_X'], paths['test_y'], str(small_limits / 'predictions.parquet'))
+
+    X_test = pd.read_parquet(paths['test_X']).to_numpy()
+    y_test = pd.read_parquet(paths['test_y']).iloc[:, 0].to_numpy()
+    y_pred = model.predict(X_test)
+    metrics = results['performance_metrics']
+    assert metrics['mse'] == pytest.approx(mean_squared_error(y_test, y_pred))
+    assert metrics['mae'] == pytest.approx(mean_absolute_error(y_test, y_pred))
+    assert metrics['r2'] == pytest.approx(r2_score(y_test, y_pred))
+    assert metrics['r2'] > 0.9
+    assert len(pd.read_parquet(small_limits / 'predictions.parquet')) == len(y_test)
+
+
+@pytest.mark.django_db
+def test_only_partial_fit_models_train_incrementally(datasource, streamed_split):
+    artifact_paths, _ = streamed_split
+    experiment = MLExperiment.objects.create(
+        project=datasource.project, input_datasource=datasource, target_column='flow',
+        feature_set=['rain', 'temp'], model_name='SGDRegressor', artifact_paths=artifact_paths
+    )
+    assert use_incremental_training(experiment)
+
+    experiment.model_name = 'RandomForestRegressor'
+    assert not use_incremental_training(experiment)
+
+
+@pytest.mark.django_db
+def test_integer_columns_and_sensor_gaps_are_handled(datasource, small_limits):
+    rng = np.random.default_rng(1)
+    # Integers in the first chunks, decimals further down
+    gauge = np.arange(500) % 7 + np.where(np.arange(500) < 300, 0, 0.2)
+    df = pd.DataFrame({'gauge': gauge, 'temp': rng.normal(size=500)})
+    df['flow'] = 4 * df['gauge'] - 2 * df['temp']
+    df['gauge'] = [f'{value:g}' for value in gauge]
+    df.loc[120:130, 'temp'] = np.nan
+    df.loc[200:205, 'flow'] = np.nan
+    datasource.file.save('gauges.csv', ContentFile(df.to_csv(index=False)))
+
+    artifact_paths, _ = write_split_streaming(
+        datasource, 'flow', str(small_limits), '.', test_size=0.2, random_state=42
+    )
+    paths = {name: str(small_limits / path) for name, path in artifact_paths.items()}
+    assert pq.read_schema(paths['train_X']).field('gauge').type == pa.float64()
+
+    model = fit_incremental(SGDRegressor(random_state=0), paths['train_X'], paths['train_y'], n_epochs=3)
+    results = evaluate_incremental(model, paths['test_X'], paths['test_y'], str(small_limits / 'predictions.parquet'))
+    assert results['performance_metrics']['r2'] > 0.9
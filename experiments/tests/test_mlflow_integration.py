@@ -0,0 +1,103 @@
+from unittest import mock
+
+import pytest
+
+from experiments.tasks.components import tracking_tasks
+from experiments.tasks.components.tracking_tasks import RunTracker
+from experiments.tracking import create_run, get_client, log_batch, tracking_uri
+
+
+@pytest.fixture
+def file_store(settings, tmp_path):
+    settings.MLFLOW_TRACKING_URI = ''
+    settings.MLFLOW_FILE_STORE_DIR = str(tmp_path / 'mlruns')
+    settings.MLFLOW_ASYNC_LOGGING = False
+    return tmp_path / 'mlruns'
+
+
+def test_empty_tracking_uri_uses_local_file_store(file_store):
+    assert tracking_uri() == file_store.resolve().as_uri()
+
+
+def test_tracker_writes_buffered_values_on_flush(file_store):
+    run_id = create_run('HydroML_Experiment_test')
+    tracker = RunTracker(run_id)
+    tracker.log_params({'model_type': 'RandomForest', 'n_estimators': 100})
+    tracker.log_metrics({'mse': 0.25, 'r2_score': 0.9})
+    tracker.set_tags({'all_tags': 'flows,daily'})
+
+    client = get_client()
+    assert client.get_run(run_id).data.params == {}
+
+    tracker.flush(status='FINISHED')
+
+    run = client.get_run(run_id)
+    assert run.data.params == {'model_type': 'RandomForest', 'n_estimators': '100'}
+    assert run.data.metrics == {'mse': 0.25, 'r2_score': 0.9}
+    assert run.data.tags['all_tags'] == 'flows,daily'
+    assert run.info.status == 'FINISHED'
+
+
+def test_log_batch_splits_at_mlflow_limits(file_store):
+    run_id = create_run('HydroML_Experiment_test')
+    params = {f'hp_{i}': i for i in range(250)}
+    assert log_batch(run_id, params=params, metrics=[('mse', 1.0, 0, 0)]) == 3
+    assert len(get_client().get_run(run_id).data.params) == 250
+
+
+def test_async_flush_queues_a_single_task(file_store, settings):
+    settings.MLFLOW_ASYNC_LOGGING = True
+    tracker = RunTracker('abc123')
+    tracker.log_param('features', 4)
+    tracker.log_metric('mse', 0.5)
+
+    with mock.patch.object(tracking_tasks.flush_run_tracking_task, 'delay') as delay:
+        tracker.flush(status='FINISHED')
+        tracker.flush()
+
+    delay.assert_called_once()
+    args, kwargs = delay.call_args
+    assert args == ('abc123',)
+    assert kwargs['params'] == {'features': '4'}
+    assert [metric[:2] for metric in kwargs['metrics']] == [('mse', 0.5)]
+    assert kwargs['status'] == 'FINISHED'
+
+
+def test_tracker_without_run_is_a_no_op(file_store):
+    with mock.patch.object(tracking_tasks, 'flush_run_tracking_task') as task:
+        tracker = RunTracker(None)
+        tracker.log_params({'model_type': 'LinearRegression'})
+        tracker.flush(status='FINISHED')
+    task.assert_not_called()
+    task.delay.assert_not_called()
+
+
+def test_tracking_errors_do_not_raise(file_store):
+    result = tracking_tasks.flush_run_tracking_task('missing-run', params={'a': 1})
+    assert 'error' in result
+
+
+def test_model_is_logged_behind_its_preprocessor(file_store, tmp_path):
+    import mlflow.sklearn
+    import pandas as pd
+    from sklearn.linear_model import LinearRegression
+    from sklearn.pipeline import Pipeline
+
+    from experiments.model_store import save_model
+    from data_tools.services.preprocessing import build_preprocessor
+
+    X = pd.DataFrame({'rain': [0.0, 1.0, 2.0, 3.0], 'station': ['a', 'b', 'a', 'b']})
+    preprocessor = build_preprocessor().fit(X)
+    save_model(preprocessor, str(tmp_path / 'preprocessor.joblib'))
+    save_model(LinearRegression().fit(preprocessor.transform(X), [1.0, 2.0, 3.0, 4.0]), str(tmp_path / 'model.joblib'))
+    run_id = create_run('HydroML_Experiment_test')
+
+    tracker = RunTracker(run_id)
+    tracker.flush(
+        status='FINISHED', model_path=str(tmp_path / 'model.joblib'),
+        preprocessor_path=str(tmp_path / 'preprocessor.joblib')
+    )
+
+    logged = mlflow.sklearn.load_model(f'runs:/{run_id}/model')
+    assert isinstance(logged, Pipeline)
+    assert len(logged.predict(X)) == 4
@@ -0,0 +1,67 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from experiments.model_store import clear_model_cache, load_model, save_model
+
+
+@pytest.fixture
+def forest():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    return RandomForestRegressor(n_estimators=20, random_state=0).fit(X, X[:, 0]), X
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_model_cache()
+    yield
+    clear_model_cache()
+
+
+def test_compressed_artifact_is_smaller_than_pickle(forest, tmp_path, settings):
+    model, _ = forest
+    settings.MODEL_ARTIFACT_COMPRESS = 3
+    size = save_model(model, str(tmp_path / 'model.joblib'))
+    assert size < len(pickle.dumps(model))
+
+
+def test_loaded_model_is_cached_until_file_changes(forest, tmp_path):
+    model, X = forest
+    path = str(tmp_path / 'model.joblib')
+    save_model(model, path)
+
+    first, load_seconds = load_model(path)
+    second, cached_seconds = load_model(path)
+    assert second is first
+    assert load_seconds > 0
+    assert cached_seconds == 0.0
+    np.testing.assert_allclose(first.predict(X), model.predict(X))
+
+    save_model(model, path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_model(path)[0] is not first
+
+
+def test_uncompressed_artifacts_are_memory_mapped(forest, tmp_path, settings):
+    model, X = forest
+    settings.MODEL_ARTIFACT_COMPRESS = 0
+    path = str(tmp_path / 'model.joblib')
+    save_model(model, path)
+
+    loaded, _ = load_model(path)
+    np.testing.assert_allclose(loaded.predict(X), model.predict(X))
+
+
+def test_legacy_pickle_artifacts_still_load(forest, tmp_path):
+    model, X = forest
+    path = str(tmp_path / 'trained_model.pkl')
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+
+    loaded, _ = load_model(path)
+    np.testing.assert_allclose(loaded.predict(X), model.predict(X))
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import optuna
+import pytest
+from django.contrib.auth.models import User
+
+from experiments.models import ExperimentSuite
+from experiments.tasks.components.suite_tasks import (
+    get_optimization_direction,
+    get_optuna_storage,
+    optimize_shared_study,
+    suggest_parameters,
+)
+from projects.models.project import Project
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+@pytest.fixture
+def journal_storage(tmp_path):
+    return get_optuna_storage(f"journal://{tmp_path / 'sweep.log'}")
+
+
+def test_direction_from_metric():
+    assert get_optimization_direction('rmse') == 'minimize'
+    assert get_optimization_direction('r2_score') == 'maximize'
+
+
+def test_suggest_parameters_structured_and_list():
+    study = optuna.create_study()
+    trial = study.ask()
+    params = suggest_parameters(trial, {
+        'n_estimators': {'type': 'int', 'low': 10, 'high': 20},
+        'learning_rate': {'type': 'float', 'low': 0.1, 'high': 0.2},
+        'criterion': ['squared_error', 'absolute_error'],
+    })
+    assert 10 <= params['n_estimators'] <= 20
+    assert 0.1 <= params['learning_rate'] <= 0.2
+    assert params['criterion'] in ('squared_error', 'absolute_error')
+
+
+def test_workers_share_trial_budget(journal_storage):
+    optuna.create_study(study_name='shared', storage=journal_storage, direction='minimize')
+
+    def objective(trial):
+        x = trial.suggest_float('x', -5, 5)
+        time.sleep(0.01)
+        return x ** 2
+
+    counts = []
+    workers = [
+        threading.Thread(target=lambda: counts.append(
+            optimize_shared_study('shared', journal_storage, objective, n_trials=12)
+        ))
+        for _ in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    study = optuna.load_study(study_name='shared', storage=journal_storage)
+    total = len(study.trials)
+    # Running trials count against the budget, so overshoot is bounded by the worker count
+    assert 12 <= total < 12 + 3
+    assert sum(counts) == total
+    assert all(count > 0 for count in counts)
+
+
+def test_failed_trials_do_not_stop_worker(journal_storage):
+    optuna.create_study(study_name='flaky', storage=journal_storage)
+
+    def objective(trial):
+        if trial.number % 2:
+            raise ValueError('boom')
+        return float(trial.number)
+
+    assert optimize_shared_study('flaky', journal_storage, objective, n_trials=4) == 4
+    states = [t.state for t in optuna.load_study(study_name='flaky', storage=journal_storage).trials]
+    assert states.count(optuna.trial.TrialState.FAIL) == 2
+
+
+def test_expired_deadline_runs_nothing(journal_storage):
+    optuna.create_study(study_name='late', storage=journal_storage)
+    ran = optimize_shared_study('late', journal_storage, lambda t: 0.0, n_trials=5,
+                                deadline=time.time() - 1)
+    assert ran == 0
+
+
+@pytest.mark.django_db
+def test_append_trial_data_keeps_concurrent_entries():
+    user = User.objects.create_user(username='sweepuser', password='sweeppass')
+    project = Project.objects.create(name='Sweep Project', owner=user)
+    suite = ExperimentSuite.objects.create(name='Sweep', project=project, n_trials=2, parallelism=2)
+
+    # Two stale in-memory copies, as on two workers
+    first = ExperimentSuite.objects.get(pk=suite.pk)
+    second = ExperimentSuite.objects.get(pk=suite.pk)
+    first.append_trial_data({'trial_number': 0, 'value': 0.5})
+    second.append_trial_data({'trial_number': 1, 'value': 0.7})
+
+    suite.refresh_from_db()
+    assert [t['trial_number'] for t in suite.trial_data] == [0, 1]
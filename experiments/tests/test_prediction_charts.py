@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from experiments.models import MLExperiment
+from experiments.prediction_charts import (
+    get_prediction_chart,
+    lttb,
+    stratified_sample,
+    write_prediction_charts,
+)
+from projects.models.datasource import DataSource, DataSourceType
+from projects.models.project import Project
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    y_true = np.sin(np.arange(100_000) / 500) + rng.normal(scale=0.05, size=100_000)
+    y_true[42_000] = 25.0
+    return y_true, y_true * 0.9
+
+
+def test_lttb_keeps_endpoints_and_peaks(series):
+    y_true, _ = series
+    indices = lttb(np.arange(len(y_true)), y_true, 500)
+
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == len(y_true) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert 42_000 in indices
+
+
+def test_lttb_returns_everything_for_short_series():
+    assert list(lttb(np.arange(5), np.arange(5), 10)) == [0, 1, 2, 3, 4]
+
+
+def test_stratified_sample_covers_sparse_tails():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.normal(size=100_000), [40.0, 50.0]])
+    indices = stratified_sample(values, 1000)
+
+    assert len(indices) <= 1000
+    assert len(np.unique(indices)) == len(indices)
+    assert values[indices].max() == 50.0
+
+
+def test_charts_are_written_per_resolution(series, tmp_path, settings):
+    settings.PREDICTION_CHART_RESOLUTIONS = [100, 1000]
+    y_true, y_pred = series
+    paths, prediction_data = write_prediction_charts(y_true, y_pred, str(tmp_path / 'charts'), 'charts')
+
+    assert set(paths) == {'100', '1000'}
+    assert (tmp_path / paths['1000']).exists()
+    assert len(prediction_data) <= 100
+    assert {'actual', 'predicted'} == set(prediction_data[0])
+
+
+@pytest.mark.django_db
+def test_chart_endpoint_serves_requested_resolution(client, series, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.PREDICTION_CHART_RESOLUTIONS = [100, 1000]
+    user = User.objects.create_user(username='charts', password='chartspass')
+    project = Project.objects.create(name='Charts', owner=user)
+    source = DataSource.objects.create(name='Flows', data_type=DataSourceType.ORIGINAL, project=project)
+    experiment = MLExperiment.objects.create(
+        project=project, input_datasource=source, target_column='flow',
+        model_name='LinearRegression', status=MLExperiment.Status.FINISHED
+    )
+    y_true, y_pred = series
+    paths, prediction_data = write_prediction_charts(
+        y_true, y_pred, str(tmp_path / 'experiments' / str(experiment.id)), f'experiments/{experiment.id}'
+    )
+    experiment.artifact_paths = {'prediction_charts': paths}
+    experiment.results = {'prediction_data': prediction_data, 'n_predictions': len(y_true)}
+    experiment.save()
+
+    assert get_prediction_chart(experiment, 50)['points'] == 100
+    assert get_prediction_chart(experiment, 5000)['points'] == 1000
+
+    client.force_login(user)
+    response = client.get(reverse('experiments:api_prediction_chart', args=[experiment.id]), {'points': 800})
+    assert response.status_code == 200
+    body = response.json()
+    assert body['points'] == 1000
+    assert body['n_total'] == len(y_true)
+    assert len(body['series']['index']) <= 1000
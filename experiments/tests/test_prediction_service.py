@@ -0,0 +1,121 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.urls import reverse
+from sklearn.linear_model import LinearRegression
+
+from experiments.model_store import clear_model_cache, model_relative_path, save_model
+from experiments.models import MLExperiment
+from experiments.tasks.components.prediction_tasks import run_batch_prediction_task
+from projects.models.datasource import DataSource, DataSourceType
+from projects.models.project import Project
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username='forecaster', password='forecastpass')
+
+
+@pytest.fixture
+def experiment(user, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    clear_model_cache()
+    project = Project.objects.create(name='Forecasts', owner=user)
+    source = DataSource.objects.create(name='Flows', data_type=DataSourceType.ORIGINAL, project=project)
+    experiment = MLExperiment.objects.create(
+        project=project, input_datasource=source, target_column='flow',
+        feature_set=['rain', 'temp'], model_name='LinearRegression',
+        status=MLExperiment.Status.FINISHED
+    )
+
+    X = pd.DataFrame({'rain': [0.0, 1.0, 2.0, 3.0], 'temp': [1.0, 0.0, 1.0, 0.0]})
+    model = LinearRegression().fit(X, 2 * X['rain'] + X['temp'])
+    save_model(model, str(tmp_path / model_relative_path(experiment)))
+    experiment.artifact_paths = {'trained_model': model_relative_path(experiment)}
+    experiment.save()
+    return experiment
+
+
+@pytest.mark.django_db
+def test_online_prediction(client, user, experiment):
+    client.force_login(user)
+    response = client.post(
+        reverse('experiments:api_predict', args=[experiment.id]),
+        data=json.dumps({'rows': [{'temp': 1.0, 'rain': 5.0, 'station': 'A'}]}),
+        content_type='application/json'
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['n_rows'] == 1
+    assert body['predictions'][0] == pytest.approx(11.0)
+
+
+@pytest.mark.django_db
+def test_online_prediction_rejects_missing_columns(client, user, experiment):
+    client.force_login(user)
+    response = client.post(
+        reverse('experiments:api_predict', args=[experiment.id]),
+        data=json.dumps({'columns': ['rain'], 'data': [[1.0]]}),
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+    assert 'temp' in response.json()['error']
+
+
+@pytest.mark.django_db
+def test_online_prediction_rejects_non_numeric_values(client, user, experiment):
+    client.force_login(user)
+    response = client.post(
+        reverse('experiments:api_predict', args=[experiment.id]),
+        data=json.dumps({'columns': ['rain', 'temp'], 'data': [['heavy', 1.0]]}),
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_online_prediction_limits_rows(client, user, experiment, settings):
+    settings.PREDICTION_MAX_ONLINE_ROWS = 2
+    client.force_login(user)
+    response = client.post(
+        reverse('experiments:api_predict', args=[experiment.id]),
+        data=json.dumps({'columns': ['rain', 'temp'], 'data': [[1.0, 0.0]] * 3}),
+        content_type='application/json'
+    )
+    assert response.status_code == 413
+
+
+@pytest.mark.django_db
+def test_batch_prediction_streams_into_new_datasource(experiment, settings, monkeypatch):
+    settings.PREDICTION_BATCH_CHUNK_ROWS = 4
+    monkeypatch.setattr(run_batch_prediction_task, 'update_state', lambda **kwargs: None)
+    rain = np.arange(10, dtype=float)
+    target = DataSource.objects.create(
+        name='New storms', data_type=DataSourceType.ORIGINAL, project=experiment.project
+    )
+    target.file.save('storms.csv', ContentFile(pd.DataFrame({'rain': rain, 'temp': 0.0}).to_csv(index=False)))
+
+    result = run_batch_prediction_task(str(experiment.id), str(target.id))
+
+    assert result['rows'] == 10
+    predictions_ds = DataSource.objects.get(id=result['datasource_id'])
+    assert list(predictions_ds.parents.all()) == [target]
+    scored = pd.read_csv(predictions_ds.file.path)
+    assert list(scored.columns) == ['rain', 'temp', 'prediction']
+    np.testing.assert_allclose(scored['prediction'], 2 * rain)
+
+
+@pytest.mark.django_db
+def test_batch_prediction_rejects_invalid_datasource_id(client, user, experiment):
+    client.force_login(user)
+    response = client.post(
+        reverse('experiments:api_batch_predict', args=[experiment.id]),
+        data=json.dumps({'datasource_id': 'not-a-uuid'}),
+        content_type='application/json'
+    )
+    assert response.status_code == 400
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_tools.services import preprocessing
+from data_tools.services.preprocessing import build_preprocessor, get_or_fit_preprocessor, preprocessor_key
+from experiments.models import MLExperiment
+from experiments.prediction_service import predict_frame
+from experiments.tasks.components.feature_matrix import load_features
+from experiments.tasks.components.training_tasks import prepare_split
+
+
+@pytest.fixture
+def stations():
+    rng = np.random.default_rng(0)
+    rain = rng.uniform(0, 10, size=200)
+    station = rng.choice(['north', 'south'], size=200)
+    flow = 2 * rain + np.where(station == 'north', 5.0, 0.0)
+    rain[::17] = np.nan
+    return pd.DataFrame({'rain': rain, 'station': station, 'flow': flow})
+
+
+@pytest.fixture
+def datasource(make_datasource, stations):
+    return make_datasource(stations, 'stations.csv')
+
+
+def test_preprocessor_encodes_imputes_and_keeps_names(stations):
+    X = stations[['rain', 'station']]
+    transformed = build_preprocessor().fit(X).transform(X)
+
+    assert list(transformed.columns) == ['rain', 'station']
+    assert not transformed.isna().any().any()
+    assert set(transformed['station']) == {0.0, 1.0}
+    assert transformed['rain'].mean() == pytest.approx(0.0, abs=1e-9)
+
+
+def test_unseen_categories_are_encoded_as_minus_one(stations):
+    preprocessor = build_preprocessor().fit(stations[['rain', 'station']])
+    new = pd.DataFrame({'rain': [1.0], 'station': ['east']})
+    assert preprocessor.transform(new)['station'].iloc[0] == -1
+
+
+@pytest.mark.django_db
+def test_stored_preprocessor_is_reused(datasource, stations, monkeypatch):
+    X = stations[['rain', 'station']]
+    key = preprocessor_key(datasource, list(X.columns), scope='split-a')
+
+    first, path, reused = get_or_fit_preprocessor(key, X)
+    assert not reused
+
+    def fail():
+        raise AssertionError('preprocessor was refitted')
+    monkeypatch.setattr(preprocessing, 'build_preprocessor', fail)
+    second, second_path, reused = get_or_fit_preprocessor(key, X)
+
+    assert reused
+    assert second_path == path
+    pd.testing.assert_frame_equal(second.transform(X), first.transform(X))
+    assert preprocessor_key(datasource, ['rain'], scope='split-a') != key
+    assert preprocessor_key(datasource, list(X.columns), scope='split-b') != key
+
+
+@pytest.mark.django_db
+def test_split_trains_on_preprocessed_features(datasource, media_root, make_experiment):
+    experiment = make_experiment(
+        datasource, feature_set=['rain', 'station'], status=MLExperiment.Status.FINISHED
+    )
+    split = prepare_split(experiment)
+    paths = dict(split.artifact_paths)
+    assert 'preprocessor' in paths
+
+    X_train = load_features(paths, 'train_X')
+    assert X_train.dtypes.map(pd.api.types.is_float_dtype).all()
+    assert not np.isnan(X_train.to_numpy()).any()
+
+    # Without the matrix the raw Parquet features are preprocessed on load
+    raw_paths = {name: path for name, path in paths.items() if not name.endswith('_matrix')}
+    np.testing.assert_allclose(load_features(raw_paths, 'train_X').to_numpy(), X_train.to_numpy())
+
+    from experiments.model_store import model_relative_path, save_model
+    from sklearn.linear_model import LinearRegression
+    y_train = pd.read_parquet(media_root / paths['train_y']).iloc[:, 0]
+    save_model(LinearRegression().fit(X_train, y_train), str(media_root / model_relative_path(experiment)))
+    experiment.artifact_paths = {**paths, 'trained_model': model_relative_path(experiment)}
+    experiment.save()
+
+    predictions = predict_frame(experiment, pd.DataFrame({'rain': [1.0, 1.0], 'station': ['north', 'south']}))
+    assert predictions[0] - predictions[1] == pytest.approx(5.0, abs=1e-6)
+
+
+@pytest.mark.django_db
+def test_preprocessor_is_stored_and_deleted_with_the_split(datasource, media_root, make_experiment):
+    experiments = [
+        make_experiment(datasource, feature_set=['rain', 'station'], hyperparameters={'fit_intercept': flag})
+        for flag in (True, False)
+    ]
+    splits = []
+    for experiment in experiments:
+        splits.append(prepare_split(experiment))
+        experiment.save()
+
+    split = splits[0]
+    assert splits[1].pk == split.pk
+    path = media_root / split.artifact_paths['preprocessor']
+    assert path.parent == media_root / split.get_directory()
+    assert path.exists()
+
+    for experiment in experiments:
+        experiment.delete()
+    assert not path.exists()
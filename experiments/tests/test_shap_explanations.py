@@ -0,0 +1,67 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+import shap
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.svm import SVR
+
+from experiments.tasks.components import explanation_tasks
+from experiments.tasks.components.explanation_tasks import (
+    build_explainer,
+    compute_shap_values,
+    get_explainer,
+)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(120, 3)), columns=['rain', 'temp', 'snow'])
+    y = 2 * X['rain'] - X['temp']
+    return X, y
+
+
+@pytest.fixture
+def saved_forest(data, tmp_path):
+    X, y = data
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+    model_path = tmp_path / 'trained_model.pkl'
+    with open(model_path, 'wb') as f:
+        pickle.dump(model, f)
+    explanation_tasks._explainer_cache.clear()
+    return model, str(model_path)
+
+
+def test_fast_paths_are_preferred(data):
+    X, y = data
+    forest = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+    svr = SVR().fit(X, y)
+
+    assert isinstance(build_explainer(forest, 'RandomForestRegressor', X), shap.TreeExplainer)
+    assert isinstance(build_explainer(svr, 'SVM', X), shap.PermutationExplainer)
+
+
+def test_batched_values_match_single_batch(data, saved_forest):
+    X, _ = data
+    model, model_path = saved_forest
+    explainer = get_explainer(model, 'RandomForestRegressor', model_path, X)
+
+    batched = compute_shap_values(explainer, X, n_jobs=2)
+    single = compute_shap_values(explainer, X, n_jobs=1)
+
+    assert batched.shape == (120, 3)
+    np.testing.assert_allclose(batched, single)
+
+
+def test_explainer_is_cached_per_model_artifact(data, saved_forest, monkeypatch):
+    X, _ = data
+    model, model_path = saved_forest
+    first = get_explainer(model, 'RandomForestRegressor', model_path, X)
+    assert get_explainer(model, 'RandomForestRegressor', model_path, X) is first
+
+    # A new worker reuses the explainer pickled next to the model
+    explanation_tasks._explainer_cache.clear()
+    monkeypatch.setattr(explanation_tasks, 'build_explainer', lambda *args: pytest.fail('explainer rebuilt'))
+    assert isinstance(get_explainer(model, 'RandomForestRegressor', model_path, X), shap.TreeExplainer)
@@ -0,0 +1,152 @@
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from experiments.models import MLExperiment, SplitArtifact
+from experiments.split_cache import SPLIT_LOCK_TIMEOUT, acquire_split, split_cache_key
+
+
+class CountingBuilder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, absolute_dir, relative_dir):
+        self.calls += 1
+        with open(os.path.join(absolute_dir, 'train_X.parquet'), 'w') as f:
+            f.write('split')
+        return {'train_X': f'{relative_dir}/train_X.parquet'}, 20
+
+
+def acquire(experiment, builder, test_size=0.2, random_state=42):
+    split = acquire_split(experiment, builder, test_size=test_size, random_state=random_state)
+    experiment.save()
+    return split
+
+
+@pytest.mark.django_db
+def test_children_share_one_split(datasource, media_root, make_experiment):
+    builder = CountingBuilder()
+    experiments = [make_experiment(datasource, hyperparameters={'n_estimators': n}) for n in (10, 20, 30)]
+
+    splits = {acquire(experiment, builder).pk for experiment in experiments}
+
+    assert builder.calls == 1
+    assert len(splits) == 1
+    split = SplitArtifact.objects.get()
+    assert split.ref_count == 3
+    assert os.path.exists(media_root / split.artifact_paths['train_X'])
+
+
+@pytest.mark.django_db
+def test_reacquiring_does_not_add_references(datasource, make_experiment):
+    builder = CountingBuilder()
+    experiment = make_experiment(datasource)
+    acquire(experiment, builder)
+    acquire(experiment, builder)
+    assert SplitArtifact.objects.get().ref_count == 1
+
+
+@pytest.mark.django_db
+def test_split_configuration_changes_key(datasource, make_experiment):
+    experiment = make_experiment(datasource)
+    base_key, _ = split_cache_key(experiment, 0.2, 42)
+    assert split_cache_key(experiment, 0.3, 42)[0] != base_key
+    assert split_cache_key(experiment, 0.2, 7)[0] != base_key
+
+    experiment.target_column = 'rain'
+    assert split_cache_key(experiment, 0.2, 42)[0] != base_key
+
+
+@pytest.mark.django_db
+def test_new_datasource_file_changes_key(datasource, make_experiment):
+    experiment = make_experiment(datasource)
+    base_key, _ = split_cache_key(experiment, 0.2, 42)
+
+    datasource.file.save('flows_v2.csv', ContentFile(b'rain,flow\n1,2\n'))
+    experiment.refresh_from_db()
+    assert split_cache_key(experiment, 0.2, 42)[0] != base_key
+
+
+@pytest.mark.django_db
+def test_last_reference_deletes_files(datasource, media_root, make_experiment):
+    builder = CountingBuilder()
+    first = make_experiment(datasource)
+    second = make_experiment(datasource)
+    split = acquire(first, builder)
+    acquire(second, builder)
+    files = media_root / split.get_directory()
+
+    first.delete()
+    assert SplitArtifact.objects.get().ref_count == 1
+    assert files.exists()
+
+    second.delete()
+    assert not SplitArtifact.objects.exists()
+    assert not files.exists()
+
+
+@pytest.mark.django_db
+def test_changed_split_releases_previous(datasource, make_experiment):
+    builder = CountingBuilder()
+    experiment = make_experiment(datasource)
+    acquire(experiment, builder, test_size=0.2)
+    acquire(experiment, builder, test_size=0.3)
+
+    assert builder.calls == 2
+    assert SplitArtifact.objects.count() == 1
+    assert SplitArtifact.objects.get().config['test_size'] == 0.3
+
+
+@pytest.mark.django_db
+def test_stale_build_claim_is_taken_over(datasource, media_root, make_experiment):
+    experiment = make_experiment(datasource)
+    cache_key, config = split_cache_key(experiment, 0.2, 42)
+    SplitArtifact.objects.create(
+        cache_key=cache_key, datasource=datasource, config=config,
+        status=SplitArtifact.Status.BUILDING,
+        last_used_at=timezone.now() - timedelta(seconds=SPLIT_LOCK_TIMEOUT + 1),
+    )
+    os.makedirs(media_root / 'experiments' / 'splits' / cache_key)
+
+    builder = CountingBuilder()
+    split = acquire(experiment, builder)
+
+    assert builder.calls == 1
+    assert split.status == SplitArtifact.Status.READY
+    assert split.ref_count == 1
+    assert os.listdir(media_root / 'experiments' / 'splits') == [cache_key]
+
+
+@pytest.mark.django_db
+def test_failed_build_gives_up_the_claim(datasource, media_root, make_experiment):
+    def failing_builder(absolute_dir, relative_dir):
+        raise ValueError('bad data')
+
+    experiment = make_experiment(datasource)
+    with pytest.raises(ValueError):
+        acquire_split(experiment, failing_builder, test_size=0.2, random_state=42)
+
+    assert not SplitArtifact.objects.exists()
+    assert os.listdir(media_root / 'experiments' / 'splits') == []
+
+
+@pytest.mark.django_db
+def test_failed_run_keeps_the_split_reference(datasource, monkeypatch, make_experiment):
+    from experiments.tasks import experiment_tasks
+    from experiments.tasks.utils import run_single_experiment_sync
+
+    def split_then_fail(experiment_id):
+        acquire(MLExperiment.objects.get(id=experiment_id), CountingBuilder())
+        raise RuntimeError('training failed')
+
+    monkeypatch.setattr(experiment_tasks, 'run_train_test_split_task', split_then_fail)
+    experiment = make_experiment(datasource)
+    with pytest.raises(RuntimeError):
+        run_single_experiment_sync(experiment)
+
+    experiment.refresh_from_db()
+    assert experiment.status == MLExperiment.Status.ERROR
+    assert experiment.split_artifact == SplitArtifact.objects.get()
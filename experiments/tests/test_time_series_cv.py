@@ -0,0 +1,69 @@
+import numpy as np
+import optuna
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.model_selection import TimeSeriesSplit
+
+from experiments.tasks.components.evaluation_tasks import cross_validate_time_series
+from experiments.tasks.components.trial_reporting import active_trial
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({'rain': rng.normal(size=120), 'temp': rng.normal(size=120)})
+    y = pd.Series(3 * X['rain'] - X['temp'] + rng.normal(scale=0.1, size=120), name='flow')
+    return X, y
+
+
+def test_parallel_folds_match_sequential(series):
+    X, y = series
+    splitter = TimeSeriesSplit(n_splits=4)
+
+    parallel = cross_validate_time_series(LinearRegression(), X, y, splitter, n_jobs=2)
+    sequential = cross_validate_time_series(LinearRegression(), X, y, splitter, n_jobs=1)
+
+    assert [m['fold'] for m in parallel] == [1, 2, 3, 4]
+    for left, right in zip(parallel, sequential):
+        assert left['mse'] == pytest.approx(right['mse'])
+
+
+def test_gap_and_max_train_size_are_applied(series):
+    X, y = series
+    splitter = TimeSeriesSplit(n_splits=3, gap=5, max_train_size=30)
+
+    fold_metrics = cross_validate_time_series(LinearRegression(), X, y, splitter, n_jobs=1)
+
+    assert len(fold_metrics) == 3
+    assert all(m['train_size'] <= 30 for m in fold_metrics)
+    assert fold_metrics[-1]['train_size'] == 30
+
+
+def test_folds_are_reported_during_trial(series):
+    X, y = series
+    study = optuna.create_study(direction='minimize')
+    trial = study.ask()
+
+    with active_trial(trial, 'mse'):
+        cross_validate_time_series(LinearRegression(), X, y, TimeSeriesSplit(n_splits=3))
+
+    assert sorted(trial.storage.get_trial(trial._trial_id).intermediate_values) == [1, 2, 3]
+
+
+def test_classification_folds_report_the_suite_metric():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({'rain': rng.normal(size=120)})
+    y = pd.Series((X['rain'] > 0).astype(int), name='flood')
+    study = optuna.create_study(direction='maximize')
+    trial = study.ask()
+
+    with active_trial(trial, 'accuracy'):
+        fold_metrics = cross_validate_time_series(LogisticRegression(), X, y, TimeSeriesSplit(n_splits=3))
+
+    assert all('accuracy' in m and 'mse' not in m for m in fold_metrics)
+    reported = trial.storage.get_trial(trial._trial_id).intermediate_values
+    assert sorted(reported) == [1, 2, 3]
+    assert all(0.5 < value <= 1.0 for value in reported.values())
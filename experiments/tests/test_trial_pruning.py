@@ -0,0 +1,102 @@
+import numpy as np
+import optuna
+import pytest
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+from experiments.models import ExperimentSuite
+from experiments.tasks.components.suite_tasks import build_pruner
+from experiments.tasks.components.trial_reporting import (
+    active_trial,
+    fit_in_stages,
+    has_active_trial,
+    report_metrics,
+    score_predictions,
+)
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+
+@pytest.fixture
+def regression_data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    y = X @ np.array([1.0, -2.0, 0.5]) + rng.normal(scale=0.1, size=200)
+    return X[:150], y[:150], X[150:], y[150:]
+
+
+def test_build_pruner_from_suite_setting():
+    assert isinstance(build_pruner(ExperimentSuite.Pruner.MEDIAN), optuna.pruners.MedianPruner)
+    assert isinstance(build_pruner(ExperimentSuite.Pruner.SUCCESSIVE_HALVING),
+                      optuna.pruners.SuccessiveHalvingPruner)
+    assert isinstance(build_pruner(ExperimentSuite.Pruner.HYPERBAND), optuna.pruners.HyperbandPruner)
+    assert isinstance(build_pruner(ExperimentSuite.Pruner.NONE), optuna.pruners.NopPruner)
+
+
+def test_report_without_trial_is_noop():
+    assert not has_active_trial()
+    report_metrics({'mse': 1.0}, step=1)
+
+
+def test_worse_trial_is_pruned():
+    study = optuna.create_study(
+        direction='minimize',
+        pruner=optuna.pruners.MedianPruner(n_startup_trials=1, n_warmup_steps=0)
+    )
+
+    good = study.ask()
+    with active_trial(good, 'mse'):
+        for step in range(1, 4):
+            report_metrics({'mse': 0.1, 'r2': 0.9}, step)
+    study.tell(good, 0.1)
+
+    bad = study.ask()
+    with active_trial(bad, 'mse'):
+        with pytest.raises(optuna.TrialPruned):
+            report_metrics({'mse': 5.0, 'r2': -1.0}, 1)
+    assert not has_active_trial()
+
+
+def test_metric_aliases_are_reported():
+    study = optuna.create_study(direction='maximize')
+    trial = study.ask()
+    with active_trial(trial, 'r2_score'):
+        report_metrics({'r2': 0.75}, 1)
+    assert trial.storage.get_trial(trial._trial_id).intermediate_values == {1: 0.75}
+
+
+def test_ensembles_fit_in_reported_stages(regression_data):
+    X_train, y_train, _, _ = regression_data
+    study = optuna.create_study(direction='minimize')
+    trial = study.ask()
+
+    model = RandomForestRegressor(n_estimators=20, random_state=0)
+    with active_trial(trial, 'mse'):
+        model = fit_in_stages(model, X_train, y_train)
+
+    reported = trial.storage.get_trial(trial._trial_id).intermediate_values
+    assert sorted(reported) == [1, 2, 3, 4, 5]
+    assert len(model.estimators_) == 20
+    assert model.get_params()['warm_start'] is False
+
+
+def test_classification_sweeps_report_their_metric():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    y = (X[:, 0] > 0).astype(int)
+    study = optuna.create_study(direction='maximize')
+    trial = study.ask()
+
+    with active_trial(trial, 'accuracy'):
+        fit_in_stages(RandomForestClassifier(n_estimators=10, random_state=0), X, y)
+
+    reported = trial.storage.get_trial(trial._trial_id).intermediate_values
+    assert len(reported) == 5
+    assert all(0.5 < value <= 1.0 for value in reported.values())
+    assert set(score_predictions(y, y, 'f1_score')) == {'accuracy', 'precision', 'recall', 'f1_score'}
+
+
+def test_plain_fit_outside_sweep(regression_data):
+    X_train, y_train, _, _ = regression_data
+    model = fit_in_stages(LinearRegression(), X_train, y_train)
+    assert model.coef_.shape == (3,)
@@ -0,0 +1,133 @@
+"""
+MLflow tracking configuration and batched writes.
+
+The tracking server comes from ``MLFLOW_TRACKING_URI``. When it is empty,
+runs are written to a local file store under ``MLFLOW_FILE_STORE_DIR``,
+which keeps tests and offline workers independent of the tracking server.
+
+Params, metrics and tags are written with ``log_batch`` in as few requests
+as the MLflow limits allow. Experiment tasks do not call these functions
+directly: they buffer values in a ``RunTracker`` (see
+``experiments.tasks.components.tracking_tasks``), which flushes them off
+the critical path.
+"""
+import logging
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# MLflow's limits for a single log_batch request
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+MAX_METRICS_PER_BATCH = 1000
+
+_configured_uri = None
+_configure_lock = threading.Lock()
+
+
+def tracking_uri():
+    """
+    Tracking URI configured in settings.
+
+    Returns:
+        str: ``MLFLOW_TRACKING_URI``, or a ``file://`` URI of the local file
+        store when it is empty.
+    """
+    uri = getattr(settings, 'MLFLOW_TRACKING_URI', '')
+    if uri:
+        return uri
+    store_dir = getattr(settings, 'MLFLOW_FILE_STORE_DIR', None) or Path(settings.BASE_DIR) / 'mlruns'
+    return Path(store_dir).resolve().as_uri()
+
+
+def configure_tracking():
+    """
+    Point the mlflow module at the configured tracking URI.
+
+    Only calls ``mlflow.set_tracking_uri`` when the URI changed since the
+    last call in this process.
+
+    Returns:
+        str: The tracking URI in use.
+    """
+    global _configured_uri
+    uri = tracking_uri()
+    if uri != _configured_uri:
+        import mlflow
+        with _configure_lock:
+            mlflow.set_tracking_uri(uri)
+            _configured_uri = uri
+    return uri
+
+
+def get_client():
+    """
+    MLflow client for the configured tracking URI.
+
+    Returns:
+        MlflowClient: The client.
+    """
+    from mlflow.tracking import MlflowClient
+    return MlflowClient(tracking_uri=configure_tracking())
+
+
+def log_batch(run_id, params=None, metrics=None, tags=None, client=None):
+    """
+    Write params, metrics and tags to a run in as few requests as possible.
+
+    Args:
+        run_id (str): MLflow run ID.
+        params (dict, optional): Param name -> value (stored as strings).
+        metrics (list, optional): ``(key, value, timestamp_ms, step)`` tuples.
+        tags (dict, optional): Tag name -> value.
+        client (MlflowClient, optional): Client to use.
+
+    Returns:
+        int: Number of log_batch requests sent.
+    """
+    from mlflow.entities import Metric, Param, RunTag
+
+    client = client or get_client()
+    params = [Param(key, str(value)) for key, value in (params or {}).items()]
+    tags = [RunTag(key, str(value)) for key, value in (tags or {}).items()]
+    metrics = [Metric(key, float(value), int(timestamp), int(step))
+               for key, value, timestamp, step in (metrics or [])]
+
+    requests = 0
+    while params or tags or metrics:
+        client.log_batch(
+            run_id,
+            metrics=metrics[:MAX_METRICS_PER_BATCH],
+            params=params[:MAX_PARAMS_PER_BATCH],
+            tags=tags[:MAX_TAGS_PER_BATCH],
+        )
+        params = params[MAX_PARAMS_PER_BATCH:]
+        tags = tags[MAX_TAGS_PER_BATCH:]
+        metrics = metrics[MAX_METRICS_PER_BATCH:]
+        requests += 1
+    return requests
+
+
+def create_run(experiment_name, tags=None):
+    """
+    Create a run in an MLflow experiment, creating the experiment if needed.
+
+    Args:
+        experiment_name (str): MLflow experiment name.
+        tags (dict, optional): Tags set when the run is created.
+
+    Returns:
+        str: The new run ID.
+    """
+    client = get_client()
+    mlflow_experiment = client.get_experiment_by_name(experiment_name)
+    if mlflow_experiment is None:
+        mlflow_experiment_id = client.create_experiment(experiment_name)
+    else:
+        mlflow_experiment_id = mlflow_experiment.experiment_id
+    run = client.create_run(mlflow_experiment_id, start_time=int(time.time() * 1000), tags=tags)
+    return run.info.run_id
@@ -83,6 +83,18 @@ urlpatterns = [
     path('api/status/<uuid:experiment_id>/',
          api_views.get_experiment_status,
          name='get_experiment_status'),
+    
+    path('api/predictions-chart/<uuid:experiment_id>/',
+         api_views.prediction_chart_view,
+         name='api_prediction_chart'),
+    
+    path('api/predict/<uuid:experiment_id>/',
+         api_views.predict_view,
+         name='api_predict'),
+    
+    path('api/predict/<uuid:experiment_id>/batch/',
+         api_views.batch_predict_view,
+         name='api_batch_predict'),
 
     # --- Rutas para Suites de Experimentos ---
     path('projects/<uuid:project_pk>/suites/create/',
@@ -3,6 +3,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Any
 from projects.models import DataSource
+from data_tools.services.dataset_reader import read_dataset
 import sentry_sdk
 import logging
 
@@ -66,15 +67,7 @@ class MLExperimentValidator:
             if hasattr(self.datasource, 'get_dataframe'):
                 self.data = self.datasource.get_dataframe()
             elif hasattr(self.datasource, 'file') and self.datasource.file:
-                file_path = self.datasource.file.path
-                if file_path.endswith('.csv'):
-                    self.data = pd.read_csv(file_path)
-                elif file_path.endswith(('.xlsx', '.xls')):
-                    self.data = pd.read_excel(file_path)
-                elif file_path.endswith('.parquet'):
-                    self.data = pd.read_parquet(file_path)
-                else:
-                    raise ValueError(f"Formato de archivo no soportado: {file_path}")
+                self.data = read_dataset(self.datasource.file.path)
             else:
                 raise ValueError("No se puede acceder a los datos del datasource")
                 
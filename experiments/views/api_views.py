@@ -1,8 +1,23 @@
 # experiments/views/api_views.py
+import json
+import time
+from uuid import UUID
+
+from django.conf import settings
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_POST
+from projects.models import DataSource
 from ..models import MLExperiment
+from ..prediction_charts import get_prediction_chart
+from ..prediction_service import (
+    PredictionError,
+    get_model_path,
+    predict_frame,
+    records_to_frame,
+)
+from ..tasks.components.prediction_tasks import run_batch_prediction_task
 
 @login_required
 def get_experiment_status(request, experiment_id):
@@ -22,3 +37,117 @@ def get_experiment_status(request, experiment_id):
         'status_display': experiment.get_status_display(),
         'results': experiment.results
     })
+
+
+@login_required
+def prediction_chart_view(request, experiment_id):
+    """
+    API endpoint con los datos del gráfico de predicciones a la resolución pedida.
+    
+    Parámetro ``points``: puntos que el gráfico puede mostrar; se devuelve la
+    menor resolución precalculada que los cubre.
+    """
+    experiment = get_object_or_404(
+        MLExperiment,
+        id=experiment_id,
+        project__owner=request.user
+    )
+    
+    try:
+        points = max(1, int(request.GET.get('points', 1000)))
+    except ValueError:
+        return JsonResponse({'error': 'points must be an integer'}, status=400)
+    
+    chart = get_prediction_chart(experiment, points)
+    if chart is None:
+        return JsonResponse({'error': 'No prediction data available'}, status=404)
+    return JsonResponse(chart)
+
+
+@login_required
+@require_POST
+def predict_view(request, experiment_id):
+    """
+    API endpoint para puntuar un lote pequeño de filas con un experimento.
+    
+    Body JSON: ``{"rows": [{...}, ...]}`` o ``{"columns": [...], "data": [[...], ...]}``.
+    El modelo se mantiene en la caché del worker entre peticiones.
+    """
+    experiment = get_object_or_404(
+        MLExperiment,
+        id=experiment_id,
+        project__owner=request.user
+    )
+    
+    try:
+        payload = json.loads(request.body or b'{}')
+        df = records_to_frame(payload)
+    except (json.JSONDecodeError, PredictionError, ValueError) as e:
+        return JsonResponse({'error': f'Invalid request body: {e}'}, status=400)
+    
+    max_rows = getattr(settings, 'PREDICTION_MAX_ONLINE_ROWS', 1000)
+    if len(df) > max_rows:
+        return JsonResponse(
+            {'error': f'Too many rows ({len(df)}); use batch prediction above {max_rows}.'},
+            status=413
+        )
+    
+    started = time.perf_counter()
+    try:
+        predictions = predict_frame(experiment, df)
+    except (PredictionError, ValueError, TypeError) as e:
+        # Values the model cannot take (text in a numeric column, unseen categories)
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse({
+        'experiment_id': str(experiment.id),
+        'model_name': experiment.model_name,
+        'predictions': predictions.tolist(),
+        'n_rows': len(predictions),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)
+    })
+
+
+@login_required
+@require_POST
+def batch_predict_view(request, experiment_id):
+    """
+    API endpoint para puntuar una fuente de datos completa en segundo plano.
+    
+    Body JSON: ``{"datasource_id": "...", "output_name": "..."}``. Devuelve el
+    id de la tarea Celery; el resultado es una nueva fuente de datos.
+    """
+    experiment = get_object_or_404(
+        MLExperiment,
+        id=experiment_id,
+        project__owner=request.user
+    )
+    
+    try:
+        payload = json.loads(request.body or b'{}')
+    except json.JSONDecodeError as e:
+        return JsonResponse({'error': f'Invalid request body: {e}'}, status=400)
+    
+    # Validate UUID format
+    datasource_id = payload.get('datasource_id')
+    try:
+        UUID(str(datasource_id))
+    except ValueError:
+        return JsonResponse({'error': 'datasource_id debe ser un UUID válido'}, status=400)
+    
+    datasource = get_object_or_404(
+        DataSource,
+        id=datasource_id,
+        project__owner=request.user
+    )
+    
+    # Only check the model is there: loading it would fill this web worker's model cache
+    try:
+        get_model_path(experiment)
+    except PredictionError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    task = run_batch_prediction_task.delay(
+        str(experiment.id), str(datasource.id), payload.get('output_name')
+    )
+    return JsonResponse({'task_id': task.id, 'status': 'queued'}, status=202)
@@ -32,6 +32,7 @@ import sentry_sdk
 
 from projects.models import Project
 from ..models import MLExperiment
+from ..tracking import configure_tracking
 from ..forms import MLExperimentForm, ForkExperimentForm
 # Se importan las tareas de Celery
 from ..tasks import (
@@ -460,7 +461,7 @@ def register_model_view(request, pk):
         import mlflow
         
         # Set MLflow tracking URI
-        mlflow.set_tracking_uri("http://mlflow:5000")
+        configure_tracking()
         
         # Construct model URI
         model_uri = f"runs:/{experiment.mlflow_run_id}/model"
@@ -9,6 +9,7 @@ from core.utils.breadcrumbs import create_experiment_breadcrumbs
 
 # Importamos el modelo usando '..' para subir un nivel y encontrar la carpeta 'models'
 from ..models import MLExperiment
+from ..tracking import configure_tracking
 
 # For PDF generation
 try:
@@ -49,7 +50,7 @@ def ml_experiment_detail(request, pk):
             
             # Set tracking URI and create client
             import mlflow
-            mlflow.set_tracking_uri("http://mlflow:5000")
+            configure_tracking()
             client = MlflowClient()
             
             # Get the run details
@@ -254,6 +254,114 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 
+# Tareas periódicas (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    'connectors-incremental-sync': {
+        'task': 'connectors.tasks.components.sync_tasks.run_due_incremental_syncs_task',
+        'schedule': float(os.getenv('INCREMENTAL_SYNC_CHECK_SECONDS', '300')),
+    },
+}
+
+# --- DATA STUDIO REAL-TIME SETTINGS ---
+# Maximum WebSocket progress frames per second and group; intermediate
+# updates are coalesced (latest value wins), terminal states are sent at once.
+DATA_STUDIO_PROGRESS_MAX_RATE = float(os.getenv('DATA_STUDIO_PROGRESS_MAX_RATE', '4'))
+# Charts are aggregated server-side: scatter/line charts draw at most
+# CHART_MAX_POINTS points and categorical axes at most CHART_MAX_CATEGORIES
+# categories. Results are cached per datasource version and chart spec.
+CHART_MAX_POINTS = int(os.getenv('CHART_MAX_POINTS', '5000'))
+CHART_MAX_CATEGORIES = int(os.getenv('CHART_MAX_CATEGORIES', '50'))
+CHART_CACHE_TIMEOUT = int(os.getenv('CHART_CACHE_TIMEOUT', '86400'))
+# Decoded datasource frames are cached per worker up to this many bytes
+# (0 disables the cache); see data_tools.services.dataset_reader.
+DATASET_CACHE_MAX_BYTES = int(os.getenv('DATASET_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+# Data Studio sessions at least this large (in memory) are stored on disk as
+# a base Parquet plus per-step column patches; Redis keeps only metadata.
+DATA_STUDIO_DISK_SESSION_MIN_BYTES = int(os.getenv('DATA_STUDIO_DISK_SESSION_MIN_BYTES', str(256 * 1024 * 1024)))
+
+# --- MISSING DATA TOOLKIT ---
+# Complete-case combinations are enumerated exhaustively up to this many;
+# beyond it only the most complete combinations of each size are searched.
+MISSING_DATA_EXHAUSTIVE_COMBINATIONS = int(os.getenv('MISSING_DATA_EXHAUSTIVE_COMBINATIONS', '10000'))
+MISSING_DATA_TOP_COMBINATIONS = int(os.getenv('MISSING_DATA_TOP_COMBINATIONS', '25'))
+# Nullity heatmaps aggregate rows into this many bins and are cached per
+# datasource version.
+NULLITY_HEATMAP_BINS = int(os.getenv('NULLITY_HEATMAP_BINS', '200'))
+NULLITY_HEATMAP_CACHE_TIMEOUT = int(os.getenv('NULLITY_HEATMAP_CACHE_TIMEOUT', '604800'))
+
+# --- DATABASE CONNECTORS ---
+# Pooled SQLAlchemy engines for user DatabaseConnections (connectors app).
+DB_CONNECTOR_POOL_SIZE = int(os.getenv('DB_CONNECTOR_POOL_SIZE', '5'))
+DB_CONNECTOR_MAX_OVERFLOW = int(os.getenv('DB_CONNECTOR_MAX_OVERFLOW', '5'))
+DB_CONNECTOR_POOL_RECYCLE = int(os.getenv('DB_CONNECTOR_POOL_RECYCLE', '1800'))
+DB_CONNECTOR_IDLE_TIMEOUT = int(os.getenv('DB_CONNECTOR_IDLE_TIMEOUT', '600'))
+
+# Database imports stream into Parquet in chunks; caps are optional (unset = no cap).
+CONNECTOR_IMPORT_CHUNK_SIZE = int(os.getenv('CONNECTOR_IMPORT_CHUNK_SIZE', '50000'))
+CONNECTOR_IMPORT_MAX_ROWS = int(os.getenv('CONNECTOR_IMPORT_MAX_ROWS')) if os.getenv('CONNECTOR_IMPORT_MAX_ROWS') else None
+CONNECTOR_IMPORT_MAX_BYTES = int(os.getenv('CONNECTOR_IMPORT_MAX_BYTES')) if os.getenv('CONNECTOR_IMPORT_MAX_BYTES') else None
+# Incremental syncs add one part file per refresh; parts are compacted into the
+# DataSource file once there are this many, or once they reach this share of its size.
+CONNECTOR_SYNC_COMPACT_PARTS = int(os.getenv('CONNECTOR_SYNC_COMPACT_PARTS', '24'))
+CONNECTOR_SYNC_COMPACT_RATIO = float(os.getenv('CONNECTOR_SYNC_COMPACT_RATIO', '0.25'))
+
+# --- MLFLOW TRACKING ---
+# Tracking server; when unset, runs go to a local file store in MLFLOW_FILE_STORE_DIR.
+MLFLOW_TRACKING_URI = os.getenv('MLFLOW_TRACKING_URI', '')
+MLFLOW_FILE_STORE_DIR = os.getenv('MLFLOW_FILE_STORE_DIR', os.path.join(BASE_DIR, 'mlruns'))
+# Params/metrics are batched and written by a background task (False = written inline).
+MLFLOW_ASYNC_LOGGING = os.getenv('MLFLOW_ASYNC_LOGGING', 'True') == 'True'
+
+# --- EXPERIMENT SWEEPS ---
+# Shared Optuna storage so sweep trials can run on several Celery workers.
+# Accepts an SQLAlchemy URL or 'journal:///path/to/file.log'; when unset the
+# default Django database is used.
+OPTUNA_STORAGE_URL = os.getenv('OPTUNA_STORAGE_URL')
+
+# Grid search children are created with bulk_create in batches of this size.
+GRID_SEARCH_BATCH_SIZE = int(os.getenv('GRID_SEARCH_BATCH_SIZE', '500'))
+
+# Grid search children of these models (MLExperiment.model_name, comma
+# separated) are trained together by the batch trainer, which skips MLflow
+# runs, SHAP plots and the model load benchmark. Empty: every child runs
+# through the full training pipeline.
+GRID_SEARCH_BATCH_MODELS = [name for name in os.getenv('GRID_SEARCH_BATCH_MODELS', '').split(',') if name]
+
+# joblib workers used by the batch trainer for each shared split (-1 = all cores).
+BATCH_TRAINER_N_JOBS = int(os.getenv('BATCH_TRAINER_N_JOBS', '1'))
+
+# dtype of the memory-mapped feature matrices stored with each split.
+# float32 halves their size but rounds the features; opt in explicitly.
+SPLIT_FEATURE_DTYPE = os.getenv('SPLIT_FEATURE_DTYPE', 'float64')
+
+# Training data larger than this (bytes, uncompressed) is trained out of core
+# when the model supports partial_fit; source files larger than this are
+# split by streaming.
+INCREMENTAL_TRAINING_THRESHOLD_BYTES = int(os.getenv('INCREMENTAL_TRAINING_THRESHOLD_BYTES', str(1024 ** 3)))
+INCREMENTAL_TRAINING_BATCH_ROWS = int(os.getenv('INCREMENTAL_TRAINING_BATCH_ROWS', '100000'))
+INCREMENTAL_TRAINING_EPOCHS = int(os.getenv('INCREMENTAL_TRAINING_EPOCHS', '5'))
+
+# SHAP explanations run as a separate task after evaluation.
+SHAP_EXPLANATIONS_ENABLED = os.getenv('SHAP_EXPLANATIONS_ENABLED', 'True') == 'True'
+SHAP_N_JOBS = int(os.getenv('SHAP_N_JOBS', '2'))
+SHAP_MAX_SAMPLES = int(os.getenv('SHAP_MAX_SAMPLES', '500'))
+SHAP_BACKGROUND_SIZE = int(os.getenv('SHAP_BACKGROUND_SIZE', '50'))
+
+# joblib compression level for model artifacts (0 = uncompressed, memory-mapped on load).
+MODEL_ARTIFACT_COMPRESS = int(os.getenv('MODEL_ARTIFACT_COMPRESS', '3'))
+# Loaded models kept per worker for evaluation, explanations and predictions.
+MODEL_CACHE_SIZE = int(os.getenv('MODEL_CACHE_SIZE', '8'))
+
+# Prediction service: row limit of the online endpoint, chunk size of batch scoring.
+PREDICTION_MAX_ONLINE_ROWS = int(os.getenv('PREDICTION_MAX_ONLINE_ROWS', '1000'))
+PREDICTION_BATCH_CHUNK_ROWS = int(os.getenv('PREDICTION_BATCH_CHUNK_ROWS', '50000'))
+
+# Point counts at which prediction chart data is precomputed after evaluation.
+PREDICTION_CHART_RESOLUTIONS = [int(points) for points in os.getenv('PREDICTION_CHART_RESOLUTIONS', '250,1000,5000').split(',')]
+
+# Time series CV folds trained concurrently (-1 = one worker per fold).
+TIME_SERIES_CV_N_JOBS = int(os.getenv('TIME_SERIES_CV_N_JOBS', '-1'))
+
 LOGIN_REDIRECT_URL = '/projects/'
 LOGOUT_REDIRECT_URL = '/accounts/login/'
 
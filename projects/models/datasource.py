@@ -126,17 +126,8 @@ class DataSource(models.Model):
         if not self.file:
             return 0
         try:
-            import pandas as pd
-            file_path = self.file.path
-            if file_path.endswith('.parquet'):
-                df = pd.read_parquet(file_path)
-            elif file_path.endswith('.csv'):
-                df = pd.read_csv(file_path, encoding='latin-1')
-            elif file_path.endswith(('.xls', '.xlsx')):
-                df = pd.read_excel(file_path)
-            else:
-                df = pd.read_parquet(file_path)  # Fallback
-            return len(df)
+            from data_tools.services.dataset_reader import read_schema
+            return read_schema(self.file.path).num_rows
         except Exception:
             return 0
 
@@ -146,17 +137,8 @@ class DataSource(models.Model):
         if not self.file:
             return 0
         try:
-            import pandas as pd
-            file_path = self.file.path
-            if file_path.endswith('.parquet'):
-                df = pd.read_parquet(file_path)
-            elif file_path.endswith('.csv'):
-                df = pd.read_csv(file_path, encoding='latin-1')
-            elif file_path.endswith(('.xls', '.xlsx')):
-                df = pd.read_excel(file_path)
-            else:
-                df = pd.read_parquet(file_path)  # Fallback
-            return len(df.columns)
+            from data_tools.services.dataset_reader import read_schema
+            return read_schema(self.file.path).num_columns
         except Exception:
             return 0
 
@@ -203,15 +203,9 @@ class ColumnAnalyzer:
             if hasattr(datasource, 'get_dataframe'):
                 df = datasource.get_dataframe()
             elif datasource.file:
-                file_path = datasource.file.path
-                if file_path.endswith('.csv'):
-                    df = pd.read_csv(file_path, nrows=10000)  # Sample for large files
-                elif file_path.endswith(('.xlsx', '.xls')):
-                    df = pd.read_excel(file_path, nrows=10000)
-                elif file_path.endswith('.parquet'):
-                    df = pd.read_parquet(file_path)
-                else:
-                    raise ValueError(f"Unsupported file format: {file_path}")
+                from data_tools.services.dataset_reader import read_dataset
+                # Sample for large files; Parquet only decodes the leading row groups
+                df = read_dataset(datasource.file.path, nrows=10000)
             else:
                 raise ValueError("Cannot access datasource data")
             
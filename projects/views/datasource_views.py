@@ -17,6 +17,7 @@ import traceback
 from ..models import Project, DataSource
 from ..forms.datasource_forms import DataSourceUpdateForm, DataSourceUploadForm
 from data_tools.tasks import convert_file_to_parquet_task
+from data_tools.services.dataset_reader import column_null_counts, read_dataset, read_schema
 from core.utils.breadcrumbs import create_breadcrumb
 
 # Configure logger
@@ -452,27 +453,18 @@ def _generate_preview_charts(datasource):
         if not os.path.exists(file_path):
             return None
 
-        # Read the data
-        if file_path.endswith('.parquet'):
-            df = pd.read_parquet(file_path)
-        elif file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        elif file_path.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path)
-        else:
-            # Try Parquet as fallback
-            try:
-                df = pd.read_parquet(file_path)
-            except:
-                return None
+        # Only the schema, the first 1000 rows of the two charted columns and
+        # the per-column missing counts (from Parquet statistics) are read
+        try:
+            schema = read_schema(file_path)
+        except Exception:
+            return None
 
         charts = []
         
-        # Limit to first 1000 rows for performance
-        df_sample = df.head(1000)
-        
         # Get numerical columns for histograms
-        numerical_cols = df_sample.select_dtypes(include=['int64', 'float64']).columns.tolist()
+        numerical_cols = [col for col in schema.columns if str(schema.dtypes[col]) in ('int64', 'float64')]
+        df_sample = read_dataset(file_path, columns=numerical_cols[:2], nrows=1000, copy=False)
         
         # Generate up to 3 charts
         chart_count = 0
@@ -521,7 +513,7 @@ def _generate_preview_charts(datasource):
         
         # Chart 3: Missing values heatmap
         if chart_count < max_charts:
-            missing_data = df.isnull().sum()
+            missing_data = column_null_counts(file_path)
             if missing_data.sum() > 0:
                 # Create missing values bar chart
                 fig = px.bar(
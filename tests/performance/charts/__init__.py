@@ -0,0 +1 @@
+# Performance tests for server-side chart aggregation
@@ -0,0 +1,83 @@
+"""
+Chart generation on long datasources.
+
+Every chart type is aggregated or downsampled server-side before the figure
+is built, so the figure JSON must stay the same size whatever the row count
+and a cached chart must be served without touching the data again.
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from django.core.cache import cache
+
+from data_tools.services.chart_data import build_chart, get_chart
+
+N_ROWS = 5_000_000
+
+CHARTS = [
+    ('histogram', {'column': 'flow'}),
+    ('box', {'y_axis': 'flow', 'x_axis': 'station'}),
+    ('bar', {'x_axis': 'station', 'y_axis': 'flow', 'aggregate': 'mean'}),
+    ('heatmap', {'x_axis': 'hour', 'y_axis': 'station', 'values': 'flow'}),
+    ('scatter', {'x_axis': 'rain', 'y_axis': 'flow'}),
+    ('line', {'x_axis': 'time', 'y_axis': 'flow'}),
+]
+
+
+def make_frame(n_rows):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'time': pd.date_range('2000-01-01', periods=n_rows, freq='min'),
+        'hour': np.arange(n_rows) // 60 % 24,
+        'flow': rng.normal(10, 2, n_rows),
+        'rain': rng.exponential(1, n_rows),
+        'station': rng.choice([f'station_{i}' for i in range(20)], n_rows),
+    })
+
+
+@pytest.fixture(scope='module')
+def long_frame():
+    return make_frame(N_ROWS)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+@pytest.mark.parametrize('chart_type,config', CHARTS)
+def test_payload_is_independent_of_row_count(long_frame, chart_type, config, settings):
+    settings.CHART_MAX_POINTS = 5000
+    # Large enough that every point and outlier budget is already saturated
+    small = len(json.dumps(build_chart(make_frame(1_000_000), chart_type, config)['figure']))
+
+    started = time.perf_counter()
+    chart = build_chart(long_frame, chart_type, config)
+    elapsed = time.perf_counter() - started
+    large = len(json.dumps(chart['figure']))
+
+    print(f"{chart_type}: {large / 1024:.1f} KiB from {chart['data_points']} rows in {elapsed:.2f}s")
+    assert elapsed < 15
+    assert large < 500 * 1024
+    assert large < small * 1.5
+
+
+@pytest.mark.performance
+def test_cached_chart_skips_loading(long_frame, settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    cache.clear()
+    datasource = SimpleNamespace(id='perf-charts', file=None, is_derived=False)
+
+    def load(columns):
+        return long_frame[columns]
+
+    get_chart(datasource, 'scatter', {'x_axis': 'rain', 'y_axis': 'flow'}, load)
+
+    def fail(columns):
+        raise AssertionError('cached chart reloaded the data')
+
+    started = time.perf_counter()
+    get_chart(datasource, 'scatter', {'x_axis': 'rain', 'y_axis': 'flow'}, fail)
+    assert time.perf_counter() - started < 0.5
@@ -0,0 +1 @@
+# Performance tests for DataSource file reads
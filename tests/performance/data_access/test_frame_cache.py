@@ -0,0 +1,50 @@
+"""
+Repeated reads of one datasource within a worker.
+
+A page load touches several endpoints (session start, pagination, a chart)
+that all read the same file; only the first one may decode it, the others
+must be served from the per-worker frame cache.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_tools.services.dataset_reader import clear_dataset_cache, dataset_cache_stats, read_dataset
+
+N_ROWS = 2_000_000
+N_COLUMNS = 20
+
+
+@pytest.fixture(scope='module')
+def parquet_file(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(N_ROWS, N_COLUMNS)), columns=[f'col_{i:02d}' for i in range(N_COLUMNS)])
+    path = tmp_path_factory.mktemp('cache') / 'data.parquet'
+    df.to_parquet(path, index=False)
+    return str(path)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_page_load_decodes_the_file_once(parquet_file, settings):
+    settings.DATASET_CACHE_MAX_BYTES = 2 * 2**30
+    clear_dataset_cache()
+
+    started = time.perf_counter()
+    read_dataset(parquet_file)
+    first = time.perf_counter() - started
+
+    started = time.perf_counter()
+    read_dataset(parquet_file)
+    read_dataset(parquet_file, columns=['col_03', 'col_07'], copy=False)
+    read_dataset(parquet_file, nrows=100, copy=False)
+    cached = time.perf_counter() - started
+
+    stats = dataset_cache_stats()
+    print(f"first read {first:.2f}s, three cached reads {cached:.3f}s, {stats['bytes'] / 2**20:.0f} MiB cached")
+    assert stats['misses'] == 1 and stats['hits'] == 3
+    assert cached < first
+    clear_dataset_cache()
@@ -0,0 +1,58 @@
+"""
+Projection-only reads of wide Parquet datasources.
+
+Column listings must be answered from the Parquet footer and one-column
+reads must only decode that column, so both stay far cheaper than loading
+the whole file.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from data_tools.services.dataset_reader import column_null_counts, read_dataset, read_schema
+
+N_ROWS = 2_000_000
+N_COLUMNS = 50
+
+
+@pytest.fixture(scope='module')
+def wide_parquet(tmp_path_factory):
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(N_ROWS, N_COLUMNS))
+    data[rng.random(data.shape) < 0.01] = np.nan
+    df = pd.DataFrame(data, columns=[f'col_{i:02d}' for i in range(N_COLUMNS)])
+    path = tmp_path_factory.mktemp('wide') / 'wide.parquet'
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=100_000)
+    return str(path)
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_projection_reads_beat_full_reads(wide_parquet):
+    full, full_elapsed = timed(pd.read_parquet, wide_parquet)
+    schema, schema_elapsed = timed(read_schema, wide_parquet)
+    column, column_elapsed = timed(read_dataset, wide_parquet, columns=['col_07'])
+    head, head_elapsed = timed(read_dataset, wide_parquet, nrows=1_000)
+    nulls, nulls_elapsed = timed(column_null_counts, wide_parquet)
+
+    print(f"full {full_elapsed:.2f}s, schema {schema_elapsed:.4f}s, one column {column_elapsed:.3f}s, "
+          f"1000 rows {head_elapsed:.3f}s, null counts {nulls_elapsed:.4f}s")
+
+    assert schema.num_rows == N_ROWS and schema.num_columns == N_COLUMNS
+    assert schema_elapsed < 0.1
+    assert nulls_elapsed < 0.5
+    assert column_elapsed < full_elapsed / 5
+    assert head_elapsed < full_elapsed / 5
+    assert len(head) == 1_000 and len(column.columns) == 1
+    assert nulls.equals(full.isnull().sum())
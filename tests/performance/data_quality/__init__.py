@@ -0,0 +1 @@
+# Performance tests for data quality analysis
@@ -0,0 +1,50 @@
+"""
+Nullity heatmaps of long datasources.
+
+Rows are aggregated into fixed bins before rendering, so the heatmap
+document for a 10M-row datasource must stay in the kilobytes and be built in
+seconds, where a per-row Plotly document ran to tens of megabytes.
+"""
+
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_tools.services.nullity_service import build_nullity_heatmap, nullity_heatmap_figure
+
+N_ROWS = 10_000_000
+N_VARIABLES = 6
+
+
+@pytest.fixture(scope='module')
+def long_frame():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(N_ROWS, N_VARIABLES)).astype(np.float32)
+    data[rng.random(data.shape, dtype=np.float32) < 0.05] = np.nan
+    # A sensor outage affecting half of the variables
+    data[4_000_000:4_200_000, ::2] = np.nan
+    return pd.DataFrame(data, columns=[f'sensor_{i}' for i in range(N_VARIABLES)])
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_ten_million_rows_render_in_kilobytes(long_frame):
+    started = time.perf_counter()
+    heatmap = build_nullity_heatmap(long_frame, n_bins=200)
+    elapsed = time.perf_counter() - started
+
+    document = json.dumps(heatmap)
+    figure = json.dumps(nullity_heatmap_figure(heatmap))
+    print(f"{N_ROWS} rows: heatmap {len(document) / 1024:.1f} KiB, figure {len(figure) / 1024:.1f} KiB in {elapsed:.2f}s")
+
+    assert elapsed < 30
+    assert len(document) < 50 * 1024
+    assert len(figure) < 200 * 1024
+
+    # The outage is visible in the bins it falls in
+    outage_bin = 4_100_000 * 200 // N_ROWS
+    sensor_0 = heatmap['missing'][heatmap['columns'].index('sensor_0')]
+    assert sensor_0[outage_bin] == heatmap['scale']
@@ -0,0 +1 @@
+# Performance tests for Data Studio session storage
@@ -0,0 +1,46 @@
+"""
+Per-step storage cost of disk-backed Data Studio sessions.
+
+An operation that touches one column of a wide dataset must only write that
+column (plus row positions), not another copy of the whole dataset.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_tools.services.dataset_reader import clear_dataset_cache
+from data_tools.services.session_disk_store import SessionDiskStore
+
+N_ROWS = 2_000_000
+N_COLUMNS = 30
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_one_column_step_writes_one_column(tmp_path, settings):
+    settings.MEDIA_ROOT = str(tmp_path)
+    clear_dataset_cache()
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(N_ROWS, N_COLUMNS)), columns=[f'col_{i:02d}' for i in range(N_COLUMNS)])
+    store = SessionDiskStore(1, 'perf-session')
+
+    base = store.initialize(df)
+    base_bytes = directory_size(store.path)
+
+    started = time.perf_counter()
+    view = store.commit(base, df.assign(col_05=df['col_05'].fillna(0) * 2))
+    elapsed = time.perf_counter() - started
+    step_bytes = directory_size(store.path) - base_bytes
+
+    print(f"base {base_bytes / 2**20:.0f} MiB, step {step_bytes / 2**20:.1f} MiB in {elapsed:.2f}s")
+    assert step_bytes < base_bytes / 5
+    assert store.assemble(view, columns=['col_05'])['col_05'].equals(df['col_05'] * 2)
+    clear_dataset_cache()
@@ -0,0 +1 @@
+# Performance tests for experiment training
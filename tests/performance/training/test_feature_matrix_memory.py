@@ -0,0 +1,67 @@
+"""
+Peak memory of RandomForest training with Parquet vs memory-mapped features.
+
+Each measurement runs in a freshly spawned process so ``ru_maxrss`` reflects
+only that training run. The memory-mapped path avoids the decoded DataFrame
+plus the float32 copy scikit-learn makes of it (the matrices are stored as
+float32 here, ``SPLIT_FEATURE_DTYPE`` opt-in), so its peak RSS should be
+lower (its file-backed pages are also shared between concurrent workers).
+"""
+
+import multiprocessing
+import os
+import resource
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+
+def _train_and_report_peak(media_root, artifact_paths, use_matrix, queue):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hydroML.settings')
+    import django
+    django.setup()
+    from django.conf import settings
+    from experiments.tasks.components.feature_matrix import load_features
+    settings.MEDIA_ROOT = media_root
+
+    paths = dict(artifact_paths)
+    if not use_matrix:
+        paths.pop('feature_columns')
+    X = load_features(paths, 'train_X')
+    y = np.arange(len(X), dtype='float64')
+    RandomForestRegressor(n_estimators=2, max_depth=4, random_state=0).fit(X, y)
+    queue.put(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _peak_rss(media_root, artifact_paths, use_matrix):
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_train_and_report_peak, args=(media_root, artifact_paths, use_matrix, queue))
+    process.start()
+    peak = queue.get(timeout=300)
+    process.join()
+    return peak
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_memory_mapped_training_lowers_peak_rss(settings, tmp_path):
+    from experiments.tasks.components.feature_matrix import write_feature_matrices
+
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.SPLIT_FEATURE_DTYPE = 'float32'
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200_000, 100)), columns=[f'f{i}' for i in range(100)])
+    X.to_parquet(tmp_path / 'train_X.parquet', index=False)
+
+    artifact_paths = {'train_X': 'train_X.parquet'}
+    artifact_paths.update(write_feature_matrices({'train_X': X}, str(tmp_path), '.'))
+    del X
+
+    parquet_peak = _peak_rss(str(tmp_path), artifact_paths, use_matrix=False)
+    mmap_peak = _peak_rss(str(tmp_path), artifact_paths, use_matrix=True)
+
+    print(f"Peak RSS - Parquet: {parquet_peak / 1024:.0f} MB, memory-mapped: {mmap_peak / 1024:.0f} MB")
+    assert mmap_peak < parquet_peak
@@ -0,0 +1,149 @@
+"""
+Prediction throughput (rows/sec) for every selectable model type, and of the
+online and batch prediction paths end to end.
+
+Each model is trained on a small synthetic dataset and then scores a large
+batch the way the prediction service does (a DataFrame with named feature
+columns). The end-to-end benchmarks score through a stored preprocessor and
+the per-worker model cache: ``predict_frame`` for small online requests, and
+``run_batch_prediction_task`` (chunked reads, feature preparation, transform,
+predict, CSV writing) for a whole datasource. The printed figures are the
+benchmark; the assertions only guard against pathological regressions.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+
+from core.constants import ML_MODEL_CHOICES
+from experiments.model_store import clear_model_cache, load_model, model_relative_path, save_model
+from experiments.models import MLExperiment
+from experiments.prediction_service import predict_frame
+from data_tools.services.preprocessing import build_preprocessor
+from experiments.tasks.components.prediction_tasks import run_batch_prediction_task
+from experiments.tasks.components.training_tasks import build_model
+from projects.models.datasource import DataSource, DataSourceType
+from projects.models.project import Project
+
+N_FEATURES = 10
+N_SCORE_ROWS = 200_000
+N_ONLINE_REQUESTS = 200
+ONLINE_REQUEST_ROWS = 100
+
+
+def make_features(rng, n_rows):
+    X = pd.DataFrame(rng.normal(size=(n_rows, N_FEATURES)), columns=[f'f{i}' for i in range(N_FEATURES)])
+    X['station'] = rng.choice(['A', 'B', 'C', 'D'], size=n_rows)
+    X.loc[rng.random(n_rows) < 0.01, 'f0'] = np.nan
+    return X
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    columns = [f'f{i}' for i in range(N_FEATURES)]
+    X_train = pd.DataFrame(rng.normal(size=(5_000, N_FEATURES)), columns=columns)
+    y_train = X_train.sum(axis=1) + rng.normal(scale=0.1, size=len(X_train))
+    X_score = pd.DataFrame(rng.normal(size=(N_SCORE_ROWS, N_FEATURES)), columns=columns)
+    return X_train, y_train, X_score
+
+
+@pytest.fixture
+def scoring_experiment(settings, tmp_path):
+    """Finished experiment with a stored preprocessor and model."""
+    settings.MEDIA_ROOT = str(tmp_path)
+    clear_model_cache()
+    user = User.objects.create_user(username='scoring', password='scoringpass')
+    project = Project.objects.create(name='Scoring', owner=user)
+    source = DataSource.objects.create(name='Training', data_type=DataSourceType.ORIGINAL, project=project)
+    rng = np.random.default_rng(0)
+    X_train = make_features(rng, 5_000)
+    y_train = X_train.drop(columns=['station']).sum(axis=1, skipna=True)
+
+    preprocessor = build_preprocessor().fit(X_train)
+    model = build_model('RandomForestRegressor', {'n_estimators': 50, 'max_depth': 8}, y_train)
+    model.fit(preprocessor.transform(X_train), y_train)
+
+    experiment = MLExperiment.objects.create(
+        project=project, input_datasource=source, target_column='flow',
+        feature_set=list(X_train.columns), model_name='RandomForestRegressor',
+        status=MLExperiment.Status.FINISHED
+    )
+    save_model(preprocessor, str(tmp_path / 'preprocessor.joblib'))
+    save_model(model, str(tmp_path / model_relative_path(experiment)))
+    experiment.artifact_paths = {
+        'trained_model': model_relative_path(experiment),
+        'preprocessor': 'preprocessor.joblib',
+    }
+    experiment.save()
+    return experiment
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+@pytest.mark.parametrize('model_name', [name for name, _ in ML_MODEL_CHOICES])
+def test_prediction_throughput(model_name, data):
+    X_train, y_train, X_score = data
+    model = build_model(model_name, {}, y_train).fit(X_train, y_train)
+
+    started = time.perf_counter()
+    predictions = model.predict(X_score)
+    elapsed = time.perf_counter() - started
+
+    rows_per_second = N_SCORE_ROWS / elapsed
+    print(f"{model_name}: {rows_per_second:,.0f} rows/sec")
+    assert len(predictions) == N_SCORE_ROWS
+    assert rows_per_second > 10_000
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_online_prediction_latency(scoring_experiment, settings):
+    rng = np.random.default_rng(1)
+    requests = [make_features(rng, ONLINE_REQUEST_ROWS) for _ in range(N_ONLINE_REQUESTS)]
+
+    started = time.perf_counter()
+    predict_frame(scoring_experiment, requests[0])
+    first = time.perf_counter() - started
+
+    latencies = []
+    for df in requests[1:]:
+        started = time.perf_counter()
+        predictions = predict_frame(scoring_experiment, df)
+        latencies.append(time.perf_counter() - started)
+
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+    print(f"online: first request {first * 1000:.1f} ms, p50 {p50:.2f} ms, p95 {p95:.2f} ms "
+          f"({ONLINE_REQUEST_ROWS} rows/request)")
+    assert len(predictions) == ONLINE_REQUEST_ROWS
+    # Served from the worker's model cache after the first request
+    model_path = f"{settings.MEDIA_ROOT}/{scoring_experiment.artifact_paths['trained_model']}"
+    assert load_model(model_path)[1] == 0.0
+    assert p50 < first * 1000
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+@pytest.mark.django_db
+def test_batch_prediction_throughput(scoring_experiment, settings, monkeypatch):
+    settings.PREDICTION_BATCH_CHUNK_ROWS = 50_000
+    monkeypatch.setattr(run_batch_prediction_task, 'update_state', lambda **kwargs: None)
+    source = DataSource.objects.create(
+        name='To score', data_type=DataSourceType.ORIGINAL, project=scoring_experiment.project
+    )
+    df = make_features(np.random.default_rng(2), N_SCORE_ROWS)
+    source.file.save('to_score.csv', ContentFile(df.to_csv(index=False)))
+
+    started = time.perf_counter()
+    result = run_batch_prediction_task(str(scoring_experiment.id), str(source.id))
+    elapsed = time.perf_counter() - started
+
+    print(f"batch: {result['rows'] / elapsed:,.0f} rows/sec end to end "
+          f"(read, transform, predict, write CSV)")
+    assert result['rows'] == N_SCORE_ROWS
+    assert result['rows'] / elapsed > 10_000